@@ -5,18 +5,34 @@ import os
 from PyQt5.QtWidgets import QApplication
 
 from src.services.schedule_api import ScheduleAPI
+from src.models.travel_times import TravelTimes
 from src.controllers.MainConroller import MainController 
 
+# Memory available for generated schedules before the ranker starts evicting (in MB)
+MEMORY_BUDGET_MB = 2048
+# Directory for on-disk result sessions, set it to keep every schedule instead of evicting (None keeps them in memory)
+SPILL_DIRECTORY = None
+# Keep every schedule in memory as a compressed prefix trie (a few bytes each) instead of evicting
+COMPRESS_RESULTS = False
+# JSON file with walking minutes between buildings (see travel_times.example.json), None ignores buildings
+TRAVEL_TIMES_FILE = None
+# Generation workers kept running from launch, each holding the parsed catalog (see WorkerPool)
+WORKER_POOL_SIZE = 2
+
 if __name__ == "__main__":
+    # Create the ScheduleAPI instance
+    api = ScheduleAPI(TravelTimes.load(TRAVEL_TIMES_FILE) if TRAVEL_TIMES_FILE else None)
+    # Start the warm generation workers now, before Qt is initialised
+    api.start_worker_pool(WORKER_POOL_SIZE)
     # Create the QApplication
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(api.shutdown_worker_pool)
     # Load and apply the stylesheet
     with open("src/styles/style.qss", "r") as f:
         app.setStyleSheet(f.read())
-    # Create the ScheduleAPI instance
-    api = ScheduleAPI()
     # Create and start the MainController
-    controller = MainController(api)
+    controller = MainController(api, memory_budget_mb=MEMORY_BUDGET_MB, spill_directory=SPILL_DIRECTORY,
+                                compress_results=COMPRESS_RESULTS)
     controller.start_application()
     # Run the event loop
     sys.exit(app.exec_())
@@ -1,10 +1,14 @@
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton
+from datetime import time
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QSpinBox, QLineEdit
 from PyQt5.QtCore import Qt
 from src.components.time_constraint_table import TimeConstraintTable
+from src.models.schedule_constraints import ScheduleConstraints, STUDY_DAYS
+from src.models.soft_preferences import SoftPreferences
 from src.styles.ui_styles import red_button_style, green_button_style
 
 class ConstraintDialog(QDialog):
-    def __init__(self, parent=None, initial_forbidden=None):
+    def __init__(self, parent=None, initial_forbidden=None, initial_limits=None, initial_preferences=None,
+                 feasibility_counter=None):
         super().__init__(parent)
         self.setWindowTitle("Select Forbidden Time Slots")
         self.setMinimumSize(950, 600)
@@ -16,7 +20,35 @@ class ConstraintDialog(QDialog):
                 self.table.set_forbidden_cell(row, col)
 
         layout = QVBoxLayout()
+        # Live count of the schedules the blocked hours leave, for the limits set when the dialog opened
+        self.feasibility_label = QLabel()
+        self.feasibility_label.setAlignment(Qt.AlignCenter)
+        self.feasibility_label.setVisible(False)
+        layout.addWidget(self.feasibility_label)
         layout.addWidget(self.table)
+        if feasibility_counter is not None:
+            self.table.feasibility_changed.connect(self._show_feasibility)
+            self.table.set_feasibility_counter(feasibility_counter)
+
+        # Schedule-wide limits, every spin box shows "Any" at its minimum (not enforced)
+        limits = QHBoxLayout()
+        self.max_days_spin = self._add_spin(limits, "Max days:", 0, STUDY_DAYS)
+        self.start_after_spin = self._add_spin(limits, "Start after:", 7, 20, ":00")
+        self.end_by_spin = self._add_spin(limits, "End by:", 8, 21, ":00")
+        self.max_gap_spin = self._add_spin(limits, "Max gap:", -1, 12, " h")
+        self.min_free_days_spin = self._add_spin(limits, "Min free days:", 0, STUDY_DAYS)
+        layout.addLayout(limits)
+        if initial_limits:
+            self._show_limits(initial_limits)
+
+        # Soft preferences: broken ones only push schedules down the list
+        wishes = QHBoxLayout()
+        self.avoid_buildings_edit = self._add_edit(wishes, "Avoid buildings:", "e.g. 1100, 605")
+        self.prefer_instructors_edit = self._add_edit(wishes, "Prefer instructors:", "comma separated")
+        self.early_before_spin = self._add_spin(wishes, "Avoid classes before:", 7, 20, ":00")
+        layout.addLayout(wishes)
+        if initial_preferences:
+            self._show_preferences(initial_preferences)
 
         btns = QHBoxLayout()
         self.clear_all_btn = QPushButton("Clear All")
@@ -37,9 +69,88 @@ class ConstraintDialog(QDialog):
         self.ok_btn.clicked.connect(self.accept)
         self.cancel_btn.clicked.connect(self.reject)
 
+    @staticmethod
+    def _add_spin(layout, label, minimum, maximum, suffix=""):
+        """Add a labelled spin box whose minimum means no limit"""
+        spin = QSpinBox()
+        spin.setRange(minimum, maximum)
+        spin.setSuffix(suffix)
+        spin.setSpecialValueText("Any")
+        layout.addWidget(QLabel(label))
+        layout.addWidget(spin)
+        return spin
+
+    @staticmethod
+    def _add_edit(layout, label, placeholder):
+        """Add a labelled line edit for a comma separated list"""
+        edit = QLineEdit()
+        edit.setPlaceholderText(placeholder)
+        layout.addWidget(QLabel(label))
+        layout.addWidget(edit)
+        return edit
+
+    def _show_feasibility(self, feasibility):
+        """Show how many schedules the blocked hours leave (a FeasibilityCount)"""
+        if feasibility.schedules == 0:
+            text = "No schedule fits these blocked hours"
+        else:
+            prefix = "" if feasibility.exact else "At least "
+            text = f"{prefix}{feasibility.schedules:,} schedules fit. Darker hours remove more of them when blocked."
+        self.feasibility_label.setText(text)
+        self.feasibility_label.setVisible(True)
+
+    def _show_preferences(self, preferences):
+        """Show the given SoftPreferences in the preference widgets"""
+        self.avoid_buildings_edit.setText(", ".join(preferences.avoided_buildings))
+        self.prefer_instructors_edit.setText(", ".join(preferences.preferred_instructors))
+        if preferences.early_before is not None:
+            self.early_before_spin.setValue(preferences.early_before.hour)
+
+    def _show_limits(self, limits):
+        """Show the given ScheduleConstraints in the spin boxes"""
+        if limits.max_active_days is not None:
+            self.max_days_spin.setValue(limits.max_active_days)
+        if limits.earliest_start is not None:
+            self.start_after_spin.setValue(limits.earliest_start.hour)
+        if limits.latest_end is not None:
+            self.end_by_spin.setValue(limits.latest_end.hour)
+        if limits.max_gap_minutes is not None:
+            self.max_gap_spin.setValue(limits.max_gap_minutes // 60)
+        if limits.min_free_days is not None:
+            self.min_free_days_spin.setValue(limits.min_free_days)
+
     def _clear_all_constraints(self):
-        """Clear all time constraints from the table"""
+        """Clear all time constraints from the table and the limits"""
         self.table.clear_constraints()
+        for spin in (self.max_days_spin, self.start_after_spin, self.end_by_spin,
+                     self.max_gap_spin, self.min_free_days_spin, self.early_before_spin):
+            spin.setValue(spin.minimum())
+        self.avoid_buildings_edit.clear()
+        self.prefer_instructors_edit.clear()
 
     def get_constraints(self):
-        return set(self.table.forbidden) 
\ No newline at end of file
+        return set(self.table.forbidden)
+
+    def get_schedule_constraints(self):
+        """Return the limits as ScheduleConstraints, spin boxes left at Any give None"""
+        def value(spin):
+            return None if spin.value() == spin.minimum() else spin.value()
+        start, end, gap = value(self.start_after_spin), value(self.end_by_spin), value(self.max_gap_spin)
+        return ScheduleConstraints(
+            max_active_days=value(self.max_days_spin),
+            earliest_start=time(start) if start is not None else None,
+            latest_end=time(end) if end is not None else None,
+            max_gap_minutes=gap * 60 if gap is not None else None,
+            min_free_days=value(self.min_free_days_spin),
+        ) 
+
+    def get_soft_preferences(self):
+        """Return the preferences as SoftPreferences"""
+        def items(edit):
+            return [item.strip() for item in edit.text().split(",") if item.strip()]
+        early = self.early_before_spin.value()
+        return SoftPreferences(
+            avoided_buildings=items(self.avoid_buildings_edit),
+            preferred_instructors=items(self.prefer_instructors_edit),
+            early_before=time(early) if early != self.early_before_spin.minimum() else None,
+        )
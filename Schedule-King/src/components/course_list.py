@@ -1,8 +1,14 @@
 from PyQt5.QtWidgets import QListWidget, QAbstractItemView, QListWidgetItem, QVBoxLayout, QWidget, QSizePolicy, QLabel
 from PyQt5.QtCore import pyqtSignal, Qt
-from PyQt5.QtGui import QFont
-from typing import List
+from PyQt5.QtGui import QFont, QColor, QBrush
+from typing import Dict, List, Optional
 from src.models.course import Course
+from src.services.catalog_index import CatalogIndex, CourseFit
+
+# Text colour of a course that can no longer fit next to the selection
+NO_FIT_COLOR = "#9E9E9E"
+# Item data holding the plain "code - name" text, before the fit is appended
+LABEL_ROLE = Qt.UserRole + 1
 
 class CourseList(QWidget):
     selectionChanged = pyqtSignal(list)
@@ -12,6 +18,10 @@ class CourseList(QWidget):
         self.courses: List[Course] = []  # All courses
         self.filtered_courses: List[Course] = []  # Currently displayed courses
         self.selected_course_codes: set = set()
+        # Index of the catalog marking the courses that still fit next to the selection, None for none
+        self.catalog_index: Optional[CatalogIndex] = None
+        self.ranking: List[CourseFit] = []  # Unselected courses by the schedules they keep, most first
+        self.fits: Dict[str, CourseFit] = {}  # Course code -> its CourseFit, empty without a selection
 
         # Create layout
         layout = QVBoxLayout(self)
@@ -65,8 +75,46 @@ class CourseList(QWidget):
         self.courses = courses
         self.filtered_courses = courses
         self.selected_course_codes.clear()
+        self.catalog_index = None
+        self.ranking = []
+        self.fits = {}
         self._update_course_list(courses)
 
+    def set_catalog_index(self, index: Optional[CatalogIndex]):
+        """
+        Marks, on every selection change, the courses that can no longer fit next to the selection and
+        shows how many schedules every other course keeps.
+        """
+        self.catalog_index = index
+        self._update_fits()
+
+    def _update_fits(self):
+        # Re-rank the catalog against the selection and refresh the shown items in place
+        selected = self.get_selected_courses()
+        if self.catalog_index is None or not selected:
+            self.ranking = []
+        else:
+            self.ranking = self.catalog_index.rank(selected)
+        self.fits = {fit.course.course_code: fit for fit in self.ranking}
+        for i in range(self.list_widget.count()):
+            self._apply_fit(self.list_widget.item(i))
+
+    def _apply_fit(self, item: QListWidgetItem):
+        # Append the schedules the course keeps to its text, and grey it out if it cannot fit
+        text = item.data(LABEL_ROLE)
+        fit = self.fits.get(item.data(Qt.UserRole))
+        if fit is None:
+            item.setText(text)
+            item.setData(Qt.ForegroundRole, None)
+        elif fit.schedules == 0 and fit.exact:
+            item.setText(f"{text}  |  does not fit")
+            item.setForeground(QBrush(QColor(NO_FIT_COLOR)))
+        else:
+            prefix = "" if fit.exact else "about "
+            plural = "" if fit.schedules == 1 else "s"
+            item.setText(f"{text}  |  keeps {prefix}{fit.schedules:,} schedule{plural}")
+            item.setData(Qt.ForegroundRole, None)
+
     def _update_course_list(self, course_list: List[Course]):
         self.list_widget.blockSignals(True)
         self.list_widget.clear()
@@ -75,6 +123,7 @@ class CourseList(QWidget):
         for course in course_list:
             item = QListWidgetItem(f"{course.course_code} - {course.name}")
             item.setData(Qt.UserRole, course.course_code)
+            item.setData(LABEL_ROLE, item.text())
 
             # Basic course info
             details = [
@@ -101,6 +150,7 @@ class CourseList(QWidget):
             format_slot_groups(course.maabadas, "Lab", "#7B1FA2")
 
             item.setToolTip("<br>".join(details))
+            self._apply_fit(item)
             self.list_widget.addItem(item)
 
             if course.course_code in self.selected_course_codes:
@@ -124,6 +174,7 @@ class CourseList(QWidget):
                 self.selected_course_codes.discard(code)
         # Always emit the full selection (from all courses, not just visible)
         selected = [course for course in self.courses if course.course_code in self.selected_course_codes]
+        self._update_fits()
         self.selectionChanged.emit(selected)
 
     def get_selected_courses(self) -> List[Course]:
@@ -136,6 +187,7 @@ class CourseList(QWidget):
     def clear_selection(self):
         self.list_widget.clearSelection()
         self.selected_course_codes.clear()
+        self._update_fits()
         self.selectionChanged.emit([])
 
     def filter_courses(self, text: str):
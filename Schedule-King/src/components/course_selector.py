@@ -9,6 +9,7 @@ from src.models.course import Course
 from src.components.course_list import CourseList
 from src.components.selected_courses_panel import SelectedCoursesPanel
 from src.components.search_bar import SearchBar
+from src.services.strategy_selector import MAX_SELECTED_COURSES
 from src.styles.ui_styles import (
     red_button_style, green_button_style, blue_button_style, 
     disabled_button_style, title_label_style, warning_label_style,
@@ -21,7 +22,7 @@ class CourseSelector(QWidget):
     coursesSelected = pyqtSignal(list)
     coursesSubmitted = pyqtSignal(list)
     loadRequested = pyqtSignal()
-    MAX_COURSES = 7  # Maximum number of courses allowed
+    MAX_COURSES = MAX_SELECTED_COURSES  # Maximum number of courses allowed
 
     def __init__(self, parent=None):
         super().__init__(parent)
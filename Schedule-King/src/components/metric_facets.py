@@ -0,0 +1,100 @@
+from PyQt5.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QProgressBar
+from PyQt5.QtCore import Qt, pyqtSignal
+from src.models.Preference import Metric
+from typing import Dict
+
+# Facet rows shown in the panel: days of a week and hourly start times (8:00 to 19:00)
+ACTIVE_DAY_FACETS = range(1, 7)
+START_HOUR_FACETS = range(8, 20)
+
+class MetricFacets(QFrame):
+    """
+    Side panel showing live metric distributions while schedules are generated:
+    - Number of schedules per count of active days
+    - Histogram of the average start hour
+    Clicking a row emits facet_selected so the window can jump to that bucket.
+    """
+    # Emits (metric: Metric, grade: int) when the user clicks a facet row
+    facet_selected = pyqtSignal(object, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("metric_facets")
+        self.setFixedWidth(240)
+        # (metric, grade) -> (button, bar, label text) for every facet row
+        self.rows: Dict[tuple, tuple] = {}
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Initialize the facet sections"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setSpacing(4)
+
+        title = QLabel("Live Distribution")
+        title.setObjectName("facets_title_label")
+        title.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title)
+
+        # Active days section
+        layout.addWidget(self._make_section_label("Active days"))
+        for days in ACTIVE_DAY_FACETS:
+            layout.addLayout(self._make_row(Metric.ACTIVE_DAYS, days, f"{days} days"))
+
+        # Start time section, grades are minutes since midnight
+        layout.addWidget(self._make_section_label("Average start time"))
+        for hour in START_HOUR_FACETS:
+            layout.addLayout(self._make_row(Metric.AVG_START_TIME, hour * 60, f"{hour:02d}:00"))
+
+        layout.addStretch()
+
+    def _make_section_label(self, text: str) -> QLabel:
+        """Create a section header label"""
+        label = QLabel(text)
+        label.setObjectName("facets_section_label")
+        return label
+
+    def _make_row(self, metric: Metric, grade: int, text: str) -> QHBoxLayout:
+        """Create a clickable facet row with a count bar"""
+        row = QHBoxLayout()
+        row.setSpacing(6)
+
+        button = QPushButton(f"{text}: 0")
+        button.setObjectName("facet_button")
+        button.setFlat(True)
+        button.setCursor(Qt.PointingHandCursor)
+        button.setEnabled(False)
+        button.clicked.connect(lambda: self.facet_selected.emit(metric, grade))
+
+        bar = QProgressBar()
+        bar.setObjectName("facet_bar")
+        bar.setTextVisible(False)
+        bar.setFixedHeight(10)
+        bar.setRange(0, 1)
+        bar.setValue(0)
+
+        row.addWidget(button, 2)
+        row.addWidget(bar, 3)
+        self.rows[(metric, grade)] = (button, bar, text)
+        return row
+
+    def update_facets(self, facets: Dict[Metric, Dict[int, int]]):
+        """
+        Refresh all rows from the given histograms.
+        :param facets: Histogram per metric, keyed by grade, as returned by ScheduleController.get_metric_facets.
+        """
+        for metric in (Metric.ACTIVE_DAYS, Metric.AVG_START_TIME):
+            histogram = facets.get(metric, {})
+            total = max(1, sum(histogram.values()))
+            for (row_metric, grade), (button, bar, text) in self.rows.items():
+                if row_metric != metric:
+                    continue
+                count = histogram.get(grade, 0)
+                button.setText(f"{text}: {count}")
+                button.setEnabled(count > 0)
+                bar.setMaximum(total)
+                bar.setValue(count)
+
+    def clear(self):
+        """Reset every row to zero"""
+        self.update_facets({})
@@ -1,11 +1,16 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QProgressBar
 from PyQt5.QtCore import Qt
+from src.models.progress_estimate import ProgressEstimate
+
+# Largest maximum a QProgressBar accepts (a C int), larger estimates show an indeterminate bar
+PROGRESS_BAR_MAXIMUM = 2**31 - 1
 
 class ScheduleProgress(QWidget):
     """
     Progress component for the schedule window containing:
     - Progress label
     - Progress bar
+    - Estimate label (confidence band and remaining time)
     """
     def __init__(self):
         super().__init__()
@@ -34,9 +39,24 @@ class ScheduleProgress(QWidget):
         self.progress_bar.setFixedWidth(300)
         self.progress_bar.setVisible(False)
         
+        # Estimate label, only shown once the controller reports a band and an ETA
+        self.estimate_label = QLabel()
+        self.estimate_label.setObjectName("progress_label")
+        self.estimate_label.setAlignment(Qt.AlignCenter)
+        self.estimate_label.setVisible(False)
+        
+        # Retention label, only shown when a bounded ranker evicted schedules
+        self.retention_label = QLabel()
+        self.retention_label.setObjectName("progress_label")
+        self.retention_label.setAlignment(Qt.AlignCenter)
+        self.retention_label.setWordWrap(True)
+        self.retention_label.setVisible(False)
+        
         # Add components to layout
         layout.addWidget(self.progress_label)
         layout.addWidget(self.progress_bar)
+        layout.addWidget(self.estimate_label)
+        layout.addWidget(self.retention_label)
         
     def update_progress(self, current: int, estimated: int):
         """
@@ -48,7 +68,7 @@ class ScheduleProgress(QWidget):
         self.progress_bar.setVisible(True)
         
         try:
-            if estimated > 0:
+            if 0 < estimated <= PROGRESS_BAR_MAXIMUM:
                 # We have an estimated total - show determinate progress
                 self.progress_bar.setMaximum(estimated)
                 self.progress_bar.setValue(current)
@@ -71,7 +91,43 @@ class ScheduleProgress(QWidget):
             print(f"Current error: {current}")  # Log the error
             print(f"Error updating progress: {str(e)}")
             
+    def update_estimate(self, estimate: ProgressEstimate):
+        """
+        Shows the confidence band of the estimated schedule count and the remaining time.
+        """
+        if estimate.exact:
+            text = f"Exactly {estimate.schedules:,} schedules"
+        else:
+            text = f"About {estimate.schedules:,} schedules (95%: {estimate.low:,} - {estimate.high:,})"
+        if estimate.eta_seconds is not None and estimate.eta_seconds > 0:
+            text += f", about {self.format_duration(estimate.eta_seconds)} left"
+        self.estimate_label.setText(text)
+        self.estimate_label.setVisible(True)
+
+    @staticmethod
+    def format_duration(seconds: float) -> str:
+        """
+        Formats a duration for the estimate label, e.g. "45s", "3 min 20s" or "2 h 5 min".
+        """
+        seconds = max(int(round(seconds)), 1)
+        if seconds < 60:
+            return f"{seconds}s"
+        if seconds < 3600:
+            return f"{seconds // 60} min {seconds % 60}s"
+        return f"{seconds // 3600} h {seconds % 3600 // 60} min"
+
+    def update_retention(self, seen: int, kept: int):
+        """
+        Shows how many schedules were generated versus kept by a bounded ranker.
+        """
+        self.retention_label.setText(
+            f"Kept {kept:,} of {seen:,} schedules (best per metric, Pareto front and a random sample)"
+        )
+        self.retention_label.setVisible(True)
+
     def hide_progress(self):
         """Hide the progress indicators"""
         self.progress_bar.setVisible(False)
-        self.progress_label.setVisible(False) 
\ No newline at end of file
+        self.progress_label.setVisible(False)
+        self.estimate_label.setVisible(False)
+        self.retention_label.setVisible(False) 
\ No newline at end of file
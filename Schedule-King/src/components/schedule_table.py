@@ -2,6 +2,8 @@ from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView, QLabel
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QColor, QBrush
 from src.models.schedule import Schedule
+from src.models.violation import Violation
+from typing import Sequence
 
 class ScheduleTable(QTableWidget):
     """
@@ -22,6 +24,8 @@ class ScheduleTable(QTableWidget):
         
         # Store current schedule for comparison
         self.current_schedule = None
+        # Cells (row, column) of the violations of the current near-miss schedule, with their descriptions
+        self.violation_cells = {}
         
         # Set up 12 rows for time slots (8:00 to 19:00)
         self.setRowCount(12)
@@ -175,6 +179,41 @@ class ScheduleTable(QTableWidget):
                     # Set the label as the cell widget
                     self.setCellWidget(row, day, label)
 
+        # Only a real Schedule can carry violations
+        self.highlight_violations(schedule.violations if isinstance(schedule, Schedule) else ())
+
         # Set fixed row heights for consistency
         for row in range(self.rowCount()):
-            self.setRowHeight(row, 100)
\ No newline at end of file
+            self.setRowHeight(row, 100)
+
+    def highlight_violations(self, violations: Sequence[Violation]):
+        """
+        Marks the overlaps and forbidden slots of a near-miss schedule with a red frame and explains
+        them in the cell tooltips. Valid schedules have no violations and are left as they are.
+
+        Args:
+            violations (Sequence[Violation]): The violations of the displayed schedule.
+        """
+        self.violation_cells = {}
+        for violation in violations:
+            day = int(violation.day) - 1
+            # Every hour row the violation touches, including a partly used last hour
+            last_hour = violation.end_time.hour + (1 if violation.end_time.minute else 0)
+            for row in range(max(violation.start_time.hour, 8) - 8, min(last_hour, 20) - 8):
+                self.violation_cells.setdefault((row, day), []).append(violation.describe())
+
+        for (row, day), descriptions in self.violation_cells.items():
+            warning = "\n".join(f"Violation: {text}" for text in descriptions)
+            item = self.item(row, day)
+            if item is None:
+                item = QTableWidgetItem()
+                self.setItem(row, day, item)
+            item.setToolTip(f"{item.toolTip()}\n{warning}".strip())
+            label = self.cellWidget(row, day)
+            if label is not None:
+                label.setToolTip(item.toolTip())
+                label.setStyleSheet(label.styleSheet() + """
+                    QLabel {
+                        border: 3px solid #D32F2F;
+                    }
+                """)
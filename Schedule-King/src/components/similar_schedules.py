@@ -0,0 +1,47 @@
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QPushButton
+from PyQt5.QtCore import Qt, pyqtSignal
+
+class SimilarSchedules(QWidget):
+    """
+    "More like this" controls for the schedule window containing:
+    - A button to jump to the same schedule with one course swapped
+    - A button to jump to the most similar schedule with fewer active days
+    """
+    # Emitted when the user asks for a one-course-swap alternative
+    swap_requested = pyqtSignal()
+    # Emitted when the user asks for a similar schedule with fewer active days
+    fewer_days_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Initialize and setup the similarity buttons"""
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        # Swap one course button
+        self.swap_button = QPushButton("Swap a Course")
+        self.swap_button.setObjectName("similar_button")
+        self.swap_button.setToolTip("Show the same schedule with one course changed")
+        self.swap_button.setCursor(Qt.PointingHandCursor)
+
+        # Fewer active days button
+        self.fewer_days_button = QPushButton("Fewer Days")
+        self.fewer_days_button.setObjectName("similar_button")
+        self.fewer_days_button.setToolTip("Show the most similar schedule with fewer active days")
+        self.fewer_days_button.setCursor(Qt.PointingHandCursor)
+
+        layout.addWidget(self.swap_button)
+        layout.addWidget(self.fewer_days_button)
+
+        # Forward button clicks as component signals
+        self.swap_button.clicked.connect(self.swap_requested.emit)
+        self.fewer_days_button.clicked.connect(self.fewer_days_requested.emit)
+
+    def set_enabled(self, enabled: bool):
+        """Enable or disable both similarity buttons"""
+        self.swap_button.setEnabled(enabled)
+        self.fewer_days_button.setEnabled(enabled)
@@ -1,9 +1,18 @@
 from PyQt5.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QColor, QBrush
 from src.models.time_slot import TimeSlot
+from src.services.feasibility_counter import FeasibilityCount, FeasibilityCounter
+
+# Colour of a free cell by the share of the remaining schedules blocking it would eliminate (alpha grows with it)
+IMPACT_COLOR = (255, 165, 0)
+IMPACT_MIN_ALPHA = 40
+IMPACT_MAX_ALPHA = 200
 
 class TimeConstraintTable(QTableWidget):
+    # Emitted with the FeasibilityCount after every change, once a feasibility counter is set
+    feasibility_changed = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
         # Set up columns for days of the week (Sunday to Friday)
@@ -38,6 +47,40 @@ class TimeConstraintTable(QTableWidget):
         self.cellEntered.connect(self._drag_enter_cell)
         self.cellReleased = False  # Not used, but defined
 
+        # Live count of the schedules left, None to leave the free cells plain
+        self.feasibility_counter = None
+        self.feasibility = None  # Latest FeasibilityCount
+
+    def set_feasibility_counter(self, counter: FeasibilityCounter):
+        """
+        Counts the schedules of the selected courses after every painted cell and colours each free cell
+        by how many of them blocking it would eliminate.
+        """
+        self.feasibility_counter = counter
+        self._update_feasibility()
+
+    def _update_feasibility(self):
+        # Recount and recolour the free cells, a few milliseconds per change
+        if self.feasibility_counter is None:
+            return
+        self.feasibility = self.feasibility_counter.count(self.forbidden)
+        for (row, col), eliminated in self.feasibility.impacts.items():
+            if row < self.rowCount() and col < self.columnCount():
+                self.setItem(row, col, self._impact_item(eliminated, self.feasibility))
+        self.feasibility_changed.emit(self.feasibility)
+
+    @staticmethod
+    def _impact_item(eliminated: int, feasibility: FeasibilityCount) -> QTableWidgetItem:
+        # A free cell, tinted by the share of the schedules blocking it would eliminate
+        item = QTableWidgetItem("")
+        if eliminated > 0 and feasibility.schedules > 0:
+            share = eliminated / feasibility.schedules
+            alpha = int(IMPACT_MIN_ALPHA + (IMPACT_MAX_ALPHA - IMPACT_MIN_ALPHA) * share)
+            item.setBackground(QBrush(QColor(*IMPACT_COLOR, alpha)))
+            prefix = "" if feasibility.exact else "about "
+            item.setToolTip(f"Blocking this hour removes {prefix}{eliminated:,} of the {feasibility.schedules:,} schedules")
+        return item
+
     def mouseReleaseEvent(self, event):
         # Stop dragging when mouse is released
         super().mouseReleaseEvent(event)
@@ -78,11 +121,13 @@ class TimeConstraintTable(QTableWidget):
                 item.setBackground(QBrush(QColor(255, 105, 97, 160)))
                 item.setTextAlignment(Qt.AlignCenter)
                 self.setItem(row, col, item)
+                self._update_feasibility()
         elif mode == 'remove':
             if key in self.forbidden:
                 self.forbidden.remove(key)
                 # Clear the cell
                 self.setItem(row, col, QTableWidgetItem(""))
+                self._update_feasibility()
 
     def set_forbidden_cell(self, row, col):
         # Mark a cell as forbidden (used externally)
@@ -92,11 +137,13 @@ class TimeConstraintTable(QTableWidget):
         item.setBackground(QBrush(QColor(255, 105, 97, 160)))
         item.setTextAlignment(Qt.AlignCenter)
         self.setItem(row, col, item)
+        self._update_feasibility()
 
     def clear_constraints(self):
         # Clear all forbidden cells
         self.forbidden.clear()
         self.clearContents()
+        self._update_feasibility()
 
     def get_forbidden_timeslots(self):
         # Return forbidden cells as a list of TimeSlot objects
@@ -2,6 +2,8 @@ from src.services.schedule_api import ScheduleAPI
 from src.models.course import Course
 from typing import List, Optional
 from src.models.time_slot import TimeSlot
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.soft_preferences import SoftPreferences
 
 class CourseController:
     def __init__(self, api: ScheduleAPI):
@@ -9,6 +11,8 @@ class CourseController:
         self.courses: List[Course] = []
         self.selected_courses: List[Course] = []
         self.forbidden_slots: List[TimeSlot] = []  # Add storage for forbidden slots
+        self.constraints: Optional[ScheduleConstraints] = None  # Hard limits on days, hours and gaps
+        self.preferences: Optional[SoftPreferences] = None  # Soft wishes ordering the schedules
 
     def get_courses_names(self, file_path: str) -> List[Course]:
         """
@@ -17,12 +21,16 @@ class CourseController:
         self.courses = self.api.get_courses(file_path)
         return self.courses
 
-    def set_selected_courses(self, selected: List[Course],forbidden_slots: Optional[List[TimeSlot]] = None) -> None:
+    def set_selected_courses(self, selected: List[Course],forbidden_slots: Optional[List[TimeSlot]] = None,
+                             constraints: Optional[ScheduleConstraints] = None,
+                             preferences: Optional[SoftPreferences] = None) -> None:
         """
         Saves the selected courses for future use.
         """
         self.selected_courses = selected
         self.forbidden_slots = forbidden_slots or []
+        self.constraints = constraints
+        self.preferences = preferences
 
     def get_selected_courses(self) -> List[Course]:
         """
@@ -34,4 +42,16 @@ class CourseController:
         """
         Returns the forbidden time slots.
         """
-        return self.forbidden_slots
\ No newline at end of file
+        return self.forbidden_slots
+
+    def get_constraints(self) -> Optional[ScheduleConstraints]:
+        """
+        Returns the hard schedule constraints, or None if none were set.
+        """
+        return self.constraints
+
+    def get_preferences(self) -> Optional[SoftPreferences]:
+        """
+        Returns the soft preferences, or None if none were set.
+        """
+        return self.preferences
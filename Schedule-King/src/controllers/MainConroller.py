@@ -7,17 +7,25 @@ from src.services.schedule_api import ScheduleAPI
 from src.models.course import Course
 from typing import List, Optional
 from src.models.time_slot import TimeSlot
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.soft_preferences import SoftPreferences
 from src.services.logger import Logger
 
 class MainController:
-    def __init__(self, api: ScheduleAPI, maximize_on_start=True):
+    def __init__(self, api: ScheduleAPI, maximize_on_start=True, memory_budget_mb: Optional[float] = None,
+                 spill_directory: Optional[str] = None, compress_results: bool = False):
         # Initialize the main controller with the API instance
         self.api = api
         self._maximize_on_start = maximize_on_start
 
         # Initialize course and schedule controllers
+        # With a memory budget the schedule controller keeps only the best results once it is exceeded,
+        # with a spill directory it keeps every result in a memory-mapped session on disk instead,
+        # and with compression it keeps every result in memory as a compact prefix trie
         self.course_controller = CourseController(api)
-        self.schedule_controller = ScheduleController(api)
+        self.schedule_controller = ScheduleController(api, memory_budget_mb=memory_budget_mb,
+                                                      spill_directory=spill_directory,
+                                                      compress_results=compress_results)
 
         # Initialize the course window and set up event handlers
         self.course_window = CourseWindow(maximize_on_start=maximize_on_start)
@@ -26,6 +34,12 @@ class MainController:
         # Set up event handlers for the course window
         self.course_window.on_courses_loaded = self.on_file_selected
         self.course_window.on_continue = self.on_courses_selected
+        # Generate the settled selection in the background while the user is still choosing
+        self.course_window.on_selection_changed = self.schedule_controller.speculate
+        # Count the schedules live while forbidden hours are painted
+        self.course_window.feasibility_counter_factory = self.api.create_feasibility_counter
+        # Mark the courses that still fit next to the selection
+        self.course_window.catalog_index_factory = self.api.create_catalog_index
 
     def start_application(self):
         # Show the course window to start the application
@@ -33,6 +47,7 @@ class MainController:
 
     def on_file_selected(self, file_path: str):
         # Handle the event when a file is selected
+        self.schedule_controller.cancel_speculation()
         try:
             # Get course names from the selected file
             courses = self.course_controller.get_courses_names(file_path)
@@ -70,7 +85,9 @@ class MainController:
                 f"An error occurred while loading the file: {str(e)}"
             )
 
-    def on_courses_selected(self, selected_courses: List[Course], forbidden_slots: Optional[List[TimeSlot]] = None):
+    def on_courses_selected(self, selected_courses: List[Course], forbidden_slots: Optional[List[TimeSlot]] = None,
+                            constraints: Optional[ScheduleConstraints] = None,
+                            preferences: Optional[SoftPreferences] = None):
         # Handle the event when courses are selected
         if not selected_courses:
             # Show a warning if no courses are selected
@@ -83,7 +100,7 @@ class MainController:
 
         # Set the selected courses and forbidden slots (if exist) in the course controller
         forbidden_slots = forbidden_slots or []
-        self.course_controller.set_selected_courses(selected_courses, forbidden_slots)
+        self.course_controller.set_selected_courses(selected_courses, forbidden_slots, constraints, preferences)
        
         # Make sure any previous schedule generation is stopped if the schedule window exists
         if self.schedule_window:
@@ -100,14 +117,17 @@ class MainController:
         # Hide the course window and show the schedule window
         self.course_window.hide()
         self.schedule_window.show()
-        # Generate schedules based on the selected courses and forbidden slots if any
-        self.schedule_controller.generate_schedules(selected_courses, forbidden_slots)
+        # Generate schedules based on the selected courses, forbidden slots, constraints and preferences if any
+        self.schedule_controller.generate_schedules(selected_courses, forbidden_slots, constraints, preferences)
 
     def on_generate_schedules(self):
         # Generate schedules for the currently selected courses
         selected_courses = self.course_controller.get_selected_courses()
         forbidden_slots = self.course_controller.get_forbidden_slots()
-        schedules = self.schedule_controller.generate_schedules(selected_courses, forbidden_slots)
+        constraints = self.course_controller.get_constraints()
+        preferences = self.course_controller.get_preferences()
+        schedules = self.schedule_controller.generate_schedules(selected_courses, forbidden_slots, constraints,
+                                                                preferences)
         if self.schedule_window:
             # Display the generated schedules in the schedule window
             self.schedule_window.displaySchedules(schedules)
@@ -118,5 +138,7 @@ class MainController:
             # Hide the schedule window and reset it
             self.schedule_window.hide()
             self.schedule_window = None  
+            # The hidden window no longer listens, speculative runs report to no view
+            self.schedule_controller.detach_callbacks()
         # Show the course window again
         self.course_window.show()
\ No newline at end of file
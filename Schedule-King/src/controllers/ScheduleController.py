@@ -1,60 +1,379 @@
 from src.services.schedule_api import ScheduleAPI
 from src.models.schedule import Schedule
 from src.models.course import Course
-from typing import List, Optional
+from src.models.course_selection import CourseSelection
+from src.models.infeasibility_core import InfeasibilityCore
+from src.models.generation_limits import GenerationLimits
+from src.models.generation_result import GenerationResult
+from src.models.search_checkpoint import SearchCheckpoint
+from src.models.progress_estimate import ProgressEstimate
+from src.services.progress_estimator import ProgressEstimator
+from typing import Dict, List, Optional, Sequence, Union
 from PyQt5.QtCore import QTimer
+import json
+import os
+import shutil
+import tempfile
+import time
 from src.models.schedule_ranker import ScheduleRanker
+from src.models.result_store import MemmapResultStore, TrieResultStore
+from src.interfaces.result_store_interface import IResultStore
 from src.models.time_slot import TimeSlot
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.soft_preferences import SoftPreferences
 from src.models.Preference import Preference, Metric
 
+# Batches taken from the queue per check while the run is speculative (up to 1000 schedules each)
+SPECULATIVE_BATCHES_PER_CHECK = 1
+
 class ScheduleController:
-    def __init__(self, api: ScheduleAPI):
+    def __init__(self, api: ScheduleAPI, max_schedules: Optional[int] = None, memory_budget_mb: Optional[float] = None,
+                 spill_directory: Optional[str] = None, compress_results: bool = False):
         """
         Initializes the ScheduleController with the given API.
         Sets up internal state for schedules, timers, and callbacks.
+
+        Args:
+            api (ScheduleAPI): The API used to generate and export schedules.
+            max_schedules (Optional[int]): Keep at most this many schedules (bounded ranker), None for no limit.
+            memory_budget_mb (Optional[float]): Alternative budget in megabytes, used if max_schedules is not given.
+            spill_directory (Optional[str]): Keep every schedule in a memory-mapped session under this directory
+                instead of in memory. Takes precedence over the budgets, nothing is evicted.
+            compress_results (bool): Keep every schedule in memory as a compressed prefix trie of its course
+                choices (a few bytes each) instead of as objects. Ignored when spilling, nothing is evicted.
         """
         self.api = api
-        self.ranker = ScheduleRanker() 
+        self.spill_directory = spill_directory
+        self.compress_results = compress_results
+        self.store: Optional[MemmapResultStore] = None  # On-disk session of the current results, if spilling
+        if spill_directory is not None or compress_results:
+            self.ranker = ScheduleRanker()
+        elif max_schedules is not None:
+            self.ranker = ScheduleRanker(max_schedules=max_schedules)
+        elif memory_budget_mb is not None:
+            self.ranker = ScheduleRanker.from_memory_budget(memory_budget_mb)
+        else:
+            self.ranker = ScheduleRanker()
         self.next = 1  # Used to determine when to notify about new schedules
         self.on_schedules_generated = lambda schedules: None  # Callback for when schedules are generated
         self.on_progress_updated = lambda current, estimated: None  # Callback for when progress is updated
+        self.on_estimate_updated = lambda estimate: None  # Callback with the confidence band and ETA of the estimate
+        self.on_retention_updated = lambda seen, kept: None  # Callback for when a bounded ranker evicted schedules
+        self.on_infeasible = lambda core: None  # Callback for when the selection was found to have no schedule
         self.timer = None  # QTimer for periodic checking
         self.queue = None  # Queue for generated schedules
         self.generation_active = False  # Flag to indicate if generation is active
         self.estimated_total = -1  # Estimated total number of schedules (optional, if known)
+        self.estimator: Optional[ProgressEstimator] = None  # Refines estimated_total while generating
+        self.progress_estimate: Optional[ProgressEstimate] = None  # Latest estimate, with its band and ETA
+        self.seen_at_start = 0  # Schedules restored before the current generation started
+        self.infeasibility_core: Optional[InfeasibilityCore] = None  # Why the last selection has no schedule
+        self.generation_started = 0.0  # perf_counter() when the last generation was requested
+        self.time_to_first_schedule: Optional[float] = None  # Seconds until the first schedule was available
+        self.probe_vector: Optional[tuple] = None  # Option vector of the probe schedule, dropped from the stream
+        self.generation_result: Optional[GenerationResult] = None  # How the last bounded generation ended
+        self.selection_key: Optional[str] = None  # Key of the current generation if it can be checkpointed
+        self.resumed_checkpoint: Optional[SearchCheckpoint] = None  # Checkpoint the current generation resumed from
+        self.speculation_key: Optional[str] = None  # Selection of the current run while it is speculative
 
-    def generate_schedules(self, selected_courses: List[Course], forbidden_slots: Optional[List[TimeSlot]] = None) -> List[Schedule]:
+    def generate_schedules(self, selected_courses: Union[List[Course], CourseSelection], forbidden_slots: Optional[List[TimeSlot]] = None,
+                           constraints: Optional[ScheduleConstraints] = None,
+                           preferences: Optional[SoftPreferences] = None,
+                           limits: Optional[GenerationLimits] = None) -> Sequence[Schedule]:
         """
         Generates possible schedules using the API and saves them.
         Starts a timer to periodically check for new schedules and report progress.
 
         Args:
-            selected_courses (List[Course]): The list of courses selected by the user.
+            selected_courses (Union[List[Course], CourseSelection]): The list of courses selected by the user,
+                or a selection with optional courses and OR-groups (preferred courses first).
+            forbidden_slots (Optional[List[TimeSlot]]): Time slots that must stay free.
+            constraints (Optional[ScheduleConstraints]): Hard limits every schedule must satisfy.
+            preferences (Optional[SoftPreferences]): Soft preferences, schedules then arrive lowest penalty first.
+            limits (Optional[GenerationLimits]): Bounds on the run; generation_result then tells whether it finished.
+
+        Without soft preferences, a greedy probe finds one schedule in this process while the worker starts,
+        so the first schedule is shown right away (see time_to_first_schedule); the worker's copy of it is dropped.
+        When spilling, the generation is checkpointed next to its session; generating the same selection again
+        after it was interrupted resumes it, with the stored schedules shown right away.
+        If speculate was called with the same selection, its run is adopted with the schedules it has found.
 
         Returns:
-            List[Schedule]: The current (initially empty) list of schedules.
+            Sequence[Schedule]: The current schedules, empty or holding the probe schedule. With a result store
+                (spilling or compressing), a read-only view of it: a resumed session is not rebuilt here.
+        """
+        key = self._speculation_key(selected_courses, forbidden_slots, constraints, preferences)
+        if limits is None and key is not None and key == self.speculation_key:
+            self._adopt_speculation()
+        else:
+            self.cancel_speculation()
+            self._start_generation(selected_courses, forbidden_slots, constraints, preferences, limits)
+
+        # Notify immediately to show generation has started (with the probe schedule, if any)
+        self.on_schedules_generated(self.ranker.size())
+        if self.infeasibility_core is not None:
+            self.on_infeasible(self.infeasibility_core)
+
+        # Estimate the number of schedules, refined on every check while the worker runs
+        self.estimator = None
+        self.progress_estimate = None
+        self.estimated_total = -1
+        if not self.generation_active:  # An adopted run that already finished
+            self._report_completion()
+            return self.ranker.get_schedules()
+        self.estimator = self.api.create_progress_estimator(selected_courses, forbidden_slots, constraints, preferences)
+        self._update_estimate()
+        # Notify progress start
+        self.on_progress_updated(self.ranker.seen_count(), self.estimated_total)
+        return self.ranker.get_schedules()
+
+    def speculate(self, selected_courses: List[Course], forbidden_slots: Optional[List[TimeSlot]] = None,
+                  constraints: Optional[ScheduleConstraints] = None,
+                  preferences: Optional[SoftPreferences] = None) -> None:
+        """
+        Starts generating for a selection the user has not confirmed yet, in a worker of low priority,
+        so that confirming it finds the schedules already there: generate_schedules with the same selection
+        adopts the run. The run of another selection is cancelled first; cancelling only signals the worker,
+        nothing waits for it. The progress estimate is left to generate_schedules, as counting the schedules
+        takes a moment in this process.
+
+        Args:
+            selected_courses (List[Course]): The courses currently selected, empty to only cancel.
+            forbidden_slots (Optional[List[TimeSlot]]): Time slots that must stay free.
+            constraints (Optional[ScheduleConstraints]): Hard limits every schedule must satisfy.
+            preferences (Optional[SoftPreferences]): Soft preferences.
+        """
+        key = self._speculation_key(selected_courses, forbidden_slots, constraints, preferences)
+        if key == self.speculation_key:
+            return
+        self.cancel_speculation()
+        if not selected_courses:
+            return
+        self._start_generation(selected_courses, forbidden_slots, constraints, preferences, low_priority=True)
+        self.speculation_key = key
+
+    def detach_callbacks(self) -> None:
+        """
+        Resets the view callbacks to no-ops, once the view they report to is gone.
+        """
+        self.on_schedules_generated = lambda schedules: None
+        self.on_progress_updated = lambda current, estimated: None
+        self.on_estimate_updated = lambda estimate: None
+        self.on_retention_updated = lambda seen, kept: None
+        self.on_infeasible = lambda core: None
+
+    def cancel_speculation(self) -> None:
+        """
+        Stops the speculative run, if any, and deletes its on-disk session unless it finished.
+        """
+        if self.speculation_key is None:
+            return
+        self.speculation_key = None
+        if self.store is not None:
+            # A speculative run is not worth resuming
+            SearchCheckpoint.remove(self.store.path)
+        self.stop_schedules_generation()
+        self.ranker.attach_store(None)
+        self._discard_session()
+
+    def _speculation_key(self, selected_courses: Union[List[Course], CourseSelection],
+                         forbidden_slots: Optional[List[TimeSlot]] = None,
+                         constraints: Optional[ScheduleConstraints] = None,
+                         preferences: Optional[SoftPreferences] = None) -> Optional[str]:
+        """
+        Returns a key that is equal for two generations of the same schedules in the same order,
+        None for a CourseSelection (never speculated).
+        """
+        if isinstance(selected_courses, CourseSelection):
+            return None
+        wishes = repr(preferences) if preferences is not None and not preferences.is_empty() else None
+        return json.dumps([SearchCheckpoint.make_selection_key(selected_courses, forbidden_slots, constraints,
+                                                               self.api.travel_times), wishes])
+
+    def _adopt_speculation(self) -> None:
         """
+        Makes the speculative run the current generation, back at normal OS priority where the OS allows it.
+        Its latency and arrival rate are counted from now, the schedules it has already found are there right away.
+        """
+        self.speculation_key = None
+        if self.generation_active:
+            self.api.restore_generation_priority()
+        self.generation_started = time.perf_counter()
+        self.time_to_first_schedule = 0.0 if self.ranker.size() else None
+        self.seen_at_start = self.ranker.seen_count()
+
+    def _start_generation(self, selected_courses: Union[List[Course], CourseSelection],
+                          forbidden_slots: Optional[List[TimeSlot]] = None,
+                          constraints: Optional[ScheduleConstraints] = None,
+                          preferences: Optional[SoftPreferences] = None,
+                          limits: Optional[GenerationLimits] = None, low_priority: bool = False) -> None:
+        """
+        Starts the worker and the timer that checks for its schedules (see generate_schedules).
+
+        Args:
+            low_priority (bool): Run the worker at a lower OS priority, for speculative runs.
+        """
+        self.generation_started = time.perf_counter()
         self.stop_schedules_generation()  # Stop any ongoing generation
-        self.ranker.clear()  # Reset the ranker state
+        # Reset the ranker state, on a new result store when spilling or compressing
+        courses = selected_courses.courses() if isinstance(selected_courses, CourseSelection) else selected_courses
+        self.selection_key = None
+        self.resumed_checkpoint = None
+        plain = not isinstance(selected_courses, CourseSelection) and (preferences is None or preferences.is_empty())
+        if self.spill_directory is not None and plain and limits is None and courses:
+            self.selection_key = SearchCheckpoint.make_selection_key(courses, forbidden_slots, constraints,
+                                                                     self.api.travel_times)
+            self.resumed_checkpoint = self._resume_session(courses)
+        if self.resumed_checkpoint is None:
+            self.ranker.attach_store(self._create_result_store(courses))
         self.next = 1  # Reset notification threshold
+        self.infeasibility_core = None
+        self.time_to_first_schedule = None
+        self.probe_vector = None
+        self.generation_result = None
 
         # Start the schedule generation in parallel (returns a queue)
-        self.queue = self.api.generate_schedules_in_parallel(selected_courses, forbidden_slots)
+        resume_after = self.resumed_checkpoint.cursor if self.resumed_checkpoint else None
+        self.queue = self.api.generate_schedules_in_parallel(selected_courses, forbidden_slots, constraints, preferences,
+                                                             limits, resume_after, low_priority)
 
-        # Attempt to get estimated schedules count if supported by the API
-        self.estimated_total = self.api.get_estimated_schedules_count(selected_courses)
+        if self.resumed_checkpoint is not None:
+            # The stored schedules are back, a probe schedule stored ahead of the cursor is still to be dropped
+            if self.resumed_checkpoint.pending_probe is not None:
+                self.probe_vector = tuple(self.resumed_checkpoint.pending_probe)
+            if self.ranker.size():
+                self.time_to_first_schedule = time.perf_counter() - self.generation_started
+        # Latency path: one schedule from the probe while the worker process spawns. With soft preferences
+        # the worker's first schedule is the best one, so the stream order is kept.
+        elif plain:
+            first = self.api.find_first_schedule(selected_courses, forbidden_slots, constraints)
+            if first is not None:
+                self.probe_vector = first.option_indices
+                self.ranker.add_batch([first])
+                self.time_to_first_schedule = time.perf_counter() - self.generation_started
         self.generation_active = True
 
         # Set up a timer to check for new schedules every 100ms
         self.timer = QTimer()
         self.timer.timeout.connect(self.check_for_schedules)
         self.timer.start(100)
+        self.seen_at_start = self.ranker.seen_count() if self.resumed_checkpoint is not None else 0
 
-        # Notify immediately with no schedule to show generation has started
-        self.on_schedules_generated(0)
-        # Notify progress start
-        self.on_progress_updated(0, self.estimated_total)
-        return self.ranker.get_schedules()
+    def _update_estimate(self) -> None:
+        """
+        Refines the estimate of the running generation and reports its band and ETA.
+        estimated_total follows the point estimate, it stays -1 while the count is unknown.
+        """
+        if self.estimator is None:
+            return
+        if self.progress_estimate is not None:
+            self.estimator.refine()
+        self.progress_estimate = self.estimator.estimate(self.ranker.seen_count(),
+                                                         time.perf_counter() - self.generation_started,
+                                                         self.seen_at_start)
+        self.estimated_total = self.progress_estimate.schedules
+        self.on_estimate_updated(self.progress_estimate)
+
+    def _report_completion(self) -> None:
+        """
+        Reports the final count of a finished generation as an exact estimate and a full progress bar.
+        """
+        final_count = self.ranker.seen_count()
+        self.progress_estimate = ProgressEstimate(final_count, final_count, final_count, 0.0, True)
+        self.estimated_total = final_count
+        self.on_estimate_updated(self.progress_estimate)
+        self.on_progress_updated(final_count, final_count)
+
+    def _create_result_store(self, selected_courses: List[Course]) -> Optional[IResultStore]:
+        """
+        Creates the result store for a generation: a new on-disk session if spilling is enabled,
+        or a compressed trie if compression is enabled.
+        The previous session is deleted unless its generation finished, finished sessions can be reopened.
+
+        Args:
+            selected_courses (List[Course]): The courses of the generation.
+
+        Returns:
+            Optional[IResultStore]: The new store, or None when results are kept as a plain list.
+        """
+        self._discard_session()
+        if not selected_courses:
+            return None
+        if self.spill_directory is None:
+            return TrieResultStore(selected_courses) if self.compress_results else None
+        os.makedirs(self.spill_directory, exist_ok=True)
+        path = tempfile.mkdtemp(prefix="session-", dir=self.spill_directory)
+        self.store = MemmapResultStore.create(path, selected_courses)
+        return self.store
+
+    def _discard_session(self) -> None:
+        """
+        Forgets the current on-disk session, deleting it if its generation did not finish and cannot be resumed.
+        """
+        if self.store and not self.store.complete and not self._is_resumable():
+            shutil.rmtree(self.store.path, ignore_errors=True)
+        self.store = None
+
+    def _is_resumable(self) -> bool:
+        """
+        Returns True if the current on-disk session has a checkpoint to resume its generation from.
+        """
+        return self.store is not None and os.path.exists(SearchCheckpoint.path_in(self.store.path))
+
+    def _resume_session(self, courses: List[Course]) -> Optional[SearchCheckpoint]:
+        """
+        Reattaches the newest interrupted session of the current selection (same selection_key) to the ranker,
+        dropping the rows stored after its checkpoint.
+
+        Args:
+            courses (List[Course]): The courses of the generation, in selection order.
+
+        Returns:
+            Optional[SearchCheckpoint]: The checkpoint to resume from, or None if no session matches.
+        """
+        if not os.path.isdir(self.spill_directory):
+            return None
+        paths = [os.path.join(self.spill_directory, name) for name in os.listdir(self.spill_directory)]
+        for path in sorted(paths, key=os.path.getmtime, reverse=True):
+            checkpoint = SearchCheckpoint.load(path)
+            if checkpoint is None or checkpoint.selection_key != self.selection_key:
+                continue
+            try:
+                store = MemmapResultStore.open(path, courses)
+            except (FileNotFoundError, ValueError):
+                continue
+            if store.complete:
+                continue
+            store.truncate(checkpoint.results)
+            self._discard_session()
+            self.store = store
+            self.ranker.attach_store(store)
+            return checkpoint
+        return None
+
+    def open_session(self, path: str, courses: List[Course]) -> int:
+        """
+        Reopens the results of a finished generation saved in a session directory.
+        Only the metric columns are read to rank the schedules, which are rebuilt on access.
+
+        Args:
+            path (str): The session directory.
+            courses (List[Course]): The courses to rebuild the schedules from (e.g. the whole catalog).
+
+        Returns:
+            int: The number of schedules in the session.
+
+        Raises:
+            FileNotFoundError: If the directory holds no session.
+            ValueError: If the courses do not match the session, or the ranker is bounded.
+        """
+        self.stop_schedules_generation()
+        store = MemmapResultStore.open(path, courses)
+        self.ranker.attach_store(store)
+        self._discard_session()
+        self.store = store
+        self.on_schedules_generated(self.ranker.size())
+        return self.ranker.size()
 
     def check_for_schedules(self) -> None:   
         """
@@ -66,6 +385,9 @@ class ScheduleController:
 
         updated = False
         max_batch_per_loop = 100 # Number of batches to process per loop
+        if self.speculation_key is not None:
+            # Nobody waits for a speculative run, keep the interface responsive
+            max_batch_per_loop = SPECULATIVE_BATCHES_PER_CHECK
         
         # Retrieve up to max_batches_per_loop batches from the queue
         for _ in range(max_batch_per_loop):
@@ -76,10 +398,42 @@ class ScheduleController:
                 schedule = self.queue.get(block=False)
                 if schedule is None:  # None signals generation is complete
                     self.generation_active = False
+                    if self.store:
+                        # The session can now be reopened by a later process
+                        self.store.mark_complete()
+                        SearchCheckpoint.remove(self.store.path)
                     # When generation is complete, set current = estimated total
                     # If we didn't have an estimate, use the actual count as both current and total
-                    self.on_progress_updated(len(self.ranker.get_schedules()), len(self.ranker.get_schedules()))
+                    self._report_completion()
                     break
+                if isinstance(schedule, SearchCheckpoint):  # Every schedule up to its cursor is stored
+                    if self.store is not None and self.selection_key is not None:
+                        schedule.results = len(self.store)
+                        schedule.selection_key = self.selection_key
+                        schedule.pending_probe = list(self.probe_vector) if self.probe_vector is not None else None
+                        schedule.save(self.store.path)
+                    continue
+                if isinstance(schedule, GenerationResult):  # A bounded run reports how it ended
+                    self.generation_result = schedule
+                    continue
+                if isinstance(schedule, InfeasibilityCore):  # No schedule exists, the worker sent the reason
+                    self.infeasibility_core = schedule
+                    if schedule.near_misses:
+                        # Few near misses, kept as objects so their violations survive
+                        self._discard_session()
+                        self.ranker.attach_store(None)
+                        self.ranker.add_batch(schedule.near_misses)
+                        updated = True
+                    self.on_infeasible(schedule)
+                    continue
+                if self.probe_vector is not None:
+                    # The probe schedule is already shown, skip the worker's copy
+                    batch = [item for item in schedule if item.option_indices != self.probe_vector]
+                    if len(batch) < len(schedule):
+                        self.probe_vector = None
+                    schedule = batch
+                if schedule and self.time_to_first_schedule is None:
+                    self.time_to_first_schedule = time.perf_counter() - self.generation_started
                 self.ranker.add_batch(schedule)  # Append the batch to the schedules list
                 updated = True
             except:
@@ -87,7 +441,12 @@ class ScheduleController:
 
         # Always notify progress update during active generation
         if self.generation_active:
-            self.on_progress_updated(self.ranker.size(), self.estimated_total)
+            self._update_estimate()
+            self.on_progress_updated(self.ranker.seen_count(), self.estimated_total)
+
+        # Report how many results were seen versus kept once the bounded ranker starts evicting
+        if updated and self.ranker.seen_count() > self.ranker.size():
+            self.on_retention_updated(self.ranker.seen_count(), self.ranker.size())
 
         # Notify UI if new schedules are added or if generation is complete
         if updated or not self.generation_active:
@@ -108,8 +467,8 @@ class ScheduleController:
             self.generation_active = False
             
             # If there are schedules, make sure the progress bar shows 100% completion
-            if self.ranker.get_schedules() and self.ranker.size() > 0:
-                final_count = self.ranker.size()
+            if self.ranker.size() > 0:
+                final_count = self.ranker.seen_count()
                 self.on_progress_updated(final_count, final_count)
             
             if self.timer and self.timer.isActive():
@@ -118,8 +477,11 @@ class ScheduleController:
 
             # Terminate the process if it's still running
             self.api.stop_schedules_generation()
-            # Clear the schedules list
-            self.ranker.clear()
+            # Clear the schedules list, the rows of a resumable session stay on disk
+            if self._is_resumable():
+                self.ranker.attach_store(None)
+            else:
+                self.ranker.clear()
 
             # Clear the queue if it exists
             if self.queue:
@@ -183,6 +545,57 @@ class ScheduleController:
         # Use the ranker to get the k-th schedule based on the current preference
         return self.ranker.get_ranked_schedule(k)
     
+    def get_similar_schedules(self, k: int) -> List[int]:
+        """
+        Finds the schedules that differ from the k-th schedule in exactly one course choice.
+
+        Args:
+            k (int): The index of the reference schedule (0-based, current ranking).
+
+        Returns:
+            List[int]: Indices of the alternatives in the current ranking, best ranked first.
+        """
+        return self.ranker.find_one_swap_alternatives(k)
+
+    def get_fewer_days_schedule(self, k: int) -> Optional[int]:
+        """
+        Finds the most similar schedule to the k-th schedule that has fewer active days.
+
+        Args:
+            k (int): The index of the reference schedule (0-based, current ranking).
+
+        Returns:
+            Optional[int]: Index of the alternative in the current ranking, or None if there is none.
+        """
+        return self.ranker.find_fewer_days_alternative(k)
+
+    def get_metric_facets(self) -> Dict[Metric, Dict[int, int]]:
+        """
+        Returns the live distributions shown while generating: schedules per number of active days
+        and per average start hour. Both are read from counters kept up to date on every insert.
+
+        Returns:
+            Dict[Metric, Dict[int, int]]: Histogram per metric, keyed by grade (minutes for start times).
+        """
+        return {
+            Metric.ACTIVE_DAYS: self.ranker.get_histogram(Metric.ACTIVE_DAYS),
+            Metric.AVG_START_TIME: self.ranker.get_histogram(Metric.AVG_START_TIME, bin_width=60),
+        }
+
+    def get_first_schedule_with_grade(self, metric: Metric, grade: int) -> int:
+        """
+        Sorts the schedules ascending by the metric and returns where the given grade starts.
+
+        Args:
+            metric (Metric): The metric to sort by.
+            grade (int): The grade of the facet (same units as get_metric_facets keys).
+
+        Returns:
+            int: The index of the first schedule with at least that grade.
+        """
+        self.ranker.set_preference(Preference(metric, True))
+        return self.ranker.get_first_rank_with_grade(metric, grade)
+
     def get_ranked_schedules(self, count: int, start: int = 0):
         """
         Returns a slice of ranked schedules.
@@ -196,12 +609,12 @@ class ScheduleController:
         """
         return self.ranker.get_ranked_schedules(start,count)
 
-    def get_schedules(self) -> List[Schedule]:
+    def get_schedules(self) -> Sequence[Schedule]:
         """
         Returns the generated schedules.
 
         Returns:
-            List[Schedule]: The list of generated schedules.
+            Sequence[Schedule]: The generated schedules, a read-only view of the result store if there is one.
         """
         return self.ranker.get_schedules()
 
@@ -0,0 +1,67 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional
+import numpy as np
+from src.models.schedule import Schedule
+
+
+class IResultStore(ABC):
+    """
+    Abstract base class for alternative storages of generated schedules.
+    A store behaves like the list ScheduleRanker keeps by default: schedules are appended
+    in generation order and read back by their insertion index.
+    """
+
+    @abstractmethod
+    def extend(self, schedules: List[Schedule]) -> None:
+        """
+        Appends a batch of schedules to the store.
+        """
+        pass
+
+    @abstractmethod
+    def __getitem__(self, index: int) -> Schedule:
+        """
+        Returns the schedule stored at the given insertion index.
+        """
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """
+        Returns the number of stored schedules.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Removes all stored schedules.
+        """
+        pass
+
+    def get_grades(self) -> Optional[np.ndarray]:
+        """
+        Returns the metric grades of all stored schedules as a (count, 5) array in Metric order,
+        or None if the store cannot provide them without rebuilding the schedules.
+        """
+        return None
+
+    def get_option_vectors(self) -> Optional[np.ndarray]:
+        """
+        Returns the option indices of all stored schedules as a (count, courses) array,
+        or None if the store cannot provide them without rebuilding the schedules.
+        """
+        return None
+
+    def append(self, schedule: Schedule) -> None:
+        """
+        Appends a single schedule to the store.
+        """
+        self.extend([schedule])
+
+    def __iter__(self) -> Iterator[Schedule]:
+        """
+        Iterates over the stored schedules in insertion order.
+        """
+        for index in range(len(self)):
+            yield self[index]
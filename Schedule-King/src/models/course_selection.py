@@ -0,0 +1,51 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+from src.models.course import Course
+
+@dataclass
+class CourseSelection:
+    """
+    Which courses a schedule may contain, beyond "all of these":
+    - mandatory: every schedule contains all of them
+    - alternatives: OR-groups, every schedule contains exactly one course of each group
+    - optional: every schedule contains between min_optional and max_optional of them
+    - preferred: course codes of optional or alternative courses, schedules containing more of them come first
+    All subsets are solved by one search (see SelectionStrategy).
+    """
+    mandatory: List[Course] = field(default_factory=list)
+    optional: List[Course] = field(default_factory=list)
+    min_optional: int = 0
+    max_optional: Optional[int] = None  # None allows all optional courses
+    alternatives: List[List[Course]] = field(default_factory=list)
+    preferred: List[str] = field(default_factory=list)
+
+    def validate(self) -> None:
+        """
+        Checks that the counts can be met.
+        :raises ValueError: If a count is out of range or an OR-group is empty.
+        """
+        if any(not group for group in self.alternatives):
+            raise ValueError("An OR-group needs at least one course.")
+        if not 0 <= self.min_optional <= self.optional_limit():
+            raise ValueError(f"Cannot take {self.min_optional} to {self.optional_limit()} "
+                             f"of {len(self.optional)} optional courses.")
+        if self.optional_limit() > len(self.optional):
+            raise ValueError(f"Cannot take {self.max_optional} of {len(self.optional)} optional courses.")
+
+    def optional_limit(self) -> int:
+        """
+        Returns the maximum number of optional courses a schedule may contain.
+        """
+        return len(self.optional) if self.max_optional is None else self.max_optional
+
+    def courses(self) -> List[Course]:
+        """
+        Returns all candidate courses in search order: mandatory, OR-groups (members next to each other), optional.
+        """
+        return self.mandatory + [course for group in self.alternatives for course in group] + self.optional
+
+    def max_courses(self) -> int:
+        """
+        Returns the largest number of courses a single schedule can contain.
+        """
+        return len(self.mandatory) + len(self.alternatives) + self.optional_limit()
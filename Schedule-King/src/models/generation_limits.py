@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class GenerationLimits:
+    """
+    Bounds on one generation run, for callers that need a bounded latency (headless or embedded use):
+    - max_schedules: return at most this many schedules
+    - offset: skip this many schedules first (they are searched, but never built)
+    - deadline_seconds: stop after this many seconds of wall-clock time
+    - node_budget: stop after placing this many options in the search
+    The deadline and node budget are checked inside the search loop, so they hold even while no schedule is found.
+    """
+    max_schedules: Optional[int] = None
+    offset: int = 0
+    deadline_seconds: Optional[float] = None
+    node_budget: Optional[int] = None
+
+    def validate(self) -> None:
+        """
+        Checks that no bound is negative.
+        :raises ValueError: If a bound is negative.
+        """
+        for name in ("max_schedules", "offset", "deadline_seconds", "node_budget"):
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                raise ValueError(f"{name} cannot be negative, got {value}.")
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if the run is not bounded at all.
+        """
+        return (self.max_schedules is None and not self.offset and self.deadline_seconds is None
+                and self.node_budget is None)
@@ -0,0 +1,28 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+from src.models.schedule import Schedule
+
+# Why a bounded generation stopped before enumerating every schedule
+STOPPED_AT_MAX_SCHEDULES = "max_schedules"
+STOPPED_AT_DEADLINE = "deadline"
+STOPPED_AT_NODE_BUDGET = "node_budget"
+
+@dataclass
+class GenerationResult:
+    """
+    Outcome of a generation run bounded by GenerationLimits.
+    finished is True when every schedule was enumerated; otherwise stop_reason tells which bound
+    truncated the run, and more schedules may exist. The worker sends one with no schedules as its
+    last item before None, to report how the run ended.
+    """
+    schedules: List[Schedule] = field(default_factory=list)
+    finished: bool = True
+    stop_reason: Optional[str] = None  # One of the STOPPED_AT_ constants, None if finished
+    nodes_visited: int = 0  # Options placed by the search
+    elapsed: float = 0.0  # Seconds of wall-clock time
+
+    def truncated(self) -> bool:
+        """
+        Returns True if a bound stopped the run before every schedule was enumerated.
+        """
+        return not self.finished
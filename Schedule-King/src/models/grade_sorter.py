@@ -1,19 +1,46 @@
-
+from array import array
+from bisect import bisect_left
+from typing import Optional, Sequence
 
 class GradeSorter:
     """
     This class allows inserting items with grades, retrieving the k-th item in sorted order,
     O(1) for insertion and O(1) for retrieval of k-th item."""
-    def __init__(self, upper_bound: int = 100):
+    def __init__(self, upper_bound: int = 100, typecode: Optional[str] = None):
         """
         Initializes the GradeSorter with upper and lower bounds for grades.
         :param upper_bound: The maximum grade value (default is 100).
+        :param typecode: If given, buckets are compact array.array objects of this type code
+                         (e.g. 'I' for unsigned ints) instead of lists, for large amounts of integer items.
         """
         self.upper_bound = upper_bound
-        self.buckets = [[] for _ in range(int(upper_bound + 1))]  # Create buckets for each grade from 0 to upper_bound-1
+        self.typecode = typecode
+        self.buckets = [self._new_bucket() for _ in range(int(upper_bound + 1))]  # Create buckets for each grade from 0 to upper_bound-1
         self.size = [0] * (int(upper_bound + 1))  # Initialize size for each bucket
         self.total_items = 0  # Total number of items added
     
+    def _new_bucket(self):
+        """
+        Creates an empty bucket, a list or a typed array depending on the typecode.
+        """
+        return array(self.typecode) if self.typecode else []
+
+    def load(self, buckets: Sequence[Sequence]):
+        """
+        Replaces the content of the sorter with already sorted buckets, one sequence of items per grade.
+        Used to restore a sorter in bulk instead of inserting the items one by one.
+        :param buckets: A sequence of upper_bound + 1 item sequences.
+        """
+        if len(buckets) != self.upper_bound + 1:
+            raise ValueError(f"Expected {self.upper_bound + 1} buckets, got {len(buckets)}")
+        self.buckets = []
+        for items in buckets:
+            bucket = self._new_bucket()
+            bucket.extend(items)
+            self.buckets.append(bucket)
+        self.size = [len(bucket) for bucket in self.buckets]
+        self.total_items = sum(self.size)
+
     def insert(self, item, grade: int):
         """
         Inserts an item into the appropriate bucket based on its grade.
@@ -50,6 +77,54 @@ class GradeSorter:
                 return bucket[k - count]
             count += self.size[grade]
 
+    def get_rank(self, item, grade: int) -> int:
+        """
+        Returns the position of an item in the sorted order (the inverse of get_kth_item).
+        Assumes items inside a bucket were inserted in increasing order, as ScheduleRanker does
+        with its insertion indices, so the lookup is a binary search inside the bucket.
+        :param item: The item to look up.
+        :param grade: The grade the item was inserted with.
+        :return: The 0-based position of the item in sorted order.
+        """
+        if not (0 <= grade <= self.upper_bound):
+            raise ValueError(f"Grade {grade} is out of bounds (0 to {self.upper_bound})")
+
+        bucket = self.buckets[grade]
+        position = bisect_left(bucket, item)
+        if position == len(bucket) or bucket[position] != item:
+            raise KeyError(f"Item {item} is not stored under grade {grade}")
+        return sum(self.size[:grade]) + position
+
+    def iter_items(self, reverse: bool = False):
+        """
+        Iterates over the items in sorted order without copying the buckets.
+        :param reverse: If True, iterate from the highest grade down (the exact reverse of the sorted order).
+        :return: Iterator over the items.
+        """
+        if reverse:
+            for bucket in reversed(self.buckets):
+                yield from reversed(bucket)
+        else:
+            for bucket in self.buckets:
+                yield from bucket
+
+    def get_histogram(self) -> list:
+        """
+        Returns the number of items stored under each grade.
+        The counts are maintained on every insertion, so no items are scanned.
+        :return: A list where index g holds the number of items with grade g.
+        """
+        return self.size.copy()
+
+    def get_first_rank(self, grade: int) -> int:
+        """
+        Returns the sorted position of the first item whose grade is at least the given grade.
+        :param grade: The grade to look up.
+        :return: The 0-based position where the grade starts (total items if nothing is that high).
+        """
+        grade = max(0, min(int(grade), self.upper_bound + 1))
+        return sum(self.size[:grade])
+
     def get_size(self):
         """
         Returns the total number of items in the GradeSorter in O(1) time.
@@ -0,0 +1,45 @@
+from dataclasses import dataclass, field
+from typing import List
+from src.models.course import Course
+from src.models.schedule import Schedule
+from src.models.time_slot import TimeSlot
+
+@dataclass
+class InfeasibilityCore:
+    """
+    A minimal explanation of why a selection has no valid schedule: these courses cannot all fit
+    around these forbidden time slots, but removing any one of them (course or slot) leaves a subset that fits.
+    uses_limits / uses_travel tell whether the schedule limits / walking times are needed for the conflict.
+    near_misses holds the closest schedules that break a rule, cheapest first (see NearMissStrategy).
+    """
+    courses: List[Course] = field(default_factory=list)
+    forbidden: List[TimeSlot] = field(default_factory=list)
+    uses_limits: bool = False
+    uses_travel: bool = False
+    near_misses: List[Schedule] = field(default_factory=list)
+
+    def size(self) -> int:
+        """
+        Returns the number of courses and forbidden slots in the core.
+        """
+        return len(self.courses) + len(self.forbidden)
+
+    def describe(self) -> str:
+        """
+        Returns a short explanation for the user.
+        """
+        names = ", ".join(f"{course.name} ({course.course_code})" for course in self.courses)
+        if len(self.courses) == 1:
+            text = f"{names} has no usable option"
+        else:
+            text = f"{names} cannot be taken together"
+        reasons = []
+        if self.forbidden:
+            reasons.append("the blocked times " + ", ".join(str(slot) for slot in self.forbidden))
+        if self.uses_limits:
+            reasons.append("your schedule limits")
+        if self.uses_travel:
+            reasons.append("the walking times between buildings")
+        if reasons:
+            text += " with " + " and ".join(reasons)
+        return text + "."
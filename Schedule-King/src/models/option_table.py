@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from itertools import product
+from typing import List, Optional, Sequence
+from weakref import WeakKeyDictionary
+from src.models.course import Course
+from src.models.lecture_group import LectureGroup
+from src.models.schedule import Schedule
+from src.models.time_slot import TimeSlot
+
+# Option index of a course left out of a schedule (optional courses, see CourseSelection), fits uint16 stores
+SKIPPED_OPTION = 0xFFFF
+
+@dataclass
+class CourseOption:
+    """
+    One way to attend a course: a lecture group with at most one tirgul group and one maabada group.
+    """
+    lecture: List[TimeSlot]
+    tirgul: Optional[List[TimeSlot]]
+    maabada: Optional[List[TimeSlot]]
+
+    @property
+    def slots(self) -> List[TimeSlot]:
+        """
+        All time slots of the option, flattened.
+        """
+        return [slot for group in (self.lecture, self.tirgul, self.maabada) if group for slot in group]
+
+
+# Options compiled by OptionTable.preload, dropped with their course
+_PRELOADED: "WeakKeyDictionary[Course, List[CourseOption]]" = WeakKeyDictionary()
+
+
+class OptionTable:
+    """
+    Compiled options of a list of courses.
+    The options of a course are its (lecture, tirgul, maabada) combinations in the same order as the
+    strategies enumerate them, so an option index recorded on a Schedule identifies the same option here.
+    """
+    def __init__(self, courses: Sequence[Course]):
+        """
+        Compiles the options of every course.
+        :param courses: The courses, in the order used by the option vectors.
+        """
+        self.courses: List[Course] = list(courses)
+        self.options: List[List[CourseOption]] = [self.compile_course(course) for course in self.courses]
+
+    @staticmethod
+    def preload(courses: Sequence[Course]) -> None:
+        """
+        Compiles the options of courses ahead of time, compile_course then returns them without recompiling
+        for as long as the courses exist (a warm worker holding its catalog, see WorkerPool).
+        The courses must not change afterwards.
+        """
+        for course in courses:
+            _PRELOADED[course] = OptionTable._compile(course)
+
+    @staticmethod
+    def compile_course(course: Course) -> List[CourseOption]:
+        """
+        Lists all options of a course.
+        Courses without tirguls or maabadas get a single None group for the missing type.
+        :param course: The course to compile.
+        :return: The options of the course in enumeration order.
+        """
+        preloaded = _PRELOADED.get(course)
+        if preloaded is not None:
+            return list(preloaded)
+        return OptionTable._compile(course)
+
+    @staticmethod
+    def _compile(course: Course) -> List[CourseOption]:
+        tirguls = course.tirguls or [None]
+        maabadas = course.maabadas or [None]
+        return [CourseOption(lecture, tirgul, maabada)
+                for lecture, tirgul, maabada in product(course.lectures, tirguls, maabadas)]
+
+    def course_codes(self) -> List[str]:
+        """
+        Returns the course codes in option vector order.
+        """
+        return [course.course_code for course in self.courses]
+
+    def build_lecture_group(self, course_index: int, option_index: int) -> LectureGroup:
+        """
+        Builds the LectureGroup of one course option.
+        :param course_index: Position of the course in the table.
+        :param option_index: Index of the option of that course.
+        :return: The LectureGroup for the option.
+        """
+        course = self.courses[course_index]
+        option = self.options[course_index][option_index]
+        return LectureGroup(
+            course_name=course.name,
+            course_code=course.course_code,
+            instructor=course.instructor,
+            lecture=option.lecture,
+            tirguls=option.tirgul,
+            maabadas=option.maabada
+        )
+
+    def build_schedule(self, option_indices: Sequence[int], generate_metrics: bool = True) -> Schedule:
+        """
+        Builds a Schedule from an option vector.
+        :param option_indices: Option index per course, in table order, SKIPPED_OPTION for courses left out.
+        :param generate_metrics: Compute the schedule metrics (skip when the caller restores them).
+        :return: The Schedule.
+        """
+        if len(option_indices) != len(self.courses):
+            raise ValueError(f"Expected {len(self.courses)} option indices, got {len(option_indices)}")
+        groups = [self.build_lecture_group(course_index, int(option_index))
+                  for course_index, option_index in enumerate(option_indices) if option_index != SKIPPED_OPTION]
+        schedule = Schedule(groups, option_indices=tuple(int(i) for i in option_indices))
+        if generate_metrics:
+            schedule.generate_metrics()
+        return schedule
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class ProgressEstimate:
+    """
+    Live estimate of the size of a running generation, see ProgressEstimator.
+    The true number of schedules lies between low and high with about 95% confidence; both are equal to
+    schedules when the count is exact. low never drops below the schedules already generated.
+    """
+    schedules: int  # Estimated total number of schedules
+    low: int  # Lower end of the confidence band
+    high: int  # Upper end of the confidence band
+    eta_seconds: Optional[float] = None  # Estimated seconds until the last schedule, None before the first ones
+    exact: bool = False  # Whether the total was counted rather than estimated
+
+    def band_width(self) -> float:
+        """
+        Returns the width of the confidence band relative to the estimate (0 for an exact count).
+        """
+        return (self.high - self.low) / self.schedules if self.schedules else 0.0
@@ -0,0 +1,332 @@
+import json
+import os
+from array import array
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+from src.interfaces.result_store_interface import IResultStore
+from src.models.course import Course
+from src.models.option_table import OptionTable
+from src.models.schedule import Schedule
+
+# Number of metric grades stored per schedule, in Metric order (same layout as Schedule.metric_tuple)
+GRADE_COLUMNS = 5
+
+class MemmapResultStore(IResultStore):
+    """
+    Out-of-core result store backed by memory-mapped files in a session directory:
+    - options.u16: one row of option indices per schedule (uint16, one column per course)
+    - grades.u16: one row of metric grades per schedule (uint16, Schedule.metric_tuple layout)
+    - meta.json: course codes, option counts per course, number of rows and whether generation finished
+    A row takes 2 bytes per course plus 10 bytes of grades, so tens of millions of schedules
+    fit on disk while only the pages being read stay resident. Schedules are rebuilt on access
+    from the option indices through an OptionTable.
+    """
+    OPTIONS_FILE = "options.u16"
+    GRADES_FILE = "grades.u16"
+    META_FILE = "meta.json"
+
+    def __init__(self, path: str, table: OptionTable, count: int = 0, complete: bool = False,
+                 initial_capacity: int = 4096):
+        """
+        Use MemmapResultStore.create or MemmapResultStore.open instead of calling this directly.
+        :param path: The session directory.
+        :param table: The option table of the session courses.
+        :param count: Number of rows already stored in the files.
+        :param complete: Whether the session holds the full result of a finished generation.
+        :param initial_capacity: Number of rows to preallocate, the files double when full.
+        """
+        if not table.courses:
+            raise ValueError("A result store needs at least one course")
+        self.path = path
+        self.table = table
+        self.width = len(table.courses)
+        self.complete = complete
+        self._count = count
+        self._capacity = max(initial_capacity, count, 1)
+        self._options: Optional[np.memmap] = None
+        self._grades: Optional[np.memmap] = None
+        self._map_files()
+
+    @classmethod
+    def create(cls, path: str, courses: Sequence[Course], initial_capacity: int = 4096) -> "MemmapResultStore":
+        """
+        Creates an empty session in the given directory (created if missing).
+        :param path: The session directory.
+        :param courses: The courses of the session, in the order the strategy visits them.
+        :param initial_capacity: Number of rows to preallocate.
+        :return: The new store.
+        """
+        os.makedirs(path, exist_ok=True)
+        store = cls(path, OptionTable(courses), initial_capacity=initial_capacity)
+        store._write_meta()
+        return store
+
+    @classmethod
+    def open(cls, path: str, courses: Sequence[Course]) -> "MemmapResultStore":
+        """
+        Reopens a session written by another process. The files are mapped, not read.
+        :param path: The session directory.
+        :param courses: The courses to rebuild schedules from, e.g. the whole catalog;
+                        every course of the session must be present and unchanged.
+        :return: The reopened store.
+        :raises FileNotFoundError: If the directory holds no session.
+        :raises ValueError: If the courses do not match the session.
+        """
+        meta_path = os.path.join(path, cls.META_FILE)
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"No result session found in '{path}'.")
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        by_code: Dict[str, Course] = {course.course_code: course for course in courses}
+        missing = [code for code in meta["course_codes"] if code not in by_code]
+        if missing:
+            raise ValueError(f"Courses missing for session '{path}': {', '.join(missing)}")
+        table = OptionTable([by_code[code] for code in meta["course_codes"]])
+        if [len(options) for options in table.options] != meta["option_counts"]:
+            raise ValueError(f"The courses changed since session '{path}' was written")
+        return cls(path, table, count=meta["count"], complete=meta["complete"])
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _map_files(self):
+        """
+        Maps both column files with the current capacity, growing the files if they are smaller.
+        """
+        self._options = self._map(self.OPTIONS_FILE, self.width)
+        self._grades = self._map(self.GRADES_FILE, GRADE_COLUMNS)
+
+    def _map(self, name: str, columns: int) -> np.memmap:
+        file_path = self._file(name)
+        size = self._capacity * columns * np.dtype(np.uint16).itemsize
+        with open(file_path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        return np.memmap(file_path, dtype=np.uint16, mode="r+", shape=(self._capacity, columns))
+
+    def _grow(self, needed: int):
+        """
+        Doubles the capacity until needed rows fit, remapping the enlarged files.
+        """
+        while self._capacity < needed:
+            self._capacity *= 2
+        self.flush()
+        self._options = None
+        self._grades = None
+        self._map_files()
+
+    def _write_meta(self):
+        meta = {
+            "course_codes": self.table.course_codes(),
+            "option_counts": [len(options) for options in self.table.options],
+            "count": self._count,
+            "complete": self.complete,
+        }
+        # Write to a temporary file first so a reader never sees a half-written file
+        temp_path = self._file(self.META_FILE + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(temp_path, self._file(self.META_FILE))
+
+    def extend(self, schedules: List[Schedule]) -> None:
+        """
+        Appends a batch of schedules. Every schedule needs an option vector covering all session courses.
+        :param schedules: The schedules to store.
+        :raises ValueError: If a schedule has no matching option vector.
+        """
+        if not schedules:
+            return
+        options = np.asarray([schedule.option_indices for schedule in schedules], dtype=np.uint16)
+        if options.shape != (len(schedules), self.width):
+            raise ValueError(f"Schedules must carry option indices for all {self.width} courses")
+        grades = np.asarray([self._grades_of(schedule) for schedule in schedules], dtype=np.uint16)
+
+        end = self._count + len(schedules)
+        if end > self._capacity:
+            self._grow(end)
+        self._options[self._count:end] = options
+        self._grades[self._count:end] = grades
+        self._count = end
+        self.flush()
+
+    @staticmethod
+    def _grades_of(schedule: Schedule) -> tuple:
+        if not hasattr(schedule, "metric_tuple"):
+            schedule.update_metric_tuple()
+        return schedule.metric_tuple
+
+    def __getitem__(self, index: int) -> Schedule:
+        """
+        Rebuilds the schedule stored at the given insertion index.
+        """
+        if index < 0:
+            index += self._count
+        if not (0 <= index < self._count):
+            raise IndexError(f"index={index} is out of bounds for {self._count} stored schedules")
+        return self.table.build_schedule(self._options[index].tolist())
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self) -> None:
+        """
+        Drops all rows. The files keep their size and are overwritten by the next rows.
+        """
+        self._count = 0
+        self.complete = False
+        self._write_meta()
+
+    def truncate(self, count: int) -> None:
+        """
+        Keeps only the first count rows, e.g. the rows covered by a SearchCheckpoint before resuming.
+        """
+        self._count = min(self._count, max(count, 0))
+        self._write_meta()
+
+    def get_grades(self) -> np.ndarray:
+        """
+        Returns the metric grades of all stored schedules as a read-only (count, 5) view,
+        so rankers can index a reopened session without rebuilding any schedule.
+        """
+        grades = self._grades[:self._count]
+        grades.flags.writeable = False
+        return grades
+
+    def get_option_vectors(self) -> np.ndarray:
+        """
+        Returns the option indices of all stored schedules as a read-only (count, courses) view.
+        """
+        options = self._options[:self._count]
+        options.flags.writeable = False
+        return options
+
+    def mark_complete(self) -> None:
+        """
+        Records that the session holds the full result of a finished generation.
+        """
+        self.complete = True
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the mapped rows and the metadata to disk.
+        """
+        if self._options is not None:
+            self._options.flush()
+            self._grades.flush()
+        self._write_meta()
+
+
+class TrieResultStore(IResultStore):
+    """
+    Compressed in-memory result store exploiting the shape of depth-first output.
+    Consecutive schedules from a DFS share all but their last one or two course choices, so option
+    vectors are stored as paths in a prefix trie: a node holds its parent and the option chosen at its depth,
+    and a schedule holds only the node of its prefix (all courses but the last) plus its last option.
+    A schedule costs 6 bytes plus its share of the prefix nodes (6 bytes per node), random access walks
+    at most one parent per course. Schedules are rebuilt on access through an OptionTable.
+    Prefixes are shared with the previously added schedule only, which is exact for DFS order;
+    schedules added in another order are still stored correctly, just less compactly.
+    """
+    ROOT = 0
+
+    def __init__(self, courses: Sequence[Course]):
+        """
+        :param courses: The courses of the stored schedules, in the order the strategy visits them.
+        """
+        self.table = OptionTable(courses)
+        self.width = len(self.table.courses)
+        if self.width == 0:
+            raise ValueError("A result store needs at least one course")
+        self.clear()
+
+    def clear(self) -> None:
+        # Trie nodes, node 0 is the root (the empty prefix)
+        self._parents = array('I', [self.ROOT])
+        self._node_options = array('H', [0])
+        # Per schedule: its prefix node and its last option
+        self._leaf_prefixes = array('I')
+        self._leaf_options = array('H')
+        # Option vector and node path (path[d] = node of the first d choices) of the last added schedule
+        self._last: List[int] = []
+        self._path: List[int] = [self.ROOT]
+
+    def extend(self, schedules: List[Schedule]) -> None:
+        """
+        Appends a batch of schedules. Every schedule needs an option vector covering all courses.
+        :raises ValueError: If a schedule has no matching option vector.
+        """
+        for schedule in schedules:
+            self.add_vector(schedule.option_indices)
+
+    def add_vector(self, vector: Sequence[int]) -> None:
+        """
+        Appends one schedule given by its option vector.
+        :param vector: Option index per course.
+        """
+        if len(vector) != self.width:
+            raise ValueError(f"Schedules must carry option indices for all {self.width} courses")
+        prefix_length = self.width - 1
+        # Reuse the prefix shared with the previous schedule, create nodes for the rest
+        shared = 0
+        last = self._last
+        while shared < prefix_length and shared < len(last) and last[shared] == vector[shared]:
+            shared += 1
+        del self._path[shared + 1:]
+        for depth in range(shared, prefix_length):
+            self._parents.append(self._path[depth])
+            self._node_options.append(vector[depth])
+            self._path.append(len(self._parents) - 1)
+        self._leaf_prefixes.append(self._path[prefix_length])
+        self._leaf_options.append(vector[-1])
+        self._last = list(vector)
+
+    def get_vector(self, index: int) -> List[int]:
+        """
+        Decodes the option vector of the schedule at the given insertion index in O(depth).
+        """
+        if index < 0:
+            index += len(self)
+        if not (0 <= index < len(self)):
+            raise IndexError(f"index={index} is out of bounds for {len(self)} stored schedules")
+        vector = [0] * self.width
+        vector[-1] = self._leaf_options[index]
+        node = self._leaf_prefixes[index]
+        for depth in range(self.width - 2, -1, -1):
+            vector[depth] = self._node_options[node]
+            node = self._parents[node]
+        return vector
+
+    def __getitem__(self, index: int) -> Schedule:
+        return self.table.build_schedule(self.get_vector(index))
+
+    def __len__(self) -> int:
+        return len(self._leaf_options)
+
+    def get_option_vectors(self) -> np.ndarray:
+        """
+        Decodes all option vectors at once, one vectorised parent step per course.
+        """
+        parents = np.frombuffer(self._parents, dtype=np.uint32)
+        node_options = np.frombuffer(self._node_options, dtype=np.uint16)
+        vectors = np.empty((len(self), self.width), dtype=np.uint16)
+        vectors[:, -1] = np.frombuffer(self._leaf_options, dtype=np.uint16)
+        nodes = np.frombuffer(self._leaf_prefixes, dtype=np.uint32)
+        for depth in range(self.width - 2, -1, -1):
+            vectors[:, depth] = node_options[nodes]
+            nodes = parents[nodes]
+        return vectors
+
+    def node_count(self) -> int:
+        """
+        Returns the number of trie nodes, including the root.
+        """
+        return len(self._parents)
+
+    def nbytes(self) -> int:
+        """
+        Returns the number of bytes used by the trie and the schedule entries.
+        """
+        return sum(len(a) * a.itemsize for a in
+                   (self._parents, self._node_options, self._leaf_prefixes, self._leaf_options))
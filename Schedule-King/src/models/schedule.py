@@ -1,8 +1,9 @@
 from .lecture_group import LectureGroup
-from typing import List
+from typing import List, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
 from src.models.lecture_group import LectureGroup
+from src.models.violation import Violation
 from datetime import datetime
 # Constants for day names
 DAY_NAMES = {
@@ -26,6 +27,13 @@ class Schedule:
     total_gap_time: int = 0
     avg_start_time: float = 0.0
     avg_end_time: float = 0.0
+    # Index of the chosen option (lecture/tirgul/maabada combination) per course,
+    # in the order the strategy visited the courses. Empty when unknown.
+    option_indices: Tuple[int, ...] = ()
+    # Sum of the soft-preference penalties of the chosen options, 0 when not scored
+    penalty: int = 0
+    # Overlaps and forbidden slots a near-miss schedule accepts (see NearMissStrategy), empty for valid schedules
+    violations: Tuple[Violation, ...] = ()
 
     def __str__(self):
         # Creating a list of course codes from each LectureGroup object and print them
@@ -137,6 +145,13 @@ class Schedule:
             self.avg_end_time = sum(daily_end_times) / len(daily_end_times)
         else:
             self.avg_end_time = 0
+        self.update_metric_tuple()
+
+    def update_metric_tuple(self):
+        """
+        Recomputes metric_tuple from the stored metric fields.
+        Called by generate_metrics, and by result stores that restore the metrics without recomputing them.
+        """
         # Store metrics as a tuple for easy comparison or sorting
         # - active_days: number of days with lectures
         # - gap_count: number of gaps greater than 30 minutes
@@ -0,0 +1,97 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import time
+from typing import Iterable, List, Optional
+from src.models.schedule import Schedule
+from src.models.time_slot import TimeSlot
+
+# Study days of a week (Sunday to Friday), used to turn free days into a limit on active days
+STUDY_DAYS = 6
+
+@dataclass
+class ScheduleConstraints:
+    """
+    Hard limits a schedule must respect, checked by the strategies during the search.
+    Every field left as None (or empty) is not enforced.
+    """
+    max_active_days: Optional[int] = None
+    # Nothing may start before this time or end after this time
+    earliest_start: Optional[time] = None
+    latest_end: Optional[time] = None
+    # Longest allowed free time between two classes of the same day
+    max_gap_minutes: Optional[int] = None
+    # Minimum number of study days (Sunday to Friday) without classes
+    min_free_days: Optional[int] = None
+    # Windows that must stay free, e.g. a whole Friday
+    free_windows: List[TimeSlot] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if no constraint is set.
+        """
+        return (self.day_limit() is None and self.earliest_start is None and self.latest_end is None
+                and self.max_gap_minutes is None and not self.free_windows)
+
+    def day_limit(self) -> Optional[int]:
+        """
+        Returns the maximum number of active days implied by max_active_days and min_free_days.
+        """
+        limits = []
+        if self.max_active_days is not None:
+            limits.append(self.max_active_days)
+        if self.min_free_days is not None:
+            limits.append(STUDY_DAYS - self.min_free_days)
+        return min(limits) if limits else None
+
+    def couples_courses(self) -> bool:
+        """
+        Returns True if a constraint depends on several courses together (days or gaps),
+        as opposed to constraints that each option satisfies or not on its own.
+        """
+        return self.day_limit() is not None or self.max_gap_minutes is not None
+
+    def allows_slot(self, slot: TimeSlot) -> bool:
+        """
+        Checks the constraints that a single time slot satisfies on its own.
+        """
+        if self.earliest_start is not None and slot.start_time < self.earliest_start:
+            return False
+        if self.latest_end is not None and slot.end_time > self.latest_end:
+            return False
+        return not any(slot.conflicts_with(window) for window in self.free_windows)
+
+    @staticmethod
+    def longest_gap(slots: Iterable[TimeSlot]) -> int:
+        """
+        Returns the longest free time in minutes between two consecutive classes of the same day.
+        """
+        daily = defaultdict(list)
+        for slot in slots:
+            daily[slot.day].append((Schedule.time_to_minutes(slot.start_time), Schedule.time_to_minutes(slot.end_time)))
+        longest = 0
+        for intervals in daily.values():
+            intervals.sort()
+            end = intervals[0][1]
+            for start, finish in intervals[1:]:
+                longest = max(longest, start - end)
+                end = max(end, finish)
+        return longest
+
+    def is_satisfied_by_slots(self, slots: List[TimeSlot]) -> bool:
+        """
+        Checks all constraints on the time slots of a complete schedule.
+        """
+        if not all(self.allows_slot(slot) for slot in slots):
+            return False
+        limit = self.day_limit()
+        if limit is not None and len({slot.day for slot in slots}) > limit:
+            return False
+        return self.max_gap_minutes is None or self.longest_gap(slots) <= self.max_gap_minutes
+
+    def is_satisfied_by(self, schedule: Schedule) -> bool:
+        """
+        Checks all constraints on a complete schedule.
+        """
+        slots = [slot for group in schedule.lecture_groups
+                 for slots in (group.lecture, group.tirguls, group.maabadas) if slots for slot in slots]
+        return self.is_satisfied_by_slots(slots)
@@ -0,0 +1,145 @@
+import numpy as np
+from typing import List, Optional, Sequence
+
+class ScheduleIndex:
+    """
+    Nearest-neighbour index over schedule option vectors.
+    Every stored schedule is one row of a growable NumPy matrix holding the option index chosen
+    for each course (any uint16 value, SKIPPED_OPTION included), plus its active days and whether it has
+    a vector at all (schedules built by hand, not by a strategy, have none). The matrix is stored column
+    by column (one contiguous array per course), so a similarity query is a handful of vectorised
+    comparisons over the rows, which keeps it in the millisecond range even with a million stored schedules.
+    """
+    def __init__(self, initial_capacity: int = 1024):
+        """
+        Initializes an empty index.
+        :param initial_capacity: Number of rows to preallocate, the matrix doubles when full.
+        """
+        self._capacity = max(1, initial_capacity)
+        self._width = 0  # Number of courses per vector, fixed by the first vector added
+        self._vectors = np.zeros((0, self._capacity), dtype=np.uint16)
+        self._active_days = np.zeros(self._capacity, dtype=np.uint8)
+        self._has_vector = np.zeros(self._capacity, dtype=bool)
+        self._size = 0
+
+    def add(self, vector: Sequence[int], active_days: int) -> int:
+        """
+        Adds a schedule option vector to the index.
+        :param vector: Option index per course, may be empty if unknown.
+        :param active_days: Number of active days of the schedule.
+        :return: The item (row) number assigned to the vector.
+        """
+        if self._width == 0 and vector:
+            self._width = len(vector)
+            self._vectors = np.zeros((self._width, self._capacity), dtype=np.uint16)
+
+        if self._size == self._capacity:
+            self._grow()
+
+        item = self._size
+        if vector and len(vector) == self._width:
+            self._vectors[:, item] = vector
+            self._has_vector[item] = True
+        self._active_days[item] = active_days
+        self._size += 1
+        return item
+
+    def add_many(self, vectors: np.ndarray, active_days: np.ndarray) -> None:
+        """
+        Adds many schedule option vectors at once, with one array assignment per column of the storage.
+        :param vectors: Option index per course of every schedule, a (count, courses) array.
+        :param active_days: Number of active days of every schedule.
+        """
+        count = len(vectors)
+        if count == 0:
+            return
+        if self._width == 0 and vectors.shape[1]:
+            self._width = vectors.shape[1]
+            self._vectors = np.zeros((self._width, self._capacity), dtype=np.uint16)
+        if self._size + count > self._capacity:
+            self._grow(self._size + count)
+
+        rows = slice(self._size, self._size + count)
+        if vectors.shape[1] and vectors.shape[1] == self._width:
+            self._vectors[:, rows] = vectors.T
+            self._has_vector[rows] = True
+        self._active_days[rows] = active_days
+        self._size += count
+
+    def _grow(self, required: int = 0):
+        """Doubles the capacity of the row storage, until it holds the required number of rows."""
+        while self._capacity < max(required, self._size + 1):
+            self._capacity *= 2
+        vectors = np.zeros((self._width, self._capacity), dtype=np.uint16)
+        vectors[:, :self._size] = self._vectors[:, :self._size]
+        self._vectors = vectors
+        active_days = np.zeros(self._capacity, dtype=np.uint8)
+        active_days[:self._size] = self._active_days[:self._size]
+        self._active_days = active_days
+        has_vector = np.zeros(self._capacity, dtype=bool)
+        has_vector[:self._size] = self._has_vector[:self._size]
+        self._has_vector = has_vector
+
+    def size(self) -> int:
+        """
+        Returns the number of indexed schedules.
+        """
+        return self._size
+
+    def clear(self):
+        """
+        Removes all rows from the index.
+        """
+        self._width = 0
+        self._vectors = np.zeros((0, self._capacity), dtype=np.uint16)
+        self._active_days[:] = 0
+        self._has_vector[:] = False
+        self._size = 0
+
+    def _distances(self, item: int) -> Optional[np.ndarray]:
+        """
+        Computes the Hamming distance between an item and every indexed row.
+        :param item: The item to compare against.
+        :return: Distance per row, or None if the item has no option vector.
+        """
+        if not (0 <= item < self._size):
+            raise IndexError(f"item={item} is out of bounds for {self._size} indexed schedules")
+        if not self._has_vector[item]:
+            return None
+
+        # One contiguous comparison per course column, accumulated into a small distance array
+        distances = np.zeros(self._size, dtype=np.uint8)
+        for column in range(self._width):
+            values = self._vectors[column, :self._size]
+            distances += values != values[item]
+        # Rows without a vector can never be neighbours
+        distances[~self._has_vector[:self._size]] = np.iinfo(np.uint8).max
+        return distances
+
+    def one_swap_neighbours(self, item: int) -> List[int]:
+        """
+        Finds the schedules that differ from the given one in exactly one course choice.
+        :param item: The item to find neighbours for.
+        :return: The neighbouring items in insertion order.
+        """
+        distances = self._distances(item)
+        if distances is None:
+            return []
+        return np.flatnonzero(distances == 1).tolist()
+
+    def closest_with_fewer_days(self, item: int) -> Optional[int]:
+        """
+        Finds the most similar schedule (fewest different course choices) that has fewer active days.
+        Ties are resolved in favour of the earliest inserted schedule.
+        :param item: The item to start from.
+        :return: The closest item with fewer active days, or None if there is none.
+        """
+        distances = self._distances(item)
+        if distances is None:
+            return None
+        active_days = self._active_days[:self._size]
+        distances[active_days >= active_days[item]] = np.iinfo(np.uint8).max
+        best = int(np.argmin(distances))
+        if distances[best] == np.iinfo(np.uint8).max:
+            return None
+        return best
@@ -1,26 +1,143 @@
 from src.models.schedule import Schedule
 from src.models.grade_sorter import GradeSorter
 from src.models.Preference import Preference, Metric
-from typing import List, Optional, Iterator
+from src.models.schedule_index import ScheduleIndex
+from src.interfaces.result_store_interface import IResultStore
+from itertools import islice
+from array import array
+from collections.abc import Sequence
+from typing import Dict, List, Optional, Iterator, Tuple, Union
+import numpy as np
+import random
+
+# Rough resident size of one generated schedule (unpickled lecture groups plus sorter entries),
+# used to turn a memory budget into a schedule count budget
+ESTIMATED_SCHEDULE_BYTES = 1024
+
+# Upper bound of the grade of each metric
+GRADE_UPPER_BOUNDS = {
+    Metric.ACTIVE_DAYS: 7,        # Upper bound for active days is 7
+    Metric.GAP_COUNT: 20,         # Upper bound for gap count is 20
+    Metric.TOTAL_GAP_TIME: 64,    # Upper bound for total gap time in helf of hours
+    Metric.AVG_START_TIME: 1440,  # Upper bound for average start time in minutes (24*60)
+    Metric.AVG_END_TIME: 1440     # Upper bound for average end time in minutes (24*60)
+}
+
+# Direction in which each metric is better when computing the Pareto front:
+# fewer days, fewer and shorter gaps, later start and earlier end
+PARETO_DIRECTIONS = {
+    Metric.ACTIVE_DAYS: 1,
+    Metric.GAP_COUNT: 1,
+    Metric.TOTAL_GAP_TIME: 1,
+    Metric.AVG_START_TIME: -1,
+    Metric.AVG_END_TIME: 1,
+}
 
 class ScheduleRanker:
     """
     This class is responsible for ranking schedules based on user-defined preferences.  
     It uses a GradeSorter to efficiently manage and retrieve schedules based on their grades.
+
+    In bounded mode (max_schedules is set) the ranker never holds many more schedules than the budget:
+    whenever it overflows, it keeps only the top N schedules for every metric in both directions,
+    the Pareto front over all metrics and a uniform reservoir sample of everything seen, and evicts the rest.
+
+    Alternatively the schedules can be kept in an IResultStore (see attach_store), e.g. a memory-mapped
+    session on disk; the sorters then hold only insertion indices and schedules are read from the store.
     """
-    def __init__(self):
-        # List of schedules to be ranked
-        self.schedules: List[Schedule] = []
+    def __init__(self, max_schedules: Optional[int] = None, top_n: Optional[int] = None,
+                 reservoir_size: Optional[int] = None, seed: Optional[int] = None):
+        """
+        :param max_schedules: Maximum number of schedules to keep, or None to keep everything.
+        :param top_n: Schedules kept per metric and direction when evicting (default: budget / 20).
+        :param reservoir_size: Size of the uniform random sample kept when evicting (default: budget / 10).
+        :param seed: Seed for the reservoir sampling, for reproducible results.
+        """
+        if max_schedules is not None and max_schedules <= 0:
+            raise ValueError("max_schedules must be positive")
+        self.max_schedules = max_schedules
+        budget = max_schedules or 0
+        self.top_n = top_n if top_n is not None else max(1, budget // (4 * len(Metric)))
+        self.reservoir_size = reservoir_size if reservoir_size is not None else max(1, budget // 10)
+        # Total number of schedules ever inserted, including evicted ones
+        self.seen = 0
+        # Retention state of the bounded mode, both hold insertion indices into self.schedules
+        self._reservoir: List[int] = []
+        self._pareto: List[Tuple[tuple, int]] = []
+        self._random = random.Random(seed)
+        # Grade counts of evicted schedules, so histograms still describe everything seen
+        self._evicted_histograms: Dict[Metric, List[int]] = {}
+
+        # List of schedules to be ranked, or the attached result store
+        self.schedules: Union[List[Schedule], IResultStore] = []
         # Dictionary mapping each metric to its corresponding GradeSorter
         self.sorters: dict[Metric, GradeSorter] = {
-            Metric.ACTIVE_DAYS: GradeSorter(7),        # Upper bound for active days is 7
-            Metric.GAP_COUNT: GradeSorter(20),         # Upper bound for gap count is 20
-            Metric.TOTAL_GAP_TIME: GradeSorter(64),    # Upper bound for total gap time in helf of hours
-            Metric.AVG_START_TIME: GradeSorter(1440),  # Upper bound for average start time in minutes (24*60)
-            Metric.AVG_END_TIME: GradeSorter(1440)     # Upper bound for average end time in minutes (24*60)
+            metric: self._new_sorter(metric) for metric in Metric
         }
         # Current user preference for sorting - None means insertion order
         self.current_preference: Optional[Preference] = None
+        # Similarity index over option vectors, filled lazily on the first similarity query
+        self.index = ScheduleIndex()
+
+    @staticmethod
+    def _new_sorter(metric: Metric) -> GradeSorter:
+        """
+        Creates an empty sorter for a metric. Items are schedule indices, stored as compact unsigned ints.
+        """
+        return GradeSorter(GRADE_UPPER_BOUNDS[metric], typecode='I')
+
+    @classmethod
+    def from_memory_budget(cls, megabytes: float, **kwargs) -> "ScheduleRanker":
+        """
+        Creates a bounded ranker whose schedule budget fits (roughly) in the given amount of memory.
+        :param megabytes: Memory budget for the stored schedules.
+        :return: A bounded ScheduleRanker.
+        """
+        max_schedules = max(1, int(megabytes * 1024 * 1024 // ESTIMATED_SCHEDULE_BYTES))
+        return cls(max_schedules=max_schedules, **kwargs)
+
+    def attach_store(self, store: Optional[IResultStore]):
+        """
+        Resets the ranker and keeps the schedules in the given store instead of an in-memory list.
+        Schedules already in the store (e.g. a reopened session) are ranked right away; when the store
+        provides its metric grades, the sorters are built from them without rebuilding any schedule.
+        The previous storage is left untouched.
+        :param store: The result store to use, or None to go back to an in-memory list.
+        :raises ValueError: If the ranker is bounded, eviction needs an in-memory list.
+        """
+        if store is not None and self.is_bounded():
+            raise ValueError("A bounded ranker cannot use a result store")
+        self.schedules = []
+        self.clear()
+        if store is None:
+            return
+
+        self.schedules = store
+        self.seen = len(store)
+        if self.seen == 0:
+            return
+        grades = store.get_grades()
+        if grades is None:
+            for item, schedule in enumerate(store):
+                for metric, grade in zip(Metric, self._grades(schedule)):
+                    self.sorters[metric].insert(item, grade)
+            return
+
+        # Bulk load: a stable sort by grade gives the bucket contents in insertion order
+        for column, metric in enumerate(Metric):
+            grade_column = np.ascontiguousarray(grades[:, column])
+            bounds = np.cumsum(np.bincount(grade_column, minlength=GRADE_UPPER_BOUNDS[metric] + 1))
+            if len(bounds) > GRADE_UPPER_BOUNDS[metric] + 1:
+                raise ValueError(f"Stored grade out of bounds for {metric}")
+            order = np.argsort(grade_column, kind="stable").astype(np.uint32)
+            # Hand the buckets over as typed arrays (raw copies) matching the sorter's compact buckets
+            self.sorters[metric].load([array('I', part.tobytes()) for part in np.split(order, bounds[:-1])])
+
+    def is_bounded(self) -> bool:
+        """
+        Returns True if the ranker evicts schedules beyond its budget.
+        """
+        return self.max_schedules is not None
 
     def set_preference(self, preference: Optional[Preference]):
         """
@@ -42,14 +159,30 @@ class ScheduleRanker:
         self.schedules.append(schedule)
         
         # Insert the schedule's metrics into all sorters
-        # Each metric is converted to an integer grade for sorting
-        self.sorters[Metric.ACTIVE_DAYS].insert(item, int(schedule.active_days))
-        self.sorters[Metric.GAP_COUNT].insert(item, int(schedule.gap_count))
-        # Total gap time is in hours, store as half-hours for grading
-        self.sorters[Metric.TOTAL_GAP_TIME].insert(item, int(schedule.total_gap_time * 2))
-        # Average times are in 700 format float, convert to minutes for grading
-        self.sorters[Metric.AVG_START_TIME].insert(item, Schedule.time_format_to_minutes(int(schedule.avg_start_time)))
-        self.sorters[Metric.AVG_END_TIME].insert(item, Schedule.time_format_to_minutes(int(schedule.avg_end_time)))
+        for metric, grade in zip(Metric, self._grades(schedule)):
+            self.sorters[metric].insert(item, grade)
+        self.seen += 1
+
+        if self.is_bounded():
+            self._track_retained(item)
+            self._evict_if_needed()
+
+    @staticmethod
+    def _grades(schedule: Schedule) -> tuple:
+        """
+        Converts the metrics of a schedule to the integer grades used by the sorters, in Metric order.
+        :param schedule: The Schedule object to grade.
+        :return: A tuple of grades matching Schedule.metric_tuple.
+        """
+        return (
+            int(schedule.active_days),
+            int(schedule.gap_count),
+            # Total gap time is in hours, store as half-hours for grading
+            int(schedule.total_gap_time * 2),
+            # Average times are in 700 format float, convert to minutes for grading
+            Schedule.time_format_to_minutes(int(schedule.avg_start_time)),
+            Schedule.time_format_to_minutes(int(schedule.avg_end_time)),
+        )
 
 
     def add_batch(self, batch: List[Schedule]):
@@ -68,7 +201,70 @@ class ScheduleRanker:
             self.sorters[metric].insert_chunk(
                 ((start_index + i, schedule.metric_tuple[idx]) for i, schedule in enumerate(batch))
             )
+        self.seen += len(batch)
+
+        if self.is_bounded():
+            for item in range(start_index, len(self.schedules)):
+                self._track_retained(item)
+            self._evict_if_needed()
+
+    def _track_retained(self, item: int):
+        """
+        Updates the reservoir sample and the Pareto front with a newly inserted schedule.
+        :param item: The insertion index of the new schedule (self.seen already counts it).
+        """
+        # Reservoir sampling (algorithm R) over every schedule seen so far
+        if len(self._reservoir) < self.reservoir_size:
+            self._reservoir.append(item)
+        else:
+            slot = self._random.randrange(self.seen)
+            if slot < self.reservoir_size:
+                self._reservoir[slot] = item
+
+        # Pareto front: drop the schedule if an equal or better one exists, otherwise replace what it dominates
+        key = tuple(PARETO_DIRECTIONS[metric] * grade
+                    for metric, grade in zip(Metric, self._grades(self.schedules[item])))
+        for other, _ in self._pareto:
+            if all(o <= k for o, k in zip(other, key)):
+                return
+        self._pareto = [(other, i) for other, i in self._pareto
+                        if not all(k <= o for k, o in zip(key, other))]
+        self._pareto.append((key, item))
+
+    def _evict_if_needed(self):
+        """
+        Evicts every schedule that is not retained once the ranker holds more than its budget.
+        Retained are the top_n schedules per metric in both directions, the Pareto front and the reservoir.
+        """
+        if len(self.schedules) <= self.max_schedules:
+            return
+
+        keep = set(self._reservoir)
+        keep.update(item for _, item in self._pareto)
+        for sorter in self.sorters.values():
+            keep.update(islice(sorter.iter_items(), self.top_n))
+            keep.update(islice(sorter.iter_items(reverse=True), self.top_n))
+        kept = sorted(keep)
+
+        # Remember the grades of the evicted schedules for the histograms
+        before = {metric: sorter.get_histogram() for metric, sorter in self.sorters.items()}
+
+        # Rebuild the storage and the sorters with the kept schedules, preserving their relative order
+        remap = {old: new for new, old in enumerate(kept)}
+        self.schedules = [self.schedules[item] for item in kept]
+        for metric in Metric:
+            self.sorters[metric] = self._new_sorter(metric)
+        for item, schedule in enumerate(self.schedules):
+            for metric, grade in zip(Metric, self._grades(schedule)):
+                self.sorters[metric].insert(item, grade)
+        self._reservoir = [remap[item] for item in self._reservoir]
+        self._pareto = [(key, remap[item]) for key, item in self._pareto]
+        self.index.clear()
 
+        for metric, counts in before.items():
+            evicted = self._evicted_histograms.setdefault(metric, [0] * len(counts))
+            for grade, count in enumerate(self.sorters[metric].get_histogram()):
+                evicted[grade] += counts[grade] - count
 
     def get_ranked_schedule(self, k: int) -> Schedule:
         """
@@ -76,12 +272,20 @@ class ScheduleRanker:
         :param k: The index of the schedule to retrieve (0-based).
         :return: The k-th Schedule object according to the current preference.
         """
+        return self.schedules[self._get_ranked_item(k)]
+
+    def _get_ranked_item(self, k: int) -> int:
+        """
+        Maps a ranked position to the insertion index of the schedule at that position.
+        :param k: The ranked position (0-based).
+        :return: The index of the schedule in self.schedules.
+        """
         if k < 0 or k >= len(self.schedules):
             raise IndexError(f"k={k} is out of bounds for {len(self.schedules)} schedules")
             
         # If no preference is set, return in insertion order
         if self.current_preference is None:
-            return self.schedules[k]
+            return k
             
         # Get the sorter and handle ascending/descending order
         metric = self.current_preference.metric
@@ -89,13 +293,65 @@ class ScheduleRanker:
         
         if self.current_preference.ascending:
             # Normal order: k-th smallest
-            schedule_index = sorter.get_kth_item(k)
-        else:
-            # Reverse order: k-th largest = (total-1-k)-th smallest
-            reverse_k = len(self.schedules) - 1 - k
-            schedule_index = sorter.get_kth_item(reverse_k)
-            
-        return self.schedules[schedule_index]
+            return sorter.get_kth_item(k)
+        # Reverse order: k-th largest = (total-1-k)-th smallest
+        reverse_k = len(self.schedules) - 1 - k
+        return sorter.get_kth_item(reverse_k)
+
+    def get_rank(self, item: int) -> int:
+        """
+        Returns the ranked position of a schedule under the current preference (inverse of get_ranked_schedule).
+        :param item: The insertion index of the schedule.
+        :return: The 0-based ranked position of the schedule.
+        """
+        if item < 0 or item >= len(self.schedules):
+            raise IndexError(f"item={item} is out of bounds for {len(self.schedules)} schedules")
+        if self.current_preference is None:
+            return item
+
+        metric = self.current_preference.metric
+        grade = self._grades(self.schedules[item])[list(Metric).index(metric)]
+        rank = self.sorters[metric].get_rank(item, grade)
+        if self.current_preference.ascending:
+            return rank
+        return len(self.schedules) - 1 - rank
+
+    def _sync_index(self):
+        """
+        Adds the schedules inserted since the last similarity query to the similarity index.
+        """
+        start = self.index.size()
+        if start == len(self.schedules):
+            return
+        # Stores with option columns are indexed without rebuilding the schedules
+        vectors = None if isinstance(self.schedules, list) else self.schedules.get_option_vectors()
+        if vectors is not None:
+            end = len(self.schedules)
+            self.index.add_many(vectors[start:end], self.schedules.get_grades()[start:end, 0])
+            return
+        for item in range(start, len(self.schedules)):
+            schedule = self.schedules[item]
+            self.index.add(schedule.option_indices, schedule.active_days)
+
+    def find_one_swap_alternatives(self, k: int) -> List[int]:
+        """
+        Finds the schedules that are identical to the k-th ranked schedule except for one course choice.
+        :param k: The ranked position of the reference schedule.
+        :return: Ranked positions of the alternatives, best ranked first.
+        """
+        self._sync_index()
+        item = self._get_ranked_item(k)
+        return sorted(self.get_rank(neighbour) for neighbour in self.index.one_swap_neighbours(item))
+
+    def find_fewer_days_alternative(self, k: int) -> Optional[int]:
+        """
+        Finds the most similar schedule to the k-th ranked schedule that has fewer active days.
+        :param k: The ranked position of the reference schedule.
+        :return: The ranked position of the alternative, or None if no schedule has fewer days.
+        """
+        self._sync_index()
+        item = self.index.closest_with_fewer_days(self._get_ranked_item(k))
+        return None if item is None else self.get_rank(item)
     
     def get_ranked_schedules(self, start: int = 0, count: Optional[int] = None) -> List[Schedule]:
         """
@@ -122,25 +378,89 @@ class ScheduleRanker:
         for i in range(len(self.schedules)):
             yield self.get_ranked_schedule(i)
     
+    def get_histogram(self, metric: Metric, bin_width: int = 1) -> Dict[int, int]:
+        """
+        Returns the live distribution of schedules over a metric, read from the sorter bucket sizes.
+        :param metric: The metric to summarize.
+        :param bin_width: Number of consecutive grades merged into one bin (e.g. 60 for hourly start times).
+        :return: Mapping from the first grade of each non-empty bin to its schedule count (over all seen schedules).
+        """
+        counts = self.sorters[metric].get_histogram()
+        # In bounded mode the histogram also covers evicted schedules
+        for grade, evicted in enumerate(self._evicted_histograms.get(metric, [])):
+            counts[grade] += evicted
+
+        histogram: Dict[int, int] = {}
+        for grade, count in enumerate(counts):
+            if count:
+                start = grade - grade % bin_width
+                histogram[start] = histogram.get(start, 0) + count
+        return histogram
+
+    def get_first_rank_with_grade(self, metric: Metric, grade: int) -> int:
+        """
+        Returns the position of the first schedule with at least the given grade when sorted ascending by metric.
+        :param metric: The metric to sort by.
+        :param grade: The grade to look up (same units as Schedule.metric_tuple).
+        :return: The 0-based ranked position under an ascending preference on the metric.
+        """
+        return self.sorters[metric].get_first_rank(grade)
+
     def size(self) -> int:
         """
         Returns the total number of schedules.
         :return: Total number of schedules.
         """
         return len(self.schedules)
+
+    def seen_count(self) -> int:
+        """
+        Returns the number of schedules inserted since the last clear, including evicted ones.
+        :return: Number of schedules seen.
+        """
+        return self.seen
     
     def clear(self):
         """
         Clears all schedules and resets the ranker.
         """
         self.schedules.clear()
+        self.index.clear()
+        self.seen = 0
+        self._reservoir = []
+        self._pareto = []
+        self._evicted_histograms = {}
         # Reset all sorters
         for metric in Metric:
-            self.sorters[metric] = GradeSorter(self.sorters[metric].upper_bound)
+            self.sorters[metric] = self._new_sorter(metric)
         
-    def get_schedules(self) -> List[Schedule]:
+    def get_schedules(self) -> Union[List[Schedule], "StoredSchedules"]:
         """
-        Returns the list of all schedules.
-        :return: List of Schedule objects.
+        Returns all schedules, in insertion order. With a result store attached, a read-only view of the store
+        is returned instead of a list, so that nothing is rebuilt until a schedule is read.
+        :return: List of Schedule objects, or a StoredSchedules view.
         """
-        return self.schedules.copy()
\ No newline at end of file
+        if isinstance(self.schedules, list):
+            return list(self.schedules)
+        return StoredSchedules(self.schedules)
+
+
+class StoredSchedules(Sequence):
+    """
+    Read-only view of the schedules of a result store: len() is free and a schedule is only rebuilt
+    from the store when it is read, so a view of a million stored schedules costs nothing to hand out.
+    """
+    def __init__(self, store: IResultStore):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._store[item] for item in range(*index.indices(len(self._store)))]
+        if index < 0:
+            index += len(self._store)
+        if not 0 <= index < len(self._store):
+            raise IndexError(f"index={index} is out of bounds for {len(self._store)} schedules")
+        return self._store[index]
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+from src.models.course import Course
+from src.models.option_table import OptionTable
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+
+@dataclass
+class SearchCheckpoint:
+    """
+    Serialisable state of an interrupted exhaustive generation, saved next to its on-disk result session.
+    The search is a depth-first walk over the courses, and it yields a schedule only with every course placed,
+    so the option cursor per course level of the last delivered schedule is the whole search stack:
+    every level resumes after its cursor option, the deepest level first (see CompatibilityStrategy).
+    results is the number of session rows the cursor covers; rows stored after it are dropped on resume.
+    """
+    FILE = "checkpoint.json"
+
+    cursor: List[int] = field(default_factory=list)  # Option index per course level of the last delivered schedule
+    results: int = 0  # Number of stored schedules the cursor covers
+    selection_key: str = ""  # Identifies the options, forbidden slots, constraints and travel times searched
+    pending_probe: Optional[List[int]] = None  # Probe schedule stored ahead of the cursor, to drop from the stream
+
+    @staticmethod
+    def make_selection_key(courses: Sequence[Course], forbidden: Optional[List[TimeSlot]] = None,
+                           constraints: Optional[ScheduleConstraints] = None,
+                           travel: Optional[TravelTimes] = None) -> str:
+        """
+        Returns a key that is equal for two generations exactly when they search the same schedules in the same order.
+        A cursor holds option indices, so the compiled options of every course are part of the key (as a hash):
+        a course re-read with other times keeps its code but not its options.
+        Bounded runs (GenerationLimits) are never checkpointed, so limits are not part of the key.
+        """
+        options = [[[[str(slot) for slot in group or []] for group in (option.lecture, option.tirgul, option.maabada)]
+                    for option in OptionTable.compile_course(course)] for course in courses]
+        options_hash = hashlib.sha256(json.dumps(options).encode("utf-8")).hexdigest()
+        bounds = None
+        if constraints is not None and not constraints.is_empty():
+            bounds = [str(constraints.max_active_days), str(constraints.earliest_start), str(constraints.latest_end),
+                      str(constraints.max_gap_minutes), str(constraints.min_free_days),
+                      sorted(str(slot) for slot in constraints.free_windows)]
+        walking = None
+        if travel is not None:
+            walking = [sorted(travel.index.items()), travel.matrix, travel.default_minutes]
+        return json.dumps([[course.course_code for course in courses], options_hash,
+                           sorted(str(slot) for slot in forbidden or []), bounds, walking])
+
+    @classmethod
+    def path_in(cls, directory: str) -> str:
+        return os.path.join(directory, cls.FILE)
+
+    def save(self, directory: str) -> None:
+        """
+        Writes the checkpoint into a session directory, replacing the previous one atomically.
+        """
+        temp_path = self.path_in(directory) + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"cursor": self.cursor, "results": self.results, "selection_key": self.selection_key,
+                       "pending_probe": self.pending_probe}, f)
+        os.replace(temp_path, self.path_in(directory))
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["SearchCheckpoint"]:
+        """
+        Reads the checkpoint of a session directory.
+        :return: The checkpoint, or None if the session has none (or it cannot be read).
+        """
+        try:
+            with open(cls.path_in(directory), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(list(data["cursor"]), int(data["results"]), data["selection_key"], data.get("pending_probe"))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @classmethod
+    def remove(cls, directory: str) -> None:
+        """
+        Deletes the checkpoint of a session directory, if any.
+        """
+        try:
+            os.remove(cls.path_in(directory))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,58 @@
+from dataclasses import dataclass, field
+from datetime import time
+from typing import Dict, List, Optional
+from src.models.course import Course
+from src.models.option_table import CourseOption, OptionTable
+
+@dataclass
+class SoftPreferences:
+    """
+    Wishes a schedule should respect but may break, each broken wish costing penalty points.
+    The penalty of a schedule is the sum of the penalties of its options, so schedules can be
+    searched from the lowest penalty up. Every field left empty (or None) costs nothing.
+    """
+    # Courses taught by anyone else cost instructor_penalty
+    preferred_instructors: List[str] = field(default_factory=list)
+    instructor_penalty: int = 3
+    # Every class held in one of these buildings costs building_penalty
+    avoided_buildings: List[str] = field(default_factory=list)
+    building_penalty: int = 2
+    # Course code -> index of the preferred tirgul group, any other tirgul costs group_penalty
+    preferred_tirguls: Dict[str, int] = field(default_factory=dict)
+    group_penalty: int = 2
+    # Every class starting before this time costs early_penalty
+    early_before: Optional[time] = None
+    early_penalty: int = 1
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if no schedule can get a penalty.
+        """
+        return (not self.preferred_instructors and not self.avoided_buildings
+                and not self.preferred_tirguls and self.early_before is None)
+
+    def option_penalty(self, course: Course, option: CourseOption) -> int:
+        """
+        Returns the penalty of attending a course through one of its options.
+        :param course: The course the option belongs to.
+        :param option: The option, as compiled by OptionTable.
+        """
+        penalty = 0
+        if self.preferred_instructors and course.instructor not in self.preferred_instructors:
+            penalty += self.instructor_penalty
+        preferred = self.preferred_tirguls.get(course.course_code)
+        if preferred is not None and preferred < len(course.tirguls) and option.tirgul is not course.tirguls[preferred]:
+            penalty += self.group_penalty
+        for slot in option.slots:
+            if slot.building in self.avoided_buildings:
+                penalty += self.building_penalty
+            if self.early_before is not None and slot.start_time < self.early_before:
+                penalty += self.early_penalty
+        return penalty
+
+    def penalties(self, table: OptionTable) -> List[List[int]]:
+        """
+        Returns the penalty of every option of a compiled option table, indexed like table.options.
+        """
+        return [[self.option_penalty(course, option) for option in options]
+                for course, options in zip(table.courses, table.options)]
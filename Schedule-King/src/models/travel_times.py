@@ -0,0 +1,88 @@
+import json
+from typing import Dict, List, Sequence
+from src.models.schedule import Schedule
+from src.models.time_slot import TimeSlot
+
+class TravelTimes:
+    """
+    Walking time in minutes between every pair of buildings.
+    Loaded from a small JSON file:
+        {"default_minutes": 0, "travel_minutes": {"10": {"20": 15}, "20": {"1100": 10}}}
+    Times are symmetric and 0 within a building. On load every time is shortened to the fastest route
+    through other listed buildings, so the times between buildings linked by listed routes obey the
+    triangle inequality. Buildings with no listed route between them (and unknown buildings) get
+    default_minutes, which stands for a walk nobody measured and is kept out of the shortest routes:
+    routing through it would replace listed times by detours through unlisted buildings (all of them by 0
+    with the usual default). So a listed time longer than twice default_minutes can exceed such a detour.
+    Every pair of slots of a day is checked, consecutive ones included, so a schedule whose walks do not
+    fit is always rejected; a pair of classes with another one in between may be held to a longer walk
+    than the detour through it.
+    """
+    def __init__(self, minutes: Dict[str, Dict[str, int]], default_minutes: int = 0):
+        """
+        :param minutes: Walking minutes per pair of buildings, listed in either direction.
+        :param default_minutes: Walking minutes between buildings not listed (also unknown buildings).
+        """
+        self.default_minutes = default_minutes
+        names = sorted({name for first, row in minutes.items() for name in (first, *row)})
+        self.index: Dict[str, int] = {name: position for position, name in enumerate(names)}
+        size = len(names)
+        unknown = float("inf")
+        matrix = [[0 if a == b else unknown for b in range(size)] for a in range(size)]
+        for first, row in minutes.items():
+            for second, value in row.items():
+                a, b = self.index[first], self.index[second]
+                if a != b:
+                    matrix[a][b] = matrix[b][a] = int(value)
+        # Shortest routes over the listed times (Floyd-Warshall), pairs without any route get the default
+        for via in range(size):
+            for a in range(size):
+                for b in range(size):
+                    through = matrix[a][via] + matrix[via][b]
+                    if through < matrix[a][b]:
+                        matrix[a][b] = through
+        self.matrix: List[List[int]] = [[default_minutes if value == unknown else int(value) for value in row]
+                                        for row in matrix]
+        self.max_minutes = max([default_minutes] + [max(row) for row in self.matrix])
+
+    @classmethod
+    def load(cls, path: str) -> "TravelTimes":
+        """
+        Reads the travel times from a JSON file.
+        :raises ValueError: If the file is not in the expected format.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        minutes = data.get("travel_minutes", {})
+        if not isinstance(minutes, dict) or not all(isinstance(row, dict) for row in minutes.values()):
+            raise ValueError(f"'travel_minutes' in '{path}' must map buildings to {{building: minutes}}")
+        return cls(minutes, int(data.get("default_minutes", 0)))
+
+    def minutes(self, first: str, second: str) -> int:
+        """
+        Returns the walking minutes between two buildings in O(1).
+        """
+        if first == second:
+            return 0
+        a, b = self.index.get(first), self.index.get(second)
+        if a is None or b is None:
+            return self.default_minutes
+        return self.matrix[a][b]
+
+    def allows(self, first: TimeSlot, second: TimeSlot) -> bool:
+        """
+        Checks that a student can attend two non-overlapping slots: on the same day,
+        the break between them must be at least the walk between their buildings.
+        """
+        if first.day != second.day:
+            return True
+        if second.start_time < first.start_time:
+            first, second = second, first
+        gap = Schedule.time_to_minutes(second.start_time) - Schedule.time_to_minutes(first.end_time)
+        return gap < 0 or gap >= self.minutes(first.building, second.building)
+
+    def allows_slots(self, slots: Sequence[TimeSlot]) -> bool:
+        """
+        Checks every pair of slots with allows().
+        """
+        return all(self.allows(slots[i], slots[j]) for i in range(len(slots)) for j in range(i + 1, len(slots)))
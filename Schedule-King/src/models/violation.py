@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from datetime import time
+from typing import Tuple
+
+OVERLAP = "overlap"
+FORBIDDEN = "forbidden"
+
+@dataclass(frozen=True)
+class Violation:
+    """
+    One broken rule of a near-miss schedule (see NearMissStrategy): two classes overlapping,
+    or a class in a forbidden time slot, on one day between start_time and end_time.
+    """
+    kind: str  # OVERLAP or FORBIDDEN
+    day: str
+    start_time: time
+    end_time: time
+    course_codes: Tuple[str, ...]  # The two overlapping courses, or the course in the forbidden slot
+    cost: int
+
+    def minutes(self) -> int:
+        """
+        Returns the length of the violation in minutes.
+        """
+        return (self.end_time.hour * 60 + self.end_time.minute) - (self.start_time.hour * 60 + self.start_time.minute)
+
+    def describe(self) -> str:
+        """
+        Returns a short explanation for the user.
+        """
+        span = f"{self.start_time.strftime('%H:%M')}-{self.end_time.strftime('%H:%M')}"
+        if self.kind == OVERLAP:
+            return f"{' and '.join(self.course_codes)} overlap {span}"
+        return f"{self.course_codes[0]} uses the blocked time {span}"
@@ -59,4 +59,18 @@ class MatrixConflictChecker:
         for hour in range(start, end):
             index = hour - FIRST_HOUR
             if 0 <= index < SLOTS_PER_DAY:
-                self.taken[day_index][index] = False
\ No newline at end of file
+                self.taken[day_index][index] = False
+
+    @staticmethod
+    def slot_mask(slot: TimeSlot) -> int:
+        """
+        # Return the cells of a TimeSlot as a bitmask, bit (day * SLOTS_PER_DAY + hour index) per taken cell.
+        # Uses the same cells as place(), hours outside 8:00-20:00 are ignored.
+        """
+        day_index = int(slot.day) - 1
+        mask = 0
+        for hour in range(slot.start_time.hour, slot.end_time.hour):
+            index = hour - FIRST_HOUR
+            if 0 <= index < SLOTS_PER_DAY:
+                mask |= 1 << (day_index * SLOTS_PER_DAY + index)
+        return mask
@@ -17,6 +17,8 @@ class AllStrategy(IScheduleStrategy):
         if len(selected) > 7:
             raise ValueError("Cannot select more than 7 courses.")
         self._selected = selected
+        self._option_path: List[int] = []  # option index chosen per course on the current path
+        self.nodes_visited = 0  # Number of options placed during the search
         self._checker = MatrixConflictChecker()
 
         # Pre-fill forbidden slots if exists
@@ -44,7 +46,7 @@ class AllStrategy(IScheduleStrategy):
         # Base case: if we've selected a group for every course, yield a Schedule
         if index == len(self._selected):
             if current:  # we only yield non-empty schedules
-                schedule = Schedule(current.copy())
+                schedule = Schedule(current.copy(), option_indices=tuple(self._option_path))
                 schedule.generate_metrics()
                 yield schedule
             return
@@ -57,7 +59,8 @@ class AllStrategy(IScheduleStrategy):
         maabadas = course.maabadas or [None]
 
         # Iterate over all possible combinations of lecture, tirgul, and maabada for this course
-        for lecture, tirgul, maabada in product(course.lectures, tirguls, maabadas):
+        # The position in this product is the option index recorded on the schedule
+        for option_index, (lecture, tirgul, maabada) in enumerate(product(course.lectures, tirguls, maabadas)):
             # Flatten the slots into a single list
             all_slots = [slot for group in (lecture, tirgul, maabada) if group for slot in group]
 
@@ -83,11 +86,14 @@ class AllStrategy(IScheduleStrategy):
                             tirguls=tirgul,
                             maabadas=maabada
                             ))
+            self._option_path.append(option_index)
+            self.nodes_visited += 1
 
             # Recursively build combinations for the next course
             yield from self._build_valid_combinations(index + 1, current)
 
             # Backtrack: remove the last group and unmark the slots
             current.pop()
+            self._option_path.pop()
             for slot in all_slots:
                 self._checker.remove(slot)
\ No newline at end of file
@@ -0,0 +1,226 @@
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from src.models.course import Course
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+from .compatibility_strategy import CompatibilityStrategy, DEADLINE_CHECK_MASK
+from .compatibility_table import popcount
+
+# A learned nogood: (course index, option index) placements that cannot all hold in one schedule
+Nogood = Tuple[Tuple[int, int], ...]
+
+class BackjumpStrategy(CompatibilityStrategy):
+    """
+    CompatibilityStrategy with conflict-directed backjumping and nogood learning (forward checking with
+    conflict-directed backjumping, FC-CBJ). It finds the same schedules, in the same order.
+    Every course keeps the earlier courses whose choices removed its options (forward checking), and the
+    earlier courses blamed for its options that failed. When a course runs out of options, the search
+    jumps straight back to the latest course to blame instead of the previous one, skipping the levels in
+    between that had nothing to do with the failure. A failure caused by the day limit, the gaps or a
+    constraint on the complete schedule depends on every earlier choice, which are all blamed.
+
+    The placements blamed for a failure are also a nogood: those options can never be combined. Nogoods of
+    up to MAX_NOGOOD_SIZE placements are cached for the rest of the search and checked like any other conflict.
+    After a schedule is found, jumps become chronological again so no schedule below a level is skipped.
+    """
+    MAX_NOGOOD_SIZE = 3
+
+    def __init__(self, selected: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                 constraints: Optional[ScheduleConstraints] = None, travel: Optional[TravelTimes] = None,
+                 quality_order: bool = False):
+        """
+        Builds the compatibility table of the selected courses (see CompatibilityStrategy).
+        """
+        super().__init__(selected, forbidden, constraints, travel, quality_order)
+        self.backjumps = 0  # Number of jumps over more than one level
+        # Learned nogoods indexed by their latest placement, holding the other placements
+        self.nogoods: Dict[Tuple[int, int], Set[Nogood]] = {}
+
+    def iter_option_vectors(self, node_limit: Optional[int] = None, deadline: Optional[float] = None,
+                            resume_after: Optional[Sequence[int]] = None,
+                            tick: Optional[float] = None) -> Iterator[Optional[Tuple[int, ...]]]:
+        """
+        Lazily generate the option vector of every valid schedule (see CompatibilityStrategy.iter_option_vectors).
+        """
+        self.limit_reached = False
+        self.deadline_reached = False
+        count = len(self._selected)
+        if count == 0 or not all(self.table.domains):
+            return
+        table = self.table
+        compatible = table.compatible
+        constraints = self.constraints
+        day_limit = constraints.day_limit() if constraints else None
+        max_gap = constraints.max_gap_minutes if constraints else None
+        check_complete = constraints is not None and constraints.couples_courses()
+        fillable = [0] * (count + 1)
+        if max_gap is not None:
+            for course in range(count - 1, -1, -1):
+                fillable[course] = fillable[course + 1] | table.domain_union(course)
+        days = [0] * (count + 1)
+        cells = [0] * (count + 1)
+        live = [list(table.domains)] + [None] * count
+        remaining = [0] * count
+        remaining[0] = live[0][0]
+        chosen = [0] * count
+        depth = 0
+        order = self.option_order
+        position = [0] * count
+        # Level sets are bitmasks of course indices. pruned[d][j]: the courses before d whose choices removed
+        # options of course j; conflicts[d]: the courses blamed for the options of course d that failed;
+        # genuine[d]: conflicts[d] only holds real conflicts (no marks left by found schedules)
+        pruned: List[Optional[List[int]]] = [[0] * count] + [None] * count
+        conflicts = [0] * count
+        genuine = [True] * count
+        if resume_after is not None:
+            depth = self._restore(resume_after, live, remaining, position, chosen, days, cells, day_limit)
+            # Every level of the restored path has a schedule below it; blaming all earlier courses is safe
+            for level in range(1, count):
+                pruned[level] = [(1 << level) - 1] * count
+                conflicts[level] = 1 << (level - 1)
+                genuine[level] = False
+
+        started = time.perf_counter()
+        next_tick = started + (tick or 0.0)
+        while True:
+            bits = remaining[depth]
+            if not bits:
+                # Course exhausted: learn why and jump back to the latest course to blame
+                culprits = conflicts[depth] | pruned[depth][depth]
+                if genuine[depth]:
+                    self._learn(culprits, chosen)
+                if not culprits:
+                    break
+                target = culprits.bit_length() - 1
+                if target < depth - 1:
+                    self.backjumps += 1
+                conflicts[target] |= culprits & ~(1 << target)
+                genuine[target] = genuine[target] and genuine[depth]
+                depth = target
+                continue
+            if order is None:
+                low = bits & -bits
+                remaining[depth] = bits ^ low
+                option = low.bit_length() - 1
+            else:
+                course_order = order[depth]
+                at = position[depth]
+                while not bits >> course_order[at] & 1:
+                    at += 1
+                option = course_order[at]
+                position[depth] = at + 1
+                remaining[depth] = bits & ~(1 << option)
+
+            earlier = (1 << depth) - 1
+            placed_days = days[depth]
+            if day_limit is not None:
+                placed_days |= table.day_masks[depth][option]
+                if popcount(placed_days) > day_limit:
+                    conflicts[depth] |= earlier
+                    continue
+            placed_cells = cells[depth]
+            if max_gap is not None:
+                placed_cells |= table.masks[depth][option]
+                if table.gap_lower_bound(placed_cells, fillable[depth + 1]) > max_gap:
+                    conflicts[depth] |= earlier
+                    continue
+            culprits = self._nogood_culprits(depth, option, chosen)
+            if culprits is not None:
+                conflicts[depth] |= culprits
+                continue
+            chosen[depth] = option
+            self.nodes_visited += 1
+            if node_limit is not None:
+                node_limit -= 1
+                if node_limit < 0:
+                    self.limit_reached = True
+                    break
+            if (deadline is not None or tick is not None) and not self.nodes_visited & DEADLINE_CHECK_MASK:
+                now = time.perf_counter()
+                if deadline is not None and now > deadline:
+                    self.deadline_reached = True
+                    break
+                if tick is not None and now >= next_tick:
+                    self.search_time += now - started
+                    yield None
+                    started = time.perf_counter()
+                    next_tick = started + tick
+
+            if depth == count - 1:
+                if check_complete and not constraints.is_satisfied_by_slots(table.option_slots(chosen)):
+                    conflicts[depth] |= earlier
+                    continue
+                self.search_time += time.perf_counter() - started
+                yield tuple(chosen)
+                started = time.perf_counter()
+                next_tick = started + (tick or 0.0)
+                # Every level has a schedule below it now, so later jumps must not skip any level
+                for level in range(1, count):
+                    conflicts[level] |= 1 << (level - 1)
+                    genuine[level] = False
+                continue
+
+            # Forward checking, recording which courses narrowed every later course
+            row = compatible[depth][option]
+            current = live[depth]
+            narrowed = current.copy()
+            blame = pruned[depth].copy()
+            days_full = day_limit is not None and popcount(placed_days) == day_limit
+            wiped = None
+            for other in range(depth + 1, count):
+                value = current[other] & row[other]
+                if value != current[other]:
+                    blame[other] |= 1 << depth
+                if days_full:
+                    within = value & table.options_within_days(other, placed_days)
+                    if within != value:
+                        blame[other] |= (2 << depth) - 1
+                    value = within
+                narrowed[other] = value
+                if not value:
+                    wiped = other
+                    break
+            if wiped is not None:
+                conflicts[depth] |= blame[wiped] & earlier
+                continue
+            depth += 1
+            live[depth] = narrowed
+            pruned[depth] = blame
+            remaining[depth] = narrowed[depth]
+            position[depth] = 0
+            days[depth] = placed_days
+            cells[depth] = placed_cells
+            conflicts[depth] = 0
+            genuine[depth] = True
+        self.search_time += time.perf_counter() - started
+
+    def _nogood_culprits(self, depth: int, option: int, chosen: List[int]) -> Optional[int]:
+        """
+        Checks an option against the learned nogoods ending with it.
+        :return: The earlier courses to blame (a bitmask) if a nogood forbids the option, None if none does.
+        """
+        for others in self.nogoods.get((depth, option), ()):
+            if all(chosen[level] == value for level, value in others):
+                culprits = 0
+                for level, _ in others:
+                    culprits |= 1 << level
+                return culprits
+        return None
+
+    def _learn(self, culprits: int, chosen: List[int]) -> None:
+        """
+        Caches the placements of the blamed courses as a nogood, if it is small enough.
+        """
+        if not culprits or popcount(culprits) > self.MAX_NOGOOD_SIZE:
+            return
+        levels = [level for level in range(culprits.bit_length()) if culprits >> level & 1]
+        latest = levels[-1]
+        others = tuple((level, chosen[level]) for level in levels[:-1])
+        self.nogoods.setdefault((latest, chosen[latest]), set()).add(others)
+
+    def nogood_count(self) -> int:
+        """
+        Returns the number of learned nogoods.
+        """
+        return sum(len(nogoods) for nogoods in self.nogoods.values())
@@ -0,0 +1,202 @@
+import random
+from itertools import islice
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from src.models.course import Course
+from src.models.option_table import OptionTable
+from .compatibility_strategy import CompatibilityStrategy
+from .compatibility_table import CompatibilityTable
+from .feasibility_counter import WORD_BITS, WORD_MASK, CELL_COUNT, leaf_masks
+from .tree_size_estimator import sample_leaf
+
+# Schedules of a selection component enumerated in full; a larger component is sampled
+SELECTION_LEAF_LIMIT = 5_000
+# Random schedules drawn from a larger component (Knuth probes, see sample_leaf)
+LEAF_SAMPLES = 1_000
+# Catalog footprints tested against the schedules of a component per matrix product
+KEY_BLOCK = 512
+# Selected courses and selection components whose results are remembered
+CACHE_SIZE = 256
+
+
+class CourseFit(NamedTuple):
+    course: Course
+    schedules: int  # Schedules of the selection with this course added, 0 if it cannot fit
+    exact: bool  # False if schedules is estimated from sampled schedules of the selection
+
+
+class CatalogIndex:
+    """
+    Time footprints of a whole catalog, to tell which courses still fit next to a selection.
+    Every option of every course is compiled once into the occupancy mask of the matrix cells it uses
+    (MatrixConflictChecker layout), in NumPy arrays. Given a selection, the schedules of each of its conflict
+    components are enumerated as masks (or sampled with their Knuth weights when there are too many), and
+    every catalog option is tested against all of them at once: the (weighted) schedules of a component that
+    leave the option's cells free. An option keeps the product of those counts over the components, and a
+    course the sum over its options, which is the number of schedules of the selection with the course added.
+    Forbidden hours and schedule limits are not applied.
+    A selection changes one course at a time, and only the component that course joins or leaves changes
+    with it, so the results of every component and selected course are cached and reused.
+    """
+    def __init__(self, catalog: List[Course], leaf_limit: int = SELECTION_LEAF_LIMIT, samples: int = LEAF_SAMPLES,
+                 seed: int = 0):
+        """
+        Compiles the options of every course of the catalog.
+        :param catalog: All courses that can be selected.
+        :param leaf_limit: Schedules of a selection component enumerated in full.
+        :param samples: Schedules sampled from a larger component.
+        :param seed: Seed of the samples, the same seed gives the same ranking.
+        """
+        self.catalog = catalog
+        self.leaf_limit = leaf_limit
+        self.samples = samples
+        self.seed = seed
+        self._positions: Dict[str, int] = {course.course_code: position for position, course in enumerate(catalog)}
+        low, high, owners = [], [], []
+        for position, course in enumerate(catalog):
+            for option in OptionTable.compile_course(course):
+                mask = CompatibilityTable.option_mask(option.slots)
+                if mask is None:  # The option overlaps itself
+                    continue
+                low.append(mask & WORD_MASK)
+                high.append(mask >> WORD_BITS)
+                owners.append(position)
+        self.option_low = np.array(low, dtype=np.uint64)
+        self.option_high = np.array(high, dtype=np.uint64)
+        self.option_course = np.array(owners, dtype=np.int64)
+        # Per selected course: which options fit next to it. Per component (its courses in selection
+        # order): the schedules every option keeps, and whether they were all enumerated.
+        self._pairwise_cache: Dict[Course, np.ndarray] = {}
+        self._component_cache: Dict[Tuple[Course, ...], Tuple[np.ndarray, bool]] = {}
+
+    def rank(self, selected: List[Course]) -> List[CourseFit]:
+        """
+        Ranks the catalog courses that are not selected by the schedules they keep, most first.
+        Courses that cannot fit next to the selection come last, with 0 schedules. A course with an option
+        that conflicts with no selected course on its own may still get an estimate of 0 from sampled
+        schedules; it is then not exact.
+        :param selected: The selected courses.
+        """
+        kept = np.ones(len(self.option_course), dtype=np.float64)
+        exact = True
+        if selected:
+            table = CompatibilityTable(selected)
+            alive = np.ones(len(self.option_course), dtype=bool)
+            for course, masks in zip(selected, table.masks):
+                alive &= self._pairwise_compatible(course, masks)
+            for courses in table.conflict_components():
+                component_kept, complete = self._component_schedules(table, selected, courses)
+                kept *= component_kept
+                exact = exact and complete
+            kept *= alive
+            # A course none of whose options fits next to every selected course on its own is certainly out
+            ruled_out = np.bincount(self.option_course, weights=alive, minlength=len(self.catalog)) == 0
+        else:
+            ruled_out = np.zeros(len(self.catalog), dtype=bool)
+        per_course = np.bincount(self.option_course, weights=kept, minlength=len(self.catalog))
+        chosen = {self._positions.get(course.course_code) for course in selected}
+        order = np.argsort(-per_course, kind="stable")
+        return [CourseFit(self.catalog[position], int(round(per_course[position])),
+                          exact or bool(ruled_out[position]))
+                for position in order if position not in chosen]
+
+    def _pairwise_compatible(self, course: Course, masks: List[Optional[int]]) -> np.ndarray:
+        """
+        Returns, for every catalog option, whether a selected course has an option that leaves its cells free.
+        :param masks: The option masks of the course (CompatibilityTable.masks).
+        """
+        if course not in self._pairwise_cache:
+            if len(self._pairwise_cache) >= CACHE_SIZE:
+                self._pairwise_cache.clear()
+            masks = [mask for mask in masks if mask is not None]
+            low = np.array([mask & WORD_MASK for mask in masks], dtype=np.uint64)
+            high = np.array([mask >> WORD_BITS for mask in masks], dtype=np.uint64)
+            self._pairwise_cache[course] = (((self.option_low[:, None] & low[None, :]) == 0) &
+                                            ((self.option_high[:, None] & high[None, :]) == 0)).any(axis=1)
+        return self._pairwise_cache[course]
+
+    def _component_schedules(self, table: CompatibilityTable, selected: List[Course],
+                             courses: List[int]) -> Tuple[np.ndarray, bool]:
+        """
+        Returns, for every catalog option, the (weighted) schedules of a selection component that leave its
+        cells free, and whether the component's schedules were all enumerated.
+        """
+        key = tuple(selected[course] for course in courses)
+        if key not in self._component_cache:
+            if len(self._component_cache) >= CACHE_SIZE:
+                self._component_cache.clear()
+            low, high, weights, complete = self._selection_schedules(table, selected, courses)
+            self._component_cache[key] = (self._free_schedules(low, high, weights), complete)
+        return self._component_cache[key]
+
+    def _selection_schedules(self, table: CompatibilityTable, selected: List[Course],
+                             courses: List[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, bool]:
+        """
+        Returns the masks of the schedules of a selection component, their weights and whether they are all
+        of them. Past leaf_limit schedules, random ones are drawn instead, each weighted by its Knuth weight
+        over the number of samples, so that weighted counts estimate the counts over all schedules.
+        """
+        strategy = CompatibilityStrategy([selected[course] for course in courses])
+        vectors = list(islice(strategy.iter_option_vectors(), self.leaf_limit + 1))
+        if len(vectors) <= self.leaf_limit:
+            weights = np.ones(len(vectors), dtype=np.float64)
+            complete = True
+        else:
+            rng = random.Random(self.seed)
+            vectors, weights = [], []
+            for _ in range(self.samples):
+                weight, chosen = sample_leaf(table, courses, rng)
+                if chosen is not None:
+                    vectors.append([chosen[course] for course in courses])
+                    weights.append(weight / self.samples)
+            weights = np.array(weights, dtype=np.float64)
+            complete = False
+        low, high = leaf_masks(table, courses, np.array(vectors, dtype=np.int64).reshape(-1, len(courses)))
+        return low, high, weights, complete
+
+    def _free_schedules(self, low: np.ndarray, high: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """
+        Returns, for every catalog option, the weight of the schedules of a selection component that leave its
+        cells free. Only the cells the component uses matter, so options are grouped by the cells they share
+        with it and schedules by their footprint; a group and a footprint are disjoint when the product of
+        their cell bits is 0, a matrix product over the component's cells.
+        """
+        if not len(low) or not len(self.option_course):
+            return np.zeros(len(self.option_course), dtype=np.float64)
+        footprints_low, footprints_high, footprint_weights, _ = _unique_masks(low, high, weights)
+        cells_low = np.bitwise_or.reduce(footprints_low)
+        cells_high = np.bitwise_or.reduce(footprints_high)
+        keys_low, keys_high, _, inverse = _unique_masks(self.option_low & cells_low, self.option_high & cells_high)
+        cells = np.flatnonzero(_cell_bits(np.array([cells_low]), np.array([cells_high]))[0])
+        footprint_bits = _cell_bits(footprints_low, footprints_high)[:, cells].astype(np.float32)
+        key_bits = _cell_bits(keys_low, keys_high)[:, cells].astype(np.float32)
+        free = np.empty(len(keys_low), dtype=np.float64)
+        for start in range(0, len(keys_low), KEY_BLOCK):
+            overlaps = key_bits[start:start + KEY_BLOCK] @ footprint_bits.T
+            free[start:start + KEY_BLOCK] = (overlaps == 0) @ footprint_weights
+        return free[inverse]
+
+
+def _unique_masks(low: np.ndarray, high: np.ndarray,
+                  weights: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the distinct masks, the summed weight of each (1 per mask by default) and, for every given mask,
+    the index of its distinct mask.
+    """
+    order = np.lexsort((high, low))
+    low, high = low[order], high[order]
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = (low[1:] != low[:-1]) | (high[1:] != high[:-1])
+    firsts = np.flatnonzero(starts)
+    sorted_weights = weights[order] if weights is not None else np.ones(len(order), dtype=np.float64)
+    inverse = np.empty(len(order), dtype=np.int64)
+    inverse[order] = np.cumsum(starts) - 1
+    return low[firsts], high[firsts], np.add.reduceat(sorted_weights, firsts), inverse
+
+
+def _cell_bits(low: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """
+    Returns one row of cell bits (0 or 1, CELL_COUNT columns) per mask.
+    """
+    words = np.stack([low, high], axis=1).astype("<u8", copy=False)
+    return np.unpackbits(words.view(np.uint8), axis=1, bitorder="little")[:, :CELL_COUNT]
@@ -0,0 +1,285 @@
+import time
+from typing import Iterator, List, Optional, Sequence, Tuple
+from src.interfaces.schedule_strategy_interface import IScheduleStrategy
+from src.models.course import Course
+from src.models.schedule import Schedule
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+from .compatibility_table import CompatibilityTable, popcount
+
+# The search reads the clock for its deadline once every DEADLINE_CHECK_MASK + 1 placed options
+DEADLINE_CHECK_MASK = 0x3FF
+
+class CompatibilityStrategy(IScheduleStrategy):
+    """
+    Enumerates the same schedules as AllStrategy, in the same order, using a CompatibilityTable.
+    The courses form a k-partite graph whose edges join compatible options, and every schedule is a
+    clique with one option per course. The search keeps, for each remaining course, the bitset of
+    options compatible with everything chosen so far; choosing an option ANDs its compatibility rows
+    into these bitsets, and a branch is abandoned as soon as any remaining course is left empty
+    (forward checking).
+
+    Hard constraints are pushed into the search. Per-option ones (earliest start, latest end, free windows)
+    shrink the domains up front. The others are checked on every partial schedule with bounds that
+    only get worse as courses are added, so a branch that fails them is abandoned as a whole:
+    - active days: an option adding a day past the limit is skipped, and once the limit is reached
+      the remaining courses are narrowed to options on the days already used
+    - gaps: see CompatibilityTable.gap_lower_bound
+    Complete schedules are checked exactly before being yielded.
+
+    With quality_order, the options of every course are tried from the best one (fewest active days, then
+    latest start) instead of in AllStrategy order, so the first schedules found are already good ones.
+    The same schedules are found, with the same option vectors; only the order changes.
+    """
+    def __init__(self, selected: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                 constraints: Optional[ScheduleConstraints] = None, travel: Optional[TravelTimes] = None,
+                 quality_order: bool = False):
+        """
+        Builds the compatibility table of the selected courses.
+        :param selected: List of courses to be included in the strategy.
+        :param forbidden: Time slots that must stay free.
+        :param constraints: Hard constraints every schedule must satisfy.
+        :param travel: Walking times between buildings, None to ignore them.
+        :param quality_order: Try the best options of every course first instead of keeping AllStrategy order.
+        """
+        self._selected = selected
+        self.constraints = constraints if constraints and not constraints.is_empty() else None
+        self.table = CompatibilityTable(selected, forbidden, self.constraints, travel)
+        self.build_time = self.table.build_time  # Seconds spent building the table
+        self.search_time = 0.0  # Seconds spent searching, excluding building schedules and the consumer
+        self.nodes_visited = 0  # Number of options placed during the search
+        self.limit_reached = False  # Whether the last search stopped at its node limit
+        self.deadline_reached = False  # Whether the last search stopped at its deadline
+        # Options of every course from the best one, None to try them in index order
+        self.option_order: Optional[List[List[int]]] = None
+        if quality_order:
+            self.option_order = [sorted(range(len(options)), key=lambda option: self._option_quality(course, option))
+                                 for course, options in enumerate(self.table.options.options)]
+
+    def _option_quality(self, course: int, option: int) -> Tuple[int, int]:
+        """
+        Sort key of an option, best first: fewest active days, then latest first class.
+        """
+        slots = self.table.options.options[course][option].slots
+        first_start = min((slot.start_time.hour * 60 + slot.start_time.minute for slot in slots), default=0)
+        return popcount(self.table.day_masks[course][option]), -first_start
+
+    def generate(self) -> Iterator[Schedule]:
+        """
+        Lazily generate all valid, conflict-free schedules by intersecting compatibility bitsets.
+        """
+        for vector in self.iter_option_vectors():
+            yield self.table.build_schedule(vector)
+
+    def iter_option_vectors(self, node_limit: Optional[int] = None, deadline: Optional[float] = None,
+                            resume_after: Optional[Sequence[int]] = None,
+                            tick: Optional[float] = None) -> Iterator[Optional[Tuple[int, ...]]]:
+        """
+        Lazily generate the option vector (option index per course) of every valid schedule.
+        :param node_limit: Stop after placing this many options and set limit_reached, None for no limit.
+        :param deadline: time.perf_counter() value to stop at and set deadline_reached, None for no deadline.
+                         Checked every DEADLINE_CHECK_MASK + 1 placed options.
+        :param resume_after: Option vector yielded by an earlier search of the same courses (see SearchCheckpoint);
+                             the search restarts right after it, None to start from the beginning.
+        :param tick: Yield None once this many seconds pass without a schedule, so that the consumer of a long
+                     search keeps control (see QualityBuffer.reorder), None for no ticks. Checked like the deadline.
+        :raises ValueError: If resume_after is not a schedule of these courses.
+        """
+        self.limit_reached = False
+        self.deadline_reached = False
+        count = len(self._selected)
+        if count == 0 or not all(self.table.domains):
+            return
+        table = self.table
+        compatible = table.compatible
+        constraints = self.constraints
+        day_limit = constraints.day_limit() if constraints else None
+        max_gap = constraints.max_gap_minutes if constraints else None
+        check_complete = constraints is not None and constraints.couples_courses()
+        # fillable[d]: cells some usable option of courses d..count-1 could still take
+        fillable = [0] * (count + 1)
+        if max_gap is not None:
+            for course in range(count - 1, -1, -1):
+                fillable[course] = fillable[course + 1] | table.domain_union(course)
+        # days[d] / cells[d]: day mask and cell mask of the choices of courses 0..d-1
+        days = [0] * (count + 1)
+        cells = [0] * (count + 1)
+        # live[d][j]: options of course j still compatible with the choices of courses 0..d-1
+        live = [list(table.domains)] + [None] * count
+        # remaining[d]: options of course d not tried yet under the current choices
+        remaining = [0] * count
+        remaining[0] = live[0][0]
+        chosen = [0] * count
+        depth = 0
+        # With quality_order, position[d]: next entry of option_order[d] to look at
+        order = self.option_order
+        position = [0] * count
+        if resume_after is not None:
+            depth = self._restore(resume_after, live, remaining, position, chosen, days, cells, day_limit)
+
+        started = time.perf_counter()
+        next_tick = started + (tick or 0.0)
+        while depth >= 0:
+            bits = remaining[depth]
+            if not bits:
+                depth -= 1
+                continue
+            if order is None:
+                low = bits & -bits
+                remaining[depth] = bits ^ low
+                option = low.bit_length() - 1
+            else:
+                course_order = order[depth]
+                at = position[depth]
+                while not bits >> course_order[at] & 1:
+                    at += 1
+                option = course_order[at]
+                position[depth] = at + 1
+                remaining[depth] = bits & ~(1 << option)
+
+            placed_days = days[depth]
+            if day_limit is not None:
+                placed_days |= table.day_masks[depth][option]
+                if popcount(placed_days) > day_limit:
+                    continue
+            placed_cells = cells[depth]
+            if max_gap is not None:
+                placed_cells |= table.masks[depth][option]
+                if table.gap_lower_bound(placed_cells, fillable[depth + 1]) > max_gap:
+                    continue
+            chosen[depth] = option
+            self.nodes_visited += 1
+            if node_limit is not None:
+                node_limit -= 1
+                if node_limit < 0:
+                    self.limit_reached = True
+                    break
+            if (deadline is not None or tick is not None) and not self.nodes_visited & DEADLINE_CHECK_MASK:
+                now = time.perf_counter()
+                if deadline is not None and now > deadline:
+                    self.deadline_reached = True
+                    break
+                if tick is not None and now >= next_tick:
+                    self.search_time += now - started
+                    yield None
+                    started = time.perf_counter()
+                    next_tick = started + tick
+
+            if depth == count - 1:
+                if check_complete and not constraints.is_satisfied_by_slots(table.option_slots(chosen)):
+                    continue
+                self.search_time += time.perf_counter() - started
+                yield tuple(chosen)
+                started = time.perf_counter()
+                next_tick = started + (tick or 0.0)
+                continue
+
+            # Forward checking: narrow every later course, give up on the option if one runs empty
+            row = compatible[depth][option]
+            current = live[depth]
+            narrowed = current.copy()
+            days_full = day_limit is not None and popcount(placed_days) == day_limit
+            for other in range(depth + 1, count):
+                narrowed[other] = current[other] & row[other]
+                if days_full:
+                    narrowed[other] &= table.options_within_days(other, placed_days)
+                if not narrowed[other]:
+                    break
+            else:
+                depth += 1
+                live[depth] = narrowed
+                remaining[depth] = narrowed[depth]
+                position[depth] = 0
+                days[depth] = placed_days
+                cells[depth] = placed_cells
+        self.search_time += time.perf_counter() - started
+
+    def _restore(self, resume_after: Sequence[int], live: List[Optional[List[int]]], remaining: List[int],
+                 position: List[int], chosen: List[int], days: List[int], cells: List[int],
+                 day_limit: Optional[int]) -> int:
+        """
+        Rebuilds the search stack along the path of a yielded option vector, every level left with the
+        options it has not tried yet, as the search loop would leave it after yielding the vector.
+        :return: The depth to continue from (the last course).
+        """
+        count = len(self._selected)
+        if len(resume_after) != count:
+            raise ValueError(f"Cannot resume {count} courses from a checkpoint of {len(resume_after)}")
+        table = self.table
+        for depth, option in enumerate(resume_after):
+            bits = live[depth][depth]
+            if not bits >> option & 1:
+                raise ValueError("The checkpoint does not match the selected courses")
+            if self.option_order is None:
+                remaining[depth] = bits & ~((2 << option) - 1)
+            else:
+                tried = self.option_order[depth][:self.option_order[depth].index(option) + 1]
+                position[depth] = len(tried)
+                remaining[depth] = bits & ~sum(1 << tried_option for tried_option in tried)
+            chosen[depth] = option
+            if depth == count - 1:
+                break
+            placed_days = days[depth] | table.day_masks[depth][option]
+            days_full = day_limit is not None and popcount(placed_days) == day_limit
+            narrowed = live[depth].copy()
+            for other in range(depth + 1, count):
+                narrowed[other] &= table.compatible[depth][option][other]
+                if days_full:
+                    narrowed[other] &= table.options_within_days(other, placed_days)
+            live[depth + 1] = narrowed
+            days[depth + 1] = placed_days
+            cells[depth + 1] = cells[depth] | table.masks[depth][option]
+        return count - 1
+
+    def count_schedules(self, node_limit: Optional[int] = None) -> Optional[int]:
+        """
+        Counts the valid schedules without building them: on the second to last course,
+        the options left for the last course are counted instead of visited.
+        Constraints linking several courses need every schedule checked, so they are enumerated instead.
+        :param node_limit: Give up after placing this many options, None for no limit.
+        :return: The number of schedules, or None if the node limit was reached.
+        """
+        if self.constraints is not None and self.constraints.couples_courses():
+            total = sum(1 for _ in self.iter_option_vectors(node_limit))
+            return None if self.limit_reached else total
+        count = len(self._selected)
+        domains = self.table.domains
+        if count == 0 or not all(domains):
+            return 0
+        if count == 1:
+            return popcount(domains[0])
+        compatible = self.table.compatible
+        live = [list(domains)] + [None] * count
+        remaining = [0] * count
+        remaining[0] = domains[0]
+        depth = 0
+        nodes = 0
+        total = 0
+        while depth >= 0:
+            bits = remaining[depth]
+            if not bits:
+                depth -= 1
+                continue
+            low = bits & -bits
+            remaining[depth] = bits ^ low
+            option = low.bit_length() - 1
+            nodes += 1
+            if node_limit is not None and nodes > node_limit:
+                return None
+
+            row = compatible[depth][option]
+            current = live[depth]
+            narrowed = current.copy()
+            for other in range(depth + 1, count):
+                narrowed[other] = current[other] & row[other]
+                if not narrowed[other]:
+                    break
+            else:
+                if depth == count - 2:
+                    total += popcount(narrowed[count - 1])
+                else:
+                    depth += 1
+                    live[depth] = narrowed
+                    remaining[depth] = narrowed[depth]
+        return total
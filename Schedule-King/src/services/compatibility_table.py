@@ -0,0 +1,312 @@
+import time
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from src.models.course import Course
+from src.models.lecture_group import LectureGroup
+from src.models.schedule import Schedule
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.option_table import OptionTable, SKIPPED_OPTION
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+from .MatrixConflicChecker import MatrixConflictChecker, DAYS, SLOTS_PER_DAY
+
+DAY_ROW = (1 << SLOTS_PER_DAY) - 1
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """
+    Yields the positions of the set bits of a bitset, lowest first.
+    """
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def popcount(bits: int) -> int:
+    """
+    Returns the number of set bits of a bitset.
+    """
+    return bin(bits).count("1")
+
+
+def _row_tables() -> Tuple[List[int], List[int]]:
+    """
+    Precomputes, for every 12-cell day row, the cells from its first to its last set cell (span)
+    and the length of its longest run of set cells.
+    """
+    spans, runs = [0] * (DAY_ROW + 1), [0] * (DAY_ROW + 1)
+    for row in range(1, DAY_ROW + 1):
+        first = (row & -row).bit_length() - 1
+        spans[row] = ((1 << row.bit_length()) - 1) & ~((1 << first) - 1)
+        run = longest = 0
+        for cell in range(SLOTS_PER_DAY):
+            run = run + 1 if row >> cell & 1 else 0
+            longest = max(longest, run)
+        runs[row] = longest
+    return spans, runs
+
+ROW_SPANS, ROW_LONGEST_RUNS = _row_tables()
+
+
+class CompatibilityTable:
+    """
+    Precomputed pairwise compatibility of the options of the selected courses.
+    Every option (lecture/tirgul/maabada combination, OptionTable order) gets the bitmask of the
+    matrix cells it occupies. From these the table stores, for every option of course i and every
+    later course j, a bitset of the options of j that do not overlap it. A search then narrows the
+    candidates of all remaining courses with one AND per course instead of checking slots one by one.
+    Options that conflict with themselves, with a forbidden slot or with a constraint that a single
+    option can violate (earliest start, latest end, free windows) are left out of the domains.
+    With travel times, two options are also incompatible when a break between their classes is shorter
+    than the walk between the buildings, so the search pays nothing for it.
+    """
+    def __init__(self, courses: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                 constraints: Optional[ScheduleConstraints] = None, travel: Optional[TravelTimes] = None):
+        """
+        Builds the table.
+        :param courses: The selected courses, in search order.
+        :param forbidden: Time slots no option may use.
+        :param constraints: Hard constraints, only the per-option ones are applied here.
+        :param travel: Walking times between buildings, None to ignore them.
+        """
+        start = time.perf_counter()
+        self.courses = courses
+        self.options = OptionTable(courses)
+        self.constraints = constraints
+        self.forbidden_mask = 0
+        for slot in forbidden or []:
+            self.forbidden_mask |= MatrixConflictChecker.slot_mask(slot)
+
+        # Cell mask and day mask of every option, and the bitset of usable options per course
+        self.masks: List[List[int]] = []
+        self.day_masks: List[List[int]] = []
+        self.domains: List[int] = []
+        # True if every slot starts and ends on a whole hour, so cell masks measure gaps exactly
+        self.aligned = True
+        for course_options in self.options.options:
+            masks, day_masks = [], []
+            domain = 0
+            for option_index, option in enumerate(course_options):
+                slots = option.slots
+                mask = self.option_mask(slots)
+                masks.append(mask)
+                day_mask = 0
+                for slot in slots:
+                    day_mask |= 1 << (int(slot.day) - 1)
+                    self.aligned = self.aligned and slot.start_time.minute == 0 and slot.end_time.minute == 0
+                day_masks.append(day_mask)
+                if mask is None or mask & self.forbidden_mask:
+                    continue
+                if constraints and not all(constraints.allows_slot(slot) for slot in slots):
+                    continue
+                if travel and not travel.allows_slots(slots):
+                    continue
+                domain |= 1 << option_index
+            self.masks.append(masks)
+            self.day_masks.append(day_masks)
+            self.domains.append(domain)
+        self._within_days: Dict[Tuple[int, int], int] = {}
+
+        # Options of every course using each cell, used to build the compatibility rows
+        occupants: List[Dict[int, int]] = []
+        for course_index, masks in enumerate(self.masks):
+            cells: Dict[int, int] = {}
+            for option_index in iter_bits(self.domains[course_index]):
+                for cell in iter_bits(masks[option_index]):
+                    cells[cell] = cells.get(cell, 0) | (1 << option_index)
+            occupants.append(cells)
+
+        # compatible[i][a][j]: options of course j (j > i) that fit next to option a of course i
+        self.compatible: List[List[Optional[Tuple[int, ...]]]] = []
+        for course_index, masks in enumerate(self.masks):
+            rows: List[Optional[Tuple[int, ...]]] = [None] * len(masks)
+            for option_index in iter_bits(self.domains[course_index]):
+                cells = list(iter_bits(masks[option_index]))
+                row = [0] * len(courses)
+                for other in range(course_index + 1, len(courses)):
+                    blocked = 0
+                    for cell in cells:
+                        blocked |= occupants[other].get(cell, 0)
+                    row[other] = self.domains[other] & ~blocked
+                rows[option_index] = tuple(row)
+            self.compatible.append(rows)
+
+        # Course pairs with options kept apart by travel times only, they depend on each other
+        self.travel_links: Set[Tuple[int, int]] = set()
+        self.travel_time = 0.0  # Seconds spent applying the travel times
+        if travel is not None and travel.max_minutes > 0:
+            travel_start = time.perf_counter()
+            self._apply_travel_times(travel)
+            self.travel_time = time.perf_counter() - travel_start
+
+        self._groups: Dict[Tuple[int, int], LectureGroup] = {}
+        self.build_time = time.perf_counter() - start
+
+    def _slot_boundaries(self, course_index: int, edge: str) -> Dict[str, Tuple[List[int], List[Tuple[int, str, int]]]]:
+        """
+        Groups the slot starts (edge "start_time") or ends (edge "end_time") of the usable options of a course.
+        :return: Per day, the sorted minutes and the matching (minute, building, options) entries.
+        """
+        grouped: Dict[Tuple[str, int, str], int] = {}
+        for option_index in iter_bits(self.domains[course_index]):
+            for slot in self.options.options[course_index][option_index].slots:
+                key = (slot.day, Schedule.time_to_minutes(getattr(slot, edge)), slot.building)
+                grouped[key] = grouped.get(key, 0) | (1 << option_index)
+        by_day: Dict[str, Tuple[List[int], List[Tuple[int, str, int]]]] = {}
+        for (day, minute, building), options in sorted(grouped.items()):
+            minutes, entries = by_day.setdefault(day, ([], []))
+            minutes.append(minute)
+            entries.append((minute, building, options))
+        return by_day
+
+    def _apply_travel_times(self, travel: TravelTimes):
+        """
+        Removes from the compatibility rows every pair of options with a break too short to change buildings.
+        Only classes starting or ending within the longest walk of a slot are looked at (binary search).
+        """
+        reach = travel.max_minutes
+        starts = [self._slot_boundaries(course, "start_time") for course in range(len(self.courses))]
+        ends = [self._slot_boundaries(course, "end_time") for course in range(len(self.courses))]
+        for course_index, rows in enumerate(self.compatible):
+            for option_index in iter_bits(self.domains[course_index]):
+                row = list(rows[option_index])
+                slots = self.options.options[course_index][option_index].slots
+                for other in range(course_index + 1, len(self.courses)):
+                    blocked = 0
+                    for slot in slots:
+                        slot_start = Schedule.time_to_minutes(slot.start_time)
+                        slot_end = Schedule.time_to_minutes(slot.end_time)
+                        # Classes of the other course starting shortly after this one ends
+                        minutes, entries = starts[other].get(slot.day, ((), ()))
+                        position = bisect_left(minutes, slot_end)
+                        while position < len(minutes) and minutes[position] < slot_end + reach:
+                            minute, building, options = entries[position]
+                            if minute - slot_end < travel.minutes(slot.building, building):
+                                blocked |= options
+                            position += 1
+                        # Classes of the other course ending shortly before this one starts
+                        minutes, entries = ends[other].get(slot.day, ((), ()))
+                        position = bisect_right(minutes, slot_start) - 1
+                        while position >= 0 and minutes[position] > slot_start - reach:
+                            minute, building, options = entries[position]
+                            if slot_start - minute < travel.minutes(building, slot.building):
+                                blocked |= options
+                            position -= 1
+                    if row[other] & blocked:
+                        row[other] &= ~blocked
+                        self.travel_links.add((course_index, other))
+                rows[option_index] = tuple(row)
+
+    @staticmethod
+    def option_mask(slots: List[TimeSlot]) -> Optional[int]:
+        """
+        Returns the cell mask of a list of slots, or None if the slots overlap each other.
+        """
+        mask = 0
+        for slot in slots:
+            slot_mask = MatrixConflictChecker.slot_mask(slot)
+            if mask & slot_mask:
+                return None
+            mask |= slot_mask
+        return mask
+
+    def lecture_group(self, course_index: int, option_index: int) -> LectureGroup:
+        """
+        Returns the LectureGroup of an option, shared by all schedules using that option.
+        """
+        key = (course_index, option_index)
+        group = self._groups.get(key)
+        if group is None:
+            group = self.options.build_lecture_group(course_index, option_index)
+            self._groups[key] = group
+        return group
+
+    def options_within_days(self, course_index: int, days: int) -> int:
+        """
+        Returns the bitset of usable options of a course that only use the given days (a day bitmask).
+        """
+        key = (course_index, days)
+        options = self._within_days.get(key)
+        if options is None:
+            options = 0
+            for option_index in iter_bits(self.domains[course_index]):
+                if not self.day_masks[course_index][option_index] & ~days:
+                    options |= 1 << option_index
+            self._within_days[key] = options
+        return options
+
+    def domain_union(self, course_index: int) -> int:
+        """
+        Returns the cells used by at least one usable option of a course.
+        """
+        union = 0
+        for option_index in iter_bits(self.domains[course_index]):
+            union |= self.masks[course_index][option_index]
+        return union
+
+    def gap_lower_bound(self, placed: int, fillable: int) -> int:
+        """
+        Returns a lower bound, in minutes, on the longest gap of any schedule extending a partial one.
+        Inside the span of the placed classes of a day, cells that are neither placed nor usable by a
+        remaining course stay free whatever is chosen later, so their longest run is a gap to come.
+        Cells only see whole hours, so when some slot starts or ends mid-hour the bound is 0.
+        :param placed: Cells of the placed options.
+        :param fillable: Cells the remaining courses could still use.
+        """
+        if not self.aligned:
+            return 0
+        longest = 0
+        for day in range(DAYS):
+            row = placed >> (day * SLOTS_PER_DAY) & DAY_ROW
+            if not row:
+                continue
+            free = ROW_SPANS[row] & ~(row | fillable >> (day * SLOTS_PER_DAY)) & DAY_ROW
+            longest = max(longest, ROW_LONGEST_RUNS[free])
+        return longest * 60
+
+    def option_slots(self, vector: Sequence[int]) -> List[TimeSlot]:
+        """
+        Returns all time slots of an option vector.
+        """
+        return [slot for course, option in enumerate(vector) if option != SKIPPED_OPTION
+                for slot in self.options.options[course][option].slots]
+
+    def build_schedule(self, vector: Sequence[int]) -> Schedule:
+        """
+        Builds the Schedule of an option vector, with its metrics.
+        :param vector: Option index per course, in table order, SKIPPED_OPTION for courses left out.
+        :return: The Schedule.
+        """
+        schedule = Schedule(
+            [self.lecture_group(course, option) for course, option in enumerate(vector) if option != SKIPPED_OPTION],
+            option_indices=tuple(vector)
+        )
+        schedule.generate_metrics()
+        return schedule
+
+    def conflict_components(self) -> List[List[int]]:
+        """
+        Splits the courses into groups that never conflict with each other: two courses are linked
+        when some usable options of them overlap, and every connected group is one component.
+        :return: The course indices of every component, components ordered by their first course.
+        """
+        unions = [self.domain_union(course_index) for course_index in range(len(self.courses))]
+
+        parents = list(range(len(self.courses)))
+        def find(course: int) -> int:
+            while parents[course] != course:
+                parents[course] = parents[parents[course]]
+                course = parents[course]
+            return course
+
+        for first in range(len(self.courses)):
+            for second in range(first + 1, len(self.courses)):
+                # Overlapping unions mean some option of one overlaps some option of the other
+                if unions[first] & unions[second] or (first, second) in self.travel_links:
+                    parents[find(second)] = find(first)
+
+        components: Dict[int, List[int]] = {}
+        for course in range(len(self.courses)):
+            components.setdefault(find(course), []).append(course)
+        return sorted(components.values())
@@ -0,0 +1,268 @@
+import time
+from itertools import islice, product
+from math import prod
+from typing import Iterator, List, Optional, Sequence, Tuple
+from src.interfaces.schedule_strategy_interface import IScheduleStrategy
+from src.models.course import Course
+from src.models.schedule import Schedule
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+from .backjump_strategy import BackjumpStrategy
+from .compatibility_strategy import CompatibilityStrategy, DEADLINE_CHECK_MASK
+from .compatibility_table import CompatibilityTable, popcount
+
+class ProductView(Sequence):
+    """
+    Lazy, read-only sequence of the schedules of independent course components.
+    Every valid schedule is one solution per component, so the view only stores the solutions of each
+    component (as option vectors) and decodes a schedule index as a mixed-radix number:
+    the first component is the most significant digit, the last one changes fastest.
+    len() is a stored product and indexing costs one divmod per component.
+    """
+    def __init__(self, table: CompatibilityTable, components: List[List[int]],
+                 solutions: List[List[Tuple[int, ...]]]):
+        """
+        :param table: The compatibility table of all selected courses, used to build schedules.
+        :param components: Course indices of every component.
+        :param solutions: Option vectors of every component, over the courses of the component.
+        """
+        self.table = table
+        self.components = components
+        self.solutions = solutions
+        self._count = prod(len(component_solutions) for component_solutions in solutions)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def option_vector(self, index: int) -> Tuple[int, ...]:
+        """
+        Returns the option vector (option index per selected course) of the schedule at the given index.
+        """
+        if index < 0:
+            index += self._count
+        if not (0 <= index < self._count):
+            raise IndexError(f"index={index} is out of bounds for {self._count} schedules")
+        vector = [0] * len(self.table.courses)
+        for courses, component_solutions in zip(reversed(self.components), reversed(self.solutions)):
+            index, digit = divmod(index, len(component_solutions))
+            for course, option in zip(courses, component_solutions[digit]):
+                vector[course] = option
+        return tuple(vector)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        return self.table.build_schedule(self.option_vector(index))
+
+
+class FactorizedStrategy(IScheduleStrategy):
+    """
+    Solves every connected component of the course conflict graph on its own.
+    Courses whose options can never overlap (e.g. morning-only and evening-only courses) are independent,
+    so the schedules are the Cartesian product of the solutions of each component. Only the component
+    solutions are searched; counting is a product and every schedule is addressable through a ProductView.
+    With a single component this is the same search, in the same order, as CompatibilityStrategy.
+    Constraints on active days or gaps link courses that never overlap, so they keep all courses in one component.
+    With quality_order, every component is searched best options first (see CompatibilityStrategy) and the
+    solutions of the other components are combined from the fewest active days up.
+    With backjump, every component is searched by BackjumpStrategy, which finds the same solutions in the
+    same order while skipping dead ends faster.
+    """
+    def __init__(self, selected: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                 constraints: Optional[ScheduleConstraints] = None, travel: Optional[TravelTimes] = None,
+                 quality_order: bool = False, backjump: bool = False):
+        """
+        Builds the compatibility table and the conflict components of the selected courses.
+        :param selected: List of courses to be included in the strategy.
+        :param forbidden: Time slots that must stay free.
+        :param constraints: Hard constraints every schedule must satisfy.
+        :param travel: Walking times between buildings, None to ignore them.
+        :param quality_order: Stream good schedules first instead of keeping ProductView order (generate only).
+        :param backjump: Search the components with conflict-directed backjumping (see BackjumpStrategy).
+        """
+        self._selected = selected
+        self._forbidden = forbidden
+        self._constraints = constraints
+        self._travel = travel
+        self.quality_order = quality_order
+        self.backjump = backjump
+        self.table = CompatibilityTable(selected, forbidden, constraints, travel)
+        if constraints is not None and constraints.couples_courses():
+            self.components = [list(range(len(selected)))] if selected else []
+        else:
+            self.components = self.table.conflict_components()
+        self._view: Optional[ProductView] = None
+        self.nodes_visited = 0  # Number of options placed by the component searches of generate
+        self.limit_reached = False  # Whether the last generation stopped at its node limit
+        self.deadline_reached = False  # Whether the last generation stopped at its deadline
+
+    def _component_strategy(self, courses: List[int], quality_order: bool = False) -> CompatibilityStrategy:
+        strategy_class = BackjumpStrategy if self.backjump else CompatibilityStrategy
+        return strategy_class([self._selected[course] for course in courses], self._forbidden,
+                              self._constraints, self._travel, quality_order)
+
+    def _days_used(self, courses: List[int], solution: Tuple[int, ...]) -> int:
+        """
+        Returns the number of active days of a component solution.
+        """
+        days = 0
+        for course, option in zip(courses, solution):
+            days |= self.table.day_masks[course][option]
+        return popcount(days)
+
+    def count(self, node_limit: Optional[int] = None) -> Optional[int]:
+        """
+        Counts the schedules as the product of the component counts, without building any schedule.
+        :param node_limit: Give up after placing this many options in a component, None for no limit.
+        :return: The number of schedules, or None if the node limit was reached.
+        """
+        if not self._selected:
+            return 0
+        if self._view is not None:
+            return len(self._view)
+        total = 1
+        for courses in self.components:
+            component_count = self._component_strategy(courses).count_schedules(node_limit)
+            if component_count is None:
+                return None
+            total *= component_count
+            if total == 0:
+                return 0
+        return total
+
+    def view(self) -> ProductView:
+        """
+        Solves every component (once) and returns the lazy product of their solutions.
+        """
+        if self._view is None:
+            solutions = []
+            for courses in self.components:
+                component_solutions = list(self._component_strategy(courses).iter_option_vectors())
+                solutions.append(component_solutions)
+                if not component_solutions:
+                    break
+            if len(solutions) < len(self.components):
+                solutions = [[] for _ in self.components]
+            self._view = ProductView(self.table, self.components, solutions)
+        return self._view
+
+    def generate(self, node_limit: Optional[int] = None, deadline: Optional[float] = None,
+                 resume_after: Optional[Sequence[int]] = None,
+                 tick: Optional[float] = None) -> Iterator[Optional[Schedule]]:
+        """
+        Lazily generate all valid, conflict-free schedules in ProductView order (unless quality_order is set).
+        The first component is streamed while it is searched, only the other components are solved upfront,
+        so the first schedules do not wait for the whole search.
+        :param node_limit: Stop after placing this many options in all components, None for no limit.
+        :param deadline: time.perf_counter() value to stop at, None for no deadline.
+        :param resume_after: Option vector generated by an earlier run, to continue right after it.
+        :param tick: Yield None once this many seconds pass without a schedule, None for no ticks.
+        """
+        for vector in self.iter_option_vectors(node_limit, deadline, resume_after, tick):
+            yield None if vector is None else self.table.build_schedule(vector)
+
+    def iter_option_vectors(self, node_limit: Optional[int] = None, deadline: Optional[float] = None,
+                            resume_after: Optional[Sequence[int]] = None,
+                            tick: Optional[float] = None) -> Iterator[Optional[Tuple[int, ...]]]:
+        """
+        Lazily generate the option vector (option index per selected course) of every schedule, in generate order.
+        Both bounds are shared by the component searches; reaching one sets limit_reached or deadline_reached.
+        :param node_limit: Stop after placing this many options in all components, None for no limit.
+        :param deadline: time.perf_counter() value to stop at, None for no deadline.
+        :param resume_after: Option vector generated by an earlier run with the same quality_order, to continue
+                             right after it: the combinations of its first-component solution that are left, then
+                             the search of the first component from that solution on.
+        :param tick: Yield None once this many seconds pass without a schedule, also while the other components
+                     are solved upfront (see CompatibilityStrategy.iter_option_vectors), None for no ticks.
+        :raises ValueError: If resume_after is not a schedule of these courses.
+        """
+        self.nodes_visited = 0
+        self.limit_reached = False
+        self.deadline_reached = False
+        if not self._selected:
+            return
+        if self._view is not None and resume_after is None:
+            for index in range(len(self._view)):
+                yield self._view.option_vector(index)
+            return
+        first, others = self.components[0], self.components[1:]
+        other_solutions = []
+        for courses in others:
+            strategy = self._component_strategy(courses, self.quality_order)
+            solutions = []
+            for solution in strategy.iter_option_vectors(self._nodes_left(node_limit), deadline, tick=tick):
+                if solution is None:
+                    yield None
+                else:
+                    solutions.append(solution)
+            other_solutions.append(solutions)
+            if self._stopped(strategy) or not solutions:
+                return
+        if self.quality_order:
+            for courses, solutions in zip(others, other_solutions):
+                solutions.sort(key=lambda solution: self._days_used(courses, solution))
+        vector = [0] * len(self._selected)
+        first_resume = None
+        if resume_after is not None:
+            first_resume = [resume_after[course] for course in first]
+            skipped = 0
+            for courses, solutions in zip(others, other_solutions):
+                solution = tuple(resume_after[course] for course in courses)
+                if solution not in solutions:
+                    raise ValueError("The checkpoint does not match the selected courses")
+                skipped = skipped * len(solutions) + solutions.index(solution)
+            for course, option in zip(first, first_resume):
+                vector[course] = option
+            yield from self._combine(vector, others, islice(product(*other_solutions), skipped + 1, None),
+                                     node_limit, deadline)
+            if self.limit_reached or self.deadline_reached:
+                return
+        strategy = self._component_strategy(first, self.quality_order)
+        solved_nodes = self.nodes_visited
+        for first_solution in strategy.iter_option_vectors(self._nodes_left(node_limit), deadline, first_resume,
+                                                           tick):
+            self.nodes_visited = solved_nodes + strategy.nodes_visited
+            if first_solution is None:
+                yield None
+                continue
+            for course, option in zip(first, first_solution):
+                vector[course] = option
+            yield from self._combine(vector, others, product(*other_solutions), node_limit, deadline)
+            if self.limit_reached or self.deadline_reached:
+                return
+        self.nodes_visited = solved_nodes
+        self._stopped(strategy)
+
+    def _combine(self, vector: List[int], others: List[List[int]],
+                 combinations: Iterator[Tuple[Tuple[int, ...], ...]], node_limit: Optional[int],
+                 deadline: Optional[float]) -> Iterator[Tuple[int, ...]]:
+        """
+        Yields the vector completed with every combination of solutions of the other components.
+        The product of the other components can be far larger than their searches, so both bounds are
+        checked here too: every DEADLINE_CHECK_MASK + 1 combinations, the clock, and the nodes placed so far.
+        """
+        for count, combination in enumerate(combinations):
+            if not count & DEADLINE_CHECK_MASK:
+                if node_limit is not None and self.nodes_visited >= node_limit:
+                    self.limit_reached = True
+                    return
+                if deadline is not None and time.perf_counter() > deadline:
+                    self.deadline_reached = True
+                    return
+            for courses, solution in zip(others, combination):
+                for course, option in zip(courses, solution):
+                    vector[course] = option
+            yield tuple(vector)
+
+    def _nodes_left(self, node_limit: Optional[int]) -> Optional[int]:
+        return None if node_limit is None else node_limit - self.nodes_visited
+
+    def _stopped(self, strategy: CompatibilityStrategy) -> bool:
+        """
+        Adds up the nodes of a finished component search. Returns True if it stopped at a bound.
+        """
+        self.nodes_visited += strategy.nodes_visited
+        self.limit_reached = strategy.limit_reached
+        self.deadline_reached = strategy.deadline_reached
+        return self.limit_reached or self.deadline_reached
@@ -0,0 +1,134 @@
+from itertools import islice
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import numpy as np
+from src.models.course import Course
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.travel_times import TravelTimes
+from .compatibility_strategy import CompatibilityStrategy
+from .compatibility_table import CompatibilityTable
+from .MatrixConflicChecker import DAYS, SLOTS_PER_DAY
+
+# Schedules kept per conflict component; a larger component is counted from its first ones (a lower bound)
+LEAF_LIMIT = 100_000
+# Forbidden-cell patterns remembered per component
+CACHE_SIZE = 256
+
+WORD_BITS = 64
+WORD_MASK = (1 << WORD_BITS) - 1
+CELL_COUNT = DAYS * SLOTS_PER_DAY
+
+
+class FeasibilityCount(NamedTuple):
+    schedules: int  # Valid schedules left with the forbidden cells blocked (at least this many if not exact)
+    exact: bool  # Whether every schedule was counted
+    impacts: Dict[Tuple[int, int], int]  # Free cell (hour index, day index) -> schedules blocking it would eliminate
+
+
+class _Component:
+    """
+    The schedules of one conflict component as occupancy masks, split in two 64-bit words.
+    """
+    def __init__(self, low: np.ndarray, high: np.ndarray, complete: bool):
+        self.low = low
+        self.high = high
+        self.complete = complete
+        self.cells = int(np.bitwise_or.reduce(low)) | int(np.bitwise_or.reduce(high)) << WORD_BITS if len(low) else 0
+        self.cache: Dict[int, Tuple[int, np.ndarray]] = {}
+
+    def survivors(self, forbidden_mask: int) -> Tuple[int, np.ndarray]:
+        """
+        Returns the number of schedules using no forbidden cell and how many of them use every cell.
+        Only forbidden cells the component can use matter, so the result is cached on those.
+        """
+        key = forbidden_mask & self.cells
+        if key not in self.cache:
+            if len(self.cache) >= CACHE_SIZE:
+                self.cache.clear()
+            keep = ((self.low & np.uint64(key & WORD_MASK)) == 0) & ((self.high & np.uint64(key >> WORD_BITS)) == 0)
+            words = np.stack([self.low[keep], self.high[keep]], axis=1).astype("<u8", copy=False)
+            bits = np.unpackbits(words.view(np.uint8), axis=1, bitorder="little")
+            self.cache[key] = (int(keep.sum()), bits.sum(axis=0, dtype=np.int64)[:CELL_COUNT])
+        return self.cache[key]
+
+
+def leaf_masks(table: CompatibilityTable, courses: List[int], vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the occupancy masks of schedules, split in two 64-bit words.
+    :param table: The compatibility table of the selected courses.
+    :param courses: Indices of the courses the schedules cover.
+    :param vectors: One row per schedule, with the option of every course of courses.
+    """
+    low = np.zeros(len(vectors), dtype=np.uint64)
+    high = np.zeros(len(vectors), dtype=np.uint64)
+    for position, course in enumerate(courses):
+        masks = [mask or 0 for mask in table.masks[course]]
+        low |= np.array([mask & WORD_MASK for mask in masks], dtype=np.uint64)[vectors[:, position]]
+        high |= np.array([mask >> WORD_BITS for mask in masks], dtype=np.uint64)[vectors[:, position]]
+    return low, high
+
+
+class FeasibilityCounter:
+    """
+    Counts the valid schedules of a selection live while forbidden cells are painted, in milliseconds.
+    The schedules of every conflict component are enumerated once, without forbidden cells, and kept as the
+    occupancy masks of the matrix cells they use (MatrixConflictChecker layout). Blocking cells removes
+    exactly the schedules whose mask meets them, so a count is a vectorised filter of the masks and the total
+    is the product over the components. The same pass counts, per cell, the surviving schedules that use it:
+    what blocking that cell as well would eliminate. Components are cached on the forbidden cells they can use,
+    so painting over one component leaves the others untouched.
+    """
+    def __init__(self, selected: List[Course], constraints: Optional[ScheduleConstraints] = None,
+                 travel: Optional[TravelTimes] = None, leaf_limit: int = LEAF_LIMIT):
+        """
+        Enumerates the schedules of every component.
+        :param selected: The selected courses.
+        :param constraints: Hard constraints every schedule must satisfy.
+        :param travel: Walking times between buildings, None to ignore them.
+        :param leaf_limit: Schedules kept per component, the counts of a larger one are lower bounds.
+        """
+        self._selected = selected
+        table = CompatibilityTable(selected, None, constraints, travel)
+        if constraints is not None and constraints.couples_courses():
+            components = [list(range(len(selected)))] if selected else []
+        else:
+            components = table.conflict_components()
+        self.components: List[_Component] = []
+        for courses in components:
+            strategy = CompatibilityStrategy([selected[course] for course in courses], None, constraints, travel)
+            vectors = list(islice(strategy.iter_option_vectors(), leaf_limit + 1))
+            complete = len(vectors) <= leaf_limit
+            vectors = np.array(vectors[:leaf_limit], dtype=np.int64).reshape(-1, len(courses))
+            low, high = leaf_masks(table, courses, vectors)
+            self.components.append(_Component(low, high, complete))
+
+    @staticmethod
+    def cells_mask(cells: Iterable[Tuple[int, int]]) -> int:
+        """
+        Returns the occupancy mask of cells given as (hour index from 8:00, day index from Sunday).
+        """
+        mask = 0
+        for hour, day in cells:
+            mask |= 1 << (day * SLOTS_PER_DAY + hour)
+        return mask
+
+    def count(self, forbidden: Iterable[Tuple[int, int]]) -> FeasibilityCount:
+        """
+        Counts the schedules left with the forbidden cells blocked, and the impact of blocking every free cell.
+        :param forbidden: Blocked cells as (hour index, day index).
+        """
+        if not self._selected:
+            return FeasibilityCount(0, True, {})
+        forbidden_mask = self.cells_mask(forbidden)
+        results = [component.survivors(forbidden_mask) for component in self.components]
+        total = 1
+        for count, _ in results:
+            total *= count
+        # Schedules left after blocking each cell as well: every component loses its schedules using the cell
+        left = np.ones(CELL_COUNT, dtype=object)
+        for count, usage in results:
+            left = left * (count - usage.astype(object))
+        impacts = {}
+        for cell in range(CELL_COUNT):
+            if not forbidden_mask >> cell & 1:
+                impacts[(cell % SLOTS_PER_DAY, cell // SLOTS_PER_DAY)] = total - int(left[cell])
+        return FeasibilityCount(total, all(component.complete for component in self.components), impacts)
@@ -0,0 +1,98 @@
+from typing import List, Optional
+from src.models.course import Course
+from src.models.schedule import Schedule
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+from .compatibility_table import CompatibilityTable, iter_bits, popcount
+
+class FirstScheduleProbe:
+    """
+    Finds one valid, reasonably good schedule in milliseconds, to show before the full enumeration
+    has even started (greedy search).
+    The search places the course with the fewest live options first (fail-first) and tries its options
+    from the fewest new active days up, then on the days most other courses can use. With forward checking
+    as in CompatibilityStrategy it usually reaches a leaf without backtracking. It gives up after
+    node_limit placed options.
+    """
+    def __init__(self, selected: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                 constraints: Optional[ScheduleConstraints] = None, travel: Optional[TravelTimes] = None,
+                 node_limit: int = 2000):
+        """
+        Builds the compatibility table of the selected courses.
+        :param selected: List of courses to be included (any number).
+        :param forbidden: Time slots that must stay free.
+        :param constraints: Hard constraints the schedule must satisfy.
+        :param travel: Walking times between buildings, None to ignore them.
+        :param node_limit: Largest number of options placed before giving up.
+        """
+        self._selected = selected
+        self.constraints = constraints if constraints and not constraints.is_empty() else None
+        self.day_limit = self.constraints.day_limit() if self.constraints else None
+        self.table = CompatibilityTable(selected, forbidden, self.constraints, travel)
+        self.node_limit = node_limit
+        self.nodes_visited = 0  # Number of options placed
+
+    def _compatible(self, course: int, option: int, other: int, live: int) -> int:
+        """
+        Returns the live options of another course that fit next to an option of a course.
+        The table only stores rows towards later courses, earlier ones are checked from their side.
+        """
+        if other > course:
+            return live & self.table.compatible[course][option][other]
+        fitting = 0
+        for other_option in iter_bits(live):
+            if self.table.compatible[other][other_option][course] >> option & 1:
+                fitting |= 1 << other_option
+        return fitting
+
+    def _search(self, live: List[int], chosen: List[Optional[int]], days: int) -> bool:
+        """
+        Places the remaining courses depth first, filling chosen. Returns True once every course has an option.
+        """
+        remaining = [course for course, option in enumerate(chosen) if option is None]
+        if not remaining:
+            return self.constraints is None or self.constraints.is_satisfied_by_slots(self.table.option_slots(chosen))
+        course = min(remaining, key=lambda c: popcount(live[c]))
+        day_masks = self.table.day_masks[course]
+        # Days each other remaining course can still use, to prefer days the others can share
+        other_days = []
+        for other in remaining:
+            if other != course:
+                union = 0
+                for option in iter_bits(live[other]):
+                    union |= self.table.day_masks[other][option]
+                other_days.append(union)
+        options = sorted(iter_bits(live[course]),
+                         key=lambda o: (popcount(day_masks[o] & ~days),
+                                        -sum(1 for union in other_days if union & day_masks[o])))
+        for option in options:
+            new_days = days | day_masks[option]
+            if self.day_limit is not None and popcount(new_days) > self.day_limit:
+                continue
+            if self.nodes_visited >= self.node_limit:
+                return False
+            self.nodes_visited += 1
+            narrowed = list(live)
+            for other in remaining:
+                if other != course:
+                    narrowed[other] = self._compatible(course, option, other, live[other])
+                    if not narrowed[other]:
+                        break
+            else:
+                chosen[course] = option
+                if self._search(narrowed, chosen, new_days):
+                    return True
+                chosen[course] = None
+        return False
+
+    def find(self) -> Optional[Schedule]:
+        """
+        Returns one valid schedule, or None if none was found within the node limit.
+        """
+        if not self._selected or not all(self.table.domains):
+            return None
+        chosen: List[Optional[int]] = [None] * len(self._selected)
+        if not self._search(list(self.table.domains), chosen, 0):
+            return None
+        return self.table.build_schedule(chosen)
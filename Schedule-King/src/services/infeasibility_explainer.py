@@ -0,0 +1,134 @@
+from typing import List, Optional, Tuple
+from src.models.course import Course
+from src.models.infeasibility_core import InfeasibilityCore
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+from .compatibility_strategy import CompatibilityStrategy
+from .compatibility_table import CompatibilityTable, iter_bits
+from .MatrixConflicChecker import MatrixConflictChecker
+from .strategy_selector import MAX_SELECTED_COURSES
+
+# Largest number of courses the feasibility check searches: any selection the interface accepts,
+# every check being bounded by node_limit anyway
+MAX_CHECKED_COURSES = MAX_SELECTED_COURSES
+
+class InfeasibilityExplainer:
+    """
+    Finds a minimal set of courses and forbidden slots that has no valid schedule (deletion-based core
+    extraction). The schedule limits and travel times stay in force throughout.
+
+    1. Seed: the compatibility table of the whole selection already shows the usual culprits, a course
+       left without usable options or a pair of courses whose options never fit together. Either is
+       a core of one or two courses. Otherwise the seed is the whole selection.
+    2. Forbidden slots that block no option of the seed courses are dropped without any check.
+    3. Deletion: an element is removed whenever the rest still has no schedule. Elements are first
+       removed in large chunks, halving the chunk size down to single elements, so irrelevant parts
+       of a large selection go away in a few checks and the single-element pass works on a set
+       close to the core.
+    Every check is a search for one schedule of a small subset, stopped after node_limit nodes; an
+    undecided check counts as feasible, so the reported core is always infeasible.
+    """
+    def __init__(self, courses: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                 constraints: Optional[ScheduleConstraints] = None, travel: Optional[TravelTimes] = None,
+                 node_limit: int = 50_000):
+        """
+        :param courses: The selected courses.
+        :param forbidden: Time slots that must stay free.
+        :param constraints: Hard constraints every schedule must satisfy.
+        :param travel: Walking times between buildings, None to ignore them.
+        :param node_limit: Search nodes per feasibility check.
+        """
+        self.courses = courses
+        self.forbidden = list(forbidden or [])
+        self.constraints = constraints if constraints and not constraints.is_empty() else None
+        self.travel = travel
+        self.node_limit = node_limit
+        self.checks = 0  # Number of feasibility checks run
+
+    def is_feasible(self, courses: List[Course], forbidden: List[TimeSlot], constraints: Optional[ScheduleConstraints],
+                    travel: Optional[TravelTimes]) -> Optional[bool]:
+        """
+        Checks whether some schedule of the courses avoids the forbidden slots.
+        :return: True or False, None if undecided (too many courses or the node limit was reached).
+        """
+        if not courses:
+            return True
+        if len(courses) > MAX_CHECKED_COURSES:
+            return None
+        self.checks += 1
+        strategy = CompatibilityStrategy(courses, forbidden, constraints, travel)
+        if next(strategy.iter_option_vectors(self.node_limit), None) is not None:
+            return True
+        return None if strategy.limit_reached else False
+
+    def _infeasible(self, elements: List[Tuple[str, object]]) -> bool:
+        """
+        Checks that a mix of ("course", Course) and ("slot", TimeSlot) elements surely has no schedule.
+        """
+        courses = [item for kind, item in elements if kind == "course"]
+        forbidden = [item for kind, item in elements if kind == "slot"]
+        return self.is_feasible(courses, forbidden, self.constraints, self.travel) is False
+
+    def _seed(self, table: CompatibilityTable) -> List[int]:
+        """
+        Returns the course indices to start from: one course without options, two courses that never
+        fit together, or all courses.
+        """
+        domains = table.domains
+        for course, domain in enumerate(domains):
+            if not domain:
+                return [course]
+        for first in range(len(domains)):
+            for second in range(first + 1, len(domains)):
+                if not any(table.compatible[first][option][second] for option in iter_bits(domains[first])):
+                    return [first, second]
+        return list(range(len(domains)))
+
+    def _relevant_slots(self, table: CompatibilityTable, course_indices: List[int]) -> List[TimeSlot]:
+        """
+        Returns the forbidden slots that block at least one option of the given courses.
+        """
+        relevant = []
+        for slot in self.forbidden:
+            slot_mask = MatrixConflictChecker.slot_mask(slot)
+            if any(mask is not None and mask & slot_mask
+                   for course in course_indices for mask in table.masks[course]):
+                relevant.append(slot)
+        return relevant
+
+    def _shrink(self, elements: List[Tuple[str, object]]) -> List[Tuple[str, object]]:
+        """
+        Removes elements, in halving chunks, while the rest stays infeasible.
+        """
+        core = list(elements)
+        chunk = max(1, len(core) // 2)
+        while True:
+            position = 0
+            while position < len(core):
+                trial = core[:position] + core[position + chunk:]
+                if self._infeasible(trial):
+                    core = trial
+                else:
+                    position += chunk
+            if chunk == 1:
+                return core
+            chunk //= 2
+
+    def find_core(self) -> Optional[InfeasibilityCore]:
+        """
+        Returns a minimal infeasible core, or None if the selection has a schedule or it cannot be decided.
+        """
+        table = CompatibilityTable(self.courses, self.forbidden, self.constraints, self.travel)
+        seed = self._seed(table)
+        elements = ([("slot", slot) for slot in self._relevant_slots(table, seed)]
+                    + [("course", self.courses[course]) for course in seed])
+        if not self._infeasible(elements):
+            return None
+        core = self._shrink(elements)
+        courses = [item for kind, item in core if kind == "course"]
+        forbidden = [item for kind, item in core if kind == "slot"]
+        # The limits and travel times are part of the explanation only if the core fits without them
+        uses_limits = self.constraints is not None and bool(self.is_feasible(courses, forbidden, None, self.travel))
+        uses_travel = self.travel is not None and bool(self.is_feasible(courses, forbidden, self.constraints, None))
+        return InfeasibilityCore(courses, forbidden, uses_limits, uses_travel)
@@ -0,0 +1,189 @@
+import math
+import random
+import time
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+from src.interfaces.schedule_strategy_interface import IScheduleStrategy
+from src.models.course import Course
+from src.models.schedule import Schedule
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.soft_preferences import SoftPreferences
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+from .compatibility_table import CompatibilityTable, DAY_ROW, ROW_SPANS, iter_bits, popcount
+from .MatrixConflicChecker import DAYS, SLOTS_PER_DAY
+
+class LocalSearchStrategy(IScheduleStrategy):
+    """
+    Anytime optimizer for selections too large to enumerate (simulated annealing).
+    The state is one option per course, conflicts allowed. A move gives one course another option;
+    the cell occupancy counts are updated for the cells of the old and new option only, so the number of
+    overlapping hours and the metrics (active days, gap hours) are kept up to date at the cost of a move.
+    The objective adds a heavy weight per overlapping hour (and per active day over the limit, if any)
+    to the composite metric and the soft-preference penalties.
+
+    Every conflict-free schedule at least as good as the best one so far is yielded as soon as it is found,
+    so the caller sees better and better schedules until the deadline passes or cancel() returns True.
+    Unlike the exhaustive strategies, it does not return every valid schedule.
+    """
+    CONFLICT_WEIGHT = 100  # Per overlapping hour, or active day over the limit
+    DAY_WEIGHT = 3  # Per active day
+    GAP_WEIGHT = 1  # Per free hour between two classes of a day
+    START_TEMPERATURE = 5.0
+    MIN_TEMPERATURE = 0.05
+    COOLING = 0.9995  # Temperature factor per move, reheated to START_TEMPERATURE when cold
+    CHECK_EVERY = 256  # Moves between two deadline / cancel checks
+
+    def __init__(self, selected: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                 constraints: Optional[ScheduleConstraints] = None,
+                 preferences: Optional[SoftPreferences] = None, travel: Optional[TravelTimes] = None,
+                 deadline: float = 5.0, cancel: Optional[Callable[[], bool]] = None,
+                 seed: Optional[int] = None, max_results: int = 1000):
+        """
+        Builds the option cell lists of the selected courses.
+        :param selected: List of courses to be included in the strategy (any number).
+        :param forbidden: Time slots that must stay free.
+        :param constraints: Hard constraints every yielded schedule must satisfy.
+        :param preferences: Soft preferences added to the objective.
+        :param travel: Walking times between buildings, schedules with too short breaks are not yielded.
+        :param deadline: Seconds to search, counted from the first call to next().
+        :param cancel: Called regularly, the search stops when it returns True.
+        :param seed: Seed of the random moves, for reproducible runs.
+        :param max_results: Stop yielding schedules that only tie with the best one after this many results.
+        """
+        self._selected = selected
+        self.table = CompatibilityTable(selected, forbidden, constraints)
+        self.travel = travel
+        self.constraints = constraints if constraints and constraints.couples_courses() else None
+        self.day_limit = constraints.day_limit() if constraints else None
+        self.penalties = (preferences or SoftPreferences()).penalties(self.table.options)
+        self.deadline = deadline
+        self.cancel = cancel or (lambda: False)
+        self.max_results = max_results
+        self._random = random.Random(seed)
+        # Usable options of every course, and the cells of every option
+        self.choices = [list(iter_bits(domain)) for domain in self.table.domains]
+        self.cells = [[list(iter_bits(mask)) if mask is not None else [] for mask in masks]
+                      for masks in self.table.masks]
+        self.iterations = 0  # Number of moves tried
+        self.best_score: Optional[float] = None  # Objective of the best conflict-free schedule found
+
+        # Search state, set up by generate()
+        self.assignment: List[int] = []
+        self._counts: List[int] = []
+        self._occupied = 0  # Cells used by at least one course
+        self._overlaps = 0  # Sum over cells of (courses using the cell - 1)
+        self._penalty = 0
+
+    def _move(self, course: int, old: Optional[int], new: int):
+        """
+        Gives a course another option, updating the occupancy of the cells of both options.
+        """
+        counts = self._counts
+        if old is not None:
+            for cell in self.cells[course][old]:
+                counts[cell] -= 1
+                if counts[cell] == 0:
+                    self._occupied &= ~(1 << cell)
+                else:
+                    self._overlaps -= 1
+            self._penalty -= self.penalties[course][old]
+        for cell in self.cells[course][new]:
+            if counts[cell] == 0:
+                self._occupied |= 1 << cell
+            else:
+                self._overlaps += 1
+            counts[cell] += 1
+        self._penalty += self.penalties[course][new]
+        self.assignment[course] = new
+
+    def score(self) -> float:
+        """
+        Returns the objective of the current state, lower is better.
+        """
+        active_days = 0
+        gap_hours = 0
+        for day in range(DAYS):
+            row = self._occupied >> (day * SLOTS_PER_DAY) & DAY_ROW
+            if row:
+                active_days += 1
+                gap_hours += popcount(ROW_SPANS[row]) - popcount(row)
+        excess_days = max(0, active_days - self.day_limit) if self.day_limit is not None else 0
+        return (self.CONFLICT_WEIGHT * (self._overlaps + excess_days)
+                + self.DAY_WEIGHT * active_days + self.GAP_WEIGHT * gap_hours + self._penalty)
+
+    def _pick_course(self) -> int:
+        """
+        Picks the course to move: half of the time one involved in an overlap, if any.
+        """
+        rng = self._random
+        if self._overlaps and rng.random() < 0.5:
+            clashing = [course for course, option in enumerate(self.assignment)
+                        if any(self._counts[cell] > 1 for cell in self.cells[course][option])]
+            return rng.choice(clashing)
+        return rng.randrange(len(self.assignment))
+
+    def generate(self) -> Iterator[Schedule]:
+        """
+        Yields improving (or equally good, new) conflict-free schedules until the deadline or cancellation.
+        """
+        count = len(self._selected)
+        if count == 0 or not all(self.choices):
+            return
+        rng = self._random
+        self._counts = [0] * (DAYS * SLOTS_PER_DAY)
+        self._occupied = self._overlaps = self._penalty = 0
+        self.assignment = [0] * count
+        for course in range(count):
+            self._move(course, None, rng.choice(self.choices[course]))
+
+        current = self.score()
+        yielded: Set[Tuple[int, ...]] = set()
+        temperature = self.START_TEMPERATURE
+        end = time.perf_counter() + self.deadline
+        candidate = True  # Whether the current state still needs to be offered as a result
+        while True:
+            if candidate and self._overlaps == 0 and (self.best_score is None or current <= self.best_score):
+                schedule = self._result(current, yielded)
+                if schedule is not None:
+                    yield schedule
+            candidate = False
+
+            self.iterations += 1
+            if self.iterations % self.CHECK_EVERY == 0 and (time.perf_counter() > end or self.cancel()):
+                return
+            course = self._pick_course()
+            old = self.assignment[course]
+            new = rng.choice(self.choices[course])
+            if new == old:
+                continue
+            self._move(course, old, new)
+            score = self.score()
+            delta = score - current
+            if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                current = score
+                candidate = True
+            else:
+                self._move(course, new, old)
+            temperature *= self.COOLING
+            if temperature < self.MIN_TEMPERATURE:
+                temperature = self.START_TEMPERATURE
+
+    def _result(self, score: float, yielded: Set[Tuple[int, ...]]) -> Optional[Schedule]:
+        """
+        Builds the current schedule if it is new, satisfies the constraints and is worth sending.
+        """
+        vector = tuple(self.assignment)
+        improved = self.best_score is None or score < self.best_score
+        if vector in yielded or (not improved and len(yielded) >= self.max_results):
+            return None
+        if self.constraints is not None or self.travel is not None:
+            slots = self.table.option_slots(vector)
+            if self.constraints is not None and not self.constraints.is_satisfied_by_slots(slots):
+                return None
+            if self.travel is not None and not self.travel.allows_slots(slots):
+                return None
+        yielded.add(vector)
+        self.best_score = score
+        schedule = self.table.build_schedule(vector)
+        schedule.penalty = self._penalty
+        return schedule
@@ -0,0 +1,188 @@
+import heapq
+from itertools import count as counter
+from typing import Iterator, List, Optional, Tuple
+from src.interfaces.schedule_strategy_interface import IScheduleStrategy
+from src.models.course import Course
+from src.models.option_table import OptionTable
+from src.models.schedule import Schedule
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+from src.models.violation import Violation, OVERLAP, FORBIDDEN
+from .compatibility_table import CompatibilityTable
+
+# Interval of a slot: (day, start minute, end minute, slot)
+Interval = Tuple[str, int, int, TimeSlot]
+
+class NearMissStrategy(IScheduleStrategy):
+    """
+    Finds the best "almost" schedules of a selection (bounded relaxation search).
+    Two classes may overlap and a class may use a forbidden slot, but every such overlap is a violation
+    whose cost grows with its length in minutes (an overlap costs OVERLAP_MINUTE_COST per minute, a forbidden
+    slot FORBIDDEN_MINUTE_COST). A schedule may have at most max_violations violations and cost at most
+    max_cost. Hard constraints and travel times still hold.
+
+    Schedules come out cheapest first (A* search as in PenaltyStrategy, valid schedules first at cost 0).
+    Every remaining course is bounded by the cheapest forbidden-slot cost among its options, and by the
+    violations it cannot avoid, so a branch is dropped as soon as it cannot stay within the bounds.
+    """
+    OVERLAP_MINUTE_COST = 2
+    FORBIDDEN_MINUTE_COST = 1
+
+    def __init__(self, selected: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                 constraints: Optional[ScheduleConstraints] = None, travel: Optional[TravelTimes] = None,
+                 max_violations: int = 1, max_cost: Optional[int] = None, node_limit: Optional[int] = None):
+        """
+        Compiles the options of the selected courses and their forbidden-slot violations.
+        :param selected: List of courses to be included in the strategy.
+        :param forbidden: Time slots that should stay free, each overlap is a violation.
+        :param constraints: Hard constraints every schedule must satisfy.
+        :param travel: Walking times between buildings, None to ignore them.
+        :param max_violations: Largest number of violations per schedule.
+        :param max_cost: Largest total violation cost per schedule, None for no limit.
+        :param node_limit: Stop after this many partial schedules and set limit_reached, None for no limit.
+        """
+        self._selected = selected
+        self.options = OptionTable(selected)
+        self.constraints = constraints if constraints and constraints.couples_courses() else None
+        self.travel = travel
+        self.max_violations = max_violations
+        self.max_cost = max_cost
+        self.node_limit = node_limit
+        forbidden_intervals = [self._interval(slot) for slot in forbidden or []]
+
+        # Usable options of every course, their intervals, days and forbidden-slot violations
+        self.choices: List[List[int]] = []
+        self.intervals: List[List[List[Interval]]] = []
+        self.day_masks: List[List[int]] = []
+        self.forbidden_hits: List[List[Tuple[Violation, ...]]] = []
+        for course_index, course_options in enumerate(self.options.options):
+            code = selected[course_index].course_code
+            choices, intervals, day_masks, hits = [], [], [], []
+            for option_index, option in enumerate(course_options):
+                slots = option.slots
+                option_intervals = [self._interval(slot) for slot in slots]
+                intervals.append(option_intervals)
+                day_masks.append(sum({1 << (int(slot.day) - 1) for slot in slots}))
+                hits.append(tuple(self._violation(FORBIDDEN, first, second, (code,), self.FORBIDDEN_MINUTE_COST)
+                                  for first in option_intervals for second in forbidden_intervals
+                                  if self._overlap(first, second)))
+                # An option whose lecture overlaps its own tirgul or maabada can never be attended
+                if CompatibilityTable.option_mask(slots) is None:
+                    continue
+                if constraints and not all(constraints.allows_slot(slot) for slot in slots):
+                    continue
+                if travel and not travel.allows_slots(slots):
+                    continue
+                choices.append(option_index)
+            self.choices.append(choices)
+            self.intervals.append(intervals)
+            self.day_masks.append(day_masks)
+            self.forbidden_hits.append(hits)
+
+        # Cheapest forbidden cost and fewest forbidden violations any option of a course can have
+        self.min_costs = [min((sum(v.cost for v in hits[o]) for o in choices), default=0)
+                          for choices, hits in zip(self.choices, self.forbidden_hits)]
+        self.min_violations = [min((len(hits[o]) for o in choices), default=0)
+                               for choices, hits in zip(self.choices, self.forbidden_hits)]
+        self.nodes_visited = 0  # Number of partial schedules pushed on the queue
+        self.limit_reached = False  # Whether the search stopped at its node limit
+
+    @staticmethod
+    def _interval(slot: TimeSlot) -> Interval:
+        return slot.day, Schedule.time_to_minutes(slot.start_time), Schedule.time_to_minutes(slot.end_time), slot
+
+    @staticmethod
+    def _overlap(first: Interval, second: Interval) -> int:
+        """
+        Returns the minutes two intervals overlap.
+        """
+        if first[0] != second[0]:
+            return 0
+        return max(0, min(first[2], second[2]) - max(first[1], second[1]))
+
+    @staticmethod
+    def _violation(kind: str, first: Interval, second: Interval, codes: Tuple[str, ...], minute_cost: int) -> Violation:
+        """
+        Builds the violation of two overlapping intervals.
+        """
+        start = first[3].start_time if first[1] >= second[1] else second[3].start_time
+        end = first[3].end_time if first[2] <= second[2] else second[3].end_time
+        minutes = min(first[2], second[2]) - max(first[1], second[1])
+        return Violation(kind, first[0], start, end, codes, minutes * minute_cost)
+
+    def _overlaps(self, chosen: Tuple[int, ...], course: int, option: int) -> Tuple[Violation, ...]:
+        """
+        Returns the overlaps between an option of a course and the options chosen for the courses before it.
+        """
+        found = []
+        days = self.day_masks[course][option]
+        code = self._selected[course].course_code
+        for other, other_option in enumerate(chosen):
+            if not days & self.day_masks[other][other_option]:
+                continue
+            codes = (self._selected[other].course_code, code)
+            for first in self.intervals[other][other_option]:
+                for second in self.intervals[course][option]:
+                    if self._overlap(first, second):
+                        found.append(self._violation(OVERLAP, first, second, codes, self.OVERLAP_MINUTE_COST))
+        return tuple(found)
+
+    def iter_scored_vectors(self) -> Iterator[Tuple[int, Tuple[int, ...], Tuple[Violation, ...]]]:
+        """
+        Lazily generate (cost, option vector, violations) of every schedule within the bounds, cheapest first.
+        """
+        count = len(self._selected)
+        self.limit_reached = False
+        if count == 0 or not all(self.choices):
+            return
+        # Lower bounds on the cost and violations of courses start.. (suffix sums)
+        rest_costs = [0] * (count + 1)
+        rest_violations = [0] * (count + 1)
+        for course in range(count - 1, -1, -1):
+            rest_costs[course] = rest_costs[course + 1] + self.min_costs[course]
+            rest_violations[course] = rest_violations[course + 1] + self.min_violations[course]
+        if rest_violations[0] > self.max_violations or (self.max_cost is not None and rest_costs[0] > self.max_cost):
+            return
+
+        tie = counter()
+        # Queue entries: (score, -depth, tie, cost so far, chosen options, violations so far)
+        queue = [(rest_costs[0], 0, next(tie), 0, (), ())]
+        while queue:
+            _, negative_depth, _, cost, chosen, violations = heapq.heappop(queue)
+            depth = -negative_depth
+            if depth == count:
+                if self.constraints is not None or self.travel is not None:
+                    slots = [slot for course, option in enumerate(chosen)
+                             for slot in self.options.options[course][option].slots]
+                    if self.constraints is not None and not self.constraints.is_satisfied_by_slots(slots):
+                        continue
+                    if self.travel is not None and not self.travel.allows_slots(slots):
+                        continue
+                yield cost, chosen, violations
+                continue
+
+            for option in self.choices[depth]:
+                added = self.forbidden_hits[depth][option] + self._overlaps(chosen, depth, option)
+                child_violations = violations + added
+                if len(child_violations) + rest_violations[depth + 1] > self.max_violations:
+                    continue
+                child_cost = cost + sum(violation.cost for violation in added)
+                score = child_cost + rest_costs[depth + 1]
+                if self.max_cost is not None and score > self.max_cost:
+                    continue
+                if self.node_limit is not None and self.nodes_visited >= self.node_limit:
+                    self.limit_reached = True
+                    return
+                self.nodes_visited += 1
+                heapq.heappush(queue, (score, negative_depth - 1, next(tie), child_cost,
+                                       chosen + (option,), child_violations))
+
+    def generate(self) -> Iterator[Schedule]:
+        """
+        Lazily generate the schedules within the bounds, cheapest first, with their violations set.
+        """
+        for _, vector, violations in self.iter_scored_vectors():
+            schedule = self.options.build_schedule(vector)
+            schedule.violations = violations
+            yield schedule
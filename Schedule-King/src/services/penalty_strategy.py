@@ -0,0 +1,108 @@
+import heapq
+from itertools import count as counter
+from typing import Iterator, List, Optional, Tuple
+from src.interfaces.schedule_strategy_interface import IScheduleStrategy
+from src.models.course import Course
+from src.models.schedule import Schedule
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.soft_preferences import SoftPreferences
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+from .compatibility_table import CompatibilityTable
+
+class PenaltyStrategy(IScheduleStrategy):
+    """
+    Enumerates the valid schedules from the lowest soft-preference penalty up (A* search).
+    A partial schedule is scored by the penalty of its chosen options plus, for every remaining course,
+    the cheapest option still compatible with the choices so far. That remainder never overestimates,
+    and it only grows as choices narrow the remaining options, so partial schedules come off the queue
+    in score order and complete schedules in penalty order. Schedules of equal penalty keep a fixed order.
+    The search only expands what it returns, so taking the best few schedules costs far less than
+    generating and sorting them all.
+    """
+    def __init__(self, selected: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                 constraints: Optional[ScheduleConstraints] = None,
+                 preferences: Optional[SoftPreferences] = None, travel: Optional[TravelTimes] = None):
+        """
+        Builds the compatibility table and the option penalties of the selected courses.
+        :param selected: List of courses to be included in the strategy.
+        :param forbidden: Time slots that must stay free.
+        :param constraints: Hard constraints every schedule must satisfy.
+        :param preferences: Soft preferences giving the option penalties, None for no penalties.
+        :param travel: Walking times between buildings, None to ignore them.
+        """
+        self._selected = selected
+        self.constraints = constraints if constraints and constraints.couples_courses() else None
+        self.table = CompatibilityTable(selected, forbidden, constraints, travel)
+        self.penalties = (preferences or SoftPreferences()).penalties(self.table.options)
+        # levels[j]: (penalty, options of course j with that penalty), cheapest first
+        self.levels: List[List[Tuple[int, int]]] = []
+        for course, domain in enumerate(self.table.domains):
+            by_penalty = {}
+            for option, penalty in enumerate(self.penalties[course]):
+                if domain >> option & 1:
+                    by_penalty[penalty] = by_penalty.get(penalty, 0) | (1 << option)
+            self.levels.append(sorted(by_penalty.items()))
+        self.nodes_visited = 0  # Number of partial schedules pushed on the queue
+        self.max_queue = 0  # Largest number of partial schedules waiting at once
+
+    def _remainder(self, live: List[int], start: int) -> Optional[int]:
+        """
+        Returns the cheapest possible penalty of courses start.. given their live options, None if one has none.
+        """
+        total = 0
+        for course in range(start, len(live)):
+            for penalty, options in self.levels[course]:
+                if live[course] & options:
+                    total += penalty
+                    break
+            else:
+                return None
+        return total
+
+    def iter_scored_vectors(self) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        """
+        Lazily generate (penalty, option vector) of every valid schedule, lowest penalty first.
+        """
+        count = len(self._selected)
+        domains = self.table.domains
+        if count == 0 or not all(domains):
+            return
+        compatible = self.table.compatible
+        tie = counter()
+        # Queue entries: (score, -depth, tie, penalty so far, chosen options, live options per course)
+        root_score = self._remainder(domains, 0)
+        queue = [(root_score, 0, next(tie), 0, (), tuple(domains))]
+        while queue:
+            self.max_queue = max(self.max_queue, len(queue))
+            score, negative_depth, _, penalty, chosen, live = heapq.heappop(queue)
+            depth = -negative_depth
+            if depth == count:
+                if self.constraints is None or self.constraints.is_satisfied_by_slots(self.table.option_slots(chosen)):
+                    yield penalty, chosen
+                continue
+
+            for option, option_penalty in enumerate(self.penalties[depth]):
+                if not live[depth] >> option & 1:
+                    continue
+                # Forward checking, as in CompatibilityStrategy
+                row = compatible[depth][option]
+                narrowed = list(live)
+                for other in range(depth + 1, count):
+                    narrowed[other] = live[other] & row[other]
+                remainder = self._remainder(narrowed, depth + 1)
+                if remainder is None:
+                    continue
+                self.nodes_visited += 1
+                child_penalty = penalty + option_penalty
+                heapq.heappush(queue, (child_penalty + remainder, negative_depth - 1, next(tie),
+                                       child_penalty, chosen + (option,), tuple(narrowed)))
+
+    def generate(self) -> Iterator[Schedule]:
+        """
+        Lazily generate all valid schedules, lowest penalty first, with their penalty set.
+        """
+        for penalty, vector in self.iter_scored_vectors():
+            schedule = self.table.build_schedule(vector)
+            schedule.penalty = penalty
+            yield schedule
@@ -0,0 +1,105 @@
+import math
+import random
+from typing import List, Optional, Sequence
+from src.models.progress_estimate import ProgressEstimate
+from src.models.schedule_constraints import ScheduleConstraints
+from .compatibility_table import CompatibilityTable
+from .tree_size_estimator import probe_tree
+
+# Random probes per conflict component drawn when the estimator is created, and on every refinement
+INITIAL_SAMPLES = 64
+REFINE_SAMPLES = 16
+# Probes per component after which the estimate is no longer refined
+MAX_SAMPLES = 4096
+# Normal quantile of the confidence band (about 95%)
+CONFIDENCE_Z = 1.96
+
+class ProgressEstimator:
+    """
+    Estimates the number of schedules of a running generation, tightening as the generation proceeds.
+    The leaves of the search tree of every conflict component are estimated by Knuth's random probing
+    (see probe_tree), each probe's schedule checked against the constraints linking courses, so the mean
+    of the probes is an unbiased estimate of the component's schedule count. The total is the product over
+    the components. Every refinement draws more probes, so the standard error and with it the confidence
+    band shrink like 1/sqrt(probes), and the schedules already generated bound the band from below.
+    The remaining time is extrapolated from the rate at which schedules arrived so far.
+    """
+    def __init__(self, table: Optional[CompatibilityTable], components: Sequence[Sequence[int]] = (),
+                 constraints: Optional[ScheduleConstraints] = None, samples: int = INITIAL_SAMPLES,
+                 seed: int = 0, exact_count: Optional[int] = None):
+        """
+        Draws the first probes of every component.
+        :param table: The compatibility table of the selected courses, None with an exact count.
+        :param components: Indices of the courses of every conflict component. Constraints linking courses
+                           (days, gaps) need a single component covering every course, as StrategySelector makes.
+        :param constraints: Hard constraints of the generation.
+        :param samples: Probes per component drawn now.
+        :param seed: Seed of the probes, the same seed gives the same estimates.
+        :param exact_count: The counted number of schedules, the estimate is then exact and never refined.
+        """
+        self.table = table
+        self.components: List[List[int]] = [sorted(courses) for courses in components]
+        self._constraints = constraints if constraints is not None and constraints.couples_courses() else None
+        self._rng = random.Random(seed)
+        self.exact_count = exact_count
+        self.samples = [0] * len(self.components)  # Probes drawn per component
+        self._sums = [0.0] * len(self.components)  # Sum of the leaf estimates per component
+        self._squares = [0.0] * len(self.components)  # Sum of their squares, for the variance
+        self.refine(samples)
+
+    @classmethod
+    def from_count(cls, count: int) -> "ProgressEstimator":
+        """
+        Returns an estimator of a generation whose number of schedules is known exactly.
+        """
+        return cls(None, exact_count=count)
+
+    def refine(self, samples: int = REFINE_SAMPLES) -> None:
+        """
+        Draws more probes of every component, up to MAX_SAMPLES each.
+        """
+        if self.exact_count is not None:
+            return
+        for component, courses in enumerate(self.components):
+            for _ in range(min(samples, MAX_SAMPLES - self.samples[component])):
+                leaves = probe_tree(self.table, courses, self._rng, self._constraints).leaves
+                self.samples[component] += 1
+                self._sums[component] += leaves
+                self._squares[component] += leaves * leaves
+
+    def _total(self) -> tuple:
+        """
+        Returns the estimated total and its standard error. The relative variances of the independent
+        component means add up to the relative variance of their product (first order).
+        """
+        if not self.components:
+            return 0.0, 0.0
+        total = 1.0
+        relative_variance = 0.0
+        for count, sum_, squares in zip(self.samples, self._sums, self._squares):
+            mean = sum_ / count if count else 0.0
+            if mean == 0.0:
+                return 0.0, 0.0
+            variance = max(squares / count - mean * mean, 0.0) * count / (count - 1) if count > 1 else 0.0
+            relative_variance += variance / count / (mean * mean)
+            total *= mean
+        return total, total * math.sqrt(relative_variance)
+
+    def estimate(self, seen: int, elapsed: float, seen_at_start: int = 0) -> ProgressEstimate:
+        """
+        Returns the current estimate of a generation.
+        :param seen: Schedules generated so far.
+        :param elapsed: Seconds since the generation started.
+        :param seen_at_start: Schedules already there when it started (restored from a checkpoint),
+                              left out of the arrival rate.
+        """
+        if self.exact_count is not None:
+            point = low = high = max(self.exact_count, seen)
+        else:
+            total, error = self._total()
+            point = max(round(total), seen)
+            low = max(math.floor(total - CONFIDENCE_Z * error), seen)
+            high = max(math.ceil(total + CONFIDENCE_Z * error), point)
+        arrived = seen - seen_at_start
+        eta = (point - seen) * elapsed / arrived if arrived > 0 and elapsed > 0 else None
+        return ProgressEstimate(point, low, high, eta, self.exact_count is not None)
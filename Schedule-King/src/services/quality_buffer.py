@@ -0,0 +1,83 @@
+import heapq
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+from src.models.schedule import Schedule
+
+# Whether a lower grade is better, per entry of Schedule.metric_tuple (fewer days and gaps, later start, earlier end)
+LOWER_IS_BETTER = (True, True, True, False, True)
+
+class QualityBuffer:
+    """
+    Holds the first schedules of a generation for a short window and reorders them so the best arrive first.
+    Once the window has passed, the head holds the top_k best schedules of every metric, best overall
+    first. The rest follows in generation order. Used by the generation worker so that, with no ranking
+    preference set, the first screen already shows near-optimal schedules.
+    """
+    def __init__(self, window_seconds: float, top_k: int):
+        """
+        :param window_seconds: How long to hold schedules, counted from the first one added.
+        :param top_k: Number of best schedules per metric sent ahead of the rest.
+        """
+        self.window_seconds = window_seconds
+        self.top_k = top_k
+        self.schedules: List[Schedule] = []
+        self._deadline = None
+        self.passing = False  # Whether reorder yields the stream unchanged, every held schedule sent
+
+    @staticmethod
+    def quality(schedule: Schedule) -> Tuple[int, ...]:
+        """
+        Returns the sort key of a schedule, best first: its metric grades with every grade oriented lower-is-better.
+        """
+        return tuple(grade if lower else -grade for grade, lower in zip(schedule.metric_tuple, LOWER_IS_BETTER))
+
+    def add(self, schedule: Schedule) -> bool:
+        """
+        Holds a schedule. Returns True once the window has passed and the buffer should be drained.
+        """
+        now = time.perf_counter()
+        if self._deadline is None:
+            self._deadline = now + self.window_seconds
+        self.schedules.append(schedule)
+        return now >= self._deadline
+
+    def expired(self) -> bool:
+        """
+        Returns whether the window of the held schedules has passed.
+        """
+        return self._deadline is not None and time.perf_counter() >= self._deadline
+
+    def drain(self) -> Tuple[List[Schedule], List[Schedule]]:
+        """
+        Empties the buffer.
+        :return: (head, rest): the best schedules per metric, best overall first, and the others in generation order.
+        """
+        schedules, self.schedules = self.schedules, []
+        self._deadline = None
+        keys = [self.quality(schedule) for schedule in schedules]
+        best = set()
+        for metric in range(len(LOWER_IS_BETTER)):
+            best.update(heapq.nsmallest(self.top_k, range(len(schedules)), key=lambda item: keys[item][metric]))
+        head = [schedules[item] for item in sorted(best, key=lambda item: (keys[item], item))]
+        rest = [schedule for item, schedule in enumerate(schedules) if item not in best]
+        return head, rest
+
+    def reorder(self, schedules: Iterable[Optional[Schedule]]) -> Iterator[Optional[Schedule]]:
+        """
+        Yields the same schedules, the best ones of the window first, then passes the stream through unchanged.
+        None items are ticks of a search that found nothing for a while (see FactorizedStrategy.generate): they
+        close the window once its time has passed, without waiting for another schedule, and are passed on.
+        """
+        stream = iter(schedules)
+        for schedule in stream:
+            if schedule is None:
+                if self.expired():
+                    break
+                yield None
+            elif self.add(schedule):
+                break
+        head, rest = self.drain()
+        yield from head
+        yield from rest
+        self.passing = True
+        yield from stream
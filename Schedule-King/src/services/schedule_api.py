@@ -1,21 +1,71 @@
 import os
-from typing import List, Optional
+import time
+from itertools import islice
+from typing import Iterator, List, Optional, Sequence, TypeVar, Union
 from .file_handler import FileHandler
 from .scheduler import Scheduler
-from .all_strategy import AllStrategy
+from .factorized_strategy import FactorizedStrategy, ProductView
+from .selection_strategy import SelectionStrategy
+from .infeasibility_explainer import InfeasibilityExplainer
+from .near_miss_strategy import NearMissStrategy
+from .first_schedule_probe import FirstScheduleProbe
+from .feasibility_counter import FeasibilityCounter
+from .catalog_index import CatalogIndex
+from .quality_buffer import QualityBuffer
+from .progress_estimator import ProgressEstimator
+from .strategy_selector import ANYTIME, StrategySelector
+from .worker_pool import POOL_SIZE, RequestStream, WorkerPool, restore_priority
 from src.models.course import Course
+from src.models.course_selection import CourseSelection
+from src.models.generation_limits import GenerationLimits
+from src.models.generation_result import (GenerationResult, STOPPED_AT_DEADLINE, STOPPED_AT_MAX_SCHEDULES,
+                                          STOPPED_AT_NODE_BUDGET)
+from src.models.infeasibility_core import InfeasibilityCore
 from src.models.schedule import Schedule
+from src.models.search_checkpoint import SearchCheckpoint
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.soft_preferences import SoftPreferences
 import multiprocessing as mp
 from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+
+# Maximum number of search nodes spent on an exact schedule count before falling back to the estimate
+COUNT_NODE_LIMIT = 200_000
+# Seconds the anytime local search keeps improving its schedules
+LOCAL_SEARCH_SECONDS = 10.0
+# A partial batch waiting longer than this is sent anyway, so slow strategies still stream
+BATCH_FLUSH_SECONDS = 0.2
+# Near-miss schedules sent with an infeasibility core: violations allowed per schedule, how many, search nodes spent
+NEAR_MISS_VIOLATIONS = 1
+NEAR_MISS_LIMIT = 100
+NEAR_MISS_NODE_LIMIT = 200_000
+# The exhaustive stream is held this long so its best schedules (QUALITY_TOP_K per metric) are sent first
+QUALITY_WINDOW_SECONDS = 0.3
+QUALITY_TOP_K = 10
+# The exhaustive search hands control back to the worker this often while it finds nothing, so the quality
+# window closes, partial batches are sent and stops are seen on time
+SEARCH_TICK_SECONDS = 0.05
+# The exhaustive worker sends a SearchCheckpoint after a batch at most this often
+CHECKPOINT_SECONDS = 2.0
+# Niceness added to a low-priority (speculative) worker, so it yields the CPU to the interface
+LOW_PRIORITY_NICENESS = 10
+
+Item = TypeVar("Item")
 
 class ScheduleAPI:
-    def __init__(self):
+    def __init__(self, travel_times: Optional[TravelTimes] = None):
         """
         Initialize ScheduleAPI with a format/parse handler.
+        :param travel_times: Walking times between buildings, generation then skips breaks too short to
+                             change buildings. None ignores buildings.
         """
         self.file_handler = FileHandler()
+        self.travel_times = travel_times
         self._process_worker = None
-        # No shared state needed here anymore
+        # Warm workers started by start_worker_pool, and the stream of the request they are running
+        self._pool: Optional[WorkerPool] = None
+        self._stream: Optional[RequestStream] = None
+        self._catalog: List[Course] = []  # The latest parsed catalog, sent to the pool
 
     def get_courses(self, source: str) -> List[Course]:
         """
@@ -24,18 +74,113 @@ class ScheduleAPI:
         if not os.path.exists(source):
             raise FileNotFoundError(f"The source file '{source}' does not exist.")
         try:
-            return self.file_handler.parse(source)
+            courses = self.file_handler.parse(source)
         except ValueError as e:
             print(f"Error parsing courses: {e}. Please check the input format.")
             return []
+        self._catalog = courses
+        if self._pool is not None:
+            self._pool.load_catalog(courses)
+        return courses
+
+    def start_worker_pool(self, size: int = POOL_SIZE) -> None:
+        """
+        Start long-lived generation workers (see WorkerPool), once when the application launches.
+        generate_schedules_in_parallel then hands every run to a warm worker that already holds the parsed
+        catalog, instead of starting a new process.
+        """
+        if self._pool is not None:
+            return
+        self._pool = WorkerPool(self._worker_generate, self.travel_times, size)
+        if self._catalog:
+            self._pool.load_catalog(self._catalog)
+
+    def shutdown_worker_pool(self) -> None:
+        """
+        Cancel the running generation and let the pool's workers exit.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._stream = None
 
-    def process(self, selected_courses: List[Course]) -> List[Schedule]:
+    def process(self, selected_courses: List[Course], limits: Optional[GenerationLimits] = None) -> List[Schedule]:
         """
-        Generate schedules based on selected courses.
+        Generate schedules based on selected courses, with the engine StrategySelector picks:
+        every schedule, unless the selection is too large to enumerate (then the best ones found in
+        LOCAL_SEARCH_SECONDS).
+        :param limits: Bounds on the run (count, offset, deadline, node budget), None to return every schedule.
+                       Use generate_bounded to also learn whether the run was truncated.
         """
-        scheduler = Scheduler(selected_courses, AllStrategy(selected_courses))
+        if limits is not None:
+            return self.generate_bounded(selected_courses, limits=limits).schedules
+        strategy = StrategySelector(selected_courses, travel=self.travel_times).build(deadline=LOCAL_SEARCH_SECONDS)
+        scheduler = Scheduler(selected_courses, strategy)
         return list(scheduler.generate())
 
+    def generate_bounded(self, selected_courses: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                         constraints: Optional[ScheduleConstraints] = None,
+                         limits: Optional[GenerationLimits] = None) -> GenerationResult:
+        """
+        Generate schedules in this process within the given bounds, in ProductView order, so the same
+        offset always addresses the same schedules. Skipped schedules are searched but never built.
+        The deadline and node budget are checked inside the search loop (see FactorizedStrategy), and the
+        result tells whether every schedule was enumerated or which bound truncated the run.
+        :raises ValueError: If a bound is negative.
+        """
+        limits = limits or GenerationLimits()
+        limits.validate()
+        started = time.perf_counter()
+        deadline = started + limits.deadline_seconds if limits.deadline_seconds is not None else None
+        strategy = FactorizedStrategy(selected_courses, forbidden, constraints, self.travel_times)
+        result = GenerationResult()
+        vectors = strategy.iter_option_vectors(limits.node_budget, deadline)
+        for vector in self._apply_limits(vectors, limits, None, result):
+            result.schedules.append(strategy.table.build_schedule(vector))
+        self._record_search_stop(strategy, result)
+        result.nodes_visited = strategy.nodes_visited
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    @staticmethod
+    def _apply_limits(items: Iterator[Item], limits: GenerationLimits, deadline: Optional[float],
+                      result: GenerationResult) -> Iterator[Item]:
+        """
+        Yields the items after the offset, up to max_schedules of them, and records in result why it stopped.
+        The stream is read one item past max_schedules, so a run holding exactly that many still counts as finished.
+        None items (search ticks) are passed on without being counted.
+        :param deadline: time.perf_counter() value checked on every item, None when the search checks it itself.
+        """
+        skipped = 0
+        kept = 0
+        for item in items:
+            if deadline is not None and time.perf_counter() > deadline:
+                result.finished, result.stop_reason = False, STOPPED_AT_DEADLINE
+                return
+            if item is None:
+                yield item
+                continue
+            if skipped < limits.offset:
+                skipped += 1
+                continue
+            if limits.max_schedules is not None and kept >= limits.max_schedules:
+                result.finished, result.stop_reason = False, STOPPED_AT_MAX_SCHEDULES
+                return
+            kept += 1
+            yield item
+
+    @staticmethod
+    def _record_search_stop(strategy, result: GenerationResult) -> None:
+        """
+        Records in result a deadline or node budget reached inside the search of a strategy that checks them.
+        """
+        if not result.finished:
+            return
+        if getattr(strategy, "deadline_reached", False):
+            result.finished, result.stop_reason = False, STOPPED_AT_DEADLINE
+        elif getattr(strategy, "limit_reached", False):
+            result.finished, result.stop_reason = False, STOPPED_AT_NODE_BUDGET
+
     def export(self, schedules: List[Schedule], destination: str) -> None:
         """
         Export the given schedules to the destination file.
@@ -47,44 +192,147 @@ class ScheduleAPI:
             print(f"Error exporting schedules: {e}.")
 
     @staticmethod
-    def _worker_generate(selected_courses: List[Course], queue: mp.Queue, stop_event: mp.Event, forbidden: Optional[List[TimeSlot]] = None) -> None:
+    def _worker_generate(selected_courses: Union[List[Course], CourseSelection], queue: mp.Queue, stop_event: mp.Event,
+                         forbidden: Optional[List[TimeSlot]] = None,
+                         constraints: Optional[ScheduleConstraints] = None,
+                         preferences: Optional[SoftPreferences] = None,
+                         travel: Optional[TravelTimes] = None,
+                         limits: Optional[GenerationLimits] = None,
+                         resume_after: Optional[Sequence[int]] = None, low_priority: bool = False) -> None:
         """
         Worker function to process courses in a separate process, sending schedules in variable batch sizes.
+        The engine of a course list is picked by StrategySelector from the estimated size of its search:
+        every schedule if it can be enumerated, from the lowest penalty up with soft preferences, and otherwise
+        the anytime local search, which sends its best schedules as it finds them for LOCAL_SEARCH_SECONDS.
+        A CourseSelection (optional courses, OR-groups) is solved in one search over all its candidate courses,
+        schedules with more preferred courses first.
+        A plain course list is first checked for a minimal infeasibility core: if one is found, the
+        InfeasibilityCore is sent instead of any batch, without running the full search, together with
+        the closest schedules that break one rule (see find_near_misses).
+        Otherwise the search tries the best options first, and the best schedules found during the first
+        QUALITY_WINDOW_SECONDS are sent ahead of the rest (see QualityBuffer). While it finds nothing, the
+        search ticks every SEARCH_TICK_SECONDS, so a sparse search still closes that window, flushes its batch
+        and sees stop_event on time.
+        With limits, the offset and max_schedules apply to the sent stream and the deadline to every schedule;
+        the exhaustive search also checks the deadline and node budget itself. A GenerationResult without
+        schedules then reports how the run ended, just before None.
+        An unbounded exhaustive run sends a SearchCheckpoint after a batch every CHECKPOINT_SECONDS, once
+        every schedule it has found was sent; given resume_after (a checkpoint cursor), it continues right
+        after that schedule, without the infeasibility check and the quality window.
+        With low_priority, the worker lowers its own OS priority first (where the OS supports it).
         Checks stop_event to gracefully terminate when requested.
         """
-        scheduler = Scheduler(selected_courses, AllStrategy(selected_courses, forbidden))
-        
+        if low_priority and hasattr(os, "nice"):
+            os.nice(LOW_PRIORITY_NICENESS)
+        resuming = resume_after is not None
+        if not isinstance(selected_courses, CourseSelection) and not resuming:
+            core = InfeasibilityExplainer(selected_courses, forbidden, constraints, travel).find_core()
+            if core is not None:
+                core.near_misses = ScheduleAPI.find_near_misses(selected_courses, forbidden, constraints, travel)
+                if not stop_event.is_set():
+                    queue.put(core)
+                    queue.put(None)
+                return
+
+        if isinstance(selected_courses, CourseSelection):
+            strategy = SelectionStrategy(selected_courses, forbidden, constraints, preferences, travel)
+            selected_courses = selected_courses.courses()
+        elif resuming:
+            # The checkpoint was taken by the exhaustive search
+            strategy = FactorizedStrategy(selected_courses, forbidden, constraints, travel, quality_order=True)
+        else:
+            selector = StrategySelector(selected_courses, forbidden, constraints, preferences, travel)
+            strategy = selector.build(deadline=LOCAL_SEARCH_SECONDS, cancel=stop_event.is_set)
+        started = time.perf_counter()
+        deadline = None
+        if limits is not None and limits.deadline_seconds is not None:
+            deadline = started + limits.deadline_seconds
+        scheduler = Scheduler(selected_courses, strategy)
+        if isinstance(strategy, FactorizedStrategy):
+            generated = strategy.generate(limits.node_budget if limits else None, deadline, resume_after,
+                                          SEARCH_TICK_SECONDS)
+        else:
+            generated = scheduler.generate()
+        buffer = None
+        if isinstance(strategy, FactorizedStrategy) and not resuming:
+            buffer = QualityBuffer(QUALITY_WINDOW_SECONDS, QUALITY_TOP_K)
+            generated = buffer.reorder(generated)
+        # Only an unbounded exhaustive run is resumable, its stream order is the search order
+        checkpointing = isinstance(strategy, FactorizedStrategy) and limits is None
+        last_checkpoint = started
+        result = GenerationResult()
+        if limits is not None:
+            generated = ScheduleAPI._apply_limits(generated, limits, deadline, result)
+
         batch_sizes = [1, 9, 90, 900]
         batch_index = 0
         current_batch_size = batch_sizes[batch_index] if batch_index < len(batch_sizes) else 1000
         batch = []
         total_sent = 0
+        last_sent = time.perf_counter()
 
-        for schedule in scheduler.generate():
+        for schedule in generated:
             if stop_event.is_set():
                 break
 
-            batch.append(schedule)
-            if len(batch) >= current_batch_size:
+            if schedule is not None:  # Otherwise a search tick
+                batch.append(schedule)
+            now = time.perf_counter()
+            if batch and (len(batch) >= current_batch_size or now - last_sent > BATCH_FLUSH_SECONDS):
+                last_sent = now
                 queue.put(batch)
                 total_sent += len(batch)
+                last_schedule = batch[-1]
                 batch = []
                 batch_index += 1
                 current_batch_size = batch_sizes[batch_index] if batch_index < len(batch_sizes) else 1000
 
                 if stop_event.is_set():
                     break
+                # Safe once the quality window is over: everything found up to this schedule was sent
+                if checkpointing and now - last_checkpoint > CHECKPOINT_SECONDS and (buffer is None or buffer.passing):
+                    last_checkpoint = now
+                    queue.put(SearchCheckpoint(list(last_schedule.option_indices), total_sent))
 
         if batch and not stop_event.is_set():
             queue.put(batch)
 
+        if limits is not None and not stop_event.is_set():
+            ScheduleAPI._record_search_stop(strategy, result)
+            result.nodes_visited = getattr(strategy, "nodes_visited", 0)
+            result.elapsed = time.perf_counter() - started
+            queue.put(result)
+
         if not stop_event.is_set():
             queue.put(None)
 
-    def generate_schedules_in_parallel(self, selected_courses: List[Course], forbidden: Optional[List[TimeSlot]] = None) -> List[Schedule]:
+    def generate_schedules_in_parallel(self, selected_courses: Union[List[Course], CourseSelection],
+                                       forbidden: Optional[List[TimeSlot]] = None,
+                                       constraints: Optional[ScheduleConstraints] = None,
+                                       preferences: Optional[SoftPreferences] = None,
+                                       limits: Optional[GenerationLimits] = None,
+                                       resume_after: Optional[Sequence[int]] = None,
+                                       low_priority: bool = False) -> List[Schedule]:
         """
         Generate schedules in parallel using multiple processes.
+        With limits, the run stops by itself at the first bound reached and its last item before None
+        is a GenerationResult telling whether it finished (see _worker_generate).
+        With resume_after, the cursor of a SearchCheckpoint sent by an earlier run of the same selection,
+        the run continues right after the last schedule that run delivered.
+        With low_priority, the worker runs at a lower OS priority (speculative runs, see ScheduleController.speculate).
+        Once start_worker_pool was called the run goes to a warm worker and the returned RequestStream is
+        read like the queue; otherwise a new process is started for it.
+        Only schedules satisfying the hard constraints, if given, are sent, lowest penalty first if
+        soft preferences are given. Schedules of a CourseSelection carry an option index for every candidate
+        course, SKIPPED_OPTION for the courses they leave out.
         """
+        if limits is not None:
+            limits.validate()
+        if self._pool is not None:
+            self.stop_schedules_generation()
+            self._stream = self._pool.submit(selected_courses, forbidden, constraints, preferences, limits,
+                                             resume_after, low_priority)
+            return self._stream
         queue = mp.Queue()
         # Create a proper Event object for signaling termination
         stop_event = mp.Event()
@@ -97,7 +345,8 @@ class ScheduleAPI:
             
         # Start a new process for schedule generation
         self._process_worker = mp.Process(target=self._worker_generate, 
-                                  args=(selected_courses, queue, stop_event, forbidden),
+                                  args=(selected_courses, queue, stop_event, forbidden, constraints, preferences,
+                                        self.travel_times, limits, resume_after, low_priority),
                                   daemon=True)
         # Store the stop event with the process
         self._process_worker.stop_event = stop_event
@@ -105,12 +354,86 @@ class ScheduleAPI:
 
         return queue
     
-    def get_estimated_schedules_count(self, selected_courses: List[Course]) -> int:
+    def select_strategy(self, selected_courses: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                        constraints: Optional[ScheduleConstraints] = None,
+                        preferences: Optional[SoftPreferences] = None) -> StrategySelector:
+        """
+        Return the strategy selector of a course list: the engine the worker would use (selector.engine)
+        and the estimated size of the search, without running it.
+        """
+        return StrategySelector(selected_courses, forbidden, constraints, preferences, self.travel_times)
+
+    def find_infeasibility_core(self, selected_courses: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                                constraints: Optional[ScheduleConstraints] = None) -> Optional[InfeasibilityCore]:
+        """
+        Return a minimal set of courses and forbidden slots that has no valid schedule, None if the
+        selection has one (or it cannot be decided quickly). See InfeasibilityExplainer.
         """
-        Estimate the theoretical number of combinations (without considering conflicts).
+        return InfeasibilityExplainer(selected_courses, forbidden, constraints, self.travel_times).find_core()
+
+    @staticmethod
+    def find_near_misses(selected_courses: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                         constraints: Optional[ScheduleConstraints] = None, travel: Optional[TravelTimes] = None,
+                         max_violations: int = NEAR_MISS_VIOLATIONS, limit: int = NEAR_MISS_LIMIT) -> List[Schedule]:
+        """
+        Return up to limit schedules with at most max_violations overlaps or forbidden slots,
+        cheapest violations first, each with its violations set. The search stops after NEAR_MISS_NODE_LIMIT nodes.
+        """
+        strategy = NearMissStrategy(selected_courses, forbidden, constraints, travel, max_violations,
+                                    node_limit=NEAR_MISS_NODE_LIMIT)
+        return list(islice(strategy.generate(), limit))
+
+    def find_first_schedule(self, selected_courses: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                            constraints: Optional[ScheduleConstraints] = None) -> Optional[Schedule]:
+        """
+        Return one valid, reasonably good schedule found by a quick greedy probe in this process,
+        or None if the probe gave up. See FirstScheduleProbe.
+        """
+        return FirstScheduleProbe(selected_courses, forbidden, constraints, self.travel_times).find()
+
+    def create_feasibility_counter(self, selected_courses: List[Course],
+                                   constraints: Optional[ScheduleConstraints] = None) -> FeasibilityCounter:
+        """
+        Return a counter of the schedules left by any set of forbidden cells, answering in milliseconds
+        after enumerating the schedules once (see FeasibilityCounter).
+        """
+        return FeasibilityCounter(selected_courses, constraints, self.travel_times)
+
+    def create_catalog_index(self, courses: List[Course]) -> CatalogIndex:
+        """
+        Return an index of the time footprints of the whole catalog, telling in milliseconds which courses
+        still fit next to a selection and how many schedules each keeps (see CatalogIndex).
+        """
+        return CatalogIndex(courses)
+
+    def get_schedule_view(self, selected_courses: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                          constraints: Optional[ScheduleConstraints] = None) -> ProductView:
+        """
+        Return all valid schedules as a lazy product over the independent course components.
+        Only the components are searched, counting and indexing the view do not build the schedules.
+        """
+        return FactorizedStrategy(selected_courses, forbidden, constraints, self.travel_times).view()
+
+    def get_estimated_schedules_count(self, selected_courses: Union[List[Course], CourseSelection],
+                                      forbidden: Optional[List[TimeSlot]] = None,
+                                      constraints: Optional[ScheduleConstraints] = None) -> int:
+        """
+        Count the valid schedules, exactly when the count is cheap enough.
+        The count is the product of the counts of the independent course components; if a component
+        needs more than COUNT_NODE_LIMIT search nodes, falls back to the theoretical number of
+        combinations (without considering conflicts).
         Returns:
-            int: Estimated number of possible combinations, or a very large number if overflow occurs.
+            int: Number of schedules, or -1 if it is unknown or too large (always for a CourseSelection).
         """
+        if isinstance(selected_courses, CourseSelection):
+            return -1
+        try:
+            exact = FactorizedStrategy(selected_courses, forbidden, constraints, self.travel_times).count(COUNT_NODE_LIMIT)
+            if exact is not None:
+                return exact if 0 < exact < 10**7 else -1
+        except ValueError:
+            pass
+
         try:
             total = 1
 
@@ -124,12 +447,51 @@ class ScheduleAPI:
         except Exception:
             return -1
         
+    def create_progress_estimator(self, selected_courses: Union[List[Course], CourseSelection],
+                                  forbidden: Optional[List[TimeSlot]] = None,
+                                  constraints: Optional[ScheduleConstraints] = None,
+                                  preferences: Optional[SoftPreferences] = None) -> Optional[ProgressEstimator]:
+        """
+        Return a live estimator of the number of schedules the worker will generate for a selection.
+        It is exact when the count fits in COUNT_NODE_LIMIT search nodes, otherwise it refines a sampled
+        estimate of the search tree (see ProgressEstimator).
+        Returns None when the count is unknown: for a CourseSelection, and when the anytime local search
+        would run, which returns the best schedules it finds within its deadline.
+        """
+        if isinstance(selected_courses, CourseSelection):
+            return None
+        selector = StrategySelector(selected_courses, forbidden, constraints, preferences, self.travel_times)
+        if selector.engine == ANYTIME:
+            return None
+        exact = FactorizedStrategy(selected_courses, forbidden, constraints, self.travel_times).count(COUNT_NODE_LIMIT)
+        if exact is not None:
+            return ProgressEstimator.from_count(exact)
+        return ProgressEstimator(selector.table, selector.components, constraints)
+
+    def restore_generation_priority(self) -> bool:
+        """
+        Run the current generation at normal OS priority again, when a low-priority run becomes the one the
+        user waits for (see ScheduleController._adopt_speculation). Most systems refuse to raise a priority
+        without privileges; the run then goes on at low priority, and a warm worker that ran it only takes
+        low-priority runs afterwards.
+        Returns whether the generation runs at normal priority now.
+        """
+        if self._stream is not None:
+            return self._pool.restore_priority(self._stream)
+        if self._process_worker is not None and self._process_worker.is_alive():
+            return restore_priority(self._process_worker.pid)
+        return True
+
     def stop_schedules_generation(self) -> None:
         """
         Stop the schedule generation process if it's running.
         Uses the process-specific Event object to signal termination.
         Does not block or join the process.
         """
+        # A warm worker takes the next request once it stopped
+        if self._stream is not None:
+            self._pool.cancel(self._stream)
+            self._stream = None
         # Signal the worker to stop
         if self._process_worker and hasattr(self._process_worker, 'stop_event'):
             self._process_worker.stop_event.set()
@@ -0,0 +1,162 @@
+import heapq
+from itertools import count as counter
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.interfaces.schedule_strategy_interface import IScheduleStrategy
+from src.models.course_selection import CourseSelection
+from src.models.option_table import SKIPPED_OPTION
+from src.models.schedule import Schedule
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.soft_preferences import SoftPreferences
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+from .compatibility_table import CompatibilityTable
+
+# Role of a candidate course in the search
+MANDATORY, ALTERNATIVE, OPTIONAL = range(3)
+
+class SelectionStrategy(IScheduleStrategy):
+    """
+    Enumerates the schedules of every course subset allowed by a CourseSelection in one search.
+    Every candidate course is either given one of its options or skipped (SKIPPED_OPTION in the option
+    vector), so all subsets share the search prefixes and the compatibility table of all candidates.
+    Mandatory courses are never skipped, exactly one course of every OR-group is taken, and the number of
+    optional courses taken stays within the selection limits; branches that can no longer meet a count
+    or leave a required course without options are pruned.
+
+    Schedules come out best first as in PenaltyStrategy (A* search): skipping a preferred course costs
+    MISSING_PREFERRED_PENALTY, so schedules with more preferred courses rank higher, then soft-preference
+    penalties break ties. Every remaining course is bounded by its cheapest choice (an option still
+    compatible, or skipping when allowed).
+    """
+    MISSING_PREFERRED_PENALTY = 100
+
+    def __init__(self, selection: CourseSelection, forbidden: Optional[List[TimeSlot]] = None,
+                 constraints: Optional[ScheduleConstraints] = None,
+                 preferences: Optional[SoftPreferences] = None, travel: Optional[TravelTimes] = None):
+        """
+        Builds the compatibility table of all candidate courses.
+        :param selection: The mandatory, alternative and optional courses.
+        :param forbidden: Time slots that must stay free.
+        :param constraints: Hard constraints every schedule must satisfy.
+        :param preferences: Soft preferences giving the option penalties, None for no penalties.
+        :param travel: Walking times between buildings, None to ignore them.
+        :raises ValueError: If the selection counts are invalid.
+        """
+        selection.validate()
+        self.selection = selection
+        self.courses = selection.courses()
+        self.constraints = constraints if constraints and constraints.couples_courses() else None
+        self.table = CompatibilityTable(self.courses, forbidden, constraints, travel)
+        self.penalties = (preferences or SoftPreferences()).penalties(self.table.options)
+
+        # Role, OR-group and skip cost of every candidate course, in search order
+        self.roles: List[int] = [MANDATORY] * len(selection.mandatory)
+        self.groups: List[int] = [-1] * len(selection.mandatory)
+        for group, members in enumerate(selection.alternatives):
+            self.roles += [ALTERNATIVE] * len(members)
+            self.groups += [group] * len(members)
+        self.roles += [OPTIONAL] * len(selection.optional)
+        self.groups += [-1] * len(selection.optional)
+        self.last_in_group = [course + 1 == len(self.courses) or self.groups[course + 1] != self.groups[course]
+                              for course in range(len(self.courses))]
+        self.skip_costs = [self.MISSING_PREFERRED_PENALTY if course.course_code in selection.preferred else 0
+                           for course in self.courses]
+        self.nodes_visited = 0  # Number of partial schedules pushed on the queue
+
+    def _cheapest(self, course: int, live: int) -> Optional[int]:
+        """
+        Returns the penalty of the cheapest live option of a course, None if it has none.
+        """
+        best = None
+        for option, penalty in enumerate(self.penalties[course]):
+            if live >> option & 1 and (best is None or penalty < best):
+                best = penalty
+        return best
+
+    def _remainder(self, live: Tuple[int, ...], start: int, taken_optional: int, taken_group: int) -> Optional[int]:
+        """
+        Returns a lower bound on the cost of the courses start.., None if no complete schedule can follow.
+        :param taken_group: The OR-group that already has its course, -1 if none.
+        """
+        total = 0
+        optional_possible = 0
+        group_alive: Dict[int, bool] = {}
+        for course in range(start, len(self.courses)):
+            role = self.roles[course]
+            cheapest = self._cheapest(course, live[course])
+            if role == MANDATORY:
+                if cheapest is None:
+                    return None
+                total += cheapest
+                continue
+            skip = self.skip_costs[course]
+            if role == ALTERNATIVE and self.groups[course] == taken_group:
+                total += skip
+                continue
+            total += skip if cheapest is None else min(skip, cheapest)
+            if role == ALTERNATIVE:
+                group = self.groups[course]
+                group_alive[group] = group_alive.get(group, False) or cheapest is not None
+            elif cheapest is not None:
+                optional_possible += 1
+        if not all(group_alive.values()) or taken_optional + optional_possible < self.selection.min_optional:
+            return None
+        return total
+
+    def iter_scored_vectors(self) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        """
+        Lazily generate (penalty, option vector) of every valid schedule, best first.
+        Skipped courses have SKIPPED_OPTION in the vector.
+        """
+        count = len(self.courses)
+        if count == 0:
+            return
+        compatible = self.table.compatible
+        limit = self.selection.optional_limit()
+        live = tuple(self.table.domains)
+        root = self._remainder(live, 0, 0, -1)
+        if root is None:
+            return
+        tie = counter()
+        # Queue entries: (score, -depth, tie, penalty, chosen, live, optional courses taken, taken OR-group)
+        queue = [(root, 0, next(tie), 0, (), live, 0, -1)]
+        while queue:
+            _, negative_depth, _, penalty, chosen, live, taken_optional, taken_group = heapq.heappop(queue)
+            depth = -negative_depth
+            if depth == count:
+                if self.constraints is None or self.constraints.is_satisfied_by_slots(self.table.option_slots(chosen)):
+                    yield penalty, chosen
+                continue
+
+            role, group = self.roles[depth], self.groups[depth]
+            can_take = not ((role == ALTERNATIVE and group == taken_group) or (role == OPTIONAL and taken_optional >= limit))
+            can_skip = role == OPTIONAL or (role == ALTERNATIVE and (group == taken_group or not self.last_in_group[depth]))
+            children = []
+            if can_take:
+                for option, option_penalty in enumerate(self.penalties[depth]):
+                    if not live[depth] >> option & 1:
+                        continue
+                    row = compatible[depth][option]
+                    narrowed = live[:depth + 1] + tuple(live[other] & row[other] for other in range(depth + 1, count))
+                    children.append((option, option_penalty, narrowed, taken_optional + (role == OPTIONAL),
+                                     group if role == ALTERNATIVE else taken_group))
+            if can_skip:
+                children.append((SKIPPED_OPTION, self.skip_costs[depth], live, taken_optional, taken_group))
+
+            for option, option_penalty, narrowed, child_optional, child_group in children:
+                remainder = self._remainder(narrowed, depth + 1, child_optional, child_group)
+                if remainder is None:
+                    continue
+                self.nodes_visited += 1
+                child_penalty = penalty + option_penalty
+                heapq.heappush(queue, (child_penalty + remainder, negative_depth - 1, next(tie), child_penalty,
+                                       chosen + (option,), narrowed, child_optional, child_group))
+
+    def generate(self) -> Iterator[Schedule]:
+        """
+        Lazily generate the schedules of all allowed subsets, best first, with their penalty set.
+        """
+        for penalty, vector in self.iter_scored_vectors():
+            schedule = self.table.build_schedule(vector)
+            schedule.penalty = penalty
+            yield schedule
@@ -0,0 +1,117 @@
+from typing import Callable, List, Optional
+from src.interfaces.schedule_strategy_interface import IScheduleStrategy
+from src.models.course import Course
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.soft_preferences import SoftPreferences
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+from .compatibility_table import CompatibilityTable
+from .factorized_strategy import FactorizedStrategy
+from .local_search_strategy import LocalSearchStrategy
+from .penalty_strategy import PenaltyStrategy
+from .tree_size_estimator import TreeEstimate, estimate_tree_size
+
+# The search engines the selector picks from
+EXHAUSTIVE = "exhaustive"  # One depth-first search over all courses (CompatibilityStrategy order)
+FACTORIZED = "factorized"  # Independent course components searched apart (FactorizedStrategy)
+BACKJUMP = "backjump"  # The components searched apart with conflict-directed backjumping (BackjumpStrategy)
+BRANCH_AND_BOUND = "branch_and_bound"  # Lowest soft-preference penalty first (PenaltyStrategy)
+ANYTIME = "anytime"  # Best schedules found within a deadline (LocalSearchStrategy)
+
+# Largest selection the interface accepts; the engines above cope with it (the anytime search with anything)
+MAX_SELECTED_COURSES = 15
+
+# Random probes per conflict component for the tree-size estimate
+ESTIMATE_SAMPLES = 64
+# Largest estimated search (options placed) enumerated in full; about a second per million nodes
+EXHAUSTIVE_NODE_LIMIT = 20_000_000
+# Largest estimated search solved before the first schedule: the components other than the streamed one
+FIRST_RESULT_NODE_LIMIT = 1_000_000
+# Largest estimated search for the best-first search, whose queue grows with the nodes it expands
+BRANCH_AND_BOUND_NODE_LIMIT = 1_000_000
+# Backjumping costs about twice as much per node, so it is only used on a component whose estimated search
+# places this many options per schedule (dead ends the jumps skip), and at least BACKJUMP_MIN_NODES of them
+BACKJUMP_DEAD_END_RATIO = 8
+BACKJUMP_MIN_NODES = 10_000
+
+
+class StrategySelector:
+    """
+    Picks the search engine for a selection of any size from an estimate of its search tree.
+    The tree of every conflict component is sized by random probing (see estimate_tree_size), a few
+    milliseconds even for 15 courses, so choosing never delays the first schedule noticeably:
+    - with soft preferences, a tree up to BRANCH_AND_BOUND_NODE_LIMIT gets the best-first search
+    - otherwise, if the whole tree is small enough to enumerate and the components solved upfront are small
+      enough not to delay the first schedule, every schedule is enumerated, component by component when
+      the courses split into independent components, and with backjumping when a component's search is
+      mostly dead ends (BACKJUMP_DEAD_END_RATIO)
+    - anything larger gets the anytime local search, which returns its best schedules within a deadline
+    """
+    def __init__(self, selected: List[Course], forbidden: Optional[List[TimeSlot]] = None,
+                 constraints: Optional[ScheduleConstraints] = None,
+                 preferences: Optional[SoftPreferences] = None, travel: Optional[TravelTimes] = None,
+                 samples: int = ESTIMATE_SAMPLES):
+        """
+        Builds the compatibility table of the selected courses and estimates the tree of every component.
+        :param selected: List of courses to be included (any number).
+        :param forbidden: Time slots that must stay free.
+        :param constraints: Hard constraints every schedule must satisfy.
+        :param preferences: Soft preferences, None or empty for none.
+        :param travel: Walking times between buildings, None to ignore them.
+        :param samples: Random probes per component.
+        """
+        self._selected = selected
+        self._forbidden = forbidden
+        self._constraints = constraints
+        self._preferences = preferences if preferences is not None and not preferences.is_empty() else None
+        self._travel = travel
+        self.table = CompatibilityTable(selected, forbidden, constraints, travel)
+        if constraints is not None and constraints.couples_courses():
+            self.components = [list(range(len(selected)))] if selected else []
+        else:
+            self.components = self.table.conflict_components()
+        # Estimated tree of every component, in FactorizedStrategy order (the first one is streamed)
+        self.estimates: List[TreeEstimate] = [estimate_tree_size(self.table, courses, samples)
+                                              for courses in self.components]
+        self.engine = self._choose()
+
+    def estimated_nodes(self) -> float:
+        """
+        Returns the estimated number of options placed by an exhaustive search of all components.
+        """
+        return sum(estimate.nodes for estimate in self.estimates)
+
+    def estimated_schedules(self) -> float:
+        """
+        Returns the estimated number of valid schedules (the product over the components).
+        """
+        total = 1.0
+        for estimate in self.estimates:
+            total *= estimate.leaves
+        return total if self.estimates else 0.0
+
+    def _choose(self) -> str:
+        if self._preferences is not None:
+            return BRANCH_AND_BOUND if self.estimated_nodes() <= BRANCH_AND_BOUND_NODE_LIMIT else ANYTIME
+        upfront = sum(estimate.nodes for estimate in self.estimates[1:])
+        if self.estimated_nodes() <= EXHAUSTIVE_NODE_LIMIT and upfront <= FIRST_RESULT_NODE_LIMIT:
+            if any(estimate.nodes >= max(BACKJUMP_MIN_NODES, BACKJUMP_DEAD_END_RATIO * estimate.leaves)
+                   for estimate in self.estimates):
+                return BACKJUMP
+            return FACTORIZED if len(self.components) > 1 else EXHAUSTIVE
+        return ANYTIME
+
+    def build(self, deadline: float = 10.0, cancel: Optional[Callable[[], bool]] = None) -> IScheduleStrategy:
+        """
+        Returns the chosen strategy. The exhaustive engines try the best options first (quality_order).
+        :param deadline: Seconds the anytime search runs.
+        :param cancel: Called regularly by the anytime search, which stops when it returns True.
+        """
+        if self.engine == BRANCH_AND_BOUND:
+            return PenaltyStrategy(self._selected, self._forbidden, self._constraints, self._preferences,
+                                   self._travel)
+        if self.engine == ANYTIME:
+            return LocalSearchStrategy(self._selected, self._forbidden, self._constraints, self._preferences,
+                                       self._travel, deadline=deadline, cancel=cancel)
+        return FactorizedStrategy(self._selected, self._forbidden, self._constraints, self._travel,
+                                  quality_order=True, backjump=self.engine == BACKJUMP)
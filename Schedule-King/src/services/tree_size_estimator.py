@@ -0,0 +1,105 @@
+import random
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+from src.models.schedule_constraints import ScheduleConstraints
+from .compatibility_table import CompatibilityTable, popcount
+
+class TreeEstimate(NamedTuple):
+    nodes: float  # Expected number of options the search places (CompatibilityStrategy.nodes_visited)
+    leaves: float  # Expected number of complete schedules, before constraints linking several courses
+
+
+def probe_tree(table: CompatibilityTable, courses: Sequence[int], rng: random.Random,
+               constraints: Optional[ScheduleConstraints] = None) -> TreeEstimate:
+    """
+    Walks down one random path of the forward-checking search tree of CompatibilityStrategy, choosing a
+    random live option per course (one Knuth probe). The product of the numbers of live options met along
+    the path is an unbiased estimate of the number of nodes at that depth.
+    :param table: The compatibility table of the selected courses.
+    :param courses: Indices of the courses to search, in search order.
+    :param rng: Source of the random choices.
+    :param constraints: Constraints linking several courses, checked on the complete schedule so that it only
+                        counts as a leaf if it satisfies them. Needs courses to cover every course of the table.
+    :return: The estimated number of nodes and leaves of this probe.
+    """
+    nodes, leaves, _ = _walk(table, courses, rng, constraints, choose_last=constraints is not None)
+    return TreeEstimate(nodes, leaves)
+
+
+def sample_leaf(table: CompatibilityTable, courses: Sequence[int], rng: random.Random) -> Tuple[float, Optional[List[int]]]:
+    """
+    Draws one random schedule of the search tree with its Knuth weight (see probe_tree): averaging a quantity
+    of the drawn schedules times their weights estimates its sum over all schedules.
+    :return: The weight and the option per course of the table (only the given courses are set),
+             or (0, None) if the probe did not reach a schedule.
+    """
+    _, weight, chosen = _walk(table, courses, rng, None, choose_last=True)
+    return (weight, chosen) if weight else (0.0, None)
+
+
+def _walk(table: CompatibilityTable, courses: Sequence[int], rng: random.Random,
+          constraints: Optional[ScheduleConstraints], choose_last: bool) -> Tuple[float, float, List[int]]:
+    """
+    Walks one random path. Returns the node estimate, the leaf weight (0 if the path died) and the options chosen.
+    :param choose_last: Also choose an option of the last course; otherwise the path stops once it is reached.
+    """
+    live = {course: table.domains[course] for course in courses}
+    chosen = [0] * len(table.domains)
+    weight = 1.0
+    nodes = 0.0
+    for position, course in enumerate(courses):
+        width = popcount(live[course])
+        if not width:
+            break
+        weight *= width
+        nodes += weight
+        if position == len(courses) - 1 and not choose_last:
+            return nodes, weight, chosen
+        option = _nth_bit(live[course], rng.randrange(width))
+        chosen[course] = option
+        if position == len(courses) - 1:
+            # Every option of the last course is a complete schedule, one of them stands for all
+            if constraints is None or constraints.is_satisfied_by_slots(table.option_slots(chosen)):
+                return nodes, weight, chosen
+            break
+        row = table.compatible[course][option]
+        later = courses[position + 1:]
+        for other in later:
+            live[other] &= row[other]
+        # Forward checking drops the option itself when a later course runs empty
+        if not all(live[other] for other in later):
+            break
+    return nodes, 0.0, chosen
+
+
+def _nth_bit(bits: int, index: int) -> int:
+    """
+    Returns the position of the index-th set bit of bits, lowest first.
+    """
+    for _ in range(index):
+        bits &= bits - 1
+    return (bits & -bits).bit_length() - 1
+
+
+def estimate_tree_size(table: CompatibilityTable, courses: Optional[Sequence[int]] = None, samples: int = 64,
+                       seed: int = 0) -> TreeEstimate:
+    """
+    Estimates the size of the forward-checking search tree of CompatibilityStrategy without searching it
+    (Knuth's random probing, see probe_tree). The estimates of all probes are averaged.
+    Day and gap limits are not applied, so the estimate is an upper bound of the search they prune.
+    :param table: The compatibility table of the selected courses.
+    :param courses: Indices of the courses to search (e.g. one conflict component), None for all of them.
+    :param samples: Number of random probes, each costing one pass over the pairs of courses.
+    :param seed: Seed of the probes, the same seed gives the same estimate.
+    :return: The estimated number of nodes and leaves.
+    """
+    courses = sorted(courses) if courses is not None else list(range(len(table.domains)))
+    if not courses:
+        return TreeEstimate(0.0, 0.0)
+    rng = random.Random(seed)
+    total_nodes = 0.0
+    total_leaves = 0.0
+    for _ in range(samples):
+        probe = probe_tree(table, courses, rng)
+        total_nodes += probe.nodes
+        total_leaves += probe.leaves
+    return TreeEstimate(total_nodes / samples, total_leaves / samples)
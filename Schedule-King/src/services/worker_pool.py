@@ -0,0 +1,280 @@
+import multiprocessing as mp
+import os
+import queue as queue_module
+import time
+import traceback
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence, Union
+from src.models.course import Course
+from src.models.course_selection import CourseSelection
+from src.models.option_table import OptionTable
+from src.models.travel_times import TravelTimes
+
+# Workers started with the pool, and the most it grows to when no idle worker of the right priority is left
+POOL_SIZE = 2
+MAX_POOL_SIZE = 4
+
+# Control messages of a worker's request queue
+LOAD_CATALOG = "load"
+GENERATE = "generate"
+
+
+def restore_priority(pid: int) -> bool:
+    """
+    Sets the OS priority of a process that lowered its own back to normal.
+    Most systems only let a privileged process lower a niceness, so this usually fails for a plain user.
+    :return: Whether the process runs at normal priority now.
+    """
+    if not hasattr(os, "setpriority"):
+        return False
+    try:
+        os.setpriority(os.PRIO_PROCESS, pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+class _Cancellation:
+    """
+    The stop_event of one request inside a worker: set once the request id is cancelled.
+    """
+    def __init__(self, cancelled, request_id: int):
+        self._cancelled = cancelled
+        self._request_id = request_id
+
+    def is_set(self) -> bool:
+        return self._cancelled.value >= self._request_id
+
+
+class _TaggedQueue:
+    """
+    The result queue of one request inside a worker: every item is sent with the request id.
+    """
+    def __init__(self, results: mp.Queue, request_id: int):
+        self._results = results
+        self._request_id = request_id
+
+    def put(self, item) -> None:
+        self._results.put((self._request_id, item))
+
+
+def _serve(generate: Callable, requests: mp.Queue, results: mp.Queue, cancelled, finished,
+           travel: Optional[TravelTimes]) -> None:
+    """
+    Main loop of a worker: keeps the catalog it was sent, with its options compiled, and runs one generation
+    request after the other until it gets None. A request names its courses by code when they come from
+    that catalog, so only a small control message crosses the process boundary.
+    """
+    catalog: Dict[str, Course] = {}
+    while True:
+        message = requests.get()
+        if message is None:
+            return
+        kind, request_id, payload = message
+        if kind == LOAD_CATALOG:
+            catalog = {course.course_code: course for course in payload}
+            OptionTable.preload(payload)
+            continue
+        selected, forbidden, constraints, preferences, limits, resume_after, low_priority = payload
+        if selected and isinstance(selected[0], str):
+            selected = [catalog[code] for code in selected]
+        stop_event = _Cancellation(cancelled, request_id)
+        try:
+            generate(selected, _TaggedQueue(results, request_id), stop_event, forbidden, constraints, preferences,
+                     travel, limits, resume_after, low_priority)
+        except Exception:
+            # The worker survives a failed request, whose stream just ends
+            traceback.print_exc()
+            if not stop_event.is_set():
+                results.put((request_id, None))
+        finished.value = request_id
+
+
+class _Worker:
+    """
+    One long-lived worker process with its request and result queues, seen from the application.
+    """
+    def __init__(self, generate: Callable, travel: Optional[TravelTimes]):
+        self.requests = mp.Queue()
+        self.results = mp.Queue()
+        self.cancelled = mp.Value("q", 0, lock=False)  # Requests up to this id are cancelled
+        self.finished = mp.Value("q", 0, lock=False)  # Requests up to this id are done
+        self.assigned = 0  # Id of the latest request sent
+        self.niced = False  # Whether a low-priority request lowered the worker's OS priority (see restore_priority)
+        self._pending = deque()  # Items of the assigned request already taken from the result queue
+        self.process = mp.Process(target=_serve, args=(generate, self.requests, self.results, self.cancelled,
+                                                       self.finished, travel), daemon=True)
+        self.process.start()
+
+    def is_idle(self) -> bool:
+        return self.process.is_alive() and self.finished.value >= self.assigned
+
+    def is_cancelled(self) -> bool:
+        """
+        Returns whether the worker's latest request is cancelled, even if its run has not stopped yet.
+        """
+        return self.cancelled.value >= self.assigned
+
+    def assign(self, request_id: int, payload: tuple) -> None:
+        self.assigned = request_id
+        self._pending.clear()
+        self.requests.put((GENERATE, request_id, payload))
+
+    def receive(self, request_id: int, block: bool, timeout: Optional[float]):
+        """
+        Returns the next item of a request, dropping those left by earlier requests.
+        A cancelled request, or one superseded by a later one, has nothing more to receive.
+        :raises queue.Empty: If no item arrives (in time).
+        """
+        self._fill(request_id, block, timeout)
+        return self._pending.popleft()
+
+    def has_item(self, request_id: int) -> bool:
+        """
+        Returns whether an item of a request can be received right away.
+        """
+        try:
+            self._fill(request_id, False, None)
+        except queue_module.Empty:
+            return False
+        return True
+
+    def _fill(self, request_id: int, block: bool, timeout: Optional[float]) -> None:
+        # Takes items from the result queue until one of the request is pending
+        deadline = time.monotonic() + timeout if block and timeout is not None else None
+        while True:
+            if request_id != self.assigned:
+                raise queue_module.Empty
+            if self.cancelled.value >= request_id:
+                self._pending.clear()
+                raise queue_module.Empty
+            if self._pending:
+                return
+            remaining = max(deadline - time.monotonic(), 0.0) if deadline is not None else None
+            received_id, item = self.results.get(block, remaining)
+            if received_id == self.assigned:
+                self._pending.append(item)
+
+    def stop(self) -> None:
+        if self.process.is_alive():
+            self.requests.put(None)
+
+
+class RequestStream:
+    """
+    The schedules of one generation request, read like the multiprocessing queue of a one-off worker:
+    batches of schedules and the other items of ScheduleAPI._worker_generate, then None.
+    """
+    def __init__(self, worker: _Worker, request_id: int):
+        self.worker = worker
+        self.request_id = request_id
+
+    def empty(self) -> bool:
+        return not self.worker.has_item(self.request_id)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        return self.worker.receive(self.request_id, block, timeout)
+
+
+class WorkerPool:
+    """
+    Long-lived generation workers, started once when the application launches.
+    Every worker keeps the loaded catalog with its options compiled (see OptionTable.preload), so a request
+    for courses of that catalog sends only their codes and the generation settings, with no process to
+    spawn and no modules to import. A cancelled request sets a shared counter the worker checks between
+    schedules; its stream is empty from then on, and once the run stops the worker takes new requests, the
+    remaining items of the cancelled run being dropped by request id.
+    A new request only goes to an idle worker whose OS priority matches (a low-priority run lowers it, and
+    only restore_priority may raise it again), never behind a cancelled run: some searches go a long while
+    between two checks. Without one the pool grows, up to MAX_POOL_SIZE, past which a worker still busy with
+    a cancelled run is replaced first, then the one used longest ago.
+    """
+    def __init__(self, generate: Callable, travel: Optional[TravelTimes] = None, size: int = POOL_SIZE):
+        """
+        Starts the workers.
+        :param generate: The generation run by a worker, with the signature of ScheduleAPI._worker_generate.
+        :param travel: Walking times between buildings, None to ignore them.
+        :param size: Workers started now.
+        """
+        self._generate = generate
+        self._travel = travel
+        self._catalog: List[Course] = []
+        self._codes: Dict[str, Course] = {}
+        self._next_id = 0
+        self.workers: List[_Worker] = [_Worker(generate, travel) for _ in range(size)]
+
+    def load_catalog(self, courses: List[Course]) -> None:
+        """
+        Sends a parsed catalog to every worker, once; requests for its courses then name them by code.
+        """
+        self._catalog = list(courses)
+        self._codes = {course.course_code: course for course in courses}
+        for worker in self.workers:
+            worker.requests.put((LOAD_CATALOG, 0, self._catalog))
+
+    def submit(self, selected_courses: Union[List[Course], CourseSelection], forbidden=None, constraints=None,
+               preferences=None, limits=None, resume_after: Optional[Sequence[int]] = None,
+               low_priority: bool = False) -> RequestStream:
+        """
+        Starts a generation on a free worker (see ScheduleAPI._worker_generate for the arguments).
+        :return: The stream of the request's items.
+        """
+        worker = self._free_worker(low_priority)
+        self._next_id += 1
+        selected = selected_courses
+        if not isinstance(selected_courses, CourseSelection) and all(
+                self._codes.get(course.course_code) is course for course in selected_courses):
+            selected = [course.course_code for course in selected_courses]
+        worker.assign(self._next_id, (selected, forbidden, constraints, preferences, limits, resume_after,
+                                      low_priority and not worker.niced))
+        worker.niced = worker.niced or low_priority
+        return RequestStream(worker, self._next_id)
+
+    def cancel(self, stream: RequestStream) -> None:
+        """
+        Cancels a request: its stream is empty from now on, and its worker stops at its next check and
+        takes new requests.
+        """
+        cancelled = stream.worker.cancelled
+        cancelled.value = max(cancelled.value, stream.request_id)
+
+    def restore_priority(self, stream: RequestStream) -> bool:
+        """
+        Raises the worker of a low-priority request back to normal OS priority, when its run becomes one the
+        user waits for. Where the OS refuses (see restore_priority), the run goes on at low priority and
+        its worker only takes low-priority requests afterwards.
+        :return: Whether the request's worker runs at normal priority now.
+        """
+        worker = stream.worker
+        if worker.niced and restore_priority(worker.process.pid):
+            worker.niced = False
+        return not worker.niced
+
+    def shutdown(self) -> None:
+        """
+        Cancels every request and lets the workers exit.
+        """
+        for worker in self.workers:
+            worker.cancelled.value = max(worker.cancelled.value, worker.assigned)
+            worker.stop()
+
+    def _free_worker(self, low_priority: bool) -> _Worker:
+        # Drop dead workers, then take an idle worker of the right priority, any idle one for a low-priority
+        # run, and only then start another worker
+        self.workers = [worker for worker in self.workers if worker.process.is_alive()]
+        idle = [worker for worker in self.workers if worker.is_idle()]
+        for worker in idle:
+            if worker.niced == low_priority:
+                return worker
+        if low_priority and idle:
+            return idle[0]
+        if len(self.workers) >= MAX_POOL_SIZE:
+            replaced = min(self.workers, key=lambda worker: (not worker.is_cancelled() or worker.is_idle(),
+                                                             worker.assigned))
+            replaced.process.terminate()
+            self.workers.remove(replaced)
+        worker = _Worker(self._generate, self._travel)
+        if self._catalog:
+            worker.requests.put((LOAD_CATALOG, 0, self._catalog))
+        self.workers.append(worker)
+        return worker
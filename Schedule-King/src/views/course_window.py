@@ -3,16 +3,24 @@ from PyQt5.QtWidgets import (
     QHBoxLayout, QWidget, QSizePolicy, QMessageBox,
     QPushButton, QDialog
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QIcon, QFont
-from typing import List, Callable
+from typing import List, Callable, Optional
 from src.models.course import Course
 from src.components.course_selector import CourseSelector
 from src.components.constraint_dialog import ConstraintDialog
+from src.services.feasibility_counter import FeasibilityCounter
+from src.services.catalog_index import CatalogIndex
+from src.services.strategy_selector import MAX_SELECTED_COURSES
 import os
 from src.models.time_slot import TimeSlot
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.soft_preferences import SoftPreferences
 from src.styles.ui_styles import red_button_style, blue_button_style
 
+# Milliseconds the selection must stay unchanged before it is generated speculatively
+SPECULATION_DELAY_MS = 500
+
 class CourseWindow(QMainWindow):
     def __init__(self, maximize_on_start=True):
         super().__init__()
@@ -30,6 +38,13 @@ class CourseWindow(QMainWindow):
         # Connect signals from the course selector to corresponding methods
         self.courseSelector.coursesSubmitted.connect(self.navigateToSchedulesWindow)
         self.courseSelector.loadRequested.connect(self.load_courses_from_file)
+        self.courseSelector.coursesSelected.connect(self._schedule_speculation)
+
+        # Debounce timer: the selection is generated in the background once it stops changing
+        self.speculation_timer = QTimer(self)
+        self.speculation_timer.setSingleShot(True)
+        self.speculation_timer.setInterval(SPECULATION_DELAY_MS)
+        self.speculation_timer.timeout.connect(self._speculate)
 
         # === Layout Setup ===
         # Create a vertical layout for the main content
@@ -43,6 +58,10 @@ class CourseWindow(QMainWindow):
         # === Time Constraints Section ===
         # Store forbidden time slots
         self.forbidden_slots = set()
+        # Store schedule-wide limits (days, hours, gaps)
+        self.schedule_constraints = ScheduleConstraints()
+        # Store soft preferences (avoided buildings, preferred instructors, early classes)
+        self.soft_preferences = SoftPreferences()
         
         # Create constraint button and add it to the CourseSelector's button layout
         self.constraintBtn = QPushButton("Set Time Constraints")
@@ -66,22 +85,65 @@ class CourseWindow(QMainWindow):
         # External callbacks for handling events
         self.on_courses_loaded: Callable[[str], None] = lambda path: None  # Callback for when courses are loaded
         self.on_continue: Callable[[List[Course]], None] = lambda selected: None  # Callback for when user continues
+        # Builds the live schedule count of the constraint dialog: (selected, constraints) -> FeasibilityCounter
+        self.feasibility_counter_factory: Callable[..., Optional[FeasibilityCounter]] = lambda selected, constraints: None
+        # Builds the index of the loaded catalog that marks the courses still fitting: (courses) -> CatalogIndex
+        self.catalog_index_factory: Callable[[List[Course]], Optional[CatalogIndex]] = lambda courses: None
+        # Callback for when the selection settled: (selected, forbidden, constraints, preferences)
+        self.on_selection_changed: Callable[..., None] = lambda selected, forbidden, constraints, preferences: None
 
         # Note: The courseSelector.clear_button only clears course selections, not time constraints
         # Time constraints are managed independently through the constraint dialog
 
     def _open_constraint_dialog(self):
         """Open the constraint selection dialog"""
-        dialog = ConstraintDialog(self, self.forbidden_slots)
+        selected = self.handleSelection()
+        counter = None
+        if selected and len(selected) <= MAX_SELECTED_COURSES:
+            counter = self.feasibility_counter_factory(selected, self.schedule_constraints)
+        dialog = ConstraintDialog(self, self.forbidden_slots, self.schedule_constraints, self.soft_preferences,
+                                  counter)
         if dialog.exec_() == QDialog.Accepted:
             forbidden_cells = dialog.get_constraints()
             self.forbidden_slots = forbidden_cells
+            self.schedule_constraints = dialog.get_schedule_constraints()
+            self.soft_preferences = dialog.get_soft_preferences()
             # Update button text to show number of constraints
             count = len(self.forbidden_slots)
             if count > 0:
                 self.constraintBtn.setText(f"Time Constraints ({count} slots)")
+            elif not self.schedule_constraints.is_empty() or not self.soft_preferences.is_empty():
+                self.constraintBtn.setText("Time Constraints (limits set)")
             else:
                 self.constraintBtn.setText("Set Time Constraints")
+            self._schedule_speculation()
+
+    def _schedule_speculation(self, *args):
+        """Restart the debounce timer after a change of the selection or the constraints"""
+        self.speculation_timer.start()
+
+    def _speculate(self):
+        """
+        Report the settled selection so it can be generated before the user continues.
+        A selection over the limit is reported empty, which only cancels the previous one.
+        """
+        selected = self.handleSelection()
+        if len(selected) > MAX_SELECTED_COURSES:
+            selected = []
+        self.on_selection_changed(selected, self._forbidden_time_slots(), self.schedule_constraints,
+                                  self.soft_preferences)
+
+    def _forbidden_time_slots(self) -> List[TimeSlot]:
+        """
+        Convert the forbidden cells to TimeSlot objects.
+        """
+        forbidden = []
+        for row, col in self.forbidden_slots:
+            day_index = col + 1  # Sunday=1
+            start_time = f"{8+row:02d}:00"
+            end_time = f"{8+row+1:02d}:00"
+            forbidden.append(TimeSlot(day=str(day_index), start_time=start_time, end_time=end_time, room="", building=""))
+        return forbidden
 
 
     def displayCourses(self, courses: List[Course]):
@@ -89,6 +151,7 @@ class CourseWindow(QMainWindow):
         Populate the course selector with a list of courses.
         """
         self.courseSelector.populate_courses(courses)
+        self.courseSelector.course_list.set_catalog_index(self.catalog_index_factory(courses))
 
     def handleSelection(self) -> List[Course]:
         """
@@ -102,24 +165,25 @@ class CourseWindow(QMainWindow):
         """
         if hasattr(self.courseSelector, 'close_progress_bar'):
             self.courseSelector.close_progress_bar()
+        # The selection is confirmed now, a pending speculation is moot
+        self.speculation_timer.stop()
 
         selected = self.handleSelection()
         if selected:
             # Check if the number of selected courses exceeds the limit
-            if len(selected) > 7:
+            if len(selected) > MAX_SELECTED_COURSES:
                 # Display a warning message to the user
-                QMessageBox.warning(self, "Warning", "You cannot select more than 7 courses.")
+                QMessageBox.warning(self, "Warning", f"You cannot select more than {MAX_SELECTED_COURSES} courses.")
                 return  # Exit the method to prevent further processing
                     
         # Convert forbidden cells to TimeSlot objects
-        forbidden = []
-        for row, col in self.forbidden_slots:
-            day_index = col + 1  # Sunday=1
-            start_time = f"{8+row:02d}:00"
-            end_time = f"{8+row+1:02d}:00"
-            forbidden.append(TimeSlot(day=str(day_index), start_time=start_time, end_time=end_time, room="", building=""))
+        forbidden = self._forbidden_time_slots()
 
-        if forbidden:
+        if not self.soft_preferences.is_empty():
+            self.on_continue(selected, forbidden, self.schedule_constraints, self.soft_preferences)
+        elif not self.schedule_constraints.is_empty():
+            self.on_continue(selected, forbidden, self.schedule_constraints)
+        elif forbidden:
             self.on_continue(selected, forbidden)
         else:
             self.on_continue(selected)
@@ -11,8 +11,11 @@ from src.components.schedule_progress import ScheduleProgress
 from src.components.full_size_window import FullSizeWindow
 from src.components.ScheduleMetrics import ScheduleMetrics
 from src.models.schedule import Schedule
+from src.models.infeasibility_core import InfeasibilityCore
 from src.controllers.ScheduleController import ScheduleController
 from src.components.ranking_controls import RankingControls
+from src.components.similar_schedules import SimilarSchedules
+from src.components.metric_facets import MetricFacets
 from typing import List, Optional
 import os
 
@@ -55,6 +58,7 @@ class ScheduleWindow(QMainWindow):
         self.schedules = schedules
         self.first_schedule_shown = False
         self.full_size_window = None
+        self.similar_cycle: List[int] = []  # Ranked indices cycled through by the "Swap a Course" button
         self.on_back = lambda: None  # Default no-op callback for navigation back to course selection
 
         # Create header and metrics components
@@ -112,6 +116,10 @@ class ScheduleWindow(QMainWindow):
         self.ranking_controls.setObjectName("ranking_controls")
         nav_container.addWidget(self.ranking_controls)
 
+        # Add "more like this" controls
+        self.similar_controls = SimilarSchedules()
+        nav_container.addWidget(self.similar_controls)
+
         # Add full size button
         self.full_size_button = QPushButton()
         self.full_size_button.setObjectName("nav_button")
@@ -155,10 +163,24 @@ class ScheduleWindow(QMainWindow):
         wrapper.addStretch(1)
         self.main_layout.addLayout(wrapper)
 
-        # Create schedule table (Keep existing setup)
+        # Explanation shown when the selection has no schedule at all
+        self.core_label = QLabel()
+        self.core_label.setObjectName("progress_label")
+        self.core_label.setAlignment(Qt.AlignCenter)
+        self.core_label.setWordWrap(True)
+        self.core_label.setVisible(False)
+        self.main_layout.addWidget(self.core_label)
+
+        # Create schedule table (Keep existing setup) with the live facets panel beside it
+        content_layout = QHBoxLayout()
+        content_layout.setSpacing(15)
         self.schedule_table = ScheduleTable()
         self.schedule_table.setObjectName("enhanced_table")
-        self.main_layout.addWidget(self.schedule_table, 1)
+        content_layout.addWidget(self.schedule_table, 1)
+
+        self.facets = MetricFacets()
+        content_layout.addWidget(self.facets)
+        self.main_layout.addLayout(content_layout, 1)
         
     def setup_connections(self):
         """Setup signal connections between components"""
@@ -177,9 +199,19 @@ class ScheduleWindow(QMainWindow):
         # Connect controller callbacks
         self.controller.on_schedules_generated = self.on_schedule_generated
         self.controller.on_progress_updated = self.progress.update_progress
+        self.controller.on_estimate_updated = self.progress.update_estimate
+        self.controller.on_retention_updated = self.progress.update_retention
+        self.controller.on_infeasible = self.on_infeasible
 
         # Connect ranking controls to controller
         self.ranking_controls.preference_changed.connect(self.on_preference_changed)
+
+        # Connect similarity controls
+        self.similar_controls.swap_requested.connect(self.on_swap_requested)
+        self.similar_controls.fewer_days_requested.connect(self.on_fewer_days_requested)
+
+        # Connect facet rows
+        self.facets.facet_selected.connect(self.on_facet_selected)
         
     def show_initial_schedule(self):
         """Display the first schedule if available"""
@@ -276,8 +308,12 @@ class ScheduleWindow(QMainWindow):
         Updates the navigator, table, and export controls.
         """
         self.navigator.set_schedules(schedules_num)
+        # Refresh the live distributions (read from counters, no scan of the schedules)
+        self.facets.update_facets(self.controller.get_metric_facets())
         if self.schedules != schedules_num:
             self.schedules = schedules_num
+            # New schedules shift ranked indices, so restart any similarity cycle
+            self.similar_cycle = []
             if schedules_num > 0 and not self.first_schedule_shown:
                 self.navigator.current_index = 0
                 self.on_schedule_changed(0)
@@ -294,11 +330,24 @@ class ScheduleWindow(QMainWindow):
         if not self.controller.generation_active and  schedules_num<=0:
             self.progress.hide_progress()
 
+    def on_infeasible(self, core: InfeasibilityCore):
+        """
+        Explains why no schedule exists, naming the smallest set of conflicting courses and blocked times.
+        The near-miss schedules of the core, if any, are browsed like regular schedules.
+        """
+        text = f"No schedule exists: {core.describe()} Without any one of them the rest fits."
+        if core.near_misses:
+            text += f" Showing the {len(core.near_misses)} closest schedules, their violations are framed in red."
+        self.core_label.setText(text)
+        self.core_label.setVisible(True)
+
     def on_preference_changed(self, metric, ascending):
         """
         Handle changes in ranking preferences.
         Updates the controller and refreshes the schedule display.
         """
+        # Ranked indices of the similarity cycle are no longer valid
+        self.similar_cycle = []
         if metric is None:
             # Clear preference
             self.controller.clear_preference()
@@ -310,6 +359,62 @@ class ScheduleWindow(QMainWindow):
         if self.navigator.current_index < self.schedules:
             self.on_schedule_changed(self.navigator.current_index)
             
+    def on_facet_selected(self, metric, grade: int):
+        """
+        Handle a click on a facet row: sort ascending by the facet metric
+        and jump to the first schedule of the clicked bucket.
+        """
+        index = self.controller.get_first_schedule_with_grade(metric, grade)
+        # Reflect the new ordering in the ranking controls without re-emitting it
+        self.ranking_controls.blockSignals(True)
+        self.ranking_controls.set_preference(metric, True)
+        self.ranking_controls.blockSignals(False)
+        self.similar_cycle = []
+        if 0 <= index < self.schedules:
+            self.jump_to_schedule(index)
+
+    def jump_to_schedule(self, index: int):
+        """
+        Move the navigator to the given ranked index and display that schedule.
+        """
+        self.navigator.current_index = index
+        self.navigator.update_display()
+        self.on_schedule_changed(index)
+
+    def on_swap_requested(self):
+        """
+        Show the current schedule with one course swapped.
+        Repeated clicks cycle through all one-swap alternatives of the same schedule.
+        """
+        current = self.navigator.current_index
+        if not self.schedules or not (0 <= current < self.schedules):
+            QMessageBox.warning(self, "No Schedule", "No schedule is currently selected.")
+            return
+
+        if current not in self.similar_cycle:
+            self.similar_cycle = [current] + self.controller.get_similar_schedules(current)
+        if len(self.similar_cycle) < 2:
+            QMessageBox.information(self, "No Alternatives", "No schedule differs from this one by a single course.")
+            return
+
+        position = (self.similar_cycle.index(current) + 1) % len(self.similar_cycle)
+        self.jump_to_schedule(self.similar_cycle[position])
+
+    def on_fewer_days_requested(self):
+        """
+        Show the most similar schedule with fewer active days than the current one.
+        """
+        current = self.navigator.current_index
+        if not self.schedules or not (0 <= current < self.schedules):
+            QMessageBox.warning(self, "No Schedule", "No schedule is currently selected.")
+            return
+
+        index = self.controller.get_fewer_days_schedule(current)
+        if index is None:
+            QMessageBox.information(self, "No Alternatives", "No generated schedule has fewer active days.")
+            return
+        self.jump_to_schedule(index)
+
     def navigateToCourseWindow(self):
         """
         Navigate back to course selection.
@@ -1,8 +1,15 @@
+import os
+import queue
 import pytest
 from src.controllers.ScheduleController import ScheduleController
+from src.services import schedule_api
 from src.services.schedule_api import ScheduleAPI
+from src.models.search_checkpoint import SearchCheckpoint
 from src.models.schedule import Schedule
 from src.models.Preference import Preference, Metric
+from src.models.schedule_ranker import ScheduleRanker, StoredSchedules
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.soft_preferences import SoftPreferences
 
 # ——— RAW_DATA ————————————————————————————————
 RAW_DATA = """
@@ -37,6 +44,29 @@ def api():
 def controller(api):
     return ScheduleController(api)
 
+class InlineAPI(ScheduleAPI):
+    """
+    Runs the generation worker in this process; with stop_after, it is interrupted once that many items are queued.
+    """
+    def __init__(self, stop_after=None):
+        super().__init__()
+        self.stop_after = stop_after
+        self.resumed_from = []
+
+    def generate_schedules_in_parallel(self, selected_courses, forbidden=None, constraints=None, preferences=None,
+                                       limits=None, resume_after=None, low_priority=False):
+        self.resumed_from.append(resume_after)
+        results = queue.Queue()
+        stop_after = self.stop_after
+
+        class Interrupt:
+            def is_set(self):
+                return stop_after is not None and results.qsize() >= stop_after
+
+        self._worker_generate(selected_courses, results, Interrupt(), forbidden, constraints, preferences,
+                              self.travel_times, limits, resume_after)
+        return results
+
 def wait_for_generation(controller):
     # Manually poll until generation completes
     while controller.generation_active:
@@ -165,4 +195,143 @@ def test_progress_tracking(controller, api, courses_txt):
     
     # Verify final progress shows completion
     final_progress = progress_updates[-1]
-    assert final_progress[0] == final_progress[1]  # current equals total
\ No newline at end of file
+    assert final_progress[0] == final_progress[1]  # current equals total
+def test_bounded_controller_reports_retention(api, courses_txt):
+    # A controller with a tiny budget evicts schedules and reports seen versus kept
+    controller = ScheduleController(api, max_schedules=1)
+    assert controller.ranker.is_bounded()
+    # Keep only the Pareto front so exactly one of the two equal schedules survives
+    controller.ranker = ScheduleRanker(max_schedules=1, top_n=0, reservoir_size=0)
+    reported = []
+    controller.on_retention_updated = lambda seen, kept: reported.append((seen, kept))
+    controller.generate_schedules(api.get_courses(courses_txt))
+    wait_for_generation(controller)
+
+    assert controller.ranker.seen_count() == 2
+    assert controller.ranker.size() == 1
+    assert reported[-1] == (2, 1)
+
+def test_spilled_session_can_be_reopened(api, courses_txt, tmp_path):
+    # Every schedule goes to an on-disk session that a new controller can reopen
+    controller = ScheduleController(api, memory_budget_mb=1, spill_directory=str(tmp_path))
+    courses = api.get_courses(courses_txt)
+    controller.generate_schedules(courses)
+    wait_for_generation(controller)
+    assert not controller.ranker.is_bounded()
+    assert controller.store.complete
+    schedules = controller.get_schedules()
+    assert len(schedules) == 2
+
+    reopened = ScheduleController(api)
+    assert reopened.open_session(controller.store.path, courses) == 2
+    assert [str(s.lecture_groups[0]) for s in reopened.get_ranked_schedules(2, 0)] == [str(s.lecture_groups[0]) for s in schedules]
+
+def test_compressed_results(api, courses_txt):
+    controller = ScheduleController(api, compress_results=True)
+    controller.generate_schedules(api.get_courses(courses_txt))
+    wait_for_generation(controller)
+    assert not isinstance(controller.ranker.schedules, list)
+    assert len(controller.get_schedules()) == 2
+    assert isinstance(controller.get_kth_schedule(1), Schedule)
+
+def test_interrupted_generation_resumes(tmp_path, monkeypatch):
+    # Checkpoint after every batch, from the first one on
+    monkeypatch.setattr(schedule_api, "CHECKPOINT_SECONDS", 0)
+    monkeypatch.setattr(schedule_api, "QUALITY_WINDOW_SECONDS", 0)
+    api = InlineAPI(stop_after=4)
+    courses = api.get_courses(os.path.join(os.path.dirname(__file__), "..", "test_files",
+                                           "courses_valid_schedule.txt"))[:5]
+    controller = ScheduleController(api, spill_directory=str(tmp_path))
+    controller.generate_schedules(courses)
+    # Batches of 1 and 9, a checkpoint (none during the quality window), then a batch of 90 it does not cover
+    controller.check_for_schedules()
+    stored = controller.ranker.size()
+    controller.stop_schedules_generation()
+    path = controller.store.path
+    checkpoint = SearchCheckpoint.load(path)
+    assert checkpoint is not None and checkpoint.results < stored
+
+    # A new controller (e.g. after a restart) picks the session up where the checkpoint left it
+    api.stop_after = None
+    resumed = ScheduleController(api, spill_directory=str(tmp_path))
+    shown = resumed.generate_schedules(courses)
+    assert resumed.store.path == path and resumed.resumed_checkpoint is not None
+    # The stored schedules stay on disk: a view of the store is returned, not a rebuilt list
+    assert isinstance(shown, StoredSchedules) and len(shown) == checkpoint.results
+    assert api.resumed_from[-1] == checkpoint.cursor and resumed.ranker.size() == checkpoint.results
+    wait_for_generation(resumed)
+    vectors = [schedule.option_indices for schedule in resumed.get_schedules()]
+    assert len(vectors) == len(set(vectors)) == 1280
+    assert resumed.store.complete and SearchCheckpoint.load(path) is None
+
+def test_other_selection_starts_new_session(tmp_path, monkeypatch):
+    monkeypatch.setattr(schedule_api, "CHECKPOINT_SECONDS", 0)
+    monkeypatch.setattr(schedule_api, "QUALITY_WINDOW_SECONDS", 0)
+    api = InlineAPI(stop_after=3)
+    courses = api.get_courses(os.path.join(os.path.dirname(__file__), "..", "test_files",
+                                           "courses_valid_schedule.txt"))[:5]
+    controller = ScheduleController(api, spill_directory=str(tmp_path))
+    controller.generate_schedules(courses)
+    controller.check_for_schedules()
+    interrupted = controller.store.path
+
+    api.stop_after = None
+    controller.generate_schedules(courses[:4])
+    wait_for_generation(controller)
+    assert controller.resumed_checkpoint is None and controller.store.path != interrupted
+    # The interrupted session stays on disk to be resumed later
+    assert SearchCheckpoint.load(interrupted) is not None
+
+def test_selection_key_covers_options(api, courses_txt, tmp_path):
+    courses = api.get_courses(courses_txt)
+    key = SearchCheckpoint.make_selection_key(courses)
+    assert SearchCheckpoint.make_selection_key(api.get_courses(courses_txt)) == key
+    # The same course codes with a tirgul moved: the option indices of a cursor mean other options
+    edited = tmp_path / "edited.txt"
+    edited.write_text(RAW_DATA.replace("T S,2,18:00,19:00", "T S,2,08:00,09:00"), encoding="utf-8")
+    assert SearchCheckpoint.make_selection_key(api.get_courses(str(edited))) != key
+
+def test_estimate_is_reported_and_ends_exact(controller, api, courses_txt):
+    estimates = []
+    controller.on_estimate_updated = estimates.append
+    controller.generate_schedules(api.get_courses(courses_txt))
+    wait_for_generation(controller)
+
+    assert estimates[0].exact and estimates[0].schedules == 2
+    assert estimates[-1].exact and estimates[-1].eta_seconds == 0.0
+    assert controller.progress_estimate.schedules == controller.ranker.seen_count() == 2
+
+def test_speculative_run_is_adopted(api, courses_txt):
+    inline = InlineAPI()
+    controller = ScheduleController(inline)
+    courses = api.get_courses(courses_txt)
+    # Empty constraints and preferences select the same schedules as none
+    controller.speculate(courses, [], ScheduleConstraints(), SoftPreferences())
+    wait_for_generation(controller)
+    assert controller.speculation_key is not None
+
+    counts = []
+    controller.on_schedules_generated = counts.append
+    controller.generate_schedules(courses)
+    assert len(inline.resumed_from) == 1  # No second worker
+    assert controller.speculation_key is None
+    assert controller.time_to_first_schedule == 0.0
+    assert counts == [2] and controller.progress_estimate.exact
+
+def test_changed_selection_cancels_speculation(api, courses_txt):
+    inline = InlineAPI()
+    controller = ScheduleController(inline)
+    courses = api.get_courses(courses_txt)
+    controller.speculate(courses)
+    controller.speculate(courses)  # Unchanged, the run goes on
+    controller.speculate(courses[:1])
+    assert len(inline.resumed_from) == 2
+
+    controller.generate_schedules(courses)
+    wait_for_generation(controller)
+    assert len(inline.resumed_from) == 3
+    assert controller.ranker.seen_count() == 2
+
+    controller.speculate(courses[:1])
+    controller.speculate([])
+    assert controller.speculation_key is None and controller.ranker.size() == 0
@@ -0,0 +1,118 @@
+import os
+import random
+from datetime import time
+import pytest
+from src.models.course import Course
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+from src.services.all_strategy import AllStrategy
+from src.services.backjump_strategy import BackjumpStrategy
+from src.services.compatibility_strategy import CompatibilityStrategy
+from src.services.factorized_strategy import FactorizedStrategy
+from src.services.schedule_api import ScheduleAPI
+from src.services.strategy_selector import StrategySelector, BACKJUMP, EXHAUSTIVE
+
+TEST_FILES = os.path.join(os.path.dirname(__file__), "..", "test_files")
+
+# ---------- Helpers ----------
+
+def slot(day, start, length=1, building="A"):
+    return TimeSlot(day=str(day), start_time=f"{start:02d}:00", end_time=f"{start + length:02d}:00", room="101",
+                    building=building)
+
+def random_courses(rnd: random.Random):
+    courses = []
+    for i in range(rnd.randint(1, 6)):
+        lectures = [[slot(rnd.randint(1, 3), rnd.randint(8, 12), rnd.randint(1, 2), rnd.choice("AB"))]
+                    for _ in range(rnd.randint(1, 4))]
+        tirguls = [[slot(rnd.randint(1, 3), rnd.randint(8, 12), 1, rnd.choice("AB"))] for _ in range(rnd.randint(0, 2))]
+        courses.append(Course(f"Course{i}", f"C{i}", "I", lectures=lectures, tirguls=tirguls))
+    return courses
+
+def dead_end_courses(dead: int, middle_count: int, width: int):
+    """
+    One component whose first course has `dead` options ruling out the last course's Sunday option, while
+    the blocker always rules out its Tuesday one. The middle courses share a Friday hour with the first course
+    only to stay in its component, they have nothing to do with the failure.
+    """
+    first = Course("First", "F", "I", lectures=[[slot(1, 8 + d), slot(6, 19)] for d in range(dead)] +
+                                               [[slot(2, 8), slot(6, 19)]])
+    middle = [Course(f"Middle{i}", f"M{i}", "I", lectures=[[slot(6, hour)] for hour in range(8, 8 + width)] +
+                                                          [[slot(6, 19)]])
+              for i in range(middle_count)]
+    blocker = Course("Blocker", "B", "I", lectures=[[slot(3, 10)], [slot(3, 11)]])
+    last = Course("Last", "L", "I", lectures=[[slot(1, 8, 12)], [slot(3, 10, 2)]])
+    return [first] + middle + [blocker, last]
+
+# ---------- Tests ----------
+
+def test_same_schedules_as_compatibility_strategy():
+    # Backjumping and nogoods only skip branches without schedules: same output, never more nodes
+    rnd = random.Random(7)
+    travel = TravelTimes({"A": {"B": 30}})
+    for _ in range(200):
+        courses = random_courses(rnd)
+        settings = dict(constraints=rnd.choice([None, ScheduleConstraints(max_active_days=2),
+                                                ScheduleConstraints(max_gap_minutes=60, earliest_start=time(9))]),
+                        travel=rnd.choice([None, travel]), quality_order=rnd.random() < 0.5)
+        plain = CompatibilityStrategy(courses, **settings)
+        backjump = BackjumpStrategy(courses, **settings)
+        expected = list(plain.iter_option_vectors())
+        assert list(backjump.iter_option_vectors()) == expected
+        assert backjump.nodes_visited <= plain.nodes_visited
+        if expected:
+            middle = len(expected) // 2
+            resumed = BackjumpStrategy(courses, **settings).iter_option_vectors(resume_after=expected[middle])
+            assert list(resumed) == expected[middle + 1:]
+
+def test_jumps_over_unrelated_courses():
+    courses = dead_end_courses(dead=1, middle_count=2, width=5)
+    plain = CompatibilityStrategy(courses)
+    backjump = BackjumpStrategy(courses)
+    assert list(backjump.iter_option_vectors()) == list(plain.iter_option_vectors())
+    # Under the first option, plain forward checking tries both blocker options below all 5 * 4 middle
+    # choices (1 + 5 + 20 + 40 nodes); backjumping gives up after the first one and jumps to the first course
+    assert plain.nodes_visited == 66 + 106
+    assert backjump.nodes_visited == (1 + 1 + 1 + 2) + 106
+    assert backjump.backjumps == 1
+    # The failure is blamed on the first course alone and cached as a one-placement nogood
+    assert backjump.nogoods == {(0, 0): {()}}
+
+def test_node_limit():
+    strategy = BackjumpStrategy(dead_end_courses(dead=1, middle_count=2, width=5))
+    assert len(list(strategy.iter_option_vectors(node_limit=20))) < 40 and strategy.limit_reached
+
+def test_no_courses():
+    assert list(BackjumpStrategy([]).generate()) == []
+
+@pytest.mark.parametrize("catalog", ["conflicting_courses.txt", "heavy.txt"])
+def test_nodes_against_plain_dfs(catalog):
+    # Every 7-course window of the catalog: the same schedules as the plain DFS of AllStrategy, with at most
+    # as many options placed (conflicting_courses.txt 0-6: 126 nodes plain, 80 with forward checking and backjumping)
+    courses = ScheduleAPI().get_courses(os.path.join(TEST_FILES, catalog))
+    nodes = []
+    for start in range(0, len(courses), 7):
+        window = courses[start:start + 7]
+        plain = AllStrategy(window)
+        backjump = BackjumpStrategy(window)
+        assert [s.option_indices for s in backjump.generate()] == [s.option_indices for s in plain.generate()]
+        assert backjump.nodes_visited <= plain.nodes_visited
+        nodes.append((plain.nodes_visited, backjump.nodes_visited))
+    if catalog == "conflicting_courses.txt":
+        assert nodes[0] == (126, 80)
+
+def test_selector_picks_backjumping_for_dead_ends():
+    # Five dead first options out of six: the search places about ten options per schedule
+    courses = dead_end_courses(dead=5, middle_count=5, width=6)
+    selector = StrategySelector(courses)
+    assert selector.engine == BACKJUMP
+    strategy = selector.build()
+    assert isinstance(strategy, FactorizedStrategy) and strategy.backjump
+    plain = FactorizedStrategy(courses, quality_order=True)
+    expected = [s.option_indices for s in plain.generate()]
+    assert [s.option_indices for s in strategy.generate()] == expected
+    assert strategy.nodes_visited * 2 < plain.nodes_visited
+    # A dense tree, with few dead ends, keeps the plain search
+    dense = ScheduleAPI().get_courses(os.path.join(TEST_FILES, "medium.txt"))[:5]
+    assert StrategySelector(dense).engine == EXHAUSTIVE
@@ -0,0 +1,88 @@
+import os
+import random
+import time
+from src.models.course import Course
+from src.models.time_slot import TimeSlot
+from src.services.catalog_index import CatalogIndex
+from src.services.factorized_strategy import FactorizedStrategy
+from src.services.schedule_api import ScheduleAPI
+
+TEST_FILES = os.path.join(os.path.dirname(__file__), "..", "test_files")
+
+# ---------- Helpers ----------
+
+def catalog(name):
+    return ScheduleAPI().get_courses(os.path.join(TEST_FILES, name))
+
+def random_slot(rng):
+    start = rng.randint(8, 18)
+    return TimeSlot(str(rng.randint(1, 6)), f"{start:02d}:00", f"{start + 1:02d}:00", "1", "A")
+
+def random_catalog(count, seed=1):
+    rng = random.Random(seed)
+    return [Course(f"Course {i}", str(10000 + i), "Lecturer",
+                   [[random_slot(rng)] for _ in range(rng.randint(2, 5))],
+                   [[random_slot(rng)] for _ in range(rng.randint(0, 3))],
+                   [[random_slot(rng)] for _ in range(rng.randint(0, 2))]) for i in range(count)]
+
+# ---------- Tests ----------
+
+def test_counts_match_the_search():
+    courses = catalog("courses_valid_schedule.txt")
+    selected = courses[:3]
+    ranking = CatalogIndex(courses).rank(selected)
+    assert len(ranking) == len(courses) - 3
+    assert [fit.schedules for fit in ranking] == sorted((fit.schedules for fit in ranking), reverse=True)
+    for fit in ranking:
+        assert fit.exact
+        assert fit.schedules == FactorizedStrategy(selected + [fit.course]).count()
+
+def test_sampled_selection_estimates_the_counts():
+    courses = catalog("medium.txt")
+    selected = courses[:2]
+    ranking = CatalogIndex(courses, leaf_limit=100, samples=2000).rank(selected)
+    for fit in ranking:
+        real = FactorizedStrategy(selected + [fit.course]).count()
+        assert not fit.exact or fit.schedules == real == 0
+        assert abs(fit.schedules - real) <= 0.1 * real
+
+def test_courses_that_cannot_fit_are_certain():
+    blocker = Course("Blocker", "B1", "Lecturer", [[TimeSlot("1", "08:00", "20:00", "1", "A")]])
+    clash = Course("Clash", "C1", "Lecturer", [[TimeSlot("1", "10:00", "11:00", "1", "A")]])
+    free = Course("Free", "F1", "Lecturer", [[TimeSlot("2", "10:00", "11:00", "1", "A")],
+                                             [TimeSlot("3", "10:00", "11:00", "1", "A")]])
+    ranking = CatalogIndex([blocker, clash, free], leaf_limit=0, samples=10).rank([blocker])
+    assert [(fit.course.course_code, fit.schedules, fit.exact) for fit in ranking] == [("F1", 2, False),
+                                                                                    ("C1", 0, True)]
+
+def test_large_catalog_ranks_fast():
+    # A loose budget for the whole run; tight timings belong to benchmarks, not to the unit suite
+    courses = random_catalog(3000)
+    index = CatalogIndex(courses)
+    selected = []
+    started = time.perf_counter()
+    for _ in range(8):
+        ranking = index.rank(selected)
+        selected.append(ranking[len(ranking) // 50].course)
+    assert time.perf_counter() - started < 8.0
+    assert ranking[0].schedules > 0
+
+def test_repeated_ranking_reuses_cached_components():
+    courses = random_catalog(300)
+    index = CatalogIndex(courses)
+    selected = courses[:4]
+    first = index.rank(selected)
+    cached = dict(index._component_cache)
+    assert set(index._pairwise_cache) == set(selected)
+    assert index.rank(selected) == first
+    assert all(index._component_cache[key] is value for key, value in cached.items())
+    # Another course changes only its own component, and the cached rankings match fresh ones
+    changed = selected[:3] + [courses[4]]
+    assert index.rank(changed) == CatalogIndex(courses).rank(changed)
+
+def test_empty_selection_counts_the_options():
+    courses = catalog("courses_valid_schedule.txt")
+    ranking = CatalogIndex(courses).rank([])
+    assert all(fit.exact for fit in ranking)
+    assert sorted(fit.schedules for fit in ranking) == sorted(FactorizedStrategy([course]).count()
+                                                              for course in courses)
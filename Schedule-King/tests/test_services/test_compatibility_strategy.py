@@ -0,0 +1,143 @@
+import os
+import random
+import pytest
+from datetime import time
+from itertools import islice
+from src.models.course import Course
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+from src.services.all_strategy import AllStrategy
+from src.services.compatibility_strategy import CompatibilityStrategy
+from src.services.factorized_strategy import FactorizedStrategy
+from src.services.compatibility_table import CompatibilityTable, iter_bits
+from src.services.MatrixConflicChecker import MatrixConflictChecker
+from src.services.schedule_api import ScheduleAPI
+
+TEST_FILES = os.path.join(os.path.dirname(__file__), "..", "test_files")
+
+# ---------- Helpers ----------
+
+def slot(day, start, end):
+    return TimeSlot(day=day, start_time=f"{start:02d}:00", end_time=f"{end:02d}:00", room="101", building="A")
+
+@pytest.fixture
+def courses():
+    # Overlapping options, a self-conflicting option (lecture and tirgul overlap) and an unused tirgul
+    return [
+        Course("Course1", "C1", "I1", lectures=[[slot("1", 8, 10)], [slot("2", 8, 10)], [slot("3", 8, 10)]],
+               tirguls=[[slot("1", 9, 10)], [slot("4", 12, 13)]]),
+        Course("Course2", "C2", "I2", lectures=[[slot("1", 9, 11)], [slot("4", 12, 14)], [slot("2", 10, 12)]]),
+        Course("Course3", "C3", "I3", lectures=[[slot("2", 8, 9)], [slot("5", 8, 9)]],
+               maabadas=[[slot("4", 13, 15)], [slot("6", 10, 12)]]),
+    ]
+
+# ---------- Tests ----------
+
+def test_slot_mask_matches_matrix_cells():
+    mask = MatrixConflictChecker.slot_mask(slot("2", 7, 10))
+    # 7:00 is outside the matrix, 8:00 and 9:00 on Monday are the first two cells of day index 1
+    assert list(iter_bits(mask)) == [12, 13]
+    assert MatrixConflictChecker.slot_mask(slot("1", 20, 22)) == 0
+
+def test_table_domains_and_rows(courses):
+    table = CompatibilityTable(courses, forbidden=[slot("5", 8, 9)])
+    # Option 0 of course 1 (Sunday lecture 8-10 with Sunday tirgul 9-10) conflicts with itself
+    assert 0 not in iter_bits(table.domains[0])
+    # The forbidden Thursday slot removes both options of course 3 using lecture 1
+    assert list(iter_bits(table.domains[2])) == [0, 1]
+    # Option 1 of course 1 (Sunday 8-10, Wednesday 12-13) excludes the Sunday 9-11 and Wednesday 12-14 lectures
+    assert list(iter_bits(table.compatible[0][1][1])) == [2]
+    assert table.build_time >= 0
+
+@pytest.mark.parametrize("forbidden", [None, [slot("2", 8, 9)], [slot("1", 8, 20)]])
+def test_same_schedules_as_all_strategy(courses, forbidden):
+    expected = [s.option_indices for s in AllStrategy(courses, forbidden).generate()]
+    strategy = CompatibilityStrategy(courses, forbidden)
+    schedules = list(strategy.generate())
+    assert [s.option_indices for s in schedules] == expected
+    assert all(s.metric_tuple for s in schedules)
+    assert strategy.nodes_visited >= len(schedules)
+
+def test_forward_checking_prunes_dead_branches():
+    # The last course only fits next to the second option of the first course,
+    # so the middle course is never tried after the first option
+    first = Course("First", "F", "I", lectures=[[slot("2", 8, 9)], [slot("3", 8, 9)]])
+    middle = Course("Middle", "M", "I", lectures=[[slot("6", hour, hour + 1)] for hour in range(8, 18)])
+    last = Course("Last", "L", "I", lectures=[[slot("2", 8, 9)]])
+    strategy = CompatibilityStrategy([first, middle, last])
+    assert len(list(strategy.generate())) == 10
+    # Both first-course options, then 10 middle and 10 last options under the second one
+    assert strategy.nodes_visited == 2 + 10 + 10
+
+@pytest.mark.parametrize("constraints", [
+    ScheduleConstraints(max_active_days=2),
+    ScheduleConstraints(min_free_days=4),
+    ScheduleConstraints(max_gap_minutes=60),
+    ScheduleConstraints(earliest_start=time(9), latest_end=time(14)),
+    ScheduleConstraints(free_windows=[slot("4", 8, 20)], max_gap_minutes=0),
+])
+def test_constraints_match_filtered_all_strategy(courses, constraints):
+    expected = [s.option_indices for s in AllStrategy(courses).generate() if constraints.is_satisfied_by(s)]
+    strategy = CompatibilityStrategy(courses, constraints=constraints)
+    assert [v for v in strategy.iter_option_vectors()] == expected
+    assert CompatibilityStrategy(courses, constraints=constraints).count_schedules() == len(expected)
+    assert sorted(s.option_indices for s in FactorizedStrategy(courses, constraints=constraints).generate()) == expected
+
+def test_constraints_on_random_catalogs():
+    rng = random.Random(7)
+    def random_slots():
+        day, start = str(rng.randint(1, 6)), rng.randint(8, 17)
+        return [slot(day, start, start + rng.randint(1, 3))]
+    for _ in range(60):
+        courses = [Course(f"Course{i}", f"C{i}", "I", lectures=[random_slots() for _ in range(rng.randint(1, 4))],
+                          tirguls=[random_slots() for _ in range(rng.randint(0, 3))])
+                   for i in range(rng.randint(1, 5))]
+        constraints = ScheduleConstraints(max_active_days=rng.choice([None, 2, 3]),
+                                          max_gap_minutes=rng.choice([None, 0, 60, 120]),
+                                          earliest_start=rng.choice([None, time(9)]))
+        expected = [s.option_indices for s in AllStrategy(courses).generate() if constraints.is_satisfied_by(s)]
+        assert list(CompatibilityStrategy(courses, constraints=constraints).iter_option_vectors()) == expected
+
+def test_constraints_prune_partial_schedules():
+    # Every option of the first two courses is on its own day, so with a 1-day limit
+    # the search never places a second-day option below the first course
+    first = Course("First", "F", "I", lectures=[[slot("1", 8, 9)], [slot("2", 8, 9)]])
+    middle = Course("Middle", "M", "I", lectures=[[slot(str(day), 10, 11)] for day in range(1, 7)])
+    last = Course("Last", "L", "I", lectures=[[slot(str(day), 12, 13)] for day in range(1, 7)])
+    strategy = CompatibilityStrategy([first, middle, last], constraints=ScheduleConstraints(max_active_days=1))
+    assert list(strategy.iter_option_vectors()) == [(0, 0, 0), (1, 1, 1)]
+    assert strategy.nodes_visited == 2 + 2 + 2
+    # Sunday 8-9 then 12-13 leaves a 3 hour gap no remaining (Monday to Friday) option can fill,
+    # so the 12-13 option is pruned before the last course is reached
+    morning = Course("Morning", "Mo", "I", lectures=[[slot("1", 8, 9)]])
+    noon = Course("Noon", "N", "I", lectures=[[slot("1", 12, 13)], [slot("1", 9, 10)]])
+    weekdays = Course("Weekdays", "W", "I", lectures=[[slot(str(day), 10, 11)] for day in range(2, 7)])
+    strategy = CompatibilityStrategy([morning, noon, weekdays], constraints=ScheduleConstraints(max_gap_minutes=60))
+    assert list(strategy.iter_option_vectors()) == [(0, 1, day) for day in range(5)]
+    assert strategy.nodes_visited == 1 + 1 + 5
+
+def test_count_with_node_limit_and_constraints(courses):
+    strategy = CompatibilityStrategy(courses, constraints=ScheduleConstraints(max_active_days=3))
+    assert strategy.count_schedules(node_limit=1) is None
+    assert strategy.limit_reached
+
+def test_more_than_seven_courses():
+    # Nine courses at their own hours, on Sunday or Monday: every combination is a schedule
+    courses = [Course(f"Course{i}", f"C{i}", "I", lectures=[[slot(1, 8 + i, 9 + i)], [slot(2, 8 + i, 9 + i)]])
+               for i in range(9)]
+    strategy = CompatibilityStrategy(courses)
+    assert strategy.count_schedules() == 512
+    assert len(list(strategy.iter_option_vectors())) == 512
+
+def test_no_courses():
+    assert list(CompatibilityStrategy([]).generate()) == []
+
+@pytest.mark.parametrize("catalog", ["heavy.txt", "big_courses.txt", "medium.txt", "courses_valid_schedule.txt"])
+def test_build_and_search_time_on_heavy_catalogs(catalog):
+    # Reports table build time and search time separately, on up to 7 courses and 20000 schedules
+    courses = ScheduleAPI().get_courses(os.path.join(TEST_FILES, catalog))[:7]
+    strategy = CompatibilityStrategy(courses)
+    found = sum(1 for _ in islice(strategy.generate(), 20000))
+    print(f"\n{catalog}: {len(courses)} courses, {found} schedules, "
+          f"build {strategy.build_time * 1000:.1f}ms, search {strategy.search_time * 1000:.1f}ms")
+    assert strategy.build_time < 1
@@ -0,0 +1,124 @@
+import os
+import random
+import pytest
+from src.models.course import Course
+from src.models.time_slot import TimeSlot
+from src.services.all_strategy import AllStrategy
+from src.services.factorized_strategy import FactorizedStrategy
+from src.services.schedule_api import ScheduleAPI
+
+TEST_FILES = os.path.join(os.path.dirname(__file__), "..", "test_files")
+
+# ---------- Helpers ----------
+
+def slot(day, start, length=1):
+    return TimeSlot(day=str(day), start_time=f"{start:02d}:00", end_time=f"{start + length:02d}:00", room="101", building="A")
+
+@pytest.fixture
+def split_courses():
+    # Two morning courses competing for Sunday, and two evening courses competing for Monday
+    return [
+        Course("Morning1", "M1", "I", lectures=[[slot(1, 8)], [slot(1, 9)], [slot(2, 8)]]),
+        Course("Evening1", "E1", "I", lectures=[[slot(2, 17)], [slot(3, 17)]]),
+        Course("Morning2", "M2", "I", lectures=[[slot(1, 8, 2)], [slot(3, 9)]]),
+        Course("Evening2", "E2", "I", lectures=[[slot(2, 17)], [slot(2, 18)], [slot(4, 17)]]),
+    ]
+
+# ---------- Tests ----------
+
+def test_components(split_courses):
+    assert FactorizedStrategy(split_courses).components == [[0, 2], [1, 3]]
+
+def test_same_schedules_as_all_strategy(split_courses):
+    expected = sorted(s.option_indices for s in AllStrategy(split_courses).generate())
+    strategy = FactorizedStrategy(split_courses)
+    generated = [s.option_indices for s in strategy.generate()]
+    assert sorted(generated) == expected
+    assert strategy.count() == len(expected)
+
+def test_product_view_random_access(split_courses):
+    strategy = FactorizedStrategy(split_courses)
+    view = strategy.view()
+    generated = [s.option_indices for s in FactorizedStrategy(split_courses).generate()]
+    # The view has the order of generate(), with the last component changing fastest
+    assert len(view) == len(generated) == 4 * 5
+    assert [view.option_vector(i) for i in range(len(view))] == generated
+    assert view[-1].option_indices == generated[-1]
+    assert [s.option_indices for s in view[2:4]] == generated[2:4]
+    assert view[7].metric_tuple
+    with pytest.raises(IndexError):
+        view.option_vector(len(view))
+
+def test_random_instances_match_all_strategy():
+    rnd = random.Random(11)
+    for _ in range(150):
+        courses = [Course(f"Course{i}", f"C{i}", "I",
+                          lectures=[[slot(rnd.randint(1, 6), rnd.randint(8, 17), rnd.randint(1, 2))]
+                                    for _ in range(rnd.randint(1, 4))])
+                   for i in range(rnd.randint(1, 6))]
+        expected = sorted(s.option_indices for s in AllStrategy(courses).generate())
+        assert sorted(s.option_indices for s in FactorizedStrategy(courses).generate()) == expected
+        assert FactorizedStrategy(courses).count() == len(expected)
+
+def test_empty_component_gives_no_schedules(split_courses):
+    blocked = Course("Blocked", "B", "I", lectures=[[slot(5, 8, 2), slot(5, 9)]])  # conflicts with itself
+    strategy = FactorizedStrategy(split_courses[:3] + [blocked])
+    assert strategy.count() == 0
+    assert list(strategy.generate()) == []
+    assert len(strategy.view()) == 0
+
+def test_count_node_limit(split_courses):
+    assert FactorizedStrategy(split_courses).count(node_limit=1) is None
+
+def test_more_than_seven_courses():
+    # Nine courses at their own hours never conflict, so each one is a component
+    courses = [Course(f"Course{i}", f"C{i}", "I", lectures=[[slot(1, 8 + i)], [slot(2, 8 + i)]]) for i in range(9)]
+    strategy = FactorizedStrategy(courses)
+    assert len(strategy.components) == 9
+    assert strategy.count() == 512 and len(list(strategy.generate())) == 512
+
+def test_no_courses():
+    strategy = FactorizedStrategy([])
+    assert strategy.count() == 0
+    assert list(strategy.generate()) == []
+
+def test_catalog_count_matches_search():
+    # courses_valid_schedule.txt splits into six components, counting needs no full enumeration
+    api = ScheduleAPI()
+    courses = api.get_courses(os.path.join(TEST_FILES, "courses_valid_schedule.txt"))[:7]
+    strategy = FactorizedStrategy(courses)
+    assert len(strategy.components) == 6
+    assert strategy.count() == 61440
+    assert api.get_estimated_schedules_count(courses) == 61440
+    view = api.get_schedule_view(courses)
+    assert len(view) == 61440
+    assert view[61439].option_indices == view.option_vector(61439)
+
+def test_resume_continues_right_after_a_vector():
+    # Resuming after any generated vector yields exactly the rest, in the same order
+    rnd = random.Random(4)
+    for _ in range(40):
+        courses = [Course(f"Course{i}", f"C{i}", "I",
+                          lectures=[[slot(rnd.randint(1, 6), rnd.randint(8, 17), rnd.randint(1, 2))]
+                                    for _ in range(rnd.randint(1, 4))])
+                   for i in range(rnd.randint(1, 5))]
+        for quality_order in (False, True):
+            full = list(FactorizedStrategy(courses, quality_order=quality_order).iter_option_vectors())
+            for index, vector in enumerate(full):
+                strategy = FactorizedStrategy(courses, quality_order=quality_order)
+                assert list(strategy.iter_option_vectors(resume_after=vector)) == full[index + 1:]
+
+def test_resume_rejects_foreign_vector(split_courses):
+    # M1 option 0 and M2 option 0 both use Sunday 8:00, so this is no schedule of these courses
+    with pytest.raises(ValueError):
+        list(FactorizedStrategy(split_courses).iter_option_vectors(resume_after=(0, 0, 0, 0)))
+
+def test_ticks_while_the_other_components_are_solved():
+    # A lone Friday course first; the other five courses share Thursday 8:00, one component of 2958 nodes
+    courses = [Course("Alone", "A", "I", lectures=[[slot(6, 20)]])] + \
+              [Course(f"Course{i}", f"C{i}", "I", lectures=[[slot(day, 8 + i)] for day in range(1, 5)] + [[slot(5, 8)]])
+               for i in range(5)]
+    items = list(FactorizedStrategy(courses).iter_option_vectors(tick=0.0))
+    # Every tick comes before the first schedule, while the second component is solved upfront
+    assert items[:2] == [None, None] and None not in items[2:]
+    assert items[2:] == list(FactorizedStrategy(courses).iter_option_vectors())
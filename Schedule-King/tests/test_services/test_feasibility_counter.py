@@ -0,0 +1,63 @@
+import os
+import random
+import time
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+from src.services.factorized_strategy import FactorizedStrategy
+from src.services.feasibility_counter import FeasibilityCounter
+from src.services.schedule_api import ScheduleAPI
+
+TEST_FILES = os.path.join(os.path.dirname(__file__), "..", "test_files")
+
+# ---------- Helpers ----------
+
+def catalog(name, count):
+    return ScheduleAPI().get_courses(os.path.join(TEST_FILES, name))[:count]
+
+def cell_slots(cells):
+    return [TimeSlot(day=str(day + 1), start_time=f"{8 + hour:02d}:00", end_time=f"{9 + hour:02d}:00",
+                     room="", building="") for hour, day in cells]
+
+def real_count(courses, cells, constraints=None):
+    return FactorizedStrategy(courses, cell_slots(cells), constraints).count()
+
+# ---------- Tests ----------
+
+def test_counts_match_the_search():
+    rng = random.Random(3)
+    for name, count in [("courses_valid_schedule.txt", 7), ("medium.txt", 3)]:
+        courses = catalog(name, count)
+        counter = FeasibilityCounter(courses)
+        cells = set()
+        for _ in range(6):
+            cells.add((rng.randrange(12), rng.randrange(6)))
+            result = counter.count(cells)
+            assert result.exact
+            assert result.schedules == real_count(courses, cells)
+
+def test_impacts_are_the_schedules_a_cell_eliminates():
+    courses = catalog("courses_valid_schedule.txt", 7)
+    counter = FeasibilityCounter(courses)
+    cells = {(0, 1), (4, 3)}
+    result = counter.count(cells)
+    assert (0, 1) not in result.impacts and len(result.impacts) == 7 * 12 - 2
+    for cell in [(0, 0), (2, 1), (8, 4), (11, 5)]:
+        assert result.impacts[cell] == result.schedules - real_count(courses, cells | {cell})
+
+def test_constraints_linking_courses_are_respected():
+    courses = catalog("medium.txt", 3)
+    constraints = ScheduleConstraints(max_active_days=3)
+    result = FeasibilityCounter(courses, constraints).count({(2, 0)})
+    assert result.schedules == real_count(courses, {(2, 0)}, constraints)
+
+def test_large_component_gives_a_lower_bound_fast():
+    courses = catalog("medium.txt", 5)
+    counter = FeasibilityCounter(courses, leaf_limit=20_000)
+    started = time.perf_counter()
+    result = counter.count({(6, 1), (3, 2)})
+    assert time.perf_counter() - started < 0.1
+    assert not result.exact
+    assert 0 < result.schedules <= real_count(courses, {(6, 1), (3, 2)})
+
+def test_empty_selection():
+    assert FeasibilityCounter([]).count({(0, 0)}).schedules == 0
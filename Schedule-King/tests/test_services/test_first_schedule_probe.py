@@ -0,0 +1,84 @@
+import os
+import random
+import time
+import pytest
+from src.controllers.ScheduleController import ScheduleController
+from src.models.course import Course
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+from src.services.compatibility_strategy import CompatibilityStrategy
+from src.services.first_schedule_probe import FirstScheduleProbe
+from src.services.schedule_api import ScheduleAPI
+
+TEST_FILES = os.path.join(os.path.dirname(__file__), "..", "test_files")
+
+# ---------- Helpers ----------
+
+def slot(day, start, end):
+    return TimeSlot(day=day, start_time=f"{start:02d}:00", end_time=f"{end:02d}:00", room="101", building="A")
+
+def course(code, *lectures):
+    return Course(f"Course{code}", code, "Dr. X", lectures=[[slot(*lecture)] for lecture in lectures])
+
+def valid_vectors(courses, constraints=None):
+    return set(CompatibilityStrategy(courses, constraints=constraints).iter_option_vectors())
+
+# ---------- Tests ----------
+
+def test_probe_finds_a_valid_schedule():
+    rng = random.Random(5)
+    for _ in range(60):
+        courses = [course(f"C{i}", *[(str(rng.randint(1, 4)), start, start + 2)
+                                     for start in rng.sample(range(8, 16), rng.randint(1, 3))])
+                   for i in range(rng.randint(1, 6))]
+        constraints = rng.choice([None, ScheduleConstraints(max_active_days=2)])
+        found = FirstScheduleProbe(courses, constraints=constraints, node_limit=10**6).find()
+        valid = valid_vectors(courses, constraints)
+        if not valid:
+            assert found is None
+        else:
+            assert found.option_indices in valid
+
+def test_probe_prefers_fewer_days():
+    a = course("A", ("1", 8, 10), ("2", 8, 10))
+    b = course("B", ("3", 8, 10), ("2", 10, 12))
+    found = FirstScheduleProbe([a, b]).find()
+    assert found.active_days == 1 and found.option_indices == (1, 1)
+
+def test_probe_gives_up_at_node_limit():
+    courses = [course(code, ("1", 8, 10), ("1", 10, 12)) for code in "ABC"]
+    probe = FirstScheduleProbe(courses, node_limit=2)
+    assert probe.find() is None
+    assert probe.nodes_visited == 2
+
+def test_controller_shows_probe_schedule_before_the_stream(qtbot):
+    api = ScheduleAPI()
+    courses = api.get_courses(os.path.join(TEST_FILES, "courses_valid_schedule.txt"))[:4]
+    controller = ScheduleController(api)
+    counts = []
+    controller.on_schedules_generated = counts.append
+    controller.generate_schedules(courses)
+    # Shown before any batch arrived from the worker
+    assert counts[0] == 1 and controller.time_to_first_schedule is not None
+    while controller.generation_active:
+        controller.check_for_schedules()
+    vectors = [s.option_indices for s in controller.get_schedules()]
+    assert len(vectors) == len(set(vectors)) == len(valid_vectors(courses))
+
+@pytest.mark.parametrize("catalog, count", [("courses_valid_schedule.txt", 7), ("medium.txt", 5)])
+def test_time_to_first_schedule_benchmark(qtbot, catalog, count):
+    # Time to first schedule: greedy probe in this process versus the first batch of the worker
+    api = ScheduleAPI()
+    courses = api.get_courses(os.path.join(TEST_FILES, catalog))[:count]
+    start = time.perf_counter()
+    assert api.find_first_schedule(courses) is not None
+    probe_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    queue = api.generate_schedules_in_parallel(courses)
+    queue.get(timeout=60)
+    worker_seconds = time.perf_counter() - start
+    api.stop_schedules_generation()
+    print(f"\n{catalog}: time to first schedule {probe_seconds * 1000:.1f} ms (probe), "
+          f"{worker_seconds * 1000:.1f} ms (worker)")
+    assert probe_seconds < 0.5
@@ -0,0 +1,116 @@
+import random
+from datetime import time
+from src.models.course import Course
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+from src.services.compatibility_strategy import CompatibilityStrategy
+from src.services.infeasibility_explainer import InfeasibilityExplainer
+from src.services.schedule_api import ScheduleAPI
+
+# ---------- Helpers ----------
+
+def slot(day, start, end, building="A"):
+    return TimeSlot(day=day, start_time=f"{start:02d}:00", end_time=f"{end:02d}:00", room="101", building=building)
+
+def course(code, *lectures):
+    return Course(f"Course{code}", code, "Dr. X", lectures=[[slot(*lecture)] for lecture in lectures])
+
+def feasible(courses, forbidden=None, constraints=None, travel=None):
+    if not courses:
+        return True
+    return next(CompatibilityStrategy(courses, forbidden, constraints, travel).iter_option_vectors(), None) is not None
+
+def codes(core):
+    return sorted(c.course_code for c in core.courses)
+
+# ---------- Tests ----------
+
+def test_feasible_selection_has_no_core():
+    courses = [course("A", ("1", 8, 10)), course("B", ("1", 10, 12))]
+    assert InfeasibilityExplainer(courses).find_core() is None
+
+def test_conflicting_pair_found_from_the_table():
+    courses = [course("A", ("1", 8, 10)), course("B", ("2", 8, 10)), course("C", ("1", 9, 11)),
+               course("D", ("3", 8, 10))]
+    explainer = InfeasibilityExplainer(courses)
+    core = explainer.find_core()
+    assert codes(core) == ["A", "C"] and core.forbidden == []
+    # The seed pair is verified and each of its two courses tried once
+    assert explainer.checks == 3
+
+def test_core_includes_the_forbidden_slots_it_needs():
+    a = course("A", ("1", 8, 10), ("2", 8, 10))
+    b = course("B", ("3", 8, 10))
+    forbidden = [slot("1", 8, 9), slot("2", 9, 10), slot("4", 8, 12)]
+    core = InfeasibilityExplainer([a, b], forbidden).find_core()
+    assert codes(core) == ["A"]
+    assert [str(s) for s in core.forbidden] == [str(forbidden[0]), str(forbidden[1])]
+    assert "has no usable option with the blocked times" in core.describe()
+
+def test_three_way_conflict_is_minimal():
+    # Each pair fits, but the three courses share two time slots
+    courses = [course(code, ("1", 8, 10), ("1", 10, 12)) for code in "ABC"] + [course("D", ("2", 8, 10))]
+    core = InfeasibilityExplainer(courses).find_core()
+    assert codes(core) == ["A", "B", "C"]
+    assert core.describe().endswith("cannot be taken together.")
+
+def test_core_found_in_a_large_selection():
+    # Twelve courses, three of them sharing two time slots
+    courses = [course(code, ("1", 8, 10), ("1", 10, 12)) for code in "ABC"]
+    courses += [course(f"E{day}{hour}", (str(day), hour, hour + 1), (str(day), hour + 1, hour + 2))
+                for day in range(2, 5) for hour in (8, 12, 16)]
+    assert len(courses) == 12
+    assert codes(InfeasibilityExplainer(courses).find_core()) == ["A", "B", "C"]
+
+def test_limits_and_travel_are_reported():
+    a = course("A", ("1", 8, 10))
+    b = course("B", ("2", 8, 10))
+    core = InfeasibilityExplainer([a, b], constraints=ScheduleConstraints(max_active_days=1)).find_core()
+    assert codes(core) == ["A", "B"] and core.uses_limits and not core.uses_travel
+
+    late = course("L", ("1", 18, 20))
+    core = InfeasibilityExplainer([late], constraints=ScheduleConstraints(latest_end=time(17))).find_core()
+    assert codes(core) == ["L"] and core.uses_limits
+
+    far = course("F", ("1", 10, 12, "B"))
+    travel = TravelTimes({"A": {"B": 20}})
+    core = InfeasibilityExplainer([a, far], travel=travel).find_core()
+    assert codes(core) == ["A", "F"] and core.uses_travel and not core.uses_limits
+
+def test_cores_are_minimal_on_random_selections():
+    rng = random.Random(7)
+    found = 0
+    for _ in range(60):
+        courses = [course(f"C{i}", *[(str(rng.randint(1, 2)), start, start + 2)
+                                     for start in rng.sample(range(8, 14), rng.randint(1, 2))])
+                   for i in range(rng.randint(2, 6))]
+        forbidden = [slot(str(rng.randint(1, 2)), hour, hour + 1) for hour in rng.sample(range(8, 16), 2)]
+        core = InfeasibilityExplainer(courses, forbidden).find_core()
+        if feasible(courses, forbidden):
+            assert core is None
+            continue
+        found += 1
+        assert not feasible(core.courses, core.forbidden)
+        for index in range(len(core.courses)):
+            assert feasible(core.courses[:index] + core.courses[index + 1:], core.forbidden)
+        for index in range(len(core.forbidden)):
+            assert feasible(core.courses, core.forbidden[:index] + core.forbidden[index + 1:])
+    assert found > 10
+
+def test_worker_sends_core_instead_of_searching():
+    sent = []
+
+    class Queue:
+        def put(self, item):
+            sent.append(item)
+
+    class Event:
+        def is_set(self):
+            return False
+
+    courses = [course("A", ("1", 8, 10)), course("B", ("1", 9, 11))]
+    ScheduleAPI._worker_generate(courses, Queue(), Event())
+    assert len(sent) == 2 and sent[1] is None
+    assert codes(sent[0]) == ["A", "B"]
+    assert codes(ScheduleAPI().find_infeasibility_core(courses)) == ["A", "B"]
@@ -0,0 +1,87 @@
+import queue
+import random
+import threading
+import pytest
+from src.models.course import Course
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+from src.services import schedule_api
+from src.services.compatibility_strategy import CompatibilityStrategy
+from src.services.local_search_strategy import LocalSearchStrategy
+from src.services.schedule_api import ScheduleAPI
+
+# ---------- Helpers ----------
+
+def slot(day, start, end):
+    return TimeSlot(day=str(day), start_time=f"{start:02d}:00", end_time=f"{end:02d}:00", room="101", building="A")
+
+def random_catalog(courses, seed=3):
+    # Many groups per course, far too many combinations to enumerate
+    rng = random.Random(seed)
+    def random_slots():
+        day, start = rng.randint(1, 6), rng.randint(8, 17)
+        return [slot(day, start, start + 2)]
+    return [Course(f"Course{i}", f"C{i}", "I", lectures=[random_slots() for _ in range(8)],
+                   tirguls=[random_slots() for _ in range(6)]) for i in range(courses)]
+
+def overlaps(strategy, vector):
+    masks = [strategy.table.masks[course][option] for course, option in enumerate(vector)]
+    return any(masks[i] & masks[j] for i in range(len(masks)) for j in range(i + 1, len(masks)))
+
+# ---------- Tests ----------
+
+def test_streams_improving_conflict_free_schedules():
+    strategy = LocalSearchStrategy(random_catalog(14), deadline=1.0, seed=1)
+    scores, vectors = [], []
+    for schedule in strategy.generate():
+        scores.append(strategy.best_score)
+        vectors.append(schedule.option_indices)
+    assert vectors, "no conflict-free schedule found"
+    assert scores == sorted(scores, reverse=True)
+    assert len(set(vectors)) == len(vectors)
+    assert not any(overlaps(strategy, vector) for vector in vectors)
+    # The incrementally kept occupancy matches the assignment it ended on
+    counts = [0] * len(strategy._counts)
+    for course, option in enumerate(strategy.assignment):
+        for cell in strategy.cells[course][option]:
+            counts[cell] += 1
+    assert counts == strategy._counts
+    assert strategy._overlaps == sum(max(0, count - 1) for count in counts)
+
+def test_finds_the_best_schedule_of_a_small_selection():
+    courses = random_catalog(3, seed=5)
+    exhaustive = CompatibilityStrategy(courses)
+    local = LocalSearchStrategy(courses, deadline=0.5, seed=2)
+    best_local = list(local.generate())[-1]
+    best_score = None
+    for vector in exhaustive.iter_option_vectors():
+        for course, option in enumerate(vector):
+            local._move(course, local.assignment[course], option)
+        score = local.score()
+        best_score = score if best_score is None else min(best_score, score)
+    assert local.best_score == best_score
+    assert not overlaps(local, best_local.option_indices)
+
+def test_cancel_and_constraints():
+    courses = random_catalog(10)
+    strategy = LocalSearchStrategy(courses, deadline=60, cancel=lambda: True, seed=1)
+    list(strategy.generate())
+    assert strategy.iterations <= LocalSearchStrategy.CHECK_EVERY
+
+    constraints = ScheduleConstraints(max_active_days=5)
+    strategy = LocalSearchStrategy(courses, constraints=constraints, deadline=0.5, seed=1)
+    assert all(constraints.is_satisfied_by(schedule) for schedule in strategy.generate())
+
+def test_unsolvable_course_yields_nothing():
+    courses = [Course("Broken", "B", "I", lectures=[[slot(1, 8, 10)]], tirguls=[[slot(1, 9, 10)]])]
+    assert list(LocalSearchStrategy(courses, deadline=0.1).generate()) == []
+    assert list(LocalSearchStrategy([], deadline=0.1).generate()) == []
+
+def test_worker_uses_local_search_for_large_selections(monkeypatch):
+    monkeypatch.setattr(schedule_api, "LOCAL_SEARCH_SECONDS", 0.5)
+    results, stop_event = queue.Queue(), threading.Event()
+    ScheduleAPI._worker_generate(random_catalog(12), results, stop_event)
+    schedules = []
+    while (batch := results.get()) is not None:
+        schedules.extend(batch)
+    assert schedules and all(len(schedule.lecture_groups) == 12 for schedule in schedules)
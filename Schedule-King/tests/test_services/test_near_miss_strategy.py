@@ -0,0 +1,122 @@
+import random
+from itertools import product
+from src.models.course import Course
+from src.models.option_table import OptionTable
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+from src.models.violation import OVERLAP, FORBIDDEN
+from src.services.near_miss_strategy import NearMissStrategy
+from src.services.schedule_api import ScheduleAPI
+
+# ---------- Helpers ----------
+
+def slot(day, start, end):
+    return TimeSlot(day=day, start_time=start, end_time=end, room="101", building="A")
+
+def course(code, *lectures):
+    return Course(f"Course{code}", code, "Dr. X", lectures=[[slot(*lecture)] for lecture in lectures])
+
+def minutes(text):
+    hours, mins = text.split(":")
+    return int(hours) * 60 + int(mins)
+
+def brute_force(courses, forbidden, max_violations):
+    """
+    (cost, vector) of every option combination within the violation bound, by checking every slot pair.
+    """
+    table = OptionTable(courses)
+    results = []
+    for vector in product(*[range(len(options)) for options in table.options]):
+        slots = [[s for s in table.options[c][o].slots] for c, o in enumerate(vector)]
+        cost = violations = 0
+        for first in range(len(slots)):
+            for s in slots[first]:
+                for f in forbidden:
+                    overlap = NearMissStrategy._overlap(NearMissStrategy._interval(s), NearMissStrategy._interval(f))
+                    if overlap:
+                        cost, violations = cost + overlap * NearMissStrategy.FORBIDDEN_MINUTE_COST, violations + 1
+                for second in range(first + 1, len(slots)):
+                    for t in slots[second]:
+                        overlap = NearMissStrategy._overlap(NearMissStrategy._interval(s), NearMissStrategy._interval(t))
+                        if overlap:
+                            cost, violations = cost + overlap * NearMissStrategy.OVERLAP_MINUTE_COST, violations + 1
+        if violations <= max_violations:
+            results.append((cost, vector))
+    return results
+
+# ---------- Tests ----------
+
+def test_valid_schedules_come_first_at_no_cost():
+    courses = [course("A", ("1", "08:00", "10:00"), ("1", "09:00", "11:00")), course("B", ("1", "10:00", "12:00"))]
+    found = list(NearMissStrategy(courses).iter_scored_vectors())
+    assert [(cost, vector) for cost, vector, _ in found] == [(0, (0, 0)), (120, (1, 0))]
+    assert found[1][2][0].kind == OVERLAP and found[1][2][0].course_codes == ("A", "B")
+
+def test_short_overlap_beats_forbidden_hour():
+    a = course("A", ("1", "08:00", "10:00"), ("2", "08:00", "10:00"))
+    b = course("B", ("1", "09:30", "11:00"))
+    forbidden = [slot("2", "09:00", "10:00")]
+    found = list(NearMissStrategy([a, b], forbidden).generate())
+    # A 30-minute overlap costs 60, a forbidden hour costs 60, ties keep the search order
+    assert [sum(v.cost for v in s.violations) for s in found] == [60, 60]
+    assert {s.violations[0].kind for s in found} == {OVERLAP, FORBIDDEN}
+    assert sorted(s.violations[0].minutes() for s in found) == [30, 60]
+
+def test_violation_and_cost_bounds():
+    courses = [course(code, ("1", "08:00", "10:00")) for code in "ABC"]
+    # Three courses at the same time overlap three times
+    assert list(NearMissStrategy(courses, max_violations=2).iter_scored_vectors()) == []
+    assert len(list(NearMissStrategy(courses, max_violations=3).iter_scored_vectors())) == 1
+    assert list(NearMissStrategy(courses, max_violations=3, max_cost=700).iter_scored_vectors()) == []
+
+def test_hard_constraints_still_hold():
+    a = course("A", ("1", "08:00", "10:00"), ("2", "08:00", "10:00"))
+    b = course("B", ("1", "09:00", "10:00"))
+    constraints = ScheduleConstraints(max_active_days=1)
+    found = list(NearMissStrategy([a, b], constraints=constraints).iter_scored_vectors())
+    assert [vector for _, vector, _ in found] == [(0, 0)]
+
+def test_matches_brute_force_and_prunes():
+    rng = random.Random(11)
+    for _ in range(30):
+        courses = [course(f"C{i}", *[(str(rng.randint(1, 2)), f"{start:02d}:{rng.choice(['00', '30'])}",
+                                      f"{start + 2:02d}:00") for start in rng.sample(range(8, 14), rng.randint(1, 3))])
+                   for i in range(rng.randint(2, 5))]
+        forbidden = [slot(str(rng.randint(1, 2)), f"{hour:02d}:00", f"{hour + 1:02d}:00") for hour in rng.sample(range(8, 16), 2)]
+        k = rng.randint(0, 2)
+        strategy = NearMissStrategy(courses, forbidden, max_violations=k)
+        found = [(cost, vector) for cost, vector, _ in strategy.iter_scored_vectors()]
+        expected = brute_force(courses, forbidden, k)
+        assert sorted(found) == sorted(expected)
+        assert [cost for cost, _ in found] == sorted(cost for cost, _ in found)
+
+def test_node_limit_stops_the_search():
+    courses = [course(code, *[("1", f"{h:02d}:00", f"{h + 1:02d}:00") for h in range(8, 16)]) for code in "ABCD"]
+    strategy = NearMissStrategy(courses, max_violations=4, node_limit=10)
+    list(strategy.iter_scored_vectors())
+    assert strategy.limit_reached and strategy.nodes_visited == 10
+
+def test_worker_sends_near_misses_with_core():
+    sent = []
+
+    class Queue:
+        def put(self, item):
+            sent.append(item)
+
+    class Event:
+        def is_set(self):
+            return False
+
+    courses = [course("A", ("1", "08:00", "10:00")), course("B", ("1", "09:30", "11:00"))]
+    ScheduleAPI._worker_generate(courses, Queue(), Event())
+    core = sent[0]
+    assert len(core.near_misses) == 1 and core.near_misses[0].violations[0].minutes() == 30
+
+def test_self_overlapping_option_is_not_a_near_miss():
+    # The lecture overlaps the course's only tirgul, so the course has no option at all
+    broken = Course("Broken", "B1", "Dr. X", lectures=[[slot("1", "08:00", "10:00")]],
+                    tirguls=[[slot("1", "09:00", "10:00")]])
+    assert list(NearMissStrategy([broken]).iter_scored_vectors()) == []
+    fine = Course("Fine", "F1", "Dr. X", lectures=[[slot("1", "08:00", "10:00")]],
+                  tirguls=[[slot("1", "09:00", "10:00")], [slot("2", "09:00", "10:00")]])
+    assert [vector for _, vector, _ in NearMissStrategy([fine]).iter_scored_vectors()] == [(1,)]
@@ -0,0 +1,97 @@
+import os
+import queue
+import threading
+import pytest
+from datetime import time
+from itertools import islice
+from src.models.course import Course
+from src.models.option_table import OptionTable
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.soft_preferences import SoftPreferences
+from src.models.time_slot import TimeSlot
+from src.services.compatibility_strategy import CompatibilityStrategy
+from src.services.penalty_strategy import PenaltyStrategy
+from src.services.schedule_api import ScheduleAPI
+
+TEST_FILES = os.path.join(os.path.dirname(__file__), "..", "test_files")
+
+# ---------- Helpers ----------
+
+def slot(day, start, end, building="A"):
+    return TimeSlot(day=day, start_time=f"{start:02d}:00", end_time=f"{end:02d}:00", room="101", building=building)
+
+@pytest.fixture
+def courses():
+    return [
+        Course("Course1", "C1", "Dr. A", lectures=[[slot("1", 8, 10)], [slot("2", 10, 12, "B")]],
+               tirguls=[[slot("3", 12, 13)], [slot("3", 14, 15, "B")]]),
+        Course("Course2", "C2", "Dr. B", lectures=[[slot("1", 9, 11)], [slot("4", 12, 14)], [slot("2", 8, 10)]]),
+        Course("Course3", "C3", "Dr. A", lectures=[[slot("2", 8, 9, "B")], [slot("5", 11, 12)]]),
+    ]
+
+def total_penalty(penalties, vector):
+    return sum(penalties[course][option] for course, option in enumerate(vector))
+
+# ---------- Tests ----------
+
+def test_option_penalties(courses):
+    preferences = SoftPreferences(preferred_instructors=["Dr. A"], avoided_buildings=["B"],
+                                  preferred_tirguls={"C1": 0}, early_before=time(9))
+    assert not preferences.is_empty()
+    penalties = preferences.penalties(OptionTable(courses))
+    # Course1 options: (Sunday 8-10 early, tirgul 0), (early, tirgul 1 in B), (B, tirgul 0), (B, tirgul 1 in B)
+    assert penalties[0] == [1, 1 + 2 + 2, 2, 2 + 2 + 2]
+    # Course2 is taught by someone else, its Monday 8-10 lecture is early
+    assert penalties[1] == [3, 3, 3 + 1]
+    assert penalties[2] == [2 + 1, 0]
+    assert SoftPreferences().is_empty()
+
+@pytest.mark.parametrize("preferences", [
+    SoftPreferences(avoided_buildings=["B"]),
+    SoftPreferences(early_before=time(10), preferred_tirguls={"C1": 1}),
+    SoftPreferences(),
+])
+def test_schedules_come_in_penalty_order(courses, preferences):
+    strategy = PenaltyStrategy(courses, preferences=preferences)
+    scored = list(strategy.iter_scored_vectors())
+    expected = list(CompatibilityStrategy(courses).iter_option_vectors())
+    assert sorted(vector for _, vector in scored) == expected
+    assert [penalty for penalty, _ in scored] == sorted(total_penalty(strategy.penalties, v) for v in expected)
+    for schedule, (penalty, vector) in zip(strategy.generate(), scored):
+        assert schedule.option_indices == vector and schedule.penalty == penalty
+
+def test_hard_constraints_still_apply(courses):
+    constraints = ScheduleConstraints(max_active_days=3)
+    preferences = SoftPreferences(avoided_buildings=["B"])
+    vectors = [v for _, v in PenaltyStrategy(courses, constraints=constraints, preferences=preferences).iter_scored_vectors()]
+    assert sorted(vectors) == list(CompatibilityStrategy(courses, constraints=constraints).iter_option_vectors())
+
+def test_best_schedules_expand_few_nodes():
+    courses = ScheduleAPI().get_courses(os.path.join(TEST_FILES, "courses_valid_schedule.txt"))[:7]
+    preferences = SoftPreferences(early_before=time(10))
+    strategy = PenaltyStrategy(courses, preferences=preferences)
+    best = list(islice(strategy.iter_scored_vectors(), 10))
+    all_penalties = sorted(total_penalty(strategy.penalties, v) for v in CompatibilityStrategy(courses).iter_option_vectors())
+    assert [penalty for penalty, _ in best] == all_penalties[:10]
+    # The best schedules are reached without visiting the tree of 61440 schedules
+    assert strategy.nodes_visited < 1000
+
+def test_worker_streams_lowest_penalty_first(courses):
+    results, stop_event = queue.Queue(), threading.Event()
+    preferences = SoftPreferences(avoided_buildings=["B"])
+    ScheduleAPI._worker_generate(courses, results, stop_event, None, None, preferences)
+    schedules = []
+    while (batch := results.get()) is not None:
+        schedules.extend(batch)
+    penalties = [schedule.penalty for schedule in schedules]
+    assert penalties == sorted(penalties) and len(schedules) == len(list(CompatibilityStrategy(courses).generate()))
+
+def test_more_than_seven_courses():
+    # Nine courses at their own hours, avoiding building B costs one point per course taught there
+    courses = [Course(f"Course{i}", f"C{i}", "I", lectures=[[slot("1", 8 + i, 9 + i, "B")], [slot("2", 8 + i, 9 + i)]])
+               for i in range(9)]
+    penalties = [s.penalty for s in PenaltyStrategy(courses, preferences=SoftPreferences(avoided_buildings=["B"])).generate()]
+    assert len(penalties) == 512 and penalties == sorted(penalties) and penalties[0] == 0
+
+def test_no_courses():
+    assert list(PenaltyStrategy([]).generate()) == []
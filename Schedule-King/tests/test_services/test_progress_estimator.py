@@ -0,0 +1,78 @@
+import os
+from src.models.course_selection import CourseSelection
+from src.models.schedule_constraints import ScheduleConstraints
+from src.services import schedule_api
+from src.services.factorized_strategy import FactorizedStrategy
+from src.services.progress_estimator import ProgressEstimator
+from src.services.schedule_api import ScheduleAPI
+from src.services.strategy_selector import StrategySelector
+
+TEST_FILES = os.path.join(os.path.dirname(__file__), "..", "test_files")
+
+# ---------- Helpers ----------
+
+def catalog(name, count):
+    return ScheduleAPI().get_courses(os.path.join(TEST_FILES, name))[:count]
+
+def estimator_for(courses, constraints=None):
+    selector = StrategySelector(courses, constraints=constraints)
+    return ProgressEstimator(selector.table, selector.components, constraints)
+
+# ---------- Tests ----------
+
+def test_band_holds_the_real_count_and_tightens():
+    courses = catalog("medium.txt", 5)
+    real = FactorizedStrategy(courses).count()
+    estimator = estimator_for(courses)
+    first = estimator.estimate(0, 0.0)
+    for _ in range(60):
+        estimator.refine()
+    refined = estimator.estimate(0, 0.0)
+
+    assert not refined.exact
+    assert refined.low <= real <= refined.high
+    assert refined.band_width() < first.band_width()
+    assert abs(refined.schedules - real) / real < 0.1
+
+def test_constraints_linking_courses_are_counted():
+    # The day limit only prunes complete schedules, each probe's schedule is checked against it
+    courses = catalog("medium.txt", 5)
+    constraints = ScheduleConstraints(max_active_days=5)
+    real = FactorizedStrategy(courses, constraints=constraints).count()
+    estimator = estimator_for(courses, constraints)
+    for _ in range(60):
+        estimator.refine()
+    estimate = estimator.estimate(0, 0.0)
+
+    assert real < FactorizedStrategy(courses).count()
+    assert estimate.low <= real <= estimate.high
+
+def test_generated_schedules_bound_the_band():
+    estimator = estimator_for(catalog("medium.txt", 5))
+    seen = estimator.estimate(0, 0.0).high + 10
+
+    estimate = estimator.estimate(seen, 1.0)
+    assert estimate.low == estimate.schedules == estimate.high == seen
+    assert estimate.eta_seconds == 0.0
+
+def test_exact_count_and_eta():
+    estimator = ProgressEstimator.from_count(100)
+    assert estimator.estimate(0, 0.0).eta_seconds is None
+
+    estimate = estimator.estimate(25, 2.0)
+    assert estimate.exact and estimate.low == estimate.high == 100
+    assert estimate.eta_seconds == 6.0
+    # Schedules restored from a checkpoint do not count towards the arrival rate
+    assert estimator.estimate(60, 2.0, seen_at_start=50).eta_seconds == 8.0
+
+def test_api_counts_small_selections_exactly(monkeypatch):
+    api = ScheduleAPI()
+    courses = catalog("courses_valid_schedule.txt", 5)
+    exact = api.create_progress_estimator(courses).estimate(0, 0.0)
+    assert exact.exact and exact.schedules == 1280
+    assert api.create_progress_estimator(CourseSelection(mandatory=courses)) is None
+
+    # Past COUNT_NODE_LIMIT the tree is sampled
+    monkeypatch.setattr(schedule_api, "COUNT_NODE_LIMIT", 1000)
+    sampled = api.create_progress_estimator(catalog("medium.txt", 5)).estimate(0, 0.0)
+    assert not sampled.exact and sampled.low <= 247968 <= sampled.high
@@ -0,0 +1,79 @@
+import random
+import time
+from src.models.course import Course
+from src.models.schedule import Schedule
+from src.models.time_slot import TimeSlot
+from src.services.compatibility_strategy import CompatibilityStrategy
+from src.services.factorized_strategy import FactorizedStrategy
+from src.services.quality_buffer import QualityBuffer
+
+# ---------- Helpers ----------
+
+def slot(day, start, end):
+    return TimeSlot(day=day, start_time=f"{start:02d}:00", end_time=f"{end:02d}:00", room="101", building="A")
+
+def random_courses(rng, count):
+    return [Course(f"Course{i}", f"C{i}", "Dr. X",
+                   lectures=[[slot(str(rng.randint(1, 5)), start, start + 2)]
+                             for start in rng.sample(range(8, 16), rng.randint(1, 4))],
+                   tirguls=[[slot(str(rng.randint(1, 5)), start, start + 1)]
+                            for start in rng.sample(range(8, 18), rng.randint(1, 2))])
+            for i in range(count)]
+
+def schedule_with(active_days, start):
+    schedule = Schedule([], active_days=active_days, avg_start_time=start, avg_end_time=1400)
+    schedule.update_metric_tuple()
+    return schedule
+
+# ---------- Tests ----------
+
+def test_quality_order_finds_the_same_schedules():
+    rng = random.Random(2)
+    for _ in range(30):
+        courses = random_courses(rng, rng.randint(1, 5))
+        plain = list(CompatibilityStrategy(courses).iter_option_vectors())
+        ordered = list(CompatibilityStrategy(courses, quality_order=True).iter_option_vectors())
+        assert sorted(plain) == sorted(ordered)
+        factorized = [s.option_indices for s in FactorizedStrategy(courses, quality_order=True).generate()]
+        assert sorted(plain) == sorted(factorized)
+
+def test_quality_order_tries_fewest_days_first():
+    course = Course("Course", "C", "Dr. X", lectures=[[slot("1", 8, 10), slot("2", 8, 10)], [slot("3", 8, 10)],
+                                                      [slot("4", 10, 12)]])
+    ordered = list(CompatibilityStrategy([course], quality_order=True).iter_option_vectors())
+    # One-day options first, the later start first among them
+    assert ordered == [(2,), (1,), (0,)]
+
+def test_drain_puts_best_per_metric_first():
+    buffer = QualityBuffer(window_seconds=10, top_k=1)
+    schedules = [schedule_with(5, 900), schedule_with(3, 800), schedule_with(4, 1100), schedule_with(5, 800)]
+    for schedule in schedules:
+        assert not buffer.add(schedule)
+    head, rest = buffer.drain()
+    # Fewest days (3) and latest start (1100) lead; metrics where all tie keep the first schedule
+    assert head == [schedules[1], schedules[2], schedules[0]]
+    assert rest == [schedules[3]]
+    assert buffer.schedules == []
+
+def test_reorder_keeps_every_schedule():
+    schedules = [schedule_with(days, 800 + 100 * (days % 3)) for days in (6, 2, 5, 1, 4, 3, 6, 2)]
+    reordered = list(QualityBuffer(window_seconds=0, top_k=2).reorder(iter(schedules)))
+    assert sorted(map(id, reordered)) == sorted(map(id, schedules))
+    # A zero window drains after the first schedule, the rest streams through
+    assert reordered == schedules
+    held = list(QualityBuffer(window_seconds=10, top_k=1).reorder(iter(schedules)))
+    assert held[0].active_days == 1 and sorted(map(id, held)) == sorted(map(id, schedules))
+
+def test_tick_closes_the_window_without_another_schedule():
+    first = schedule_with(5, 900)
+
+    def sparse():
+        yield first
+        while True:
+            yield None  # The search has found nothing more yet
+
+    reordered = QualityBuffer(window_seconds=0.05, top_k=1).reorder(sparse())
+    # Held within the window, the tick is passed on
+    assert next(reordered) is None
+    time.sleep(0.05)
+    assert next(reordered) is first
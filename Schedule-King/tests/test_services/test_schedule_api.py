@@ -1,7 +1,16 @@
+import os
+import queue
+import threading
 import pytest
 from src.services.schedule_api import ScheduleAPI
 from src.models.course import Course
+from src.models.generation_limits import GenerationLimits
+from src.models.generation_result import (GenerationResult, STOPPED_AT_DEADLINE, STOPPED_AT_MAX_SCHEDULES,
+                                          STOPPED_AT_NODE_BUDGET)
 from src.models.schedule import Schedule
+from src.models.time_slot import TimeSlot
+
+TEST_FILES = os.path.join(os.path.dirname(__file__), "..", "test_files")
 
 # ——— RAW DATA ———————————————————————————————————————————
 RAW_DATA = """
@@ -83,6 +92,63 @@ def test_process_empty_list(api):
     schedules = api.process([])
     assert schedules == [], "No selected courses should yield no schedules"
 
+# ——— bounded generation tests ——————————————————————————————————
+
+@pytest.fixture
+def medium_courses(api):
+    return api.get_courses(os.path.join(TEST_FILES, "medium.txt"))
+
+def test_bounded_page_matches_full_order(api, medium_courses):
+    # An offset and a count address the same schedules as slicing a longer run
+    first = api.generate_bounded(medium_courses, limits=GenerationLimits(max_schedules=20))
+    page = api.generate_bounded(medium_courses, limits=GenerationLimits(max_schedules=10, offset=5))
+    assert [s.option_indices for s in page.schedules] == [s.option_indices for s in first.schedules[5:15]]
+    limited = api.process(medium_courses, GenerationLimits(max_schedules=3))
+    assert [s.option_indices for s in limited] == [s.option_indices for s in first.schedules[:3]]
+
+def test_bounded_run_finishes_exactly_at_the_count(api, courses_file):
+    courses = api.get_courses(courses_file)
+    full = api.generate_bounded(courses)
+    assert full.finished and full.stop_reason is None and len(full.schedules) == 1
+    # Exactly every schedule was requested, so nothing was cut off
+    assert api.generate_bounded(courses, limits=GenerationLimits(max_schedules=1)).finished
+    assert api.generate_bounded(courses, limits=GenerationLimits(offset=1)).schedules == []
+
+def test_bounded_run_reports_truncation(api, medium_courses):
+    result = api.generate_bounded(medium_courses, limits=GenerationLimits(max_schedules=10, offset=5))
+    assert len(result.schedules) == 10 and result.truncated() and result.stop_reason == STOPPED_AT_MAX_SCHEDULES
+
+    result = api.generate_bounded(medium_courses, limits=GenerationLimits(node_budget=1000))
+    assert result.truncated() and result.stop_reason == STOPPED_AT_NODE_BUDGET
+    assert result.nodes_visited <= 1001 and result.schedules
+
+    # 247968 schedules take seconds; the deadline is checked inside the search
+    result = api.generate_bounded(medium_courses, limits=GenerationLimits(deadline_seconds=0.05))
+    assert result.truncated() and result.stop_reason == STOPPED_AT_DEADLINE
+    assert result.elapsed < 1.0
+
+def test_bounded_run_stops_while_combining_components(api):
+    # Five courses on five different days: five components of 12 options, 248832 schedules
+    courses = [Course(f"Day {day}", f"D{day}", "Lecturer",
+                      [[TimeSlot(str(day), f"{hour:02d}:00", f"{hour + 1:02d}:00", "1", "A")] for hour in range(8, 20)])
+               for day in range(1, 6)]
+    result = api.generate_bounded(courses, limits=GenerationLimits(deadline_seconds=0.05))
+    assert result.truncated() and result.stop_reason == STOPPED_AT_DEADLINE
+    assert result.elapsed < 1.0 and len(result.schedules) < 12 ** 5
+
+def test_bounded_run_rejects_negative_limits(api, courses_file):
+    with pytest.raises(ValueError):
+        api.generate_bounded(api.get_courses(courses_file), limits=GenerationLimits(offset=-1))
+
+def test_worker_reports_bounded_result(medium_courses):
+    results, stop_event = queue.Queue(), threading.Event()
+    ScheduleAPI._worker_generate(medium_courses, results, stop_event, limits=GenerationLimits(max_schedules=25))
+    items = []
+    while (item := results.get()) is not None:
+        items.append(item)
+    assert isinstance(items[-1], GenerationResult) and items[-1].stop_reason == STOPPED_AT_MAX_SCHEDULES
+    assert sum(len(batch) for batch in items[:-1]) == 25
+
 # ——— export tests ——————————————————————————————————————————
 
 @pytest.fixture
@@ -0,0 +1,142 @@
+import random
+import pytest
+from itertools import combinations, product
+from src.models.course import Course
+from src.models.course_selection import CourseSelection
+from src.models.option_table import SKIPPED_OPTION
+from src.models.result_store import TrieResultStore
+from src.models.soft_preferences import SoftPreferences
+from src.models.time_slot import TimeSlot
+from src.services.compatibility_strategy import CompatibilityStrategy
+from src.services.schedule_api import ScheduleAPI
+from src.services.selection_strategy import SelectionStrategy
+
+# ---------- Helpers ----------
+
+def slot(day, start, end, building="A"):
+    return TimeSlot(day=day, start_time=f"{start:02d}:00", end_time=f"{end:02d}:00", room="101", building=building)
+
+def course(code, *lectures, instructor="Dr. X"):
+    return Course(f"Course{code}", code, instructor, lectures=[[slot(*lecture)] for lecture in lectures])
+
+def vectors(strategy):
+    return [vector for _, vector in strategy.iter_scored_vectors()]
+
+def brute_force(selection):
+    """
+    All valid schedules of a selection as full-width option vectors, by solving every allowed subset apart.
+    """
+    candidates = selection.courses()
+    position = {id(c): index for index, c in enumerate(candidates)}
+    results = set()
+    for chosen_alternatives in product(*selection.alternatives):
+        for size in range(selection.min_optional, selection.optional_limit() + 1):
+            for optional in combinations(selection.optional, size):
+                subset = selection.mandatory + list(chosen_alternatives) + list(optional)
+                subset.sort(key=lambda c: position[id(c)])
+                for vector in CompatibilityStrategy(subset).iter_option_vectors():
+                    full = [SKIPPED_OPTION] * len(candidates)
+                    for c, option in zip(subset, vector):
+                        full[position[id(c)]] = option
+                    results.add(tuple(full))
+    return results
+
+# ---------- Tests ----------
+
+def test_mandatory_only_matches_compatibility_strategy():
+    courses = [course("A", ("1", 8, 10), ("2", 8, 10)), course("B", ("1", 9, 11), ("3", 8, 10))]
+    selection = CourseSelection(mandatory=courses)
+    assert sorted(vectors(SelectionStrategy(selection))) == sorted(CompatibilityStrategy(courses).iter_option_vectors())
+
+def test_k_of_n_optional_courses():
+    a = course("A", ("1", 8, 10))
+    b = course("B", ("1", 9, 11), ("2", 8, 10))
+    c = course("C", ("3", 8, 10))
+    selection = CourseSelection(mandatory=[a], optional=[b, c], min_optional=1, max_optional=1)
+    found = vectors(SelectionStrategy(selection))
+    # B only fits with its second lecture, and exactly one of B and C is taken
+    assert sorted(found) == [(0, 1, SKIPPED_OPTION), (0, SKIPPED_OPTION, 0)]
+
+def test_or_group_takes_exactly_one_course():
+    a = course("A", ("1", 8, 10))
+    group = [course("B", ("1", 8, 10)), course("C", ("2", 8, 10)), course("D", ("3", 8, 10))]
+    selection = CourseSelection(mandatory=[a], alternatives=[group])
+    found = sorted(vectors(SelectionStrategy(selection)))
+    # B always clashes with A, so C or D is taken
+    assert found == [(0, SKIPPED_OPTION, 0, SKIPPED_OPTION), (0, SKIPPED_OPTION, SKIPPED_OPTION, 0)]
+
+def test_unsatisfiable_minimum_yields_nothing():
+    a = course("A", ("1", 8, 10))
+    optional = [course("B", ("1", 8, 10)), course("C", ("1", 9, 10))]
+    selection = CourseSelection(mandatory=[a], optional=optional, min_optional=1)
+    strategy = SelectionStrategy(selection)
+    assert vectors(strategy) == []
+    assert strategy.nodes_visited == 0
+
+def test_preferred_courses_rank_first():
+    a = course("A", ("1", 8, 10))
+    b = course("B", ("2", 8, 10))
+    c = course("C", ("3", 8, 10), instructor="Dr. Y")
+    selection = CourseSelection(mandatory=[a], optional=[b, c], min_optional=1, preferred=["B", "C"])
+    preferences = SoftPreferences(preferred_instructors=["Dr. Y"])
+    found = list(SelectionStrategy(selection, preferences=preferences).generate())
+    missing = [sum(code not in [g.course_code for g in schedule.lecture_groups] for code in ("B", "C"))
+               for schedule in found]
+    assert missing == [0, 1, 1]
+    # Courses not taught by Dr. Y cost 3, so among schedules missing one preferred course the one keeping C comes first
+    assert [schedule.penalty for schedule in found] == [6, 103, 106]
+    assert len(found[1].lecture_groups) == 2
+
+def test_selection_of_more_than_seven_courses():
+    # Nine courses at their own hours: six mandatory and two of the three optional ones
+    courses = [course(str(i), ("1", 8 + i, 9 + i)) for i in range(9)]
+    found = list(SelectionStrategy(CourseSelection(mandatory=courses[:6], optional=courses[6:], max_optional=2,
+                                                   min_optional=2)).generate())
+    assert len(found) == 3 and all(len(schedule.lecture_groups) == 8 for schedule in found)
+
+def test_invalid_counts_raise():
+    a = course("A", ("1", 8, 10))
+    with pytest.raises(ValueError):
+        CourseSelection(optional=[a], min_optional=2).validate()
+    with pytest.raises(ValueError):
+        CourseSelection(alternatives=[[]]).validate()
+
+def test_matches_brute_force_on_random_selections():
+    rng = random.Random(3)
+    for _ in range(40):
+        catalog = [course(f"C{i}", *[(str(rng.randint(1, 3)), start, start + rng.randint(1, 2))
+                                     for start in rng.sample(range(8, 14), rng.randint(1, 3))])
+                   for i in range(7)]
+        rng.shuffle(catalog)
+        optional = catalog[4:]
+        max_optional = rng.choice([None, 1, 2])
+        limit = len(optional) if max_optional is None else max_optional
+        selection = CourseSelection(mandatory=catalog[:1], alternatives=[catalog[1:2], catalog[2:4]],
+                                    optional=optional, min_optional=rng.randint(0, limit),
+                                    max_optional=max_optional, preferred=[catalog[2].course_code])
+        scored = list(SelectionStrategy(selection).iter_scored_vectors())
+        assert {vector for _, vector in scored} == brute_force(selection)
+        assert len(scored) == len({vector for _, vector in scored})
+        assert [penalty for penalty, _ in scored] == sorted(penalty for penalty, _ in scored)
+
+def test_worker_and_store_accept_selection():
+    a = course("A", ("1", 8, 10))
+    b = course("B", ("2", 8, 10), ("3", 8, 10))
+    selection = CourseSelection(mandatory=[a], optional=[b])
+    sent = []
+
+    class Queue:
+        def put(self, batch):
+            sent.append(batch)
+
+    class Event:
+        def is_set(self):
+            return False
+
+    ScheduleAPI._worker_generate(selection, Queue(), Event())
+    schedules = [schedule for batch in sent if batch for schedule in batch]
+    assert sent[-1] is None and len(schedules) == 3
+    store = TrieResultStore(selection.courses())
+    store.extend(schedules)
+    assert [len(store[i].lecture_groups) for i in range(3)] == [len(s.lecture_groups) for s in schedules]
+    assert ScheduleAPI().get_estimated_schedules_count(selection) == -1
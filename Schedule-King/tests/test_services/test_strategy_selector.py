@@ -0,0 +1,76 @@
+import os
+import random
+from src.models.course import Course
+from src.models.soft_preferences import SoftPreferences
+from src.models.time_slot import TimeSlot
+from src.services.compatibility_strategy import CompatibilityStrategy
+from src.services.compatibility_table import CompatibilityTable, popcount
+from src.services.factorized_strategy import FactorizedStrategy
+from src.services.local_search_strategy import LocalSearchStrategy
+from src.services.penalty_strategy import PenaltyStrategy
+from src.services.schedule_api import ScheduleAPI
+from src.services.strategy_selector import StrategySelector, EXHAUSTIVE, FACTORIZED, BRANCH_AND_BOUND, ANYTIME
+from src.services.tree_size_estimator import estimate_tree_size
+
+TEST_FILES = os.path.join(os.path.dirname(__file__), "..", "test_files")
+
+# ---------- Helpers ----------
+
+def slot(day, start, end):
+    return TimeSlot(day=str(day), start_time=f"{start:02d}:00", end_time=f"{end:02d}:00", room="101", building="A")
+
+def random_catalog(count, lectures, seed=7):
+    rng = random.Random(seed)
+    return [Course(f"Course{i}", f"C{i}", "I",
+                   lectures=[[slot(rng.randint(1, 6), start, start + 2)]
+                             for start in [rng.randint(8, 18) for _ in range(lectures)]],
+                   tirguls=[[slot(rng.randint(1, 6), start, start + 1)]
+                            for start in [rng.randint(8, 19) for _ in range(lectures)]])
+            for i in range(count)]
+
+def catalog(name, count):
+    return ScheduleAPI().get_courses(os.path.join(TEST_FILES, name))[:count]
+
+# ---------- Tests ----------
+
+def test_estimate_is_close_to_the_real_tree():
+    courses = catalog("medium.txt", 5)
+    estimate = estimate_tree_size(CompatibilityTable(courses))
+    strategy = CompatibilityStrategy(courses)
+    schedules = sum(1 for _ in strategy.iter_option_vectors())
+    assert 0.5 < estimate.nodes / strategy.nodes_visited < 2
+    assert 0.5 < estimate.leaves / schedules < 2
+
+def test_estimate_is_exact_without_branching_choices():
+    # One course: every probe sees the same single level
+    courses = catalog("medium.txt", 1)
+    table = CompatibilityTable(courses)
+    assert estimate_tree_size(table) == (popcount(table.domains[0]), popcount(table.domains[0]))
+    assert estimate_tree_size(table, []) == (0, 0)
+
+def test_small_selections_are_enumerated():
+    selector = StrategySelector(catalog("medium.txt", 5))
+    assert selector.engine == EXHAUSTIVE and isinstance(selector.build(), FactorizedStrategy)
+    # courses_valid_schedule.txt splits into six independent components
+    assert StrategySelector(catalog("courses_valid_schedule.txt", 7)).engine == FACTORIZED
+
+def test_preferences_get_branch_and_bound():
+    selector = StrategySelector(catalog("medium.txt", 5), preferences=SoftPreferences(avoided_buildings=["B"]))
+    assert selector.engine == BRANCH_AND_BOUND and isinstance(selector.build(), PenaltyStrategy)
+    # Empty preferences change nothing
+    assert StrategySelector(catalog("medium.txt", 5), preferences=SoftPreferences()).engine == EXHAUSTIVE
+
+def test_large_selections_get_anytime_search():
+    selector = StrategySelector(random_catalog(12, 5))
+    assert selector.estimated_nodes() > 20_000_000 and selector.engine == ANYTIME
+    strategy = selector.build(deadline=0.2)
+    assert isinstance(strategy, LocalSearchStrategy)
+    assert next(iter(strategy.generate()), None) is not None
+
+def test_ten_course_selection_is_enumerated():
+    # Ten courses with few groups each stay small enough to list every schedule
+    courses = random_catalog(10, 2, seed=2)
+    selector = StrategySelector(courses)
+    assert selector.engine in (EXHAUSTIVE, FACTORIZED)
+    expected = sum(1 for _ in CompatibilityStrategy(courses).iter_option_vectors())
+    assert expected and len(ScheduleAPI().process(courses)) == expected
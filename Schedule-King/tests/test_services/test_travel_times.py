@@ -0,0 +1,104 @@
+import json
+import os
+import random
+import time
+import pytest
+from src.models.course import Course
+from src.models.time_slot import TimeSlot
+from src.models.travel_times import TravelTimes
+from src.services.all_strategy import AllStrategy
+from src.services.compatibility_strategy import CompatibilityStrategy
+from src.services.factorized_strategy import FactorizedStrategy
+from src.services.penalty_strategy import PenaltyStrategy
+from src.services.schedule_api import ScheduleAPI
+
+TEST_FILES = os.path.join(os.path.dirname(__file__), "..", "test_files")
+EXAMPLE_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "travel_times.example.json")
+
+# ---------- Helpers ----------
+
+def slot(day, start, end, building):
+    return TimeSlot(day=str(day), start_time=start, end_time=end, room="101", building=building)
+
+def slots_of(schedule):
+    return [s for group in schedule.lecture_groups
+            for part in (group.lecture, group.tirguls, group.maabadas) if part for s in part]
+
+@pytest.fixture
+def travel():
+    return TravelTimes({"A": {"B": 15, "C": 40}, "B": {"C": 10}}, default_minutes=5)
+
+# ---------- Tests ----------
+
+def test_matrix_is_symmetric_with_shortest_routes(travel):
+    assert travel.minutes("A", "B") == travel.minutes("B", "A") == 15
+    # A to C is faster through B
+    assert travel.minutes("A", "C") == 25
+    assert travel.minutes("A", "A") == 0
+    assert travel.minutes("A", "Unknown") == 5
+    assert travel.max_minutes == 25
+
+def test_default_minutes_stay_out_of_the_shortest_routes(travel):
+    # A detour through a building with no listed route is not a shorter route: the listed time stands
+    assert travel.minutes("A", "Unknown") + travel.minutes("Unknown", "B") == 10
+    assert travel.minutes("A", "B") == 15
+    unlisted = TravelTimes({"A": {"B": 15}, "C": {"D": 10}})
+    assert unlisted.minutes("A", "C") == 0 and unlisted.minutes("A", "B") == 15
+
+def test_allows(travel):
+    assert not travel.allows(slot(1, "08:00", "10:00", "A"), slot(1, "10:00", "11:00", "B"))
+    assert travel.allows(slot(1, "10:15", "11:00", "B"), slot(1, "08:00", "10:00", "A"))
+    assert travel.allows(slot(1, "08:00", "10:00", "A"), slot(1, "10:00", "11:00", "A"))
+    assert travel.allows(slot(1, "08:00", "10:00", "A"), slot(2, "10:00", "11:00", "C"))
+
+def test_load_example_file(tmp_path):
+    travel = TravelTimes.load(EXAMPLE_FILE)
+    assert travel.minutes("10", "30") == 20
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps({"travel_minutes": {"A": 5}}))
+    with pytest.raises(ValueError):
+        TravelTimes.load(str(bad))
+
+def test_random_catalogs_match_filtered_all_strategy(travel):
+    rng = random.Random(11)
+    def random_slots():
+        day, start = rng.randint(1, 2), rng.randint(8, 16)
+        return [slot(day, f"{start:02d}:{rng.choice(['00', '30'])}", f"{start + 1:02d}:00", rng.choice("ABCD"))]
+    for _ in range(80):
+        courses = [Course(f"Course{i}", f"C{i}", "I", lectures=[random_slots() for _ in range(rng.randint(1, 4))],
+                          tirguls=[random_slots() for _ in range(rng.randint(0, 2))])
+                   for i in range(rng.randint(1, 4))]
+        expected = [s.option_indices for s in AllStrategy(courses).generate() if travel.allows_slots(slots_of(s))]
+        strategy = CompatibilityStrategy(courses, travel=travel)
+        assert list(strategy.iter_option_vectors()) == expected
+        assert sorted(s.option_indices for s in FactorizedStrategy(courses, travel=travel).generate()) == expected
+        assert sorted(v for _, v in PenaltyStrategy(courses, travel=travel).iter_scored_vectors()) == expected
+
+def test_courses_linked_by_travel_share_a_component(travel):
+    morning = Course("Morning", "M", "I", lectures=[[slot(1, "08:00", "10:00", "A")]])
+    next_door = Course("Next", "N", "I", lectures=[[slot(1, "10:00", "11:00", "B")], [slot(1, "12:00", "13:00", "B")]])
+    strategy = FactorizedStrategy([morning, next_door], travel=travel)
+    assert strategy.components == [[0, 1]]
+    assert [s.option_indices for s in strategy.generate()] == [(0, 1)]
+    assert FactorizedStrategy([morning, next_door]).components == [[0], [1]]
+
+@pytest.mark.parametrize("catalog", ["courses_valid_schedule.txt", "medium.txt"])
+def test_travel_cost_is_measured(catalog):
+    # The default path does no travel work; with travel times only the table build grows
+    courses = ScheduleAPI().get_courses(os.path.join(TEST_FILES, catalog))[:7]
+    buildings = sorted({s.building for course in courses for group in course.lectures + course.tirguls for s in group})
+    travel = TravelTimes({first: {second: 10 for second in buildings if second != first} for first in buildings})
+    plain = CompatibilityStrategy(courses)
+    started = time.perf_counter()
+    plain_count = plain.count_schedules()
+    plain_search = time.perf_counter() - started
+    walking = CompatibilityStrategy(courses, travel=travel)
+    started = time.perf_counter()
+    walking_count = walking.count_schedules()
+    walking_search = time.perf_counter() - started
+    print(f"\n{catalog}: build {plain.build_time * 1000:.1f}ms -> {walking.build_time * 1000:.1f}ms "
+          f"(travel {walking.table.travel_time * 1000:.1f}ms), count {plain_count} -> {walking_count} "
+          f"in {plain_search * 1000:.1f}ms -> {walking_search * 1000:.1f}ms")
+    assert plain.table.travel_time == 0
+    assert walking_count <= plain_count
+    assert walking.table.travel_time < 1
@@ -0,0 +1,160 @@
+import os
+import queue
+import time
+import pytest
+from types import SimpleNamespace
+from src.services import worker_pool
+from src.services.schedule_api import ScheduleAPI, LOW_PRIORITY_NICENESS
+from src.services.worker_pool import GENERATE, LOAD_CATALOG, WorkerPool, _serve
+
+TEST_FILES = os.path.join(os.path.dirname(__file__), "..", "test_files")
+
+# ---------- Helpers ----------
+
+def catalog(api):
+    return api.get_courses(os.path.join(TEST_FILES, "courses_valid_schedule.txt"))
+
+def collect(stream):
+    vectors = []
+    while True:
+        item = stream.get(timeout=60)
+        if item is None:
+            return sorted(vectors)
+        if isinstance(item, list):
+            vectors.extend(tuple(schedule.option_indices) for schedule in item)
+
+def serve_inline(messages, generate=ScheduleAPI._worker_generate, cancelled=0):
+    # Runs the worker loop in this process on plain queues
+    requests, results = queue.Queue(), queue.Queue()
+    for message in messages + [None]:
+        requests.put(message)
+    finished = SimpleNamespace(value=0)
+    _serve(generate, requests, results, SimpleNamespace(value=cancelled), finished, None)
+    items = []
+    while not results.empty():
+        items.append(results.get())
+    return items, finished.value
+
+def lingering_generate(selected, queue, stop_event, forbidden=None, constraints=None, preferences=None,
+                       travel=None, limits=None, resume_after=None, low_priority=False):
+    # No courses: a run that notices its cancellation only a while later, like a search between two checks
+    if selected:
+        ScheduleAPI._worker_generate(selected, queue, stop_event, forbidden, constraints, preferences, travel,
+                                     limits, resume_after, low_priority)
+        return
+    if low_priority:
+        os.nice(LOW_PRIORITY_NICENESS)
+    queue.put([])
+    while not stop_event.is_set():
+        time.sleep(0.01)
+    time.sleep(0.5)
+
+def wait_until(condition):
+    end = time.monotonic() + 30
+    while not condition():
+        assert time.monotonic() < end
+        time.sleep(0.01)
+
+def request(request_id, selected):
+    return (GENERATE, request_id, (selected, None, None, None, None, None, False))
+
+# ---------- Tests ----------
+
+def test_worker_resolves_course_codes_from_its_catalog():
+    courses = catalog(ScheduleAPI())
+    items, finished = serve_inline([(LOAD_CATALOG, 0, courses), request(1, [c.course_code for c in courses[:3]])])
+    assert finished == 1
+    assert all(request_id == 1 for request_id, _ in items) and items[-1][1] is None
+    sent = sum(len(item) for _, item in items if isinstance(item, list))
+    assert sent == ScheduleAPI().get_estimated_schedules_count(courses[:3])
+
+def test_cancelled_request_sends_nothing():
+    courses = catalog(ScheduleAPI())
+    items, finished = serve_inline([request(1, courses[:3])], cancelled=1)
+    assert items == [] and finished == 1
+
+def test_failed_request_ends_its_stream_and_the_worker_goes_on():
+    def failing(*args):
+        raise ValueError("broken request")
+    items, finished = serve_inline([request(1, []), request(2, [])], generate=failing)
+    assert items == [(1, None), (2, None)] and finished == 2
+
+def test_pool_matches_a_one_off_worker_and_reuses_its_workers():
+    api = ScheduleAPI()
+    courses = catalog(api)
+    expected = collect(api.generate_schedules_in_parallel(courses[:4]))
+    api.start_worker_pool()
+    try:
+        pool = api._pool
+        pids = sorted(worker.process.pid for worker in pool.workers)
+        assert collect(api.generate_schedules_in_parallel(courses[:4])) == expected
+        first = api.generate_schedules_in_parallel(courses[:5])
+        first.get(timeout=60)
+        api.stop_schedules_generation()
+        second = api.generate_schedules_in_parallel(courses[:4])
+        assert collect(second) == expected
+        assert sorted(worker.process.pid for worker in pool.workers) == pids
+    finally:
+        api.shutdown_worker_pool()
+
+def test_cancelled_stream_is_empty_and_its_worker_reused_once_stopped():
+    api = ScheduleAPI()
+    courses = catalog(api)
+    expected = collect(api.generate_schedules_in_parallel(courses[:2]))
+    pool = WorkerPool(lingering_generate, size=1)
+    try:
+        pool.load_catalog(courses)
+        worker = pool.workers[0]
+        old = pool.submit([])
+        old.get(timeout=60)
+        pool.cancel(old)
+        # Empty right away, whatever the cancelled run is still sending
+        assert old.empty()
+        with pytest.raises(queue.Empty):
+            old.get(timeout=0.1)
+        # The cancelled run has not stopped yet: the request does not wait behind it
+        new = pool.submit(courses[:2])
+        assert new.worker is not worker and len(pool.workers) == 2
+        assert collect(new) == expected
+        # Once stopped, the worker takes requests again
+        wait_until(worker.is_idle)
+        assert pool.submit(courses[:2]).worker is worker
+        assert old.empty()
+    finally:
+        pool.shutdown()
+
+def test_full_pool_replaces_a_worker_busy_with_a_cancelled_run(monkeypatch):
+    monkeypatch.setattr(worker_pool, "MAX_POOL_SIZE", 2)
+    pool = WorkerPool(lingering_generate, size=2)
+    try:
+        running, cancelled = pool.submit([]), pool.submit([])
+        running.get(timeout=60)
+        cancelled.get(timeout=60)
+        pool.cancel(cancelled)
+        stream = pool.submit([])
+        assert pool.workers == [running.worker, stream.worker] and stream.worker is not cancelled.worker
+        assert stream.get(timeout=60) == []
+        cancelled.worker.process.join(10)
+        assert not cancelled.worker.process.is_alive()
+    finally:
+        pool.shutdown()
+
+@pytest.mark.skipif(not hasattr(os, "getpriority"), reason="OS priorities are Unix only")
+def test_adopted_low_priority_run_gets_its_priority_back_or_keeps_its_worker():
+    pool = WorkerPool(lingering_generate, size=1)
+    try:
+        stream = pool.submit([], low_priority=True)
+        stream.get(timeout=60)
+        worker = stream.worker
+        pid = worker.process.pid
+        assert worker.niced and os.getpriority(os.PRIO_PROCESS, pid) >= LOW_PRIORITY_NICENESS
+        restored = pool.restore_priority(stream)
+        assert restored == (os.getpriority(os.PRIO_PROCESS, pid) == 0) and worker.niced == (not restored)
+        pool.cancel(stream)
+        wait_until(worker.is_idle)
+        # A normal request never runs on a worker left at low priority
+        normal = pool.submit([])
+        assert (normal.worker is worker) == restored
+        pool.cancel(normal)
+    finally:
+        pool.shutdown()
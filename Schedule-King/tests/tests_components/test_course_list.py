@@ -7,6 +7,7 @@ from PyQt5.QtCore import Qt
 from src.components.course_list import CourseList
 from src.models.course import Course
 from src.models.time_slot import TimeSlot
+from src.services.catalog_index import CatalogIndex
 
 class TestCourseList(unittest.TestCase):
     @classmethod
@@ -82,5 +83,24 @@ class TestCourseList(unittest.TestCase):
         visible_codes = [self.course_list.list_widget.item(i).data(Qt.UserRole) for i in range(self.course_list.list_widget.count())]
         self.assertNotIn(selected_code, visible_codes)
 
+    def test_catalog_index_marks_courses_that_no_longer_fit(self):
+        course_list = CourseList()
+        morning = Course("Morning", "M1", "Dr. Smith", [[TimeSlot("2", "09:00", "11:00", "101", "A")]])
+        clash = Course("Clash", "C1", "Dr. Brown", [[TimeSlot("2", "10:00", "11:00", "102", "A")]])
+        flexible = Course("Flexible", "F1", "Dr. Green", [[TimeSlot("2", "10:00", "11:00", "103", "A")],
+                                                          [TimeSlot("3", "10:00", "11:00", "103", "A")]])
+        course_list.populate_courses([morning, clash, flexible])
+        course_list.set_catalog_index(CatalogIndex([morning, clash, flexible]))
+        self.assertEqual(course_list.list_widget.item(1).text(), "C1 - Clash")
+
+        course_list.list_widget.item(0).setSelected(True)
+        self.app.processEvents()
+        self.assertEqual([fit.course.course_code for fit in course_list.ranking], ["F1", "C1"])
+        self.assertEqual(course_list.list_widget.item(1).text(), "C1 - Clash  |  does not fit")
+        self.assertEqual(course_list.list_widget.item(2).text(), "F1 - Flexible  |  keeps 1 schedule")
+
+        course_list.clear_selection()
+        self.assertEqual(course_list.list_widget.item(1).text(), "C1 - Clash")
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -2,6 +2,7 @@ import pytest
 from src.components.course_selector import CourseSelector  
 from src.models.course import Course
 from unittest.mock import patch
+from src.services.strategy_selector import MAX_SELECTED_COURSES
 
 
 @pytest.fixture
@@ -69,3 +70,17 @@ def test_clear_button_clears_selection(qtbot, selector, sample_courses):
     assert len(selected) == 0
     # Verify that the title label reflects the cleared state
     assert selector.title_label.text().endswith("total)")
+
+def test_selection_up_to_the_shared_limit_is_accepted(qtbot):
+    # Larger selections than 7 courses are generated by the sampled-size engine choice
+    courses = [Course(f"Course {i}", f"C{i:02d}", "Dr. X", lectures=[], tirguls=[], maabadas=[])
+               for i in range(MAX_SELECTED_COURSES + 1)]
+    widget = CourseSelector()
+    qtbot.addWidget(widget)
+    widget.populate_courses(courses)
+    with patch("src.components.course_selector.QMessageBox.warning") as warning:
+        widget.select_courses_by_code([c.course_code for c in courses[:MAX_SELECTED_COURSES]])
+        qtbot.wait(50)
+        warning.assert_not_called()
+    assert len(widget.get_selected_courses()) == MAX_SELECTED_COURSES
+    assert widget.submit_button.isEnabled()
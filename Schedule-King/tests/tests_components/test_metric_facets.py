@@ -0,0 +1,47 @@
+import pytest
+from src.components.metric_facets import MetricFacets
+from src.models.Preference import Metric
+
+
+@pytest.fixture
+def facets(qtbot):
+    # Fixture to create the facets panel
+    widget = MetricFacets()
+    qtbot.addWidget(widget)
+    return widget
+
+
+def test_initial_rows_are_empty(facets):
+    # Every row starts at zero and disabled
+    button, bar, _ = facets.rows[(Metric.ACTIVE_DAYS, 3)]
+    assert button.text() == "3 days: 0"
+    assert not button.isEnabled()
+    assert bar.value() == 0
+
+
+def test_update_facets_sets_counts(facets):
+    # Counts are shown on the buttons and as bar lengths relative to the total
+    facets.update_facets({
+        Metric.ACTIVE_DAYS: {2: 5, 3: 15},
+        Metric.AVG_START_TIME: {600: 20},
+    })
+    button, bar, _ = facets.rows[(Metric.ACTIVE_DAYS, 3)]
+    assert button.text() == "3 days: 15"
+    assert button.isEnabled()
+    assert bar.maximum() == 20 and bar.value() == 15
+
+    button, bar, _ = facets.rows[(Metric.AVG_START_TIME, 600)]
+    assert button.text() == "10:00: 20"
+
+    facets.clear()
+    button, _, _ = facets.rows[(Metric.ACTIVE_DAYS, 3)]
+    assert button.text() == "3 days: 0"
+
+
+def test_clicking_row_emits_facet(qtbot, facets):
+    # Clicking an enabled row emits its metric and grade
+    facets.update_facets({Metric.ACTIVE_DAYS: {4: 1}})
+    button, _, _ = facets.rows[(Metric.ACTIVE_DAYS, 4)]
+    with qtbot.waitSignal(facets.facet_selected, timeout=500) as signal:
+        button.click()
+    assert signal.args == [Metric.ACTIVE_DAYS, 4]
@@ -203,4 +203,21 @@ def test_fill_all_schedule_cells(qtbot):
     # Assert all 12×7 cells are filled
     for row in range(table.rowCount()):
         for col in range(table.columnCount()):
-            assert table.item(row, col) is not None, f"Missing item at ({row}, {col})"
\ No newline at end of file
+            assert table.item(row, col) is not None, f"Missing item at ({row}, {col})"
+def test_near_miss_violations_highlighted(qtbot):
+    from src.models.course import Course
+    from src.models.time_slot import TimeSlot
+    from src.services.near_miss_strategy import NearMissStrategy
+
+    a = Course("Algebra", "A1", "Dr. A", lectures=[[TimeSlot("1", "09:00", "11:00", "101", "22")]])
+    b = Course("Logic", "L1", "Dr. B", lectures=[[TimeSlot("1", "10:30", "12:00", "102", "22")]])
+    schedule = next(NearMissStrategy([a, b]).generate())
+    assert [v.minutes() for v in schedule.violations] == [30]
+
+    table = setup_table(qtbot)
+    table.display_schedule(schedule)
+    # The 10:30-11:00 overlap is in the 10:00 row of Sunday
+    assert list(table.violation_cells) == [(2, 0)]
+    assert "A1 and L1 overlap 10:30-11:00" in table.item(2, 0).toolTip()
+    assert "#D32F2F" in table.cellWidget(2, 0).styleSheet()
+    assert "#D32F2F" not in table.cellWidget(1, 0).styleSheet()
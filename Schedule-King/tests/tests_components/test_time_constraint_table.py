@@ -167,4 +167,24 @@ def test_cell_interaction(table):
     # Test removing a cell that's not forbidden
     table._set_cell(0, 1, 'remove')  # Try to remove non-forbidden cell
     QTest.qWait(100)  # Give Qt time to process
-    assert (0, 1) not in table.forbidden  # Should not affect anything 
\ No newline at end of file
+    assert (0, 1) not in table.forbidden  # Should not affect anything 
+def test_feasibility_count_follows_painting(table):
+    """Test the live schedule count and the impact colours of free cells"""
+    from src.services.schedule_api import ScheduleAPI
+    from src.services.feasibility_counter import FeasibilityCounter
+    import os
+    path = os.path.join(os.path.dirname(__file__), "..", "test_files", "courses_valid_schedule.txt")
+    courses = ScheduleAPI().get_courses(path)[:5]
+    reported = []
+    table.feasibility_changed.connect(reported.append)
+    table.set_feasibility_counter(FeasibilityCounter(courses))
+    assert reported[-1].schedules == 1280
+
+    # Paint the free cell with the largest impact, the count drops by that impact
+    cell = max(reported[-1].impacts, key=reported[-1].impacts.get)
+    eliminated = reported[-1].impacts[cell]
+    assert table.item(*cell).background().color().alpha() > 0
+    table._set_cell(cell[0], cell[1], 'add')
+    assert reported[-1].schedules == 1280 - eliminated
+    table.clear_constraints()
+    assert reported[-1].schedules == 1280
@@ -47,3 +47,31 @@ def test_empty_sorter_raises_on_get():
     sorter = GradeSorter()
     with pytest.raises(IndexError):
         sorter.get_kth_item(0)
+
+def test_get_rank_is_inverse_of_get_kth_item():
+    # Test that get_rank returns the sorted position of each inserted item
+    sorter = GradeSorter(upper_bound=5)
+    sorter.insert_chunk([(0, 3), (1, 1), (2, 3), (3, 0), (4, 1)])
+    for k in range(sorter.get_size()):
+        item = sorter.get_kth_item(k)
+        grade = [3, 1, 3, 0, 1][item]
+        assert sorter.get_rank(item, grade) == k
+
+def test_get_rank_unknown_item_raises():
+    # Test that asking for an item under the wrong grade raises KeyError
+    sorter = GradeSorter(upper_bound=3)
+    sorter.insert(0, 2)
+    with pytest.raises(KeyError):
+        sorter.get_rank(0, 1)
+
+def test_histogram_and_first_rank():
+    # Test that bucket counts and bucket start positions are reported without scanning
+    sorter = GradeSorter(upper_bound=4)
+    sorter.insert_chunk([("A", 2), ("B", 0), ("C", 2), ("D", 4)])
+    assert sorter.get_histogram() == [1, 0, 2, 0, 1]
+    assert sorter.get_first_rank(0) == 0
+    assert sorter.get_first_rank(1) == 1
+    assert sorter.get_first_rank(2) == 1
+    assert sorter.get_first_rank(3) == 3
+    assert sorter.get_first_rank(10) == 4
+    assert sorter.get_kth_item(sorter.get_first_rank(4)) == "D"
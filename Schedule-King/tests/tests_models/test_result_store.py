@@ -0,0 +1,194 @@
+import os
+import pytest
+from itertools import islice
+from src.models.course import Course
+from src.models.option_table import OptionTable
+from src.models.result_store import MemmapResultStore, TrieResultStore
+from src.models.schedule import Schedule
+from src.models.schedule_ranker import ScheduleRanker, StoredSchedules
+from src.models.Preference import Preference, Metric
+from src.models.time_slot import TimeSlot
+from src.services.all_strategy import AllStrategy
+from src.services.schedule_api import ScheduleAPI
+
+def make_courses():
+    """
+    Three courses with a few lecture and tirgul options each, spread over the week.
+    """
+    def slot(day, start, end):
+        return TimeSlot(day, f"{start:02d}:00", f"{end:02d}:00", "101", "Main")
+    return [
+        Course("Algebra", "A1", "Dr. A", lectures=[[slot("1", 8, 10)], [slot("2", 8, 10)], [slot("3", 12, 14)]],
+               tirguls=[[slot("1", 14, 15)], [slot("4", 9, 10)]]),
+        Course("Physics", "P1", "Dr. P", lectures=[[slot("1", 10, 12)], [slot("5", 10, 12)]]),
+        Course("Logic", "L1", "Dr. L", lectures=[[slot("2", 12, 14)], [slot("3", 8, 10)]],
+               tirguls=[[slot("2", 16, 17)], [slot("5", 8, 9)]]),
+    ]
+
+def groups(schedule):
+    """
+    Describes the lecture groups of a schedule, LectureGroup has no equality of its own.
+    """
+    return [str(group) for group in schedule.lecture_groups]
+
+@pytest.fixture
+def courses():
+    return make_courses()
+
+@pytest.fixture
+def schedules(courses):
+    return list(AllStrategy(courses).generate())
+
+def test_option_table_matches_strategy(courses, schedules):
+    # Rebuilding from the option vector gives the same schedule the strategy produced
+    table = OptionTable(courses)
+    assert table.course_codes() == ["A1", "P1", "L1"]
+    assert [len(options) for options in table.options] == [6, 2, 4]
+    for schedule in schedules:
+        rebuilt = table.build_schedule(schedule.option_indices)
+        assert groups(rebuilt) == groups(schedule)
+        assert rebuilt.metric_tuple == schedule.metric_tuple
+
+def test_option_table_rejects_wrong_width(courses):
+    with pytest.raises(ValueError):
+        OptionTable(courses).build_schedule([0, 0])
+
+def test_store_round_trip_and_growth(tmp_path, courses, schedules):
+    store = MemmapResultStore.create(str(tmp_path / "session"), courses, initial_capacity=2)
+    store.extend(schedules[:3])
+    for schedule in schedules[3:]:
+        store.append(schedule)
+
+    assert len(store) == len(schedules)
+    assert [groups(s) for s in store] == [groups(s) for s in schedules]
+    assert store[-1].option_indices == schedules[-1].option_indices
+    assert store.get_grades().tolist() == [list(s.metric_tuple) for s in schedules]
+    with pytest.raises(IndexError):
+        store[len(schedules)]
+
+def test_store_requires_option_vectors(tmp_path, courses):
+    store = MemmapResultStore.create(str(tmp_path / "session"), courses)
+    with pytest.raises(ValueError):
+        store.append(Schedule([]))
+
+def test_reopen_finished_session(tmp_path, courses, schedules):
+    path = str(tmp_path / "session")
+    store = MemmapResultStore.create(path, courses)
+    store.extend(schedules)
+    store.mark_complete()
+
+    # The catalog may hold more courses, in any order
+    catalog = list(reversed(courses)) + [Course("Other", "O1", "Dr. O", lectures=[])]
+    reopened = MemmapResultStore.open(path, catalog)
+    assert reopened.complete
+    assert len(reopened) == len(schedules)
+    assert groups(reopened[2]) == groups(schedules[2])
+
+def test_reopen_rejects_changed_courses(tmp_path, courses, schedules):
+    path = str(tmp_path / "session")
+    MemmapResultStore.create(path, courses).extend(schedules)
+    with pytest.raises(ValueError):
+        MemmapResultStore.open(path, courses[:2])
+    changed = make_courses()
+    changed[1].lectures.pop()
+    with pytest.raises(ValueError):
+        MemmapResultStore.open(path, changed)
+    with pytest.raises(FileNotFoundError):
+        MemmapResultStore.open(str(tmp_path / "missing"), courses)
+
+def test_ranker_reads_store_transparently(tmp_path, courses, schedules):
+    # A ranker on a store ranks exactly like a ranker on a list
+    in_memory = ScheduleRanker()
+    in_memory.add_batch(schedules)
+    on_disk = ScheduleRanker()
+    on_disk.attach_store(MemmapResultStore.create(str(tmp_path / "session"), courses))
+    on_disk.add_batch(schedules)
+
+    for metric in Metric:
+        for ascending in (True, False):
+            in_memory.set_preference(Preference(metric, ascending))
+            on_disk.set_preference(Preference(metric, ascending))
+            assert ([groups(s) for s in on_disk.get_ranked_schedules()] ==
+                    [groups(s) for s in in_memory.get_ranked_schedules()])
+    assert on_disk.find_one_swap_alternatives(0) == in_memory.find_one_swap_alternatives(0)
+
+def test_ranker_hands_out_a_view_of_its_store(tmp_path, courses, schedules):
+    # get_schedules rebuilds nothing up front: schedules are read from the store on access
+    ranker = ScheduleRanker()
+    ranker.attach_store(MemmapResultStore.create(str(tmp_path / "session"), courses))
+    ranker.add_batch(schedules)
+    view = ranker.get_schedules()
+    assert isinstance(view, StoredSchedules) and len(view) == len(schedules)
+    assert groups(view[-1]) == groups(schedules[-1])
+    assert [groups(s) for s in view[1:3]] == [groups(s) for s in schedules[1:3]]
+    assert [groups(s) for s in view] == [groups(s) for s in schedules]
+    with pytest.raises(IndexError):
+        view[len(schedules)]
+
+def test_ranker_bulk_loads_reopened_session(tmp_path, courses, schedules):
+    path = str(tmp_path / "session")
+    store = MemmapResultStore.create(path, courses)
+    store.extend(schedules)
+    store.mark_complete()
+
+    expected = ScheduleRanker()
+    expected.add_batch(schedules)
+    ranker = ScheduleRanker()
+    ranker.attach_store(MemmapResultStore.open(path, courses))
+    assert ranker.size() == ranker.seen_count() == len(schedules)
+    for metric in Metric:
+        assert ranker.get_histogram(metric) == expected.get_histogram(metric)
+        ranker.set_preference(Preference(metric, True))
+        expected.set_preference(Preference(metric, True))
+        assert ([s.option_indices for s in ranker.get_ranked_schedules()] ==
+                [s.option_indices for s in expected.get_ranked_schedules()])
+
+def test_bounded_ranker_rejects_store(tmp_path, courses):
+    ranker = ScheduleRanker(max_schedules=10)
+    with pytest.raises(ValueError):
+        ranker.attach_store(MemmapResultStore.create(str(tmp_path / "session"), courses))
+
+def test_trie_round_trip(courses, schedules):
+    store = TrieResultStore(courses)
+    store.extend(schedules)
+    assert len(store) == len(schedules)
+    assert [store.get_vector(i) for i in range(len(store))] == [list(s.option_indices) for s in schedules]
+    assert [groups(s) for s in store] == [groups(s) for s in schedules]
+    assert store.get_option_vectors().tolist() == [list(s.option_indices) for s in schedules]
+    with pytest.raises(IndexError):
+        store.get_vector(len(schedules))
+
+def test_trie_shares_prefixes(courses):
+    # DFS order shares the prefix with the previous vector, other orders still decode correctly
+    store = TrieResultStore(courses)
+    for vector in ([0, 0, 0], [0, 0, 1], [0, 1, 0], [2, 1, 3], [0, 0, 2]):
+        store.add_vector(vector)
+    assert store.node_count() == 1 + 2 + 1 + 2 + 2
+    assert store.get_vector(4) == [0, 0, 2]
+    assert store.get_vector(-2) == [2, 1, 3]
+    with pytest.raises(ValueError):
+        store.add_vector([0, 0])
+    store.clear()
+    assert len(store) == 0 and store.node_count() == 1
+
+@pytest.mark.parametrize("catalog, course_count", [("4courses.txt", 4), ("medium.txt", 5), ("courses_valid_schedule.txt", 7)])
+def test_trie_compression_on_catalogs(catalog, course_count):
+    # Benchmark: bytes per schedule of the trie against a plain uint16 option vector
+    path = os.path.join(os.path.dirname(__file__), "..", "test_files", catalog)
+    courses = ScheduleAPI().get_courses(path)[:course_count]
+    store = TrieResultStore(courses)
+    for schedule in islice(AllStrategy(courses).generate(), 20000):
+        store.append(schedule)
+    per_schedule = store.nbytes() / len(store)
+    print(f"\n{catalog}: {len(store)} schedules, {per_schedule:.2f} bytes each "
+          f"(plain vectors {2 * course_count} bytes, compression {2 * course_count / per_schedule:.1f}x)")
+    assert per_schedule < 8
+    assert store.get_vector(len(store) - 1) == list(schedule.option_indices)
+
+def test_ranker_on_trie(courses, schedules):
+    ranker = ScheduleRanker()
+    ranker.attach_store(TrieResultStore(courses))
+    ranker.add_batch(schedules)
+    ranker.set_preference(Preference(Metric.ACTIVE_DAYS, True))
+    expected = sorted(range(len(schedules)), key=lambda i: schedules[i].active_days)
+    assert [s.option_indices for s in ranker.get_ranked_schedules()] == [schedules[i].option_indices for i in expected]
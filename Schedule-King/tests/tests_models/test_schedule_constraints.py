@@ -0,0 +1,58 @@
+import pytest
+from datetime import time
+from src.models.lecture_group import LectureGroup
+from src.models.schedule import Schedule
+from src.models.schedule_constraints import ScheduleConstraints
+from src.models.time_slot import TimeSlot
+
+def slot(day, start, end):
+    return TimeSlot(day=day, start_time=start, end_time=end, room="101", building="A")
+
+@pytest.fixture
+def slots():
+    # Sunday 8-10 and 13-14 (3 hour gap), Tuesday 10-12
+    return [slot("1", "08:00", "10:00"), slot("1", "13:00", "14:00"), slot("3", "10:00", "12:00")]
+
+def test_empty_constraints():
+    constraints = ScheduleConstraints()
+    assert constraints.is_empty()
+    assert not constraints.couples_courses()
+    assert constraints.day_limit() is None
+
+def test_day_limit_combines_max_days_and_free_days():
+    assert ScheduleConstraints(max_active_days=4).day_limit() == 4
+    assert ScheduleConstraints(min_free_days=3).day_limit() == 3
+    assert ScheduleConstraints(max_active_days=4, min_free_days=1).day_limit() == 4
+    assert ScheduleConstraints(min_free_days=2).couples_courses()
+
+def test_allows_slot():
+    constraints = ScheduleConstraints(earliest_start=time(9), latest_end=time(16),
+                                      free_windows=[slot("6", "08:00", "20:00")])
+    assert constraints.allows_slot(slot("1", "09:00", "11:00"))
+    assert not constraints.allows_slot(slot("1", "08:00", "10:00"))
+    assert not constraints.allows_slot(slot("1", "15:00", "17:00"))
+    assert not constraints.allows_slot(slot("6", "10:00", "11:00"))
+    assert not constraints.couples_courses()
+
+def test_longest_gap(slots):
+    assert ScheduleConstraints.longest_gap(slots) == 180
+    assert ScheduleConstraints.longest_gap([slot("1", "08:00", "12:00"), slot("1", "09:00", "10:00"),
+                                            slot("1", "12:30", "13:00")]) == 30
+
+@pytest.mark.parametrize("constraints, expected", [
+    (ScheduleConstraints(max_active_days=2), True),
+    (ScheduleConstraints(max_active_days=1), False),
+    (ScheduleConstraints(min_free_days=5), False),
+    (ScheduleConstraints(max_gap_minutes=180), True),
+    (ScheduleConstraints(max_gap_minutes=120), False),
+    (ScheduleConstraints(earliest_start=time(8), latest_end=time(14)), True),
+    (ScheduleConstraints(free_windows=[slot("3", "11:00", "12:00")]), False),
+])
+def test_is_satisfied_by_slots(slots, constraints, expected):
+    assert constraints.is_satisfied_by_slots(slots) == expected
+
+def test_is_satisfied_by_schedule(slots):
+    group = LectureGroup("Course1", "C1", "I1", lecture=[slots[0], slots[1]], tirguls=[slots[2]], maabadas=None)
+    schedule = Schedule([group])
+    assert ScheduleConstraints(max_gap_minutes=180).is_satisfied_by(schedule)
+    assert not ScheduleConstraints(max_active_days=1).is_satisfied_by(schedule)
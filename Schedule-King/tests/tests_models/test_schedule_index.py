@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+import time
+from src.models.option_table import SKIPPED_OPTION
+from src.models.schedule_index import ScheduleIndex
+
+def test_one_swap_neighbours():
+    # Test that only vectors differing in exactly one position are returned
+    index = ScheduleIndex(initial_capacity=2)
+    index.add((0, 0, 0), 3)
+    index.add((0, 0, 1), 3)
+    index.add((0, 1, 1), 2)
+    index.add((2, 0, 0), 3)
+    assert index.one_swap_neighbours(0) == [1, 3]
+    assert index.one_swap_neighbours(2) == [1]
+    assert index.size() == 4
+
+def test_closest_with_fewer_days():
+    # Test that the closest vector with fewer active days is chosen
+    index = ScheduleIndex()
+    index.add((0, 0, 0), 4)
+    index.add((1, 1, 1), 2)
+    index.add((0, 1, 1), 3)
+    index.add((0, 0, 1), 4)
+    assert index.closest_with_fewer_days(0) == 2
+    assert index.closest_with_fewer_days(1) is None
+
+def test_missing_vectors_are_never_matched():
+    # Test that rows without an option vector are skipped by both queries
+    index = ScheduleIndex()
+    index.add((0, 0), 3)
+    index.add((), 1)
+    index.add((0, 1), 3)
+    assert index.one_swap_neighbours(0) == [2]
+    assert index.closest_with_fewer_days(0) is None
+    assert index.one_swap_neighbours(1) == []
+
+def test_skipped_first_course_still_has_a_vector():
+    # Test that a vector skipping its first course is compared like any other
+    index = ScheduleIndex()
+    index.add((SKIPPED_OPTION, 0), 3)
+    index.add((SKIPPED_OPTION, 1), 2)
+    index.add((), 1)
+    assert index.one_swap_neighbours(0) == [1]
+    assert index.closest_with_fewer_days(0) == 1
+
+def test_add_many_matches_adding_one_by_one():
+    # Test that bulk rows, across a growth of the storage, answer queries like rows added one at a time
+    vectors = np.array([(0, 0, 0), (0, 0, 1), (0, 1, 1), (2, 0, 0), (0, 1, 0)], dtype=np.uint16)
+    active_days = np.array([3, 3, 2, 3, 1], dtype=np.uint8)
+    single, bulk = ScheduleIndex(initial_capacity=2), ScheduleIndex(initial_capacity=2)
+    for vector, days in zip(vectors, active_days):
+        single.add(tuple(vector.tolist()), int(days))
+    bulk.add((0, 0, 0), 3)
+    bulk.add_many(vectors[1:], active_days[1:])
+    assert bulk.size() == single.size() == 5
+    for item in range(5):
+        assert bulk.one_swap_neighbours(item) == single.one_swap_neighbours(item)
+        assert bulk.closest_with_fewer_days(item) == single.closest_with_fewer_days(item)
+
+def test_out_of_bounds_raises():
+    # Test that querying an unknown item raises IndexError
+    index = ScheduleIndex()
+    with pytest.raises(IndexError):
+        index.one_swap_neighbours(0)
+
+def test_clear():
+    # Test that clearing removes all rows
+    index = ScheduleIndex()
+    index.add((0, 0), 2)
+    index.clear()
+    assert index.size() == 0
+    index.add((1, 2, 3), 2)
+    assert index.one_swap_neighbours(0) == []
+
+def test_queries_are_fast_with_many_rows():
+    # Test that queries over 200k rows stay well below interactive latency
+    index = ScheduleIndex()
+    for i in range(200_000):
+        index.add((i % 7, i % 11, i % 13, i % 17), 2 + i % 4)
+    start = time.perf_counter()
+    index.one_swap_neighbours(12345)
+    index.closest_with_fewer_days(12345)
+    assert time.perf_counter() - start < 0.1
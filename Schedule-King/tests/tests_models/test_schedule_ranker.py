@@ -563,4 +563,163 @@ def test_get_ranked_schedules_range(sample_schedules):
     
     # Test invalid range
     with pytest.raises(IndexError):
-        ranker.get_ranked_schedules(start=len(sample_schedules))
\ No newline at end of file
+        ranker.get_ranked_schedules(start=len(sample_schedules))
+
+
+def generated_schedules():
+    """
+    Generates the four schedules of two courses with two lecture options each.
+    Option 0 of both courses is on Sunday, option 1 is on Monday (course A) or Tuesday (course B).
+    """
+    from src.models.course import Course
+    from src.services.all_strategy import AllStrategy
+    course_a = Course("Course A", "A", "Dr. A", lectures=[
+        [create_time_slot("1", 8, 0, 9, 0)], [create_time_slot("2", 8, 0, 9, 0)]
+    ])
+    course_b = Course("Course B", "B", "Dr. B", lectures=[
+        [create_time_slot("1", 10, 0, 11, 0)], [create_time_slot("3", 10, 0, 11, 0)]
+    ])
+    return list(AllStrategy([course_a, course_b]).generate())
+
+def test_get_rank_matches_ranked_order(sample_schedules):
+    """
+    Tests that get_rank is the inverse of the ranked order for every preference.
+    """
+    ranker = ScheduleRanker()
+    ranker.add_batch(sample_schedules)
+    for metric in Metric:
+        for ascending in (True, False):
+            ranker.set_preference(Preference(metric, ascending))
+            for k in range(ranker.size()):
+                item = ranker.schedules.index(ranker.get_ranked_schedule(k))
+                assert ranker.get_rank(item) == k
+
+def test_find_one_swap_alternatives():
+    """
+    Tests that one-swap alternatives differ from the reference in exactly one course choice.
+    """
+    ranker = ScheduleRanker()
+    ranker.add_batch(generated_schedules())
+    assert [s.option_indices for s in ranker.get_schedules()] == [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+    # (1, 1) has two neighbours: (0, 1) and (1, 0)
+    alternatives = ranker.find_one_swap_alternatives(3)
+    assert [ranker.get_ranked_schedule(k).option_indices for k in alternatives] == [(0, 1), (1, 0)]
+
+    # The alternatives are returned as positions in the current ranking
+    ranker.set_preference(Preference(Metric.ACTIVE_DAYS, ascending=False))
+    k = ranker.get_rank(3)
+    alternatives = ranker.find_one_swap_alternatives(k)
+    assert sorted(ranker.get_ranked_schedule(a).option_indices for a in alternatives) == [(0, 1), (1, 0)]
+    assert alternatives == sorted(alternatives)
+
+def test_find_fewer_days_alternative():
+    """
+    Tests finding the most similar schedule with fewer active days.
+    """
+    ranker = ScheduleRanker()
+    ranker.add_batch(generated_schedules())
+
+    # (1, 1) uses Monday and Tuesday, only (0, 0) has a single active day
+    k = ranker.find_fewer_days_alternative(3)
+    assert ranker.get_ranked_schedule(k).option_indices == (0, 0)
+    # Nothing has fewer days than the one-day schedule
+    assert ranker.find_fewer_days_alternative(0) is None
+
+def test_histogram_tracks_inserts(sample_schedules):
+    """
+    Tests that metric histograms match the stored schedules and support binning.
+    """
+    ranker = ScheduleRanker()
+    ranker.add_batch(sample_schedules[:5])
+    ranker.insert_schedule(sample_schedules[5])
+
+    days = ranker.get_histogram(Metric.ACTIVE_DAYS)
+    expected = {}
+    for s in sample_schedules[:6]:
+        expected[s.active_days] = expected.get(s.active_days, 0) + 1
+    assert days == expected
+
+    hours = ranker.get_histogram(Metric.AVG_START_TIME, bin_width=60)
+    assert sum(hours.values()) == 6
+    assert all(start % 60 == 0 for start in hours)
+
+def test_first_rank_with_grade(sample_schedules):
+    """
+    Tests that the first rank of a grade points at the first schedule of that bucket.
+    """
+    ranker = ScheduleRanker()
+    ranker.add_batch(sample_schedules)
+    ranker.set_preference(Preference(Metric.ACTIVE_DAYS, ascending=True))
+    for days in ranker.get_histogram(Metric.ACTIVE_DAYS):
+        k = ranker.get_first_rank_with_grade(Metric.ACTIVE_DAYS, days)
+        assert ranker.get_ranked_schedule(k).active_days == days
+        if k > 0:
+            assert ranker.get_ranked_schedule(k - 1).active_days < days
+
+def synthetic_schedule(active_days: int, gap_count: int, gap_hours: float, start: int, end: int) -> Schedule:
+    """
+    Creates a schedule with the given metrics without any lecture groups.
+    """
+    schedule = Schedule([], active_days=active_days, gap_count=gap_count, total_gap_time=gap_hours,
+                        avg_start_time=start, avg_end_time=end)
+    schedule.metric_tuple = ScheduleRanker._grades(schedule)
+    return schedule
+
+def test_bounded_ranker_keeps_budget_and_best():
+    """
+    Tests that a bounded ranker stays within its budget while keeping the best schedules of every metric.
+    """
+    rng = __import__("random").Random(7)
+    schedules = [
+        synthetic_schedule(rng.randint(1, 6), rng.randint(0, 10), rng.randint(0, 20) / 2,
+                           rng.choice([800, 900, 1000, 1100]), rng.choice([1400, 1600, 1800]))
+        for _ in range(500)
+    ]
+    ranker = ScheduleRanker(max_schedules=60, top_n=3, reservoir_size=5, seed=1)
+    for i in range(0, 400, 25):
+        ranker.add_batch(schedules[i:i + 25])
+    for schedule in schedules[400:]:
+        ranker.insert_schedule(schedule)
+
+    assert ranker.size() <= 60
+    assert ranker.seen_count() == 500
+    kept = ranker.get_schedules()
+
+    # The best and worst schedule of every metric survived eviction
+    for idx, metric in enumerate(Metric):
+        grades = [s.metric_tuple[idx] for s in schedules]
+        assert min(grades) == min(s.metric_tuple[idx] for s in kept)
+        assert max(grades) == max(s.metric_tuple[idx] for s in kept)
+
+    # Histograms still describe every schedule seen, not only the kept ones
+    assert sum(ranker.get_histogram(Metric.ACTIVE_DAYS).values()) == 500
+
+    # Ranking still works on the kept schedules
+    ranker.set_preference(Preference(Metric.GAP_COUNT, ascending=True))
+    ranked = ranker.get_ranked_schedules()
+    assert [s.gap_count for s in ranked] == sorted(s.gap_count for s in kept)
+
+def test_bounded_ranker_keeps_pareto_front():
+    """
+    Tests that schedules on the Pareto front are never evicted.
+    """
+    front = synthetic_schedule(2, 0, 0, 1000, 1400)  # Better than everything below on all metrics
+    others = [synthetic_schedule(3 + i % 3, 1 + i % 4, 1, 900, 1600) for i in range(100)]
+    ranker = ScheduleRanker(max_schedules=10, top_n=1, reservoir_size=1, seed=0)
+    ranker.add_batch(others[:50] + [front] + others[50:])
+    assert any(s is front for s in ranker.get_schedules())
+    assert ranker.size() <= 10
+
+def test_memory_budget_and_clear():
+    """
+    Tests building a ranker from a memory budget and that clear resets the counters.
+    """
+    ranker = ScheduleRanker.from_memory_budget(1)
+    assert ranker.is_bounded()
+    assert ranker.max_schedules == 1024 * 1024 // 1024
+    assert not ScheduleRanker().is_bounded()
+    ranker.add_batch([synthetic_schedule(2, 0, 0, 900, 1200)])
+    ranker.clear()
+    assert ranker.seen_count() == 0
+    assert ranker.get_histogram(Metric.ACTIVE_DAYS) == {}
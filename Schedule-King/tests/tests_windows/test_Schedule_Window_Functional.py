@@ -206,3 +206,23 @@ class TestScheduleWindowInit:
         assert hasattr(win, "ranking_controls")
         assert hasattr(win, "header")
         assert hasattr(win, "metrics_widget")
+
+# ---------------------- Test for the infeasibility core ----------------------
+
+class TestScheduleWindowInfeasible:
+    def test_core_is_reported(self, qapp, qtbot, mock_schedule_controller):
+        """
+        The controller callback shows which courses conflict when no schedule exists.
+        """
+        from src.models.course import Course
+        from src.models.infeasibility_core import InfeasibilityCore
+
+        win = ScheduleWindow(mock_schedule_controller)
+        qtbot.addWidget(win)
+        assert mock_schedule_controller.on_infeasible == win.on_infeasible
+        assert win.core_label.isHidden()
+
+        core = InfeasibilityCore([Course("Algebra", "A1", "Dr. A"), Course("Logic", "L1", "Dr. B")])
+        win.on_infeasible(core)
+        assert not win.core_label.isHidden()
+        assert "Algebra (A1), Logic (L1) cannot be taken together" in win.core_label.text()
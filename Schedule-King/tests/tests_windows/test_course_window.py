@@ -119,3 +119,49 @@ def test_submit_selection(loaded_window, qtbot):
         qtbot.mouseClick(loaded_window.courseSelector.submit_button, Qt.LeftButton)
         mock_critical.assert_called_once()
         assert captured_selections == []
+
+def test_submit_with_schedule_constraints(loaded_window, qtbot):
+    from datetime import time
+    from src.components.constraint_dialog import ConstraintDialog
+    from src.models.schedule_constraints import ScheduleConstraints
+
+    dialog = ConstraintDialog(initial_limits=ScheduleConstraints(max_active_days=3, latest_end=time(18)))
+    qtbot.addWidget(dialog)
+    dialog.max_gap_spin.setValue(2)
+    constraints = dialog.get_schedule_constraints()
+    assert constraints == ScheduleConstraints(max_active_days=3, latest_end=time(18), max_gap_minutes=120)
+    assert dialog.get_soft_preferences().is_empty()
+    dialog.avoid_buildings_edit.setText("1100, 605 ,")
+    dialog.early_before_spin.setValue(10)
+    preferences = dialog.get_soft_preferences()
+    assert preferences.avoided_buildings == ["1100", "605"] and preferences.early_before == time(10)
+    dialog._clear_all_constraints()
+    assert dialog.get_schedule_constraints().is_empty() and dialog.get_soft_preferences().is_empty()
+
+    captured = []
+    loaded_window.on_continue = lambda *args: captured.append(args)
+    loaded_window.schedule_constraints = constraints
+    list_widget = loaded_window.courseSelector.findChild(QListWidget)
+    with patch.object(course_selector.CourseSelector, "show_progress_bar", return_value=None):
+        list_widget.item(0).setSelected(True)
+        qtbot.mouseClick(loaded_window.courseSelector.submit_button, Qt.LeftButton)
+    assert len(captured) == 1
+    selected, forbidden, passed = captured[0]
+    assert [c.course_code for c in selected] == ["00001"] and forbidden == [] and passed is constraints
+
+def test_settled_selection_is_reported_for_speculation(loaded_window, qtbot):
+    captured = []
+    loaded_window.on_selection_changed = lambda *args: captured.append(args)
+    loaded_window.speculation_timer.setInterval(10)
+    loaded_window.forbidden_slots = {(0, 1)}
+    list_widget = loaded_window.courseSelector.findChild(QListWidget)
+    list_widget.item(0).setSelected(True)
+    list_widget.item(1).setSelected(True)
+    # Both changes restart the debounce timer, the settled selection is reported once
+    qtbot.waitUntil(lambda: len(captured) == 1, timeout=2000)
+    qtbot.wait(50)
+    assert len(captured) == 1
+    selected, forbidden, constraints, preferences = captured[0]
+    assert len(selected) == 2
+    assert [(slot.day, slot.start_time.hour) for slot in forbidden] == [("2", 8)]
+    assert constraints is loaded_window.schedule_constraints and preferences is loaded_window.soft_preferences